@@ -1,22 +1,56 @@
 """
 Tradovate WebSocket Data Feed
 
-Provides real-time market data streaming.
+Provides real-time market data streaming on asyncio:
+
+    - each websocket frame is decoded once (a Tradovate "a[...]" frame
+      carries several events) and the items of an md message are
+      processed as one batch
+    - trades build 1m bars per symbol on the exchange timestamp of each
+      trade (receipt time only if the message has none); a bar closes on
+      the first trade of a later minute, or bar_close_grace seconds after
+      its minute ends on the exchange clock if no trade comes
+    - consumers read bounded asyncio queues (add_consumer) and never slow
+      the reader: a full queue drops its oldest item, and quote queues can
+      coalesce to the latest quote per symbol instead
+    - a dropped connection is reopened with backoff and every symbol
+      resubscribed
+    - throughput() reports frame/item/bar counts and rates, drops,
+      coalesced quotes and reconnects
+
+The on_quote / on_trade / on_bar callbacks still run inline for
+synchronous users (SyncDataFeed, runners.run_tradovate).
+
+Usage:
+    feed = TradovateDataFeed(client)
+    bars = feed.add_consumer("bar")
+    quotes = feed.add_consumer("quote", maxsize=100, policy="coalesce")
+
+    async def main():
+        asyncio.create_task(feed.run(["ESM6", "NQM6"]))
+        while True:
+            bar = await bars.get()
+            ...
 """
 from __future__ import annotations
 import json
+import time
 import asyncio
 import websockets
-from datetime import datetime
+from websockets.asyncio.client import connect as ws_connect
+from datetime import datetime, timezone
 from dataclasses import dataclass
-from typing import Optional, Callable
-from collections import defaultdict
+from typing import Any, Optional, Callable
 
 from core.types import Bar
+from core.stage_timer import StageTimer
 from broker.tradovate.api_client import TradovateClient
 
+KINDS = ("quote", "trade", "bar")
+POLICIES = ("drop_oldest", "drop_newest", "coalesce")
 
-@dataclass
+
+@dataclass(slots=True)
 class Quote:
     """Real-time quote data."""
     symbol: str
@@ -27,7 +61,7 @@ class Quote:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Real-time trade data."""
     symbol: str
@@ -36,6 +70,153 @@ class Trade:
     timestamp: datetime
 
 
+def decode_frame(raw: str | bytes) -> list[dict]:
+    """
+    Events of one websocket frame.
+
+    A frame is a JSON object, a JSON array of objects, or a Tradovate
+    "a[...]" array frame; the "o" / "h" / "c" control frames have none.
+
+    Raises:
+        ValueError: If the frame is not valid JSON.
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    if not raw:
+        return []
+    head = raw[0]
+    if head == "a":
+        data = json.loads(raw[1:])
+    elif head in "ohc":
+        return []
+    else:
+        data = json.loads(raw)
+    if isinstance(data, list):
+        return [event for event in data if isinstance(event, dict)]
+    return [data] if isinstance(data, dict) else []
+
+
+class BarBuilder:
+    """
+    Bars of one symbol built from trades on epoch seconds.
+
+    add() returns the bar a trade closed (the first trade of a later
+    bucket closes the current one); close_due() closes the current bar
+    once its bucket ended grace seconds ago. Trades older than the latest
+    bucket are counted in `late` and ignored. Bars are stamped with their
+    open time in naive local time.
+    """
+
+    __slots__ = ("symbol", "interval", "timeframe", "start", "last_start",
+                 "open", "high", "low", "close", "volume", "late")
+
+    def __init__(self, symbol: str, interval: int = 60):
+        self.symbol = symbol
+        self.interval = interval
+        self.timeframe = f"{interval // 60}m"
+        self.start: Optional[int] = None       # Open bucket (epoch seconds)
+        self.last_start: Optional[int] = None  # Latest bucket, even once closed
+        self.open = self.high = self.low = self.close = 0.0
+        self.volume = 0
+        self.late = 0
+
+    def add(self, epoch: float, price: float, size: int) -> Optional[Bar]:
+        """Add one trade; returns the bar it closed, if any."""
+        start = int(epoch) // self.interval * self.interval
+        if start == self.start:
+            if price > self.high:
+                self.high = price
+            elif price < self.low:
+                self.low = price
+            self.close = price
+            self.volume += size
+            return None
+        if self.last_start is not None and start <= self.last_start:
+            self.late += 1
+            return None
+        closed = self._take() if self.start is not None else None
+        self.start = self.last_start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = size
+        return closed
+
+    def close_due(self, now: float, grace: float) -> Optional[Bar]:
+        """Close the open bar if its bucket ended at least grace seconds before now."""
+        if self.start is not None and now >= self.start + self.interval + grace:
+            return self._take()
+        return None
+
+    def _take(self) -> Bar:
+        bar = Bar(
+            timestamp=datetime.fromtimestamp(self.start),
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=self.volume,
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+        )
+        self.start = None
+        return bar
+
+
+class CoalescingQueue:
+    """
+    Bounded queue holding only the latest item per key.
+
+    put_nowait() replaces a key's pending item instead of queueing another,
+    so a slow consumer gets the newest quote of each symbol; get() returns
+    pending keys in the order they became pending.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self._items: dict[Any, Any] = {}
+        self._ready = asyncio.Event()
+
+    def put_nowait(self, key, item) -> Optional[str]:
+        """Queue item under key; returns "coalesced" or "dropped" if an older item gave way."""
+        outcome = None
+        if key in self._items:
+            outcome = "coalesced"
+        elif self.maxsize and len(self._items) >= self.maxsize:
+            del self._items[next(iter(self._items))]
+            outcome = "dropped"
+        self._items[key] = item
+        self._ready.set()
+        return outcome
+
+    async def get(self):
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.pop(next(iter(self._items)))
+
+    def get_nowait(self):
+        if not self._items:
+            raise asyncio.QueueEmpty
+        return self._items.pop(next(iter(self._items)))
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+
+def _offer(queue: asyncio.Queue, item, policy: str) -> Optional[str]:
+    """put_nowait() that never waits: on a full queue drop the oldest item (or this one)."""
+    if not queue.full():
+        queue.put_nowait(item)
+        return None
+    if policy == "drop_oldest":
+        queue.get_nowait()
+        queue.task_done()
+        queue.put_nowait(item)
+    return "dropped"
+
+
 class TradovateDataFeed:
     """
     WebSocket-based real-time data feed from Tradovate.
@@ -43,14 +224,32 @@ class TradovateDataFeed:
     Provides:
     - Real-time quotes
     - Real-time trades
-    - Bar aggregation
+    - Bar aggregation on exchange timestamps
+    - Bounded consumer queues, reconnect with resubscribe
+
+    Args:
+        client: Authenticated (or authenticatable) TradovateClient.
+        reconnect_delay: Seconds before the first reconnect attempt (doubled
+            per failure up to max_reconnect_delay); None disables reconnecting.
+        max_reconnect_delay: Backoff ceiling.
+        bar_close_grace: Seconds after a bar's minute ends (exchange clock)
+            to close it if no later trade arrived; None waits for the trade.
     """
 
-    def __init__(self, client: TradovateClient):
+    def __init__(
+        self,
+        client: TradovateClient,
+        reconnect_delay: Optional[float] = 5.0,
+        max_reconnect_delay: float = 60.0,
+        bar_close_grace: Optional[float] = 5.0,
+    ):
         self.client = client
-        self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.ws = None
         self.subscriptions: set[str] = set()
         self.running = False
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.bar_close_grace = bar_close_grace
 
         # Callbacks
         self.on_quote: Optional[Callable[[Quote], None]] = None
@@ -59,8 +258,30 @@ class TradovateDataFeed:
 
         # Bar aggregation
         self.bar_interval = 60  # seconds (1 minute)
-        self.current_bars: dict[str, dict] = defaultdict(dict)
-        self.last_bar_time: dict[str, datetime] = {}
+        self.builders: dict[str, BarBuilder] = {}
+
+        # Consumer queues: kind -> [(queue, policy)]
+        self._consumers: dict[str, list[tuple[Any, str]]] = {kind: [] for kind in KINDS}
+
+        # Contract lookups survive reconnects (no REST call on resubscribe)
+        self._contract_ids: dict[str, int] = {}
+        self._contract_symbols: dict[int, str] = {}
+
+        # Throughput
+        self.timings = StageTimer(window=1000)
+        self._started: Optional[float] = None
+
+        # Exchange clock: receipt time minus exchange time of the latest trade
+        self._clock_offset = 0.0
+        # One-entry caches: ISO timestamp second -> epoch, epoch -> local datetime
+        self._ts_key: Optional[str] = None
+        self._ts_epoch = 0
+        self._dt_epoch: Optional[int] = None
+        self._dt: Optional[datetime] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stopping = False
 
         # Message ID counter
         self._msg_id = 0
@@ -69,17 +290,42 @@ class TradovateDataFeed:
         self._msg_id += 1
         return self._msg_id
 
+    def add_consumer(self, kind: str, maxsize: int = 1000, policy: str = "drop_oldest"):
+        """
+        Bounded queue receiving every quote, trade or closed bar.
+
+        The reader never waits on a consumer. When the queue is full,
+        drop_oldest discards its oldest item, drop_newest the new one;
+        coalesce (quotes only) keeps just the latest quote per symbol.
+        Queues are filled on the feed's event loop: read them there.
+
+        Returns:
+            An asyncio.Queue, or a CoalescingQueue for policy "coalesce".
+
+        Raises:
+            ValueError: Unknown kind or policy, or coalesce for non-quotes.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown consumer kind {kind!r} (expected one of {KINDS})")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r} (expected one of {POLICIES})")
+        if policy == "coalesce" and kind != "quote":
+            raise ValueError("Only quote consumers can coalesce")
+        queue = CoalescingQueue(maxsize) if policy == "coalesce" else asyncio.Queue(maxsize)
+        self._consumers[kind].append((queue, policy))
+        return queue
+
     async def connect(self) -> bool:
         """Connect to Tradovate WebSocket."""
         if not self.client.is_authenticated():
-            if not self.client.authenticate():
+            if not await asyncio.to_thread(self.client.authenticate):
                 print("Failed to authenticate")
                 return False
 
         try:
-            self.ws = await websockets.connect(
+            self.ws = await ws_connect(
                 self.client.config.md_url,
-                extra_headers={"Authorization": f"Bearer {self.client.access_token}"}
+                additional_headers={"Authorization": f"Bearer {self.client.access_token}"}
             )
             print(f"Connected to {self.client.config.md_url}")
 
@@ -97,29 +343,61 @@ class TradovateDataFeed:
 
         except Exception as e:
             print(f"Connection failed: {e}")
+            await self._close_ws()
             return False
 
     async def disconnect(self):
         """Disconnect from WebSocket."""
+        self._stopping = True
         self.running = False
-        if self.ws:
-            await self.ws.close()
-            self.ws = None
+        await self._close_ws()
         print("Disconnected from Tradovate")
 
+    async def _close_ws(self):
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    def stop(self):
+        """Stop run() / listen(); safe to call from any thread."""
+        self._stopping = True
+        self.running = False
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:  # Loop already shut down
+                pass
+
+    def _wake(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self.ws is not None:
+            asyncio.ensure_future(self.ws.close())
+
     async def subscribe(self, symbol: str):
         """Subscribe to market data for a symbol."""
         if not self.ws:
             print("Not connected")
             return
 
-        # Get contract ID
-        contract = self.client.get_contract(symbol)
-        if not contract:
-            print(f"Contract not found: {symbol}")
-            return
-
-        contract_id = contract.get("id")
+        # Get contract ID (looked up once, reused on resubscribe)
+        contract_id = self._contract_ids.get(symbol)
+        if contract_id is None:
+            try:
+                contract = await asyncio.to_thread(self.client.get_contract, symbol)
+            except Exception as e:
+                print(f"Contract lookup failed for {symbol}: {e}")
+                return
+            if not contract:
+                print(f"Contract not found: {symbol}")
+                return
+            contract_id = contract.get("id")
+            self._contract_ids[symbol] = contract_id
+            self._contract_symbols[contract_id] = symbol
 
         # Subscribe to quotes
         msg = {
@@ -149,142 +427,279 @@ class TradovateDataFeed:
         self.subscriptions.discard(symbol)
         print(f"Unsubscribed from {symbol}")
 
-    def _process_quote(self, data: dict):
-        """Process incoming quote data."""
-        try:
-            quote = Quote(
-                symbol=data.get("symbol", ""),
-                bid=float(data.get("bid", 0)),
-                ask=float(data.get("ask", 0)),
-                last=float(data.get("last", 0)),
-                volume=int(data.get("volume", 0)),
-                timestamp=datetime.now()
-            )
-            if self.on_quote:
-                self.on_quote(quote)
-        except Exception as e:
-            print(f"Error processing quote: {e}")
+    def _exchange_epoch(self, value, received: float) -> int:
+        """Epoch seconds of a message timestamp (ISO 8601 or epoch ms), receipt time if absent."""
+        if value is None:
+            return int(received)
+        if isinstance(value, (int, float)):
+            return int(value / 1000 if value > 1e11 else value)
+        key = value[:19]  # Consecutive trades mostly share the second
+        if key != self._ts_key:
+            ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            self._ts_key, self._ts_epoch = key, int(ts.timestamp())
+        return self._ts_epoch
+
+    def _local_time(self, epoch: int) -> datetime:
+        if epoch != self._dt_epoch:
+            self._dt_epoch, self._dt = epoch, datetime.fromtimestamp(epoch)
+        return self._dt
+
+    def _symbol_of(self, item: dict) -> str:
+        return item.get("symbol") or self._contract_symbols.get(item.get("contractId"), "")
+
+    def process_frame(self, raw: str | bytes, received: Optional[float] = None):
+        """
+        Decode one websocket frame and dispatch its quotes, trades and closed bars.
 
-    def _process_trade(self, data: dict):
-        """Process incoming trade data."""
+        Args:
+            raw: Frame text.
+            received: Receipt time (epoch seconds), default now.
+        """
+        start = time.perf_counter()
+        received = time.time() if received is None else received
         try:
-            trade = Trade(
-                symbol=data.get("symbol", ""),
-                price=float(data.get("price", 0)),
-                size=int(data.get("size", 0)),
-                timestamp=datetime.now()
-            )
-            if self.on_trade:
-                self.on_trade(trade)
-
-            # Update current bar
-            self._update_bar(trade)
+            events = decode_frame(raw)
+        except ValueError as e:
+            self.timings.count("decode_errors")
+            print(f"Error decoding message: {e}")
+            return
 
-        except Exception as e:
-            print(f"Error processing trade: {e}")
-
-    def _update_bar(self, trade: Trade):
-        """Update the current bar with trade data."""
-        symbol = trade.symbol
-        now = trade.timestamp
-
-        # Calculate bar start time
-        bar_seconds = int(now.timestamp()) // self.bar_interval * self.bar_interval
-        bar_time = datetime.fromtimestamp(bar_seconds)
-
-        # Check if we need to emit a completed bar
-        if symbol in self.last_bar_time and self.last_bar_time[symbol] < bar_time:
-            # Emit the previous bar
-            prev_bar = self.current_bars.get(symbol)
-            if prev_bar and self.on_bar:
-                bar = Bar(
-                    timestamp=self.last_bar_time[symbol],
-                    open=prev_bar["open"],
-                    high=prev_bar["high"],
-                    low=prev_bar["low"],
-                    close=prev_bar["close"],
-                    volume=prev_bar["volume"],
-                    symbol=symbol,
-                    timeframe=f"{self.bar_interval // 60}m"
+        quotes, trades = [], []
+        for event in events:
+            msg_type = event.get("e") or event.get("type")
+            data = event.get("d", event)
+            if msg_type == "quote":
+                quotes.append(data)
+            elif msg_type == "trade":
+                trades.append(data)
+            elif msg_type == "md":
+                # Market data update: a batch of quotes and trades
+                for item in data if isinstance(data, list) else ():
+                    if "bid" in item or "ask" in item:
+                        quotes.append(item)
+                    elif "price" in item and "size" in item:
+                        trades.append(item)
+
+        if quotes:
+            self._process_quotes(quotes, received)
+        if trades:
+            self._process_trades(trades, received)
+        self.timings.count("frames")
+        self.timings.count("items", len(quotes) + len(trades))
+        self.timings.record("frame", time.perf_counter() - start)
+
+    def _process_quotes(self, items: list[dict], received: float):
+        """Process a batch of incoming quotes."""
+        self.timings.count("quotes", len(items))
+        if self.on_quote is None and not self._consumers["quote"]:
+            return
+        quotes = []
+        for data in items:
+            try:
+                quote = Quote(
+                    symbol=self._symbol_of(data),
+                    bid=float(data.get("bid", 0)),
+                    ask=float(data.get("ask", 0)),
+                    last=float(data.get("last", 0)),
+                    volume=int(data.get("volume", 0)),
+                    timestamp=self._local_time(self._exchange_epoch(data.get("timestamp"), received)),
                 )
-                self.on_bar(bar)
-
-            # Reset for new bar
-            self.current_bars[symbol] = {}
-
-        # Update current bar
-        bar = self.current_bars[symbol]
-        if not bar:
-            bar["open"] = trade.price
-            bar["high"] = trade.price
-            bar["low"] = trade.price
-            bar["volume"] = 0
-
-        bar["high"] = max(bar.get("high", trade.price), trade.price)
-        bar["low"] = min(bar.get("low", trade.price), trade.price)
-        bar["close"] = trade.price
-        bar["volume"] = bar.get("volume", 0) + trade.size
-
-        self.current_bars[symbol] = bar
-        self.last_bar_time[symbol] = bar_time
+            except (TypeError, ValueError) as e:
+                print(f"Error processing quote: {e}")
+                continue
+            quotes.append(quote)
+            if self.on_quote:
+                try:
+                    self.on_quote(quote)
+                except Exception as e:
+                    print(f"Error in quote callback: {e}")
+        self._deliver("quote", quotes)
+
+    def _process_trades(self, items: list[dict], received: float):
+        """Process a batch of incoming trades: update bars, then hand trades out."""
+        self.timings.count("trades", len(items))
+        wanted = self.on_trade is not None or bool(self._consumers["trade"])
+        trades, closed = [], []
+        epoch = None
+        for data in items:
+            try:
+                symbol = self._symbol_of(data)
+                price = float(data["price"])
+                size = int(data.get("size", 0))
+                epoch = self._exchange_epoch(data.get("timestamp"), received)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Error processing trade: {e}")
+                continue
+
+            builder = self.builders.get(symbol)
+            if builder is None:
+                builder = self.builders[symbol] = BarBuilder(symbol, self.bar_interval)
+            bar = builder.add(epoch, price, size)
+            if bar is not None:
+                closed.append(bar)
+
+            if wanted:
+                trade = Trade(symbol=symbol, price=price, size=size, timestamp=self._local_time(epoch))
+                trades.append(trade)
+                if self.on_trade:
+                    try:
+                        self.on_trade(trade)
+                    except Exception as e:
+                        print(f"Error in trade callback: {e}")
+
+        if epoch is not None:
+            self._clock_offset = received - epoch
+        self._deliver("trade", trades)
+        if closed:
+            self._emit_bars(closed)
+
+    def close_due_bars(self, now: Optional[float] = None) -> list[Bar]:
+        """Close (and emit) bars whose minute ended bar_close_grace seconds ago on the exchange clock."""
+        if self.bar_close_grace is None:
+            return []
+        exchange_now = (time.time() if now is None else now) - self._clock_offset
+        closed = []
+        for builder in self.builders.values():
+            bar = builder.close_due(exchange_now, self.bar_close_grace)
+            if bar is not None:
+                closed.append(bar)
+        if closed:
+            self._emit_bars(closed)
+        return closed
+
+    def _emit_bars(self, bars: list[Bar]):
+        self.timings.count("bars", len(bars))
+        if self.on_bar:
+            for bar in bars:
+                try:
+                    self.on_bar(bar)
+                except Exception as e:
+                    print(f"Error in bar callback: {e}")
+        self._deliver("bar", bars)
+
+    def _deliver(self, kind: str, items: list):
+        for queue, policy in self._consumers[kind]:
+            for item in items:
+                if policy == "coalesce":
+                    outcome = queue.put_nowait(item.symbol, item)
+                else:
+                    outcome = _offer(queue, item, policy)
+                if outcome:
+                    self.timings.count(f"{kind}s_{outcome}")
+
+    async def _housekeeping(self):
+        """Once a second: close bars due on time, and honour running=False set from outside."""
+        while True:
+            await asyncio.sleep(1.0)
+            if not self.running:
+                await self._close_ws()
+                return
+            self.close_due_bars()
+
+    async def listen(self) -> bool:
+        """
+        Listen for incoming messages until stopped or the connection drops.
 
-    async def listen(self):
-        """Listen for incoming messages."""
+        Returns:
+            True if the connection was lost (run() reconnects), False if stopped.
+        """
         if not self.ws:
             print("Not connected")
-            return
+            return False
 
         print("Listening for market data...")
-
+        housekeeping = asyncio.create_task(self._housekeeping())
         try:
-            while self.running:
-                try:
-                    message = await asyncio.wait_for(self.ws.recv(), timeout=30)
-                    data = json.loads(message)
-
-                    # Process based on message type
-                    msg_type = data.get("e") or data.get("type")
-
-                    if msg_type == "quote":
-                        self._process_quote(data.get("d", data))
-                    elif msg_type == "trade":
-                        self._process_trade(data.get("d", data))
-                    elif msg_type == "md":
-                        # Market data update
-                        for item in data.get("d", []):
-                            if "bid" in item or "ask" in item:
-                                self._process_quote(item)
-                            elif "price" in item and "size" in item:
-                                self._process_trade(item)
-
-                except asyncio.TimeoutError:
-                    # Send heartbeat
-                    if self.ws:
-                        await self.ws.ping()
-
+            async for message in self.ws:
+                self.process_frame(message)
+                if not self.running:
+                    break
+            else:
+                print("Connection closed")
         except websockets.exceptions.ConnectionClosed:
             print("Connection closed")
-            self.running = False
         except Exception as e:
             print(f"Error in listen loop: {e}")
-            self.running = False
+        finally:
+            housekeeping.cancel()
+
+        lost = self.running and not self._stopping
+        self.running = False
+        return lost
 
     async def run(self, symbols: list[str]):
         """
         Main entry point - connect, subscribe, and listen.
 
+        If the connection cannot be opened or drops, reconnects after
+        reconnect_delay (doubling per failure) and resubscribes every
+        symbol, until stop() / disconnect().
+
         Args:
             symbols: List of symbols to subscribe to (e.g., ["ESH5", "NQH5"])
         """
-        if not await self.connect():
-            return
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._stopping = False
+        if self._started is None:
+            self._started = time.monotonic()
+
+        delay = self.reconnect_delay
+        while not self._stopping:
+            if await self.connect():
+                # Subscribe to all symbols (plus any subscribed since)
+                for symbol in dict.fromkeys([*symbols, *sorted(self.subscriptions)]):
+                    await self.subscribe(symbol)
+                delay = self.reconnect_delay
+
+                # Listen for data
+                lost = await self.listen()
+                await self._close_ws()
+                if not lost:
+                    break
+
+            if self.reconnect_delay is None or self._stopping:
+                break
+            print(f"Reconnecting in {delay:.0f}s...")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.timings.count("reconnects")
 
-        # Subscribe to all symbols
-        for symbol in symbols:
-            await self.subscribe(symbol)
+        self.running = False
 
-        # Listen for data
-        await self.listen()
+    def throughput(self) -> dict[str, Any]:
+        """
+        Counts and rates since run() started.
+
+        Returns:
+            {'uptime_s', 'counters': {frames, items, quotes, trades, bars,
+            reconnects, late_trades, decode_errors, <kind>s_dropped,
+            quotes_coalesced}, 'per_second': {frames, items, quotes, trades,
+            bars}, 'queues': {kind: [depth per consumer]}, 'frame': rolling
+            per-frame processing time (n, last, p50, p95, max)}.
+        """
+        summary = self.timings.summary(digits=6)
+        counters = summary["counters"]
+        late = sum(builder.late for builder in self.builders.values())
+        if late:
+            counters["late_trades"] = late
+        uptime = time.monotonic() - self._started if self._started is not None else 0.0
+        return {
+            "uptime_s": round(uptime, 3),
+            "counters": counters,
+            "per_second": {
+                name: round(counters.get(name, 0) / uptime, 2) if uptime > 0 else 0.0
+                for name in ("frames", "items", "quotes", "trades", "bars")
+            },
+            "queues": {kind: [queue.qsize() for queue, _ in consumers]
+                       for kind, consumers in self._consumers.items() if consumers},
+            "frame": summary["stages"].get("frame"),
+        }
 
 
 # Synchronous wrapper for easier use
@@ -311,8 +726,8 @@ class SyncDataFeed:
         asyncio.run(self.feed.run(symbols))
 
     def stop(self):
-        """Stop the data feed."""
-        self.feed.running = False
+        """Stop the data feed (from any thread)."""
+        self.feed.stop()
 
 
 if __name__ == "__main__":
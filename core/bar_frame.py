@@ -0,0 +1,263 @@
+"""
+Columnar Bar Container
+
+BarFrame stores a bar series as contiguous NumPy arrays instead of one
+Bar dataclass per row:
+
+    timestamps: int64 epoch seconds
+    open/high/low/close/volume: float64
+
+A 10k-bar history is ~480 KB of arrays instead of 10k Python objects
+(each Bar plus its datetime and float objects is several hundred bytes),
+and indicator code can read bars.close directly instead of rebuilding
+[b.close for b in bars] on every call.
+
+Legacy code keeps working: indexing with an int returns a regular Bar,
+iterating yields Bars, and to_bars()/from_bars() convert in bulk. Slicing
+with a slice returns a BarFrame whose arrays are views (no copy).
+
+Timestamps:
+    Naive datetimes (the TradingView/CSV convention: exchange-local wall
+    time) are stored as wall-clock seconds since 1970-01-01 and come back
+    naive. Timezone-aware datetimes are stored as true UTC epoch seconds
+    and come back in the frame's tz. A frame holds one or the other, never
+    both. Resolution is one second.
+
+Usage:
+    from core.bar_frame import BarFrame
+
+    frame = BarFrame.from_bars(bars)
+    closes = frame.close            # np.ndarray, no per-bar work
+    recent = frame[-500:]           # BarFrame view
+    bar = frame[-1]                 # core.types.Bar
+    bars_again = frame.to_bars()
+    for bar in frame.iter_bars():   # streams Bars without a full list
+        ...
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone, tzinfo
+from typing import Iterator
+
+import numpy as np
+
+from core.types import Bar
+
+
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+
+
+def datetimes_to_epoch(timestamps: list[datetime]) -> tuple[np.ndarray, tzinfo | None]:
+    """
+    Convert datetimes to int64 epoch seconds.
+
+    Returns:
+        (epoch_seconds, tz) - tz is None for naive input, otherwise the
+        tzinfo of the first timestamp (used when converting back).
+
+    Raises:
+        ValueError: If naive and aware datetimes are mixed.
+    """
+    if not timestamps:
+        return np.empty(0, dtype=np.int64), None
+
+    tz = timestamps[0].tzinfo
+    if tz is None:
+        if any(ts.tzinfo is not None for ts in timestamps):
+            raise ValueError("Cannot mix naive and timezone-aware timestamps in one BarFrame")
+        naive = timestamps
+    else:
+        if any(ts.tzinfo is None for ts in timestamps):
+            raise ValueError("Cannot mix naive and timezone-aware timestamps in one BarFrame")
+        naive = [ts.astimezone(timezone.utc).replace(tzinfo=None) for ts in timestamps]
+
+    return np.array(naive, dtype="datetime64[s]").astype(np.int64), tz
+
+
+def epoch_to_datetimes(epoch_seconds: np.ndarray, tz: tzinfo | None = None) -> list[datetime]:
+    """Inverse of datetimes_to_epoch()."""
+    naive = np.asarray(epoch_seconds, dtype=np.int64).astype("datetime64[s]").tolist()
+    if tz is None:
+        return naive
+    return [ts.replace(tzinfo=timezone.utc).astimezone(tz) for ts in naive]
+
+
+def datetime_to_epoch(ts: datetime, tz: tzinfo | None = None) -> int:
+    """Epoch seconds for a single datetime, using a frame's naive/aware convention."""
+    if tz is None:
+        if ts.tzinfo is not None:
+            raise ValueError("Aware timestamp used with a naive BarFrame")
+        return int((ts - _EPOCH_NAIVE).total_seconds())
+    if ts.tzinfo is None:
+        raise ValueError("Naive timestamp used with a timezone-aware BarFrame")
+    return int(ts.timestamp())
+
+
+class BarFrame:
+    """
+    Columnar OHLCV bar series backed by NumPy arrays.
+
+    Attributes:
+        timestamps: int64 epoch seconds (bar open time), chronological.
+        open, high, low, close, volume: float64 arrays.
+        symbol: Instrument for every row (e.g. "ES").
+        timeframe: Bar duration for every row (e.g. "3m").
+        tz: tzinfo of the original timestamps, None for naive bars.
+    """
+
+    __slots__ = ("timestamps", "open", "high", "low", "close", "volume",
+                 "symbol", "timeframe", "tz", "_int_volume")
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray | None = None,
+        symbol: str = "",
+        timeframe: str = "",
+        tz: tzinfo | None = None,
+        int_volume: bool = True,
+    ):
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = (np.zeros(len(self.timestamps), dtype=np.float64) if volume is None
+                       else np.asarray(volume, dtype=np.float64))
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.tz = tz
+        self._int_volume = int_volume
+
+        n = len(self.timestamps)
+        for name in ("open", "high", "low", "close", "volume"):
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"BarFrame column '{name}' has {len(getattr(self, name))} rows, expected {n}")
+
+    # -------------------------------------------------------------------------
+    # Construction / conversion
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_bars(cls, bars: list[Bar]) -> "BarFrame":
+        """Build a frame from a list of Bar objects (symbol/timeframe from the first bar)."""
+        n = len(bars)
+        timestamps, tz = datetimes_to_epoch([b.timestamp for b in bars])
+
+        def column(name):
+            return np.fromiter((getattr(b, name) for b in bars), dtype=np.float64, count=n)
+
+        volumes = [b.volume for b in bars]
+        return cls(
+            timestamps=timestamps,
+            open=column("open"),
+            high=column("high"),
+            low=column("low"),
+            close=column("close"),
+            volume=np.array(volumes, dtype=np.float64),
+            symbol=bars[0].symbol if bars else "",
+            timeframe=bars[0].timeframe if bars else "",
+            tz=tz,
+            int_volume=all(isinstance(v, int) for v in volumes),
+        )
+
+    @classmethod
+    def empty(cls, symbol: str = "", timeframe: str = "", tz: tzinfo | None = None) -> "BarFrame":
+        """Zero-row frame."""
+        z = np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype=np.int64), z, z, z, z, z, symbol=symbol, timeframe=timeframe, tz=tz)
+
+    def datetimes(self) -> list[datetime]:
+        """Bar timestamps as datetime objects (naive or in self.tz)."""
+        return epoch_to_datetimes(self.timestamps, self.tz)
+
+    def to_bars(self) -> list[Bar]:
+        """Materialize every row as a Bar (for code that needs list[Bar])."""
+        volumes = self.volume.astype(np.int64).tolist() if self._int_volume else self.volume.tolist()
+        return [
+            Bar(timestamp=ts, open=o, high=h, low=l, close=c, volume=v,
+                symbol=self.symbol, timeframe=self.timeframe)
+            for ts, o, h, l, c, v in zip(
+                self.datetimes(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), volumes,
+            )
+        ]
+
+    # -------------------------------------------------------------------------
+    # Sequence protocol
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, key):
+        """frame[i] -> Bar, frame[a:b] -> BarFrame view."""
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError("BarFrame slices must be contiguous (step 1)")
+            return self._view(key)
+        return self.row(key)
+
+    def __iter__(self) -> Iterator[Bar]:
+        return self.iter_bars()
+
+    def iter_bars(self, chunk_size: int = 4096) -> Iterator[Bar]:
+        """Yield every row as a Bar, materializing chunk_size rows at a time."""
+        for start in range(0, len(self), chunk_size):
+            yield from self._view(slice(start, start + chunk_size)).to_bars()
+
+    def _view(self, key: slice) -> "BarFrame":
+        return BarFrame(
+            self.timestamps[key], self.open[key], self.high[key], self.low[key],
+            self.close[key], self.volume[key],
+            symbol=self.symbol, timeframe=self.timeframe, tz=self.tz,
+            int_volume=self._int_volume,
+        )
+
+    def row(self, i: int) -> Bar:
+        """Row i as a Bar."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("BarFrame index out of range")
+        volume = self.volume[i].item()
+        return Bar(
+            timestamp=epoch_to_datetimes(self.timestamps[i:i + 1], self.tz)[0],
+            open=self.open[i].item(),
+            high=self.high[i].item(),
+            low=self.low[i].item(),
+            close=self.close[i].item(),
+            volume=int(volume) if self._int_volume else volume,
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+        )
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def index_of(self, ts: datetime) -> int | None:
+        """Row index of a bar timestamp, or None (binary search, timestamps must be sorted)."""
+        key = datetime_to_epoch(ts, self.tz)
+        i = int(np.searchsorted(self.timestamps, key, side="left"))
+        if i < len(self) and self.timestamps[i] == key:
+            return i
+        return None
+
+    def between(self, start: datetime | None = None, end: datetime | None = None) -> "BarFrame":
+        """View of rows with start <= timestamp <= end (either bound optional)."""
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, datetime_to_epoch(start, self.tz), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamps, datetime_to_epoch(end, self.tz), side="right"))
+        return self._view(slice(lo, hi))
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"BarFrame({self.symbol} {self.timeframe}, 0 bars)"
+        first, last = epoch_to_datetimes(self.timestamps[[0, -1]], self.tz)
+        return f"BarFrame({self.symbol} {self.timeframe}, {len(self)} bars, {first} -> {last})"
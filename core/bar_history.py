@@ -0,0 +1,191 @@
+"""
+Bounded Bar History
+
+Bar lists for strategies that only look back a fixed number of bars.
+Only the newest `maxlen` bars are kept, so appending costs O(1) however
+long the strategy runs.
+
+    BarHistory   indices stay absolute (bar 0 is the first bar ever
+                 appended, len() counts every bar); reading a bar that
+                 has been dropped raises IndexError instead of silently
+                 returning a different bar - size maxlen to the largest
+                 lookback
+    BarWindow    a list of the newest maxlen bars (bar 0 is the oldest
+                 bar held), the same as appending to a list and trimming
+                 it to its last maxlen bars, without copying the list on
+                 every bar
+
+Usage:
+    from core.bar_history import BarHistory, BarWindow
+
+    bars = BarHistory(maxlen=100)
+    for bar in stream:
+        bars.append(bar)
+    bars[-1]                 # latest bar
+    bars[len(bars) - 3:]     # last three bars (a list)
+    bars.first_index         # oldest bar still held
+
+    window = BarWindow(maxlen=100)
+    window.append(bar)
+    window[0], window[-1], window[:-1]  # as on a list of <= 100 bars
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from core.types import Bar
+
+
+class BarHistory:
+    """
+    Append-only bar sequence with absolute indices and bounded memory.
+
+    Args:
+        maxlen: Bars to keep (None keeps every bar).
+        bars: Initial bars.
+        on_append: Optional callback run with each appended bar (keeps
+            incremental indicators in step with bars appended directly).
+    """
+
+    def __init__(
+        self,
+        maxlen: int | None = None,
+        bars: Iterable[Bar] = (),
+        on_append: Callable[[Bar], None] | None = None,
+    ):
+        if maxlen is not None and maxlen < 1:
+            raise ValueError(f"maxlen must be >= 1, got {maxlen}")
+        self.maxlen = maxlen
+        self.on_append = on_append
+        self._bars: list[Bar] = []
+        self._start = 0   # Position in _bars of the oldest bar held
+        self._offset = 0  # Absolute index of _bars[0]
+        for bar in bars:
+            self.append(bar)
+
+    @property
+    def first_index(self) -> int:
+        """Absolute index of the oldest bar still held."""
+        return self._offset + self._start
+
+    def append(self, bar: Bar) -> None:
+        """Add the newest bar, dropping the oldest one past maxlen."""
+        self._bars.append(bar)
+        if self.maxlen is not None and len(self._bars) - self._start > self.maxlen:
+            self._drop(1)
+        if self.on_append is not None:
+            self.on_append(bar)
+
+    def discard_before(self, index: int) -> None:
+        """Drop every bar with absolute index < index."""
+        count = min(index, len(self)) - self.first_index
+        if count > 0:
+            self._drop(count)
+
+    def bisect_timestamp(self, ts: datetime) -> int:
+        """Absolute index of the first held bar with timestamp >= ts (len() if none)."""
+        k = bisect_left(self._bars, ts, lo=self._start, key=lambda b: b.timestamp)
+        return self._offset + k
+
+    def _drop(self, count: int) -> None:
+        self._start += count
+        # Compact once the dead prefix outweighs the live bars (amortized O(1))
+        if self._start > 64 and self._start * 2 > len(self._bars):
+            del self._bars[:self._start]
+            self._offset += self._start
+            self._start = 0
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not self.first_index <= index < len(self):
+            raise IndexError(f"bar {index} not held (holding {self.first_index}..{len(self) - 1})")
+        return index - self._offset
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("BarHistory slices do not support a step")
+            if start >= stop:
+                return []
+            if start < self.first_index:
+                raise IndexError(f"bar {start} not held (holding {self.first_index}..{len(self) - 1})")
+            return self._bars[start - self._offset:stop - self._offset]
+        return self._bars[self._position(key)]
+
+    def __len__(self) -> int:
+        return self._offset + len(self._bars)
+
+    def __iter__(self) -> Iterator[Bar]:
+        """Bars still held, oldest first."""
+        return iter(self._bars[self._start:])
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return f"BarHistory(bars={len(self)}, held={len(self) - self.first_index}, maxlen={self.maxlen})"
+
+
+class BarWindow:
+    """
+    The newest `maxlen` bars, indexed and sliced like a list.
+
+    Equivalent to `bars.append(bar); bars = bars[-maxlen:]`, but appending
+    is amortized O(1): dropped bars are only compacted away once they
+    outnumber the bars held.
+
+    Args:
+        maxlen: Bars to keep.
+        bars: Initial bars.
+    """
+
+    def __init__(self, maxlen: int, bars: Iterable[Bar] = ()):
+        if maxlen < 1:
+            raise ValueError(f"maxlen must be >= 1, got {maxlen}")
+        self.maxlen = maxlen
+        self._bars: list[Bar] = []
+        self._start = 0  # Position in _bars of window[0]
+        for bar in bars:
+            self.append(bar)
+
+    def append(self, bar: Bar) -> None:
+        """Add the newest bar, dropping the oldest one past maxlen."""
+        self._bars.append(bar)
+        if len(self._bars) - self._start > self.maxlen:
+            self._start += 1
+            if self._start >= self.maxlen:
+                del self._bars[:self._start]
+                self._start = 0
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return self._bars[self._start:][key]
+            return self._bars[self._start + start:self._start + max(start, stop)]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("BarWindow index out of range")
+        return self._bars[self._start + key]
+
+    def __len__(self) -> int:
+        return len(self._bars) - self._start
+
+    def __iter__(self) -> Iterator[Bar]:
+        return islice(self._bars, self._start, None)
+
+    def __reversed__(self) -> Iterator[Bar]:
+        return islice(reversed(self._bars), len(self))
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return f"BarWindow(bars={len(self)}, maxlen={self.maxlen})"
@@ -0,0 +1,116 @@
+"""
+DataFrame Bar Ingestion
+
+Converts OHLCV DataFrames from data vendors (tvDatafeed: lowercase
+open/high/low/close/volume columns, naive DatetimeIndex; yfinance:
+Open/High/Low/Close/Volume, tz-aware DatetimeIndex) to a BarFrame or to
+Bars with column-wise NumPy extraction instead of df.iterrows():
+
+    - prices are read as whole float64 columns
+    - missing volume (NaN, or no volume column) becomes 0
+    - the index is converted to epoch seconds in one pass; strip_tz
+      keeps the index's wall-clock time and drops the timezone (the
+      old `.to_pydatetime().replace(tzinfo=None)`)
+
+A 10k-row DataFrame converts to a BarFrame in well under a millisecond;
+to Bars, the cost is creating the Bar objects themselves.
+
+Usage:
+    from core.bar_ingest import bars_from_dataframe, frame_from_dataframe
+
+    df = tv.get_hist(symbol="ES1!", exchange="CME_MINI", interval=..., n_bars=10000)
+    frame = frame_from_dataframe(df, symbol="ES", timeframe="3m")
+    bars = bars_from_dataframe(df, symbol="ES", timeframe="3m")
+
+    df = yf.Ticker("ES=F").history(period="5d", interval="1m")
+    bars = bars_from_dataframe(df, symbol="ES", timeframe="1m", strip_tz=True)
+"""
+
+from __future__ import annotations
+
+from datetime import tzinfo
+from typing import Any
+
+import numpy as np
+
+from core.bar_frame import BarFrame
+from core.types import Bar
+
+
+def _column(df: Any, name: str) -> Any:
+    """Column by lowercase name, matching vendor capitalization (open / Open)."""
+    if name in df.columns:
+        return df[name]
+    for col in df.columns:
+        if str(col).lower() == name:
+            return df[col]
+    return None
+
+
+def index_epoch_seconds(df: Any, strip_tz: bool = False) -> tuple[np.ndarray, tzinfo | None]:
+    """
+    int64 epoch seconds of a DataFrame's DatetimeIndex (BarFrame convention).
+
+    Returns:
+        (epoch_seconds, tz) - naive wall-clock seconds and None for a naive
+        index (or any index with strip_tz), else UTC seconds and the index tz.
+    """
+    index = df.index
+    tz = getattr(index, "tz", None)
+    if tz is not None and strip_tz:
+        index = index.tz_localize(None)
+        tz = None
+    # .values is wall time for a naive index and UTC for an aware one
+    seconds = np.asarray(index.values).astype("datetime64[s]").astype(np.int64)
+    return seconds, tz
+
+
+def frame_from_dataframe(
+    df: Any,
+    symbol: str,
+    timeframe: str,
+    strip_tz: bool = False,
+) -> BarFrame:
+    """
+    Convert an OHLCV DataFrame with a DatetimeIndex to a BarFrame.
+
+    Args:
+        df: DataFrame with open/high/low/close[/volume] columns (any case).
+        symbol, timeframe: Stamped on the frame.
+        strip_tz: Drop the index timezone, keeping its wall-clock time.
+
+    Raises:
+        ValueError: If a price column is missing.
+    """
+    if df is None or len(df) == 0:
+        return BarFrame.empty(symbol=symbol, timeframe=timeframe)
+
+    timestamps, tz = index_epoch_seconds(df, strip_tz)
+    prices = {}
+    for name in ("open", "high", "low", "close"):
+        column = _column(df, name)
+        if column is None:
+            raise ValueError(f"DataFrame has no '{name}' column (columns: {list(df.columns)})")
+        prices[name] = column.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    column = _column(df, "volume")
+    if column is None:
+        volume = np.zeros(len(timestamps), dtype=np.float64)
+    else:
+        volume = np.nan_to_num(column.to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+
+    return BarFrame(timestamps, volume=volume, symbol=symbol, timeframe=timeframe, tz=tz, **prices)
+
+
+def bars_from_dataframe(
+    df: Any,
+    symbol: str,
+    timeframe: str,
+    strip_tz: bool = False,
+) -> list[Bar]:
+    """
+    Convert an OHLCV DataFrame to Bars (int volume, NaN volume -> 0).
+
+    Same arguments as frame_from_dataframe().
+    """
+    return frame_from_dataframe(df, symbol, timeframe, strip_tz).to_bars()
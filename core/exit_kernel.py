@@ -0,0 +1,94 @@
+"""
+Exit Simulation Kernel Helpers
+
+Array building blocks for simulating T1/T2/runner exits without stepping
+a Python loop through every bar of a trade:
+
+    price_arrays()   high/low/close columns of a bar series
+    swing_masks()    mask[idx] == is_swing_high/low(bars, idx, lookback)
+                     for every idx at once
+    first_true()     first bar of a window where a condition holds
+                     (first touch of a stop, target or trail)
+    trail_levels()   a structure trail as a running max: a trail that
+                     only ever ratchets towards price is the cumulative
+                     max of its candidate levels
+
+Trail and touch logic is written for longs; shorts use the same code on
+negated prices (a short's stop is hit when -high <= -stop, its trail is
+the running max of -(swing high + buffer)). Negation is exact in floating
+point, so levels come out bit-identical to the scalar simulators.
+
+run_v10_dual_entry.simulate_exits jumps from one event bar to the next
+with these helpers and only runs its scalar per-bar code on the bars
+where something happens.
+
+Usage:
+    from core.exit_kernel import first_true, price_arrays, swing_masks, trail_levels
+
+    high, low, close = price_arrays(bars)
+    swing_high, swing_low = swing_masks(high, low, lookback=2)
+    stop_bar = first_true(low[start:] <= stop)  # -1 if never touched
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def price_arrays(bars) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(high, low, close) float64 arrays of a list of Bars or a BarFrame."""
+    if hasattr(bars, 'timestamps'):  # BarFrame: columns already exist
+        return bars.high, bars.low, bars.close
+    high = np.fromiter((b.high for b in bars), dtype=np.float64, count=len(bars))
+    low = np.fromiter((b.low for b in bars), dtype=np.float64, count=len(bars))
+    close = np.fromiter((b.close for b in bars), dtype=np.float64, count=len(bars))
+    return high, low, close
+
+
+def swing_masks(high: np.ndarray, low: np.ndarray, lookback: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Swing high / swing low flags for every bar.
+
+    A swing high is strictly above the `lookback` highs on either side (a
+    swing low strictly below the lows); the first and last `lookback` bars
+    are never swings. Same rule as is_swing_high/is_swing_low.
+    """
+    n = len(high)
+    swing_high = np.zeros(n, dtype=bool)
+    swing_low = np.zeros(n, dtype=bool)
+    if n <= 2 * lookback:
+        return swing_high, swing_low
+
+    inner = slice(lookback, n - lookback)
+    swing_high[inner] = True
+    swing_low[inner] = True
+    for k in range(1, lookback + 1):
+        center_h = high[inner]
+        center_l = low[inner]
+        swing_high[inner] &= (center_h > high[lookback - k:n - lookback - k]) & (center_h > high[lookback + k:n - lookback + k])
+        swing_low[inner] &= (center_l < low[lookback - k:n - lookback - k]) & (center_l < low[lookback + k:n - lookback + k])
+    return swing_high, swing_low
+
+
+def first_true(mask: np.ndarray) -> int:
+    """Index of the first True in mask, or -1 if there is none."""
+    if not len(mask):
+        return -1
+    idx = int(mask.argmax())
+    return idx if mask[idx] else -1
+
+
+def trail_levels(candidates: np.ndarray, initial: float) -> np.ndarray:
+    """
+    Trail level after each bar of a ratcheting (long-side) trail.
+
+    Args:
+        candidates: Level each bar proposes (-inf where the bar proposes
+            nothing, e.g. no confirmed swing)
+        initial: Trail level before the first bar
+
+    Returns:
+        levels[k] = max(initial, candidates[0..k])
+    """
+    levels = np.maximum.accumulate(candidates) if len(candidates) else candidates
+    return np.maximum(levels, initial)
@@ -0,0 +1,93 @@
+"""
+Bounded Memo Cache
+
+LRUMemo is a small least-recently-used cache with hit/miss counters, used
+to share expensive per-bars work (FVG detection, entry candidates) across
+repeated strategy runs on the same bars - A/B variants, parameter sweeps,
+multi-day backtests over one history.
+
+bars_fingerprint() gives the cache key for a bar series: it covers every
+timestamp and OHLCV value, so bars that differ anywhere (including a
+still-forming last bar) never share an entry.
+
+Usage:
+    from core.memo import LRUMemo, bars_fingerprint
+
+    memo = LRUMemo(maxsize=16)
+    fvgs = memo.get_or_compute((bars_fingerprint(bars), config_key), lambda: detect(bars))
+    memo.stats()  # {'hits': ..., 'misses': ..., 'size': ..., 'maxsize': ...}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+class LRUMemo:
+    """
+    Least-recently-used memo with a fixed number of entries.
+
+    Thread-safe (the live scanner evaluates symbols on a thread pool).
+    maxsize=0 disables caching: every lookup is a miss and nothing is kept.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = compute()
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+def bars_fingerprint(bars) -> tuple:
+    """
+    Hashable key identifying a bar series by content.
+
+    Accepts a list of Bars or a BarFrame. Returns (len, digest).
+    """
+    if hasattr(bars, 'timestamps'):  # BarFrame: hash the column bytes
+        h = hashlib.blake2b(digest_size=16)
+        for column in (bars.timestamps, bars.open, bars.high, bars.low, bars.close, bars.volume):
+            h.update(np.ascontiguousarray(column).tobytes())
+        return len(bars), h.hexdigest()
+    return len(bars), hash(tuple((b.timestamp, b.open, b.high, b.low, b.close, b.volume) for b in bars))
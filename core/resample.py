@@ -0,0 +1,292 @@
+"""
+Bar Resampling
+
+Builds higher-timeframe bars from a lower-timeframe stream (normally 1m)
+by wall-clock bucket, not by counting bars, so a gap (no trades, a missed
+fetch, the maintenance break) never shifts the buckets that follow it.
+
+Buckets are session-aware. With the default CME_SESSION (Globex: opens
+18:00 ET, closes 17:00 ET next day) buckets are anchored at the session
+open - 4h bars start 18:00, 22:00, 02:00, 06:00, 10:00, 14:00 as on
+TradingView - no bucket spans two sessions, and the last bucket of a
+session ends at the close (the 14:00 4h bar covers 14:00-17:00). Daily
+bars cover a whole session and are stamped with the trading date at
+midnight (the Sunday 18:00 open belongs to Monday). session=None anchors
+buckets at midnight with calendar-day daily bars.
+
+    resample_frame    vectorized: BarFrame in, BarFrame out
+    resample_bars     same for a list of Bars
+    BarResampler      incremental: feed 1m bars one at a time, get each
+                      higher-timeframe bar as soon as its last minute
+                      arrives (or the next bucket starts, after a gap)
+    resample_stream   BarResampler over an iterable, yields closed bars
+
+Timestamps are bar open times. Naive timestamps are exchange-local wall
+time (the TradingView/CSV convention); aware ones are bucketed on their
+wall time in exchange_tz and come back aware.
+
+Usage:
+    from core.resample import BarResampler, resample_bars
+
+    bars_5m = resample_bars(bars_1m, "5m")
+
+    resampler = BarResampler(["3m", "5m", "1h"])
+    for bar in live_1m_bars:
+        for closed in resampler.update(bar):
+            if closed.timeframe == "3m":
+                strategy.process_mtf_bar(closed)
+            elif closed.timeframe == "5m":
+                strategy.process_bar(closed)
+    resampler.forming("1h")  # 1h bar so far
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Iterable, Iterator
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from core.bar_frame import BarFrame, datetime_to_epoch
+from core.types import Bar
+
+ET = ZoneInfo("America/New_York")
+
+# CME Globex equity index futures: (open, close) in exchange time
+CME_SESSION = (time(18, 0), time(17, 0))
+
+_DAY = 86400
+_TIMEFRAME_RE = re.compile(r"^(\d+)\s*(m|min|h|d)$")
+_UNIT_MINUTES = {"m": 1, "min": 1, "h": 60, "d": 1440}
+
+
+def timeframe_minutes(timeframe: str) -> int:
+    """Minutes in a timeframe string ("3m", "15m", "1h", "4h", "1d")."""
+    match = _TIMEFRAME_RE.match(timeframe.strip().lower())
+    if match is None:
+        raise ValueError(f"Invalid timeframe: {timeframe!r} (expected e.g. '3m', '1h', '1d')")
+    minutes = int(match.group(1)) * _UNIT_MINUTES[match.group(2)]
+    if not 1 <= minutes <= 1440:
+        raise ValueError(f"Timeframe {timeframe!r} must be between 1m and 1d")
+    return minutes
+
+
+def _seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60
+
+
+class _Calendar:
+    """Bucket arithmetic for one timeframe and session (works on ints and arrays)."""
+
+    def __init__(self, minutes: int, session: tuple[time, time] | None):
+        self.minutes = minutes
+        if session is None:
+            self.open_s, self.length, self.crosses_midnight = 0, _DAY, False
+        else:
+            open_s, close_s = _seconds(session[0]), _seconds(session[1])
+            self.open_s = open_s
+            self.length = (close_s - open_s) % _DAY or _DAY
+            self.crosses_midnight = close_s <= open_s and close_s != 0
+        self.step = _DAY if minutes >= 1440 else minutes * 60
+
+    def bucket(self, wall):
+        """(session-relative bucket start, session-relative bucket end) of wall-clock seconds."""
+        s = wall - self.open_s
+        day_start = s // _DAY * _DAY
+        start = day_start + (s - day_start) // self.step * self.step
+        close = day_start + self.length  # Buckets after the close (no session) are not cut
+        if isinstance(s, np.ndarray):
+            return start, np.where(start < close, np.minimum(start + self.step, close), start + self.step)
+        return start, min(start + self.step, close) if start < close else start + self.step
+
+    def label(self, start):
+        """Wall-clock seconds of the timestamp a bucket is stamped with."""
+        if self.step == _DAY:
+            # Trading date at midnight (start is the open date's midnight)
+            return start + _DAY if self.crosses_midnight else start
+        return start + self.open_s
+
+
+def _hourly_offsets(epoch: np.ndarray, tz: tzinfo) -> np.ndarray:
+    """UTC offset (seconds) of tz at each epoch second, looked up once per hour."""
+    hours, inverse = np.unique(epoch // 3600, return_inverse=True)
+    offsets = np.array([
+        int(datetime.fromtimestamp(int(h) * 3600, timezone.utc).astimezone(tz).utcoffset().total_seconds())
+        for h in hours
+    ], dtype=np.int64)
+    return offsets[inverse]
+
+
+def resample_frame(
+    frame: BarFrame,
+    timeframe: str,
+    session: tuple[time, time] | None = CME_SESSION,
+    exchange_tz: tzinfo = ET,
+    drop_partial_first: bool = False,
+) -> BarFrame:
+    """
+    Resample a chronological BarFrame to a higher timeframe in one vectorized pass.
+
+    The last bucket may be incomplete (still forming).
+
+    Args:
+        frame: Source bars (e.g. 1m), sorted by timestamp.
+        timeframe: Target timeframe ("2m" ... "4h", "1d").
+        session: (open, close) in exchange time, or None for calendar days.
+        exchange_tz: Timezone aware timestamps are bucketed in.
+        drop_partial_first: Drop the first bucket if the source starts after
+            its start (a capped history that begins mid-bucket).
+    """
+    calendar = _Calendar(timeframe_minutes(timeframe), session)
+    if not len(frame):
+        return BarFrame.empty(symbol=frame.symbol, timeframe=timeframe, tz=frame.tz)
+
+    epoch = frame.timestamps
+    wall = epoch if frame.tz is None else epoch + _hourly_offsets(epoch, exchange_tz)
+    start, _ = calendar.bucket(wall)
+
+    if drop_partial_first and wall[0] - calendar.open_s != start[0]:
+        first = np.flatnonzero(start != start[0])
+        if not len(first):
+            return BarFrame.empty(symbol=frame.symbol, timeframe=timeframe, tz=frame.tz)
+        frame, epoch, wall, start = frame[first[0]:], epoch[first[0]:], wall[first[0]:], start[first[0]:]
+
+    starts = np.flatnonzero(np.r_[True, start[1:] != start[:-1]])
+    ends = np.r_[starts[1:], len(frame)]
+    labels = calendar.label(start[starts])
+    # Back to the frame's epoch convention (same offset as the bucket's first bar)
+    timestamps = epoch[starts] - (wall[starts] - labels)
+
+    return BarFrame(
+        timestamps,
+        open=frame.open[starts],
+        high=np.maximum.reduceat(frame.high, starts),
+        low=np.minimum.reduceat(frame.low, starts),
+        close=frame.close[ends - 1],
+        volume=np.add.reduceat(frame.volume, starts),
+        symbol=frame.symbol,
+        timeframe=timeframe,
+        tz=frame.tz,
+        int_volume=frame._int_volume,
+    )
+
+
+def resample_bars(
+    bars: list[Bar],
+    timeframe: str,
+    session: tuple[time, time] | None = CME_SESSION,
+    exchange_tz: tzinfo = ET,
+    drop_partial_first: bool = False,
+) -> list[Bar]:
+    """resample_frame() for a list of Bars."""
+    if not bars:
+        return []
+    frame = resample_frame(BarFrame.from_bars(bars), timeframe, session, exchange_tz, drop_partial_first)
+    return frame.to_bars()
+
+
+class BarResampler:
+    """
+    Incremental multi-timeframe resampler.
+
+    Feed source bars in time order with update(); each returns the higher-
+    timeframe bars that closed with that bar (in timeframes order). A
+    bar closes when the source bar ending at its bucket end arrives, or,
+    if that bar never comes (a gap), when the next bucket starts. Source
+    bars not newer than the last one are ignored.
+
+    Args:
+        timeframes: Target timeframes.
+        session: (open, close) in exchange time, or None for calendar days.
+        exchange_tz: Timezone aware timestamps are bucketed in.
+        source_minutes: Duration of each source bar.
+    """
+
+    def __init__(
+        self,
+        timeframes: Iterable[str],
+        session: tuple[time, time] | None = CME_SESSION,
+        exchange_tz: tzinfo = ET,
+        source_minutes: int = 1,
+    ):
+        self.timeframes = list(timeframes)
+        self.exchange_tz = exchange_tz
+        self.source_seconds = source_minutes * 60
+        self._calendars = {tf: _Calendar(timeframe_minutes(tf), session) for tf in self.timeframes}
+        self._forming: dict[str, dict | None] = {tf: None for tf in self.timeframes}
+        self._last_ts: datetime | None = None
+
+    def update(self, bar: Bar) -> list[Bar]:
+        """Add one source bar; returns the bars it closed."""
+        if self._last_ts is not None and bar.timestamp <= self._last_ts:
+            return []
+        self._last_ts = bar.timestamp
+        wall = self._wall_seconds(bar.timestamp)
+        bar_end = wall + self.source_seconds
+
+        closed = []
+        for tf in self.timeframes:
+            calendar = self._calendars[tf]
+            start, end = calendar.bucket(wall)
+            state = self._forming[tf]
+            if state is not None and state["start"] != start:
+                closed.append(self._to_bar(tf, state))
+                state = None
+            if state is None:
+                label = calendar.label(start)
+                state = self._forming[tf] = {
+                    "start": start,
+                    "end": end,
+                    "timestamp": bar.timestamp - timedelta(seconds=wall - label),
+                    "symbol": bar.symbol,
+                    "open": bar.open, "high": bar.high, "low": bar.low,
+                    "close": bar.close, "volume": bar.volume,
+                }
+            else:
+                state["high"] = max(state["high"], bar.high)
+                state["low"] = min(state["low"], bar.low)
+                state["close"] = bar.close
+                state["volume"] += bar.volume
+            if bar_end - calendar.open_s >= state["end"]:
+                closed.append(self._to_bar(tf, state))
+                self._forming[tf] = None
+        return closed
+
+    def forming(self, timeframe: str) -> Bar | None:
+        """The open (incomplete) bar of a timeframe, or None."""
+        state = self._forming[timeframe]
+        return self._to_bar(timeframe, state) if state is not None else None
+
+    def flush(self) -> list[Bar]:
+        """Close every forming bar (end of data)."""
+        closed = [self._to_bar(tf, s) for tf, s in self._forming.items() if s is not None]
+        self._forming = {tf: None for tf in self.timeframes}
+        return closed
+
+    def _wall_seconds(self, ts: datetime) -> int:
+        if ts.tzinfo is not None:
+            ts = ts.astimezone(self.exchange_tz).replace(tzinfo=None)
+        return datetime_to_epoch(ts)
+
+    @staticmethod
+    def _to_bar(timeframe: str, state: dict) -> Bar:
+        return Bar(
+            timestamp=state["timestamp"], open=state["open"], high=state["high"], low=state["low"],
+            close=state["close"], volume=state["volume"], symbol=state["symbol"], timeframe=timeframe,
+        )
+
+
+def resample_stream(
+    bars: Iterable[Bar],
+    timeframes: Iterable[str],
+    session: tuple[time, time] | None = CME_SESSION,
+    exchange_tz: tzinfo = ET,
+    source_minutes: int = 1,
+) -> Iterator[Bar]:
+    """Yield closed higher-timeframe bars from a source stream (forming bars flushed at the end)."""
+    resampler = BarResampler(timeframes, session, exchange_tz, source_minutes)
+    for bar in bars:
+        yield from resampler.update(bar)
+    yield from resampler.flush()
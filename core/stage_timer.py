@@ -0,0 +1,165 @@
+"""
+Stage Timers
+
+StageTimer times the named stages of a repeating loop (the live bot's scan
+cycle: bar fetch, history load, FVG detection, strategy run, trade
+management, broker calls, state writes, notifications) and keeps the last
+`window` durations of each stage, overall and per symbol, so summary()
+can report rolling p50 / p95 / max without unbounded growth. Counters
+track events (cycles over budget, full reloads, ...).
+
+profile_call() runs one call under cProfile and saves the stats, for a
+one-off look at a single cycle (calling thread only).
+
+Usage:
+    from core.stage_timer import StageTimer, profile_call
+
+    timer = StageTimer(window=200)
+    with timer.stage("tv_fetch", symbol="ES"):
+        bars = fetch(...)
+    timer.count("full_reloads")
+    timer.summary()
+    # {'stages': {'tv_fetch': {'n': 1, 'last': 0.41, 'p50': 0.41, 'p95': 0.41,
+    #                          'max': 0.41, 'symbols': {'ES': {...}}}},
+    #  'counters': {'full_reloads': 1}}
+
+    report = profile_call(run_one_cycle, Path("cycle.prof"))
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+
+class StageTimer:
+    """
+    Rolling durations per stage (and per stage + symbol) plus counters.
+
+    Thread-safe: stages may be timed from the scan pool's threads.
+    """
+
+    def __init__(self, window: int = 200):
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        self.window = window
+        self._samples: dict[tuple[str, str | None], deque] = {}
+        self._counts: dict[tuple[str, str | None], int] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, symbol: str | None = None) -> Iterator[None]:
+        """Time the block as one run of stage name (also recorded even if it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, symbol)
+
+    def record(self, name: str, seconds: float, symbol: str | None = None) -> None:
+        """Add one duration of stage name (for symbol, if given)."""
+        keys = [(name, None)] if symbol is None else [(name, None), (name, symbol)]
+        with self._lock:
+            for key in keys:
+                samples = self._samples.get(key)
+                if samples is None:
+                    samples = self._samples[key] = deque(maxlen=self.window)
+                samples.append(seconds)
+                self._counts[key] = self._counts.get(key, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment counter name by n."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def last(self, name: str, symbol: str | None = None) -> float | None:
+        """Latest duration of a stage, or None if it never ran."""
+        with self._lock:
+            samples = self._samples.get((name, symbol))
+            return samples[-1] if samples else None
+
+    def summary(self, digits: int = 4) -> dict[str, Any]:
+        """
+        JSON-ready rolling statistics.
+
+        Returns:
+            {'stages': {name: {n, last, p50, p95, max, symbols: {symbol:
+            {n, last, p50, p95, max}}}}, 'counters': {name: count}}.
+            n counts every run; the other values cover the last `window`.
+        """
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+            counts = dict(self._counts)
+            counters = dict(self._counters)
+
+        stages: dict[str, dict] = {}
+        for (name, symbol), values in samples.items():
+            if symbol is None:
+                stages.setdefault(name, {}).update(_stats(values, counts[name, symbol], digits))
+        for (name, symbol), values in samples.items():
+            if symbol is not None:
+                stats = _stats(values, counts[name, symbol], digits)
+                stages.setdefault(name, {}).setdefault("symbols", {})[symbol] = stats
+        return {"stages": stages, "counters": counters}
+
+    def reset(self) -> None:
+        """Forget every duration and counter."""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._counters.clear()
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """q-th percentile (0-100) of sorted values, linear interpolation."""
+    pos = (len(ordered) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def _stats(values: list[float], n: int, digits: int) -> dict[str, float | int]:
+    ordered = sorted(values)
+    return {
+        "n": n,
+        "last": round(values[-1], digits),
+        "p50": round(_percentile(ordered, 50), digits),
+        "p95": round(_percentile(ordered, 95), digits),
+        "max": round(ordered[-1], digits),
+    }
+
+
+def profile_call(fn: Callable[[], Any], path: Path | None = None, top: int = 25) -> str:
+    """
+    Run fn() under cProfile.
+
+    Only the calling thread is profiled: work fn() hands to other threads
+    (a thread pool) does not appear in the report, so run it inline.
+
+    Args:
+        fn: Call to profile (its result is discarded; exceptions propagate
+            after the stats are saved).
+        path: Where to dump the raw stats (pstats / snakeviz format).
+        top: Rows of the cumulative-time report to return.
+
+    Returns:
+        The top rows of the report sorted by cumulative time.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(fn)
+    finally:
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(path))
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+    return out.getvalue()
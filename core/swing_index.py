@@ -0,0 +1,286 @@
+"""
+Incremental Swing Point Index
+
+One definition of a swing point for every signal module, and an index that
+keeps the confirmed swings of a growing bar series up to date bar by bar.
+
+A swing high is a bar whose high is strictly above the highs of the `left`
+bars before it and the `right` bars after it (a swing low strictly below
+the lows). The first `left` bars of a series are never swings, and a swing
+is only confirmed once its `right` bars have closed - the swing at bar j
+is known on bar j + right.
+
+    is_swing_high()   point check on a list of bars (lookback bars each
+    is_swing_low()    side, or left/right strengths)
+    SwingIndex        confirmed swings of one (left, right) strength;
+                      append() costs O(left + right) per bar, queries are
+                      a bisect over the swings found so far
+    SwingIndexes      SwingIndex per (left, right) over one bar stream,
+                      created on first use
+
+Usage:
+    from core.swing_index import SwingIndex, SwingIndexes
+
+    index = SwingIndex(left=3, right=1)
+    for bar in bars:
+        index.append(bar.high, bar.low)
+    idx, price = index.last_high(before=len(bars))  # (None, None) if none yet
+
+    swings = SwingIndexes.from_bars(bars)
+    for scale in (4, 8, 16):
+        highs = swings.get(scale, 1).highs()  # [(bar_index, price), ...]
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+
+def is_swing_high(bars, idx: int, lookback: int = 2, right: int | None = None) -> bool:
+    """Check if bar at idx is a swing high (lookback bars left, right bars right; default lookback)."""
+    if right is None:
+        right = lookback
+    if idx < lookback or idx >= len(bars) - right:
+        return False
+    bar_high = bars[idx].high
+    for i in range(1, lookback + 1):
+        if bar_high <= bars[idx - i].high:
+            return False
+    for i in range(1, right + 1):
+        if bar_high <= bars[idx + i].high:
+            return False
+    return True
+
+
+def is_swing_low(bars, idx: int, lookback: int = 2, right: int | None = None) -> bool:
+    """Check if bar at idx is a swing low (lookback bars left, right bars right; default lookback)."""
+    if right is None:
+        right = lookback
+    if idx < lookback or idx >= len(bars) - right:
+        return False
+    bar_low = bars[idx].low
+    for i in range(1, lookback + 1):
+        if bar_low >= bars[idx - i].low:
+            return False
+    for i in range(1, right + 1):
+        if bar_low >= bars[idx + i].low:
+            return False
+    return True
+
+
+class SwingIndex:
+    """
+    Confirmed swing highs and lows of one (left, right) strength.
+
+    Bars are appended one at a time; each append checks the one bar it
+    confirms (the bar `right` bars back), so the index is always equal to
+    running the point checks over every bar appended so far.
+
+    Attributes:
+        left, right: Swing strength.
+        count: Bars appended (the next bar's index).
+        high_indices, high_prices: Swing highs in bar order (read-only).
+        low_indices, low_prices: Swing lows in bar order (read-only).
+    """
+
+    def __init__(self, left: int = 2, right: int | None = None):
+        if right is None:
+            right = left
+        if left < 0 or right < 0:
+            raise ValueError(f"Swing strengths must be >= 0, got left={left}, right={right}")
+        self.left = left
+        self.right = right
+        self.count = 0
+        self.high_indices: list[int] = []
+        self.high_prices: list[float] = []
+        self.low_indices: list[int] = []
+        self.low_prices: list[float] = []
+        self._span = left + right + 1
+        self._highs: list[float] = []
+        self._lows: list[float] = []
+
+    @classmethod
+    def from_bars(cls, bars, left: int = 2, right: int | None = None) -> "SwingIndex":
+        """Index of a list of Bars (or a BarFrame)."""
+        index = cls(left, right)
+        index.extend(bars)
+        return index
+
+    def extend(self, bars) -> None:
+        """Append every bar of a list of Bars (or a BarFrame)."""
+        if hasattr(bars, 'timestamps'):  # BarFrame: use the columns
+            self.extend_prices(bars.high.tolist(), bars.low.tolist())
+        else:
+            self.extend_prices([b.high for b in bars], [b.low for b in bars])
+
+    def append(self, high: float, low: float) -> None:
+        """Add the next bar and record the swing it confirms, if any."""
+        self.extend_prices((high,), (low,))
+
+    def extend_prices(self, highs, lows) -> None:
+        """Append bars given as parallel high / low sequences."""
+        if not len(highs):
+            return
+        kept = len(self._highs)
+        window_highs = self._highs + list(highs)
+        window_lows = self._lows + list(lows)
+        base = self.count - kept  # Bar number of window_highs[0]
+        left = self.left
+        right = self.right
+
+        # Bars confirmed by the new bars: the `right` bars before each new bar.
+        # The adjacent bars rule out most candidates before the full check.
+        # (With no bars on a side the "adjacent" bar is the candidate itself.)
+        near_left = 1 if left else 0
+        near_right = 1 if right else 0
+        for k in range(max(left, kept - right), len(window_highs) - right):
+            center = window_highs[k]
+            if ((window_highs[k - near_left] < center or not left)
+                    and (window_highs[k + near_right] < center or not right)):
+                for j in range(k - left, k + right + 1):
+                    if window_highs[j] >= center and j != k:
+                        break
+                else:
+                    self.high_indices.append(base + k)
+                    self.high_prices.append(center)
+            center = window_lows[k]
+            if ((window_lows[k - near_left] > center or not left)
+                    and (window_lows[k + near_right] > center or not right)):
+                for j in range(k - left, k + right + 1):
+                    if window_lows[j] <= center and j != k:
+                        break
+                else:
+                    self.low_indices.append(base + k)
+                    self.low_prices.append(center)
+
+        self.count += len(highs)
+        self._highs = window_highs[-self._span:]
+        self._lows = window_lows[-self._span:]
+
+    def is_high(self, idx: int) -> bool:
+        """True if bar idx is a confirmed swing high."""
+        k = bisect_left(self.high_indices, idx)
+        return k < len(self.high_indices) and self.high_indices[k] == idx
+
+    def is_low(self, idx: int) -> bool:
+        """True if bar idx is a confirmed swing low."""
+        k = bisect_left(self.low_indices, idx)
+        return k < len(self.low_indices) and self.low_indices[k] == idx
+
+    def last_high(self, before: int, after: int = -1) -> tuple[int | None, float | None]:
+        """
+        Most recent swing high with after < bar index < before.
+
+        Only confirmed swings are in the index, so on bar i (the latest
+        bar) this is the most recent swing known by then; pass
+        before=i - right + 1 as well when querying a historical bar i of a
+        complete series.
+
+        Returns:
+            (bar_index, price), or (None, None) if there is none.
+        """
+        return _last(self.high_indices, self.high_prices, before, after)
+
+    def last_low(self, before: int, after: int = -1) -> tuple[int | None, float | None]:
+        """Most recent swing low with after < bar index < before (see last_high)."""
+        return _last(self.low_indices, self.low_prices, before, after)
+
+    def highs(self, start: int = 0, stop: int | None = None) -> list[tuple[int, float]]:
+        """Swing highs with start <= bar index < stop as (bar_index, price)."""
+        return _between(self.high_indices, self.high_prices, start, stop)
+
+    def lows(self, start: int = 0, stop: int | None = None) -> list[tuple[int, float]]:
+        """Swing lows with start <= bar index < stop as (bar_index, price)."""
+        return _between(self.low_indices, self.low_prices, start, stop)
+
+    def recent_highs(self, before: int, count: int) -> list[tuple[int, float]]:
+        """Up to count swing highs with bar index < before, most recent first."""
+        return _recent(self.high_indices, self.high_prices, before, count)
+
+    def recent_lows(self, before: int, count: int) -> list[tuple[int, float]]:
+        """Up to count swing lows with bar index < before, most recent first."""
+        return _recent(self.low_indices, self.low_prices, before, count)
+
+    def prune(self, before: int) -> None:
+        """Forget swings before bar index `before` (bounds memory on a live stream)."""
+        k = bisect_left(self.high_indices, before)
+        if k:
+            del self.high_indices[:k]
+            del self.high_prices[:k]
+        k = bisect_left(self.low_indices, before)
+        if k:
+            del self.low_indices[:k]
+            del self.low_prices[:k]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return (f"SwingIndex(left={self.left}, right={self.right}, bars={self.count}, "
+                f"highs={len(self.high_indices)}, lows={len(self.low_indices)})")
+
+
+class SwingIndexes:
+    """
+    SwingIndex per (left, right) strength over one bar stream.
+
+    get() creates an index on first use and back-fills it from the bars
+    seen so far; append() then keeps every index current.
+    """
+
+    def __init__(self):
+        self._highs: list[float] = []
+        self._lows: list[float] = []
+        self._indexes: dict[tuple[int, int], SwingIndex] = {}
+
+    @classmethod
+    def from_bars(cls, bars) -> "SwingIndexes":
+        """Indexes over a list of Bars (or a BarFrame)."""
+        indexes = cls()
+        if hasattr(bars, 'timestamps'):
+            indexes._highs = bars.high.tolist()
+            indexes._lows = bars.low.tolist()
+        else:
+            indexes._highs = [b.high for b in bars]
+            indexes._lows = [b.low for b in bars]
+        return indexes
+
+    def append(self, high: float, low: float) -> None:
+        """Add the next bar to every index."""
+        self._highs.append(high)
+        self._lows.append(low)
+        for index in self._indexes.values():
+            index.append(high, low)
+
+    def get(self, left: int = 2, right: int | None = None) -> SwingIndex:
+        """The index for (left, right), built from the bars so far on first use."""
+        key = (left, left if right is None else right)
+        index = self._indexes.get(key)
+        if index is None:
+            index = SwingIndex(*key)
+            for high, low in zip(self._highs, self._lows):
+                index.append(high, low)
+            self._indexes[key] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self._highs)
+
+
+def _last(indices, prices, before, after):
+    k = bisect_left(indices, before) - 1
+    if k >= 0 and indices[k] > after:
+        return indices[k], prices[k]
+    return None, None
+
+
+def _between(indices, prices, start, stop):
+    lo = bisect_left(indices, start)
+    hi = len(indices) if stop is None else bisect_left(indices, stop)
+    return list(zip(indices[lo:hi], prices[lo:hi]))
+
+
+def _recent(indices, prices, before, count):
+    hi = bisect_left(indices, before)
+    lo = max(0, hi - count)
+    return list(zip(reversed(indices[lo:hi]), reversed(prices[lo:hi])))
@@ -1,7 +1,29 @@
 """
 V10.16 Multi-Day Backtest - Validate strategy across multiple trading days.
+
+History window mode (--window-days=N):
+    By default every trading day is run against the full loaded history
+    (up to 10k+ bars), so detect_fvgs and the mitigation loop rescan the
+    whole history - including bars after that day - once per day. With
+    --window-days=N each day only sees the N prior dates in the data plus
+    the day itself, which is enough for overnight FVGs and EMA50/ADX
+    warm-up and turns each day into a bounded amount of work.
+
+    --parity-report runs every day both ways and lists any trades that
+    differ. Differences come from FVGs older than the window or from FVGs
+    that the full history marks as mitigated using later bars.
+
+Parallel mode (--workers=N):
+    Each day's run_session_v10 call only depends on the bars, so days are
+    farmed out to N worker processes. The bars and kwargs are handed to
+    each worker once (pool initializer), workers return per-day results,
+    and the report is built from them in date order - the printed output
+    and totals are identical to the serial run.
 """
 import sys
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 sys.path.insert(0, '.')
 
 from version import STRATEGY_VERSION
@@ -9,17 +31,210 @@ from version import STRATEGY_VERSION
 from datetime import time as dt_time
 from runners.tradingview_loader import fetch_futures_bars
 from runners.bar_storage import load_bars_with_history
-from runners.run_v10_dual_entry import run_session_v10
+from runners.run_v10_dual_entry import run_session_v10, set_memoization
 from runners.symbol_defaults import get_symbol_config, get_session_v10_kwargs
 
+# Prior dates of history handed to each day in window mode
+DEFAULT_WINDOW_DAYS = 3
+
+# Full session = ~240 bars (4:00-16:00). Allow partial days (>=10 bars) with warning.
+FULL_SESSION_BARS = 240
+MIN_SESSION_BARS = 10
+
+
+def build_history_windows(all_bars, trading_dates, window_days=DEFAULT_WINDOW_DAYS):
+    """Map each trading date to an (start, end) all_bars slice for window mode.
+
+    The slice starts at the first bar of the date window_days dates before
+    target_date (counting every date present in all_bars) and ends after the
+    last bar of target_date. all_bars must be sorted chronologically.
+    """
+    day_bounds = {}  # date -> [first_idx, last_idx + 1]
+    for i, b in enumerate(all_bars):
+        d = b.timestamp.date()
+        if d in day_bounds:
+            day_bounds[d][1] = i + 1
+        else:
+            day_bounds[d] = [i, i + 1]
+
+    dates = list(day_bounds)
+    date_pos = {d: pos for pos, d in enumerate(dates)}
+
+    windows = {}
+    for target_date in trading_dates:
+        pos = date_pos.get(target_date)
+        if pos is None:
+            continue
+        first_date = dates[max(0, pos - window_days)]
+        windows[target_date] = (day_bounds[first_date][0], day_bounds[target_date][1])
+    return windows
+
+
+def forming_bar_index(all_bars, session_bars):
+    """all_bars index of the day's last session bar (sorted all_bars).
+
+    With --drop-last-bar that bar is still forming for the live scanner, so
+    both the full history and the window are cut here: neither run sees it
+    or anything after it.
+    """
+    return bisect_left(all_bars, session_bars[-1].timestamp, key=lambda b: b.timestamp)
+
+
+def _trade_key(r):
+    """Comparable identity of a run_session_v10 result (entry + every exit)."""
+    return (
+        r['entry_time'], r['direction'], r['entry_type'], r['entry_price'],
+        r['stop_price'], r['contracts'],
+        tuple((e['type'], e['cts'], e['price'], e['time']) for e in r['exits']),
+    )
+
+
+def compare_trade_lists(full_results, window_results):
+    """Return (only_in_full, only_in_window) trade lists, order-insensitive."""
+    full_keys = {_trade_key(r): r for r in full_results}
+    window_keys = {_trade_key(r): r for r in window_results}
+    only_full = [r for k, r in full_keys.items() if k not in window_keys]
+    only_window = [r for k, r in window_keys.items() if k not in full_keys]
+    return only_full, only_window
+
+
+def select_trading_dates(all_bars, days):
+    """Pick the last `days` dates with a (possibly partial) 4:00-16:00 session.
+
+    Returns:
+        (trading_dates, partial_dates) - dates oldest first, and
+        date -> session bar count for days below FULL_SESSION_BARS.
+    """
+    # Get unique trading dates
+    all_dates = sorted(set(b.timestamp.date() for b in all_bars), reverse=True)
+
+    # Filter to trading days only (has session bars 4:00-16:00)
+    trading_dates = []
+    partial_dates = {}  # date -> session_bar_count for days below full session
+    for d in all_dates:
+        day_bars = [b for b in all_bars if b.timestamp.date() == d]
+        session_bars = [b for b in day_bars if dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+        if len(session_bars) >= MIN_SESSION_BARS:
+            trading_dates.append(d)
+            if len(session_bars) < FULL_SESSION_BARS:
+                partial_dates[d] = len(session_bars)
+        if len(trading_dates) >= days:
+            break
+
+    return sorted(trading_dates), partial_dates  # Oldest first
+
+
+# Per-process inputs for --workers (set once by _init_day_worker)
+_worker_inputs = {}
+
+
+def run_backtest_day(target_date, all_bars, kwargs, windows=None, drop_last_bar=False, parity_report=False):
+    """Run run_session_v10 for one trading day.
+
+    Args:
+        windows: build_history_windows() result for window mode, else None.
+        drop_last_bar: Drop the day's last session bar and cut the history
+            (full and window alike) before it - see forming_bar_index().
+
+    Returns:
+        (results, full_results, window_secs, full_secs). results is None if
+        the day has too few session bars; full_results is only set for the
+        parity report.
+    """
+    day_bars = [b for b in all_bars if b.timestamp.date() == target_date]
+    session_bars = [b for b in day_bars if dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+    if len(session_bars) < MIN_SESSION_BARS:
+        return None, None, 0.0, 0.0
+
+    # Optionally drop last bar to simulate live scanner behavior
+    strategy_session_bars = session_bars[:-1] if drop_last_bar else session_bars
+    history_end = forming_bar_index(all_bars, session_bars) if drop_last_bar else len(all_bars)
+    strategy_all_bars = all_bars[:history_end]
+
+    if drop_last_bar and len(strategy_session_bars) < 1:
+        return None, None, 0.0, 0.0
+
+    full_results = None
+    full_secs = 0.0
+    window_secs = 0.0
+    if windows is not None:
+        start, end = windows[target_date]
+        window_bars = all_bars[start:min(end, history_end)]
+
+        t0 = time.perf_counter()
+        results = run_session_v10(strategy_session_bars, window_bars, **kwargs)
+        window_secs = time.perf_counter() - t0
+
+        if parity_report:
+            t0 = time.perf_counter()
+            full_results = run_session_v10(strategy_session_bars, strategy_all_bars, **kwargs)
+            full_secs = time.perf_counter() - t0
+    else:
+        # Run V10 strategy with all filters
+        t0 = time.perf_counter()
+        results = run_session_v10(
+            strategy_session_bars,
+            strategy_all_bars,
+            **kwargs,
+        )
+        full_secs = time.perf_counter() - t0
+
+    return results, full_results, window_secs, full_secs
+
+
+def _init_day_worker(all_bars, kwargs, windows, drop_last_bar, parity_report):
+    """Pool initializer: receive the shared read-only inputs once per worker."""
+    _worker_inputs.update(all_bars=all_bars, kwargs=kwargs, windows=windows,
+                          drop_last_bar=drop_last_bar, parity_report=parity_report)
+    set_memoization(True)
+
+
+def _run_day_in_worker(target_date):
+    return run_backtest_day(target_date, **_worker_inputs)
+
+
+def run_backtest_days(trading_dates, all_bars, kwargs, windows=None, drop_last_bar=False,
+                      parity_report=False, workers=1):
+    """Yield run_backtest_day() results for trading_dates, in date order.
+
+    workers > 1 runs the days in a process pool; results are still yielded
+    in the order of trading_dates. The run_session_v10 memos are on while
+    the days run (every day shares one history).
+    """
+    if workers <= 1 or len(trading_dates) <= 1:
+        memos_were_on = set_memoization(True)
+        try:
+            for target_date in trading_dates:
+                yield run_backtest_day(target_date, all_bars, kwargs, windows, drop_last_bar, parity_report)
+        finally:
+            set_memoization(memos_were_on)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_day_worker,
+                             initargs=(all_bars, kwargs, windows, drop_last_bar, parity_report)) as pool:
+        yield from pool.map(_run_day_in_worker, trading_dates)
+
 
 def backtest_v10_multiday(symbol='ES', days=30, contracts=3, t1_r=3, trail_r=6, verbose=False, fvg_mode="wick",
                           opp_fvg_exit=False, opp_fvg_min_ticks=5, opp_fvg_after_6r=False,
                           opp_fvg_mode=None,
                           min_fvg_ticks=5, min_risk_override=None,
                           post_t1_trail_r=0, t2_fixed_r=0, time_decay_bars=0, time_decay_r=0,
-                          drop_last_bar=False, confirm_creation=False):
-    """Run V10 backtest across multiple days."""
+                          drop_last_bar=False, confirm_creation=False,
+                          window_days=None, parity_report=False, workers=1):
+    """Run V10 backtest across multiple days.
+
+    Args:
+        window_days: If set, run each day on a bounded history window (this
+            many prior dates + the day) instead of the full loaded history.
+        parity_report: Run each day with both full history and the window
+            and print any trade differences (window defaults to
+            DEFAULT_WINDOW_DAYS when window_days is not set).
+        workers: Worker processes for the per-day strategy runs (1 = serial).
+            The report is the same for any worker count.
+    """
+    if parity_report and window_days is None:
+        window_days = DEFAULT_WINDOW_DAYS
 
     cfg = get_symbol_config(symbol)
     tick_size = cfg['tick_size']
@@ -36,26 +251,7 @@ def backtest_v10_multiday(symbol='ES', days=30, contracts=3, t1_r=3, trail_r=6,
         print('No data available')
         return
 
-    # Get unique trading dates
-    all_dates = sorted(set(b.timestamp.date() for b in all_bars), reverse=True)
-
-    # Filter to trading days only (has session bars 4:00-16:00)
-    # Full session = ~240 bars (4:00-16:00). Allow partial days (>=10 bars) with warning.
-    FULL_SESSION_BARS = 240
-    MIN_SESSION_BARS = 10
-    trading_dates = []
-    partial_dates = {}  # date -> session_bar_count for days below full session
-    for d in all_dates:
-        day_bars = [b for b in all_bars if b.timestamp.date() == d]
-        session_bars = [b for b in day_bars if dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
-        if len(session_bars) >= MIN_SESSION_BARS:
-            trading_dates.append(d)
-            if len(session_bars) < FULL_SESSION_BARS:
-                partial_dates[d] = len(session_bars)
-        if len(trading_dates) >= days:
-            break
-
-    trading_dates = sorted(trading_dates)  # Oldest first
+    trading_dates, partial_dates = select_trading_dates(all_bars, days)
 
     print(f'Found {len(trading_dates)} trading days')
     print(f'Date range: {trading_dates[0]} to {trading_dates[-1]}')
@@ -87,6 +283,9 @@ def backtest_v10_multiday(symbol='ES', days=30, contracts=3, t1_r=3, trail_r=6,
         print(f'  - Drop Last Bar: ON (simulate live scanner delay)')
     if confirm_creation:
         print(f'  - Confirm Creation: ON (delay CREATION entries by 1 bar)')
+    if window_days is not None:
+        print(f'  - History Window: {window_days} prior dates per day'
+              f'{" (parity report vs full history)" if parity_report else ""}')
     print('='*80)
     print()
 
@@ -104,63 +303,57 @@ def backtest_v10_multiday(symbol='ES', days=30, contracts=3, t1_r=3, trail_r=6,
     losing_streak = 0
     max_losing_streak = 0
 
+    windows = build_history_windows(all_bars, trading_dates, window_days) if window_days is not None else None
+    parity_diffs = []  # (date, only_in_full, only_in_window)
+    full_secs = 0.0
+    window_secs = 0.0
+
     print(f'{"Date":<12} {"Trades":>7} {"Wins":>5} {"Losses":>7} {"Win%":>6} {"P/L":>12} {"Cumulative":>12}')
     print('-'*80)
 
-    for target_date in trading_dates:
-        # Get bars for this date
-        day_bars = [b for b in all_bars if b.timestamp.date() == target_date]
+    # Build kwargs from centralized config with CLI overrides
+    cli_overrides = {}
+    if t1_r != cfg.get('t1_r_target', 3):
+        cli_overrides['t1_r_target'] = t1_r
+    if trail_r != cfg.get('trail_r_trigger', 4):
+        cli_overrides['trail_r_trigger'] = trail_r
+    if min_risk_override is not None:
+        cli_overrides['min_risk'] = min_risk_override
+    if t2_fixed_r > 0:
+        cli_overrides['t2_fixed_r'] = t2_fixed_r
+
+    kwargs = get_session_v10_kwargs(symbol, **cli_overrides)
+
+    # Add backtest-specific params not in centralized config
+    kwargs['fvg_mode'] = fvg_mode
+    kwargs['opposing_fvg_mode'] = opp_fvg_mode
+    kwargs['entry_min_fvg_ticks'] = min_fvg_ticks
+    kwargs['post_t1_trail_r'] = post_t1_trail_r
+    kwargs['time_decay_bars'] = time_decay_bars
+    kwargs['time_decay_r'] = time_decay_r
+
+    # CLI overrides for opposing FVG (only if explicitly passed)
+    if opp_fvg_exit:
+        kwargs['opposing_fvg_exit'] = opp_fvg_exit
+        kwargs['opposing_fvg_min_ticks'] = opp_fvg_min_ticks
+        kwargs['opposing_fvg_after_6r_only'] = opp_fvg_after_6r
 
-        premarket_start = dt_time(4, 0)
-        rth_end = dt_time(16, 0)
-        session_bars = [b for b in day_bars if premarket_start <= b.timestamp.time() <= rth_end]
+    if confirm_creation:
+        kwargs['confirm_creation'] = True
 
-        if len(session_bars) < MIN_SESSION_BARS:
-            continue
+    day_runs = run_backtest_days(trading_dates, all_bars, kwargs, windows=windows,
+                                 drop_last_bar=drop_last_bar, parity_report=parity_report,
+                                 workers=workers)
 
-        # Build kwargs from centralized config with CLI overrides
-        cli_overrides = {}
-        if t1_r != cfg.get('t1_r_target', 3):
-            cli_overrides['t1_r_target'] = t1_r
-        if trail_r != cfg.get('trail_r_trigger', 4):
-            cli_overrides['trail_r_trigger'] = trail_r
-        if min_risk_override is not None:
-            cli_overrides['min_risk'] = min_risk_override
-        if t2_fixed_r > 0:
-            cli_overrides['t2_fixed_r'] = t2_fixed_r
-
-        kwargs = get_session_v10_kwargs(symbol, **cli_overrides)
-
-        # Add backtest-specific params not in centralized config
-        kwargs['fvg_mode'] = fvg_mode
-        kwargs['opposing_fvg_mode'] = opp_fvg_mode
-        kwargs['entry_min_fvg_ticks'] = min_fvg_ticks
-        kwargs['post_t1_trail_r'] = post_t1_trail_r
-        kwargs['time_decay_bars'] = time_decay_bars
-        kwargs['time_decay_r'] = time_decay_r
-
-        # CLI overrides for opposing FVG (only if explicitly passed)
-        if opp_fvg_exit:
-            kwargs['opposing_fvg_exit'] = opp_fvg_exit
-            kwargs['opposing_fvg_min_ticks'] = opp_fvg_min_ticks
-            kwargs['opposing_fvg_after_6r_only'] = opp_fvg_after_6r
-
-        if confirm_creation:
-            kwargs['confirm_creation'] = True
-
-        # Optionally drop last bar to simulate live scanner behavior
-        strategy_session_bars = session_bars[:-1] if drop_last_bar else session_bars
-        strategy_all_bars = all_bars[:-1] if drop_last_bar else all_bars
-
-        if drop_last_bar and len(strategy_session_bars) < 1:
+    for target_date, (results, full_results, day_window_secs, day_full_secs) in zip(trading_dates, day_runs):
+        if results is None:
             continue
-
-        # Run V10 strategy with all filters
-        results = run_session_v10(
-            strategy_session_bars,
-            strategy_all_bars,
-            **kwargs,
-        )
+        window_secs += day_window_secs
+        full_secs += day_full_secs
+        if full_results is not None:
+            only_full, only_window = compare_trade_lists(full_results, results)
+            if only_full or only_window:
+                parity_diffs.append((target_date, only_full, only_window))
 
         # Tally results
         day_trades = len(results)
@@ -274,6 +467,24 @@ def backtest_v10_multiday(symbol='ES', days=30, contracts=3, t1_r=3, trail_r=6,
         print(f'  {et}: {count} ({pct:.1f}%)')
     print('='*80)
 
+    if parity_report:
+        print()
+        print('='*80)
+        print(f'PARITY REPORT - {window_days}-date window vs full history ({len(all_bars)} bars)')
+        print('='*80)
+        print(f'Strategy time:     full {full_secs:.2f}s | window {window_secs:.2f}s')
+        if not parity_diffs:
+            print(f'Trade lists identical on all {len(daily_results)} days')
+        for d, only_full, only_window in parity_diffs:
+            print(f'{d}: {len(only_full)} trade(s) only in full history, {len(only_window)} only in window')
+            for label, trades in (('full  ', only_full), ('window', only_window)):
+                for r in trades:
+                    print(f"  [{label}] {r['direction']} {r['entry_type']} @ {r['entry_time'].strftime('%H:%M')} "
+                          f"Entry: {r['entry_price']:.2f} ${r['total_dollars']:+,.2f}")
+        print('='*80)
+    elif window_days is not None:
+        print(f'Strategy time (window): {window_secs:.2f}s')
+
     return daily_results
 
 
@@ -299,6 +510,9 @@ if __name__ == '__main__':
     time_decay_r = 0
     drop_last_bar = False
     confirm_creation = False
+    window_days = None
+    parity_report = False
+    workers = 1
     for arg in sys.argv[3:]:
         if arg.startswith('--t1-r='):
             t1_r = int(arg.split('=')[1])
@@ -332,6 +546,12 @@ if __name__ == '__main__':
             drop_last_bar = True
         elif arg == '--confirm-creation':
             confirm_creation = True
+        elif arg.startswith('--window-days='):
+            window_days = int(arg.split('=')[1])
+        elif arg == '--parity-report':
+            parity_report = True
+        elif arg.startswith('--workers='):
+            workers = int(arg.split('=')[1])
 
     backtest_v10_multiday(symbol=symbol, days=days, contracts=contracts, t1_r=t1_r, trail_r=trail_r,
                           verbose=verbose, fvg_mode=fvg_mode,
@@ -340,4 +560,5 @@ if __name__ == '__main__':
                           min_fvg_ticks=min_fvg_ticks, min_risk_override=min_risk_override,
                           post_t1_trail_r=post_t1_trail_r, t2_fixed_r=t2_fixed_r,
                           time_decay_bars=time_decay_bars, time_decay_r=time_decay_r,
-                          drop_last_bar=drop_last_bar, confirm_creation=confirm_creation)
+                          drop_last_bar=drop_last_bar, confirm_creation=confirm_creation,
+                          window_days=window_days, parity_report=parity_report, workers=workers)
@@ -0,0 +1,216 @@
+"""
+Bar-close event sources for the live loop.
+
+By default LiveTrader sleeps to each 3m boundary + 5s and then polls
+TradingView for the bars. Given a bar source it scans the moment a bar
+closes instead, on the bar the source delivered (LiveBarCache.push), and
+keeps the polling schedule only as a fallback when no event arrives.
+
+    FeedBarSource     Tradovate market data: 1m bars from TradovateDataFeed
+                      resampled to the scan timeframe (core.resample)
+    ReplayBarSource   recorded bars, optionally paced (tests, dry runs)
+    BarCloseQueue     collects the bars sources emit; wait() returns the
+                      next close with every symbol's bar for that time
+
+A source's start(emit) calls emit(bar) from its own thread for every
+closed bar - root symbol (ES, not ESM6), naive local timestamp like the
+TradingView bars - and stop() ends it.
+
+Usage:
+    from runners.bar_events import FeedBarSource
+    from broker.tradovate.api_client import TradovateClient
+
+    source = FeedBarSource(TradovateClient(), {"ESM6": "ES", "MESM6": "MES"})
+    trader = LiveTrader(paper_mode=True, symbols=["ES", "MES"], bar_source=source)
+    trader.start()
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import re
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from core.resample import BarResampler
+from core.types import Bar
+
+# Futures contract code: root + month letter + 1-2 digit year (ESM6, MNQZ25)
+_CONTRACT_RE = re.compile(r"^([A-Z0-9]+?)[FGHJKMNQUVXZ]\d{1,2}$")
+
+
+def root_symbol(contract: str) -> str:
+    """Root symbol of a futures contract code (ESM6 -> ES); other symbols unchanged."""
+    match = _CONTRACT_RE.match(contract.upper())
+    return match.group(1) if match else contract.upper()
+
+
+def _local_naive(ts: datetime) -> datetime:
+    """Naive local time (the TradingView bar convention)."""
+    return ts.astimezone().replace(tzinfo=None) if ts.tzinfo is not None else ts
+
+
+class BarCloseQueue:
+    """
+    Thread-safe inbox of closed bars.
+
+    Args:
+        symbols: Symbols expected to close together; wait() returns as soon
+            as all of them reported the same bar time.
+        coalesce_seconds: After the first bar of a close, how long to wait
+            for the other symbols' bars.
+    """
+
+    def __init__(self, symbols: Iterable[str], coalesce_seconds: float = 1.0):
+        self.symbols = set(symbols)
+        self.coalesce_seconds = coalesce_seconds
+        self._queue: queue.Queue = queue.Queue()
+
+    def put(self, bar: Bar) -> None:
+        """Add a closed bar (the emit callback of a source)."""
+        self._queue.put(bar)
+
+    def wait(self, timeout: float, should_stop: Optional[Callable[[], bool]] = None) -> list[Bar]:
+        """
+        Block until a bar closes (or timeout seconds pass).
+
+        Returns:
+            The bars of the next close, every symbol's bar for that time
+            that arrived within coalesce_seconds plus anything older still
+            queued, in arrival order. Empty on timeout or stop.
+        """
+        deadline = time.monotonic() + timeout
+        first = None
+        while first is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (should_stop is not None and should_stop()):
+                return []
+            try:
+                first = self._queue.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                continue
+
+        bars = [first]
+        seen = {first.symbol}
+        coalesce_until = time.monotonic() + self.coalesce_seconds
+        while not self.symbols <= seen:
+            remaining = coalesce_until - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                bar = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            bars.append(bar)
+            if bar.timestamp >= first.timestamp:
+                seen.add(bar.symbol)
+        return bars
+
+
+class ReplayBarSource:
+    """
+    Emit recorded bars in time order from a background thread.
+
+    Args:
+        bars: Closed bars (any symbols).
+        delay: Seconds to wait between distinct bar times (0 = as fast as
+            possible).
+    """
+
+    def __init__(self, bars: Iterable[Bar], delay: float = 0.0):
+        self.bars = sorted(bars, key=lambda b: b.timestamp)
+        self.delay = delay
+        self.done = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, emit: Callable[[Bar], None]) -> None:
+        self._thread = threading.Thread(target=self._run, args=(emit,), daemon=True, name='bar-replay')
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self, emit: Callable[[Bar], None]) -> None:
+        last_ts = None
+        for bar in self.bars:
+            if self._stop.is_set():
+                break
+            if last_ts is not None and bar.timestamp != last_ts and self.delay:
+                if self._stop.wait(self.delay):
+                    break
+            last_ts = bar.timestamp
+            emit(bar)
+        self.done.set()
+
+
+class FeedBarSource:
+    """
+    Closed scan-timeframe bars from the Tradovate market data feed.
+
+    Runs TradovateDataFeed on its own event loop thread, resamples its 1m
+    bars per symbol on clock-aligned CME session buckets and emits each
+    bar of `timeframe` when its last minute arrives. The feed reconnects
+    (and resubscribes) after a dropped connection until stop().
+
+    Args:
+        client: broker.tradovate.api_client.TradovateClient (market data auth).
+        contracts: Contract code -> root symbol ({"ESM6": "ES"}); a list of
+            codes maps each with root_symbol().
+        timeframe: Timeframe to emit (the scan timeframe).
+        reconnect_delay: Seconds before the first reconnect attempt.
+    """
+
+    def __init__(self, client, contracts, timeframe: str = '3m', reconnect_delay: float = 5.0):
+        if not isinstance(contracts, dict):
+            contracts = {c: root_symbol(c) for c in contracts}
+        self.client = client
+        self.contracts = contracts
+        self.timeframe = timeframe
+        self.reconnect_delay = reconnect_delay
+        self.feed = None
+        self._resamplers = {root: BarResampler([timeframe]) for root in set(contracts.values())}
+        self._emit: Optional[Callable[[Bar], None]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, emit: Callable[[Bar], None]) -> None:
+        from broker.tradovate.data_feed import TradovateDataFeed
+
+        self._emit = emit
+        self.feed = TradovateDataFeed(self.client, reconnect_delay=self.reconnect_delay)
+        self.feed.on_bar = self.on_minute_bar
+        self._thread = threading.Thread(target=self._run, daemon=True, name='bar-feed')
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.feed is not None:
+            self.feed.stop()
+
+    def throughput(self) -> Optional[dict]:
+        """Market data feed counters and rates (TradovateDataFeed.throughput)."""
+        return self.feed.throughput() if self.feed is not None else None
+
+    def on_minute_bar(self, bar: Bar) -> None:
+        """Feed one 1m bar (the TradovateDataFeed.on_bar callback)."""
+        root = self.contracts.get(bar.symbol) or root_symbol(bar.symbol)
+        resampler = self._resamplers.get(root)
+        if resampler is None:
+            return
+        bar = replace(bar, timestamp=_local_naive(bar.timestamp), symbol=root)
+        for closed in resampler.update(bar):
+            self._emit(closed)
+
+    def _run(self) -> None:
+        # The feed reconnects and resubscribes by itself; this only restarts it after an error
+        while not self._stop.is_set():
+            try:
+                asyncio.run(self.feed.run(list(self.contracts)))
+            except Exception as e:
+                print(f"  [EVENTS] Market data feed error: {e}", flush=True)
+            if not self._stop.wait(self.reconnect_delay):
+                print("  [EVENTS] Market data feed stopped, restarting...", flush=True)
@@ -2,57 +2,251 @@
 Local bar storage for deeper backtests.
 
 TradingView caps 3m bar history at ~6,800 bars (15 trading days).
-This module saves bars to CSV daily and merges local + live data
+This module saves bars to disk daily and merges local + live data
 to enable 30+ day backtests.
 
-Storage layout: data/bars/{symbol}/YYYY-MM-DD.csv
-CSV format matches data_loader.py: timestamp,open,high,low,close,volume,symbol,timeframe
+Storage layout: data/bars/{symbol}/{interval}.bars
+    Append-only binary columnar file: one fixed-size little-endian record
+    per bar (int64 timestamp, float64 open/high/low/close/volume), sorted
+    by timestamp. Timestamps are naive wall-clock seconds since 1970-01-01
+    (same convention as the CSV files), so the date of every row is
+    timestamp // 86400 and the per-date index is a binary search on the
+    memory-mapped timestamp column - loading needs no parsing at all.
+    Naive bars are stored as given (New York time, the TradingView
+    convention for CME futures); timezone-aware bars are converted to
+    America/New_York before the offset is dropped, so loads always return
+    naive New York wall-clock time.
+
+Legacy layout: data/bars/{symbol}/YYYY-MM-DD.csv
+    CSV format matches data_loader.py: timestamp,open,high,low,close,volume,symbol,timeframe
+    Per-day CSVs found next to the store are imported into it on first
+    load (import_csv_bars), which then leaves a {interval}.csv-imported
+    marker next to the store so later loads and saves skip the scan.
+    export_csv_bars writes the old layout back out for tools that still
+    expect it.
 """
 from __future__ import annotations
 
 import csv
+import os
+import threading
+import time
+from contextlib import nullcontext
 from datetime import datetime, date, timedelta
 from pathlib import Path
 
+import numpy as np
+
+from core.bar_frame import BarFrame
+from core.resample import ET, timeframe_minutes
 from core.types import Bar
 from runners.data_loader import load_csv_bars
-from runners.tradingview_loader import fetch_futures_bars
+from runners.tradingview_loader import bars_to_cover, fetch_futures_bars
 
 # Root directory for bar storage
 _BARS_DIR = Path(__file__).parent.parent / "data" / "bars"
 
-# Maximum retention period — CSVs older than this are deleted on save
+# Maximum retention period — dates older than this are pruned on save
 _MAX_RETENTION_DAYS = 90  # 3 months
 
+# Interval of the per-day CSV layout (save_bars/run_live only ever stored 3m)
+_CSV_INTERVAL = "3m"
+
+# One record per bar in the binary store
+BAR_RECORD = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+_SECONDS_PER_DAY = 86400
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+def _store_path(symbol: str, interval: str) -> Path:
+    return _BARS_DIR / symbol.upper() / f"{interval}.bars"
+
+
+def _csv_marker_path(symbol: str, interval: str) -> Path:
+    return _BARS_DIR / symbol.upper() / f"{interval}.csv-imported"
+
+
+def _day_number(d: date) -> int:
+    return (d - _EPOCH_DATE).days
+
+
+def _to_records(bars: list[Bar]) -> np.ndarray:
+    """Bars -> sorted record array (wall-clock timestamps, aware ones in New York time)."""
+    records = np.empty(len(bars), dtype=BAR_RECORD)
+    wall = [b.timestamp if b.timestamp.tzinfo is None else b.timestamp.astimezone(ET).replace(tzinfo=None)
+            for b in bars]
+    records["timestamp"] = np.array(wall, dtype="datetime64[s]").astype(np.int64)
+    for name in ("open", "high", "low", "close", "volume"):
+        records[name] = [getattr(b, name) for b in bars]
+    return np.sort(records, order="timestamp", kind="stable")
+
+
+def _read_store(path: Path, mmap: bool = True) -> np.ndarray:
+    """
+    Read a store file (a torn trailing record from a crash is ignored).
+
+    Loads memory-map the file; writers pass mmap=False so no mapping is
+    held open while the file is truncated or replaced (Windows refuses both).
+    """
+    if not path.exists():
+        return np.empty(0, dtype=BAR_RECORD)
+    n = path.stat().st_size // BAR_RECORD.itemsize
+    if n == 0:
+        return np.empty(0, dtype=BAR_RECORD)
+    if mmap:
+        return np.memmap(path, dtype=BAR_RECORD, mode="r", shape=(n,))
+    return np.fromfile(path, dtype=BAR_RECORD, count=n)
+
+
+def _rewrite_store(path: Path, records: np.ndarray) -> None:
+    """Atomically replace a store file (readers keep their old mapping)."""
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        np.ascontiguousarray(records).tofile(f)
+    os.replace(tmp, path)
+
+
+def _stored_days(records: np.ndarray) -> np.ndarray:
+    """Sorted unique day numbers present in a record array (the date index)."""
+    return np.unique(records["timestamp"] // _SECONDS_PER_DAY)
+
+
+def _append_days(path: Path, new_records: np.ndarray) -> list[str]:
+    """
+    Add records for dates not yet in the store. Returns the dates added.
+
+    Days after the last stored bar are appended in place; backfilled days
+    (older than the store's end) trigger a sorted rewrite.
+    """
+    existing = _read_store(path, mmap=False)
+    days = new_records["timestamp"] // _SECONDS_PER_DAY
+    keep = ~np.isin(days, _stored_days(existing))
+    new_records = new_records[keep]
+    if len(new_records) == 0:
+        return []
+
+    # Deduplicate by timestamp (first occurrence wins, as in load_local_bars)
+    _, first = np.unique(new_records["timestamp"], return_index=True)
+    new_records = new_records[np.sort(first)]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if len(existing) == 0 or new_records["timestamp"][0] > existing["timestamp"][-1]:
+        with path.open("ab") as f:
+            # Drop any torn trailing record before appending
+            f.truncate(len(existing) * BAR_RECORD.itemsize)
+            new_records.tofile(f)
+    else:
+        merged = np.concatenate([existing, new_records])
+        _rewrite_store(path, np.sort(merged, order="timestamp", kind="stable"))
+
+    added = np.unique(new_records["timestamp"] // _SECONDS_PER_DAY)
+    return [(_EPOCH_DATE + timedelta(days=int(d))).isoformat() for d in added]
 
-def save_daily_bars(symbol: str, bars: list[Bar]) -> list[Path]:
+
+def _prune_store(path: Path, cutoff: date) -> None:
+    """Drop dates older than cutoff (rewrites the file only when needed)."""
+    records = _read_store(path, mmap=False)
+    if len(records) == 0:
+        return
+    cutoff_ts = _day_number(cutoff) * _SECONDS_PER_DAY
+    if records["timestamp"][0] >= cutoff_ts:
+        return
+    start = int(np.searchsorted(records["timestamp"], cutoff_ts, side="left"))
+    _rewrite_store(path, records[start:])
+
+
+def save_daily_bars(symbol: str, bars: list[Bar], interval: str | None = None) -> list[str]:
     """
-    Save bars to per-date CSV files under data/bars/{symbol}/.
+    Append bars to the binary store under data/bars/{symbol}/.
 
-    Idempotent: skips dates that already have a CSV on disk.
-    Returns list of newly created file paths.
+    Idempotent: skips dates that are already stored.
+    Returns list of newly stored dates (YYYY-MM-DD).
     """
     if not bars:
         return []
 
+    interval = interval or bars[0].timeframe or _CSV_INTERVAL
+    path = _store_path(symbol, interval)
+
+    # Fold in any legacy CSVs first so their dates count as already saved
+    if interval == _CSV_INTERVAL:
+        import_csv_bars(symbol)
+
+    created = _append_days(path, _to_records(bars))
+
+    # Prune dates older than 3 months
+    cutoff = date.today() - timedelta(days=_MAX_RETENTION_DAYS)
+    _prune_store(path, cutoff)
+
+    return created
+
+
+def import_csv_bars(symbol: str, interval: str = _CSV_INTERVAL) -> list[str]:
+    """
+    Import legacy per-day CSVs (data/bars/{symbol}/YYYY-MM-DD.csv) into the store.
+
+    Runs once per store: afterwards a marker file next to the store makes
+    this a no-op (delete the marker, or the store, to import again). Only
+    dates missing from the store are parsed. CSV files are left in place.
+    Returns list of imported dates.
+    """
+    sym_dir = _BARS_DIR / symbol.upper()
+    if not sym_dir.exists():
+        return []
+
+    path = _store_path(symbol, interval)
+    marker = _csv_marker_path(symbol, interval)
+    if marker.exists() and path.exists():
+        return []
+
+    stored = set(_stored_days(_read_store(path)).tolist())
+    cutoff = date.today() - timedelta(days=_MAX_RETENTION_DAYS)
+
+    bars: list[Bar] = []
+    for csv_path in sorted(sym_dir.glob("*.csv")):
+        try:
+            file_date = date.fromisoformat(csv_path.stem)
+        except ValueError:
+            continue
+        if file_date < cutoff or _day_number(file_date) in stored:
+            continue
+        try:
+            bars.extend(load_csv_bars(csv_path))
+        except Exception as e:
+            print(f"  Warning: failed to load {csv_path}: {e}")
+
+    imported = _append_days(path, _to_records(bars)) if bars else []
+    marker.touch()
+    return imported
+
+
+def export_csv_bars(symbol: str, interval: str = _CSV_INTERVAL, overwrite: bool = False) -> list[Path]:
+    """
+    Write the store back out as per-day CSVs (legacy layout).
+
+    Existing CSVs are kept unless overwrite=True. Returns paths written.
+    """
+    frame = load_local_frame(symbol, interval, apply_retention=False)
     sym_dir = _BARS_DIR / symbol.upper()
     sym_dir.mkdir(parents=True, exist_ok=True)
 
-    # Group bars by date
+    written: list[Path] = []
     by_date: dict[str, list[Bar]] = {}
-    for b in bars:
-        date_str = b.timestamp.strftime("%Y-%m-%d")
-        by_date.setdefault(date_str, []).append(b)
+    for b in frame.to_bars():
+        by_date.setdefault(b.timestamp.strftime("%Y-%m-%d"), []).append(b)
 
-    created: list[Path] = []
     for date_str, day_bars in sorted(by_date.items()):
         csv_path = sym_dir / f"{date_str}.csv"
-        if csv_path.exists():
+        if csv_path.exists() and not overwrite:
             continue
-
-        # Sort by timestamp within the day
-        day_bars.sort(key=lambda b: b.timestamp)
-
         with csv_path.open("w", encoding="utf-8", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(["timestamp", "open", "high", "low", "close", "volume", "symbol", "timeframe"])
@@ -67,59 +261,48 @@ def save_daily_bars(symbol: str, bars: list[Bar]) -> list[Path]:
                     b.symbol,
                     b.timeframe,
                 ])
-        created.append(csv_path)
+        written.append(csv_path)
 
-    # Prune CSVs older than 3 months
-    cutoff = date.today() - timedelta(days=_MAX_RETENTION_DAYS)
-    for csv_path in sym_dir.glob("*.csv"):
-        try:
-            file_date = date.fromisoformat(csv_path.stem)
-            if file_date < cutoff:
-                csv_path.unlink()
-        except ValueError:
-            pass
-
-    return created
+    return written
 
 
-def load_local_bars(symbol: str) -> list[Bar]:
+def load_local_frame(symbol: str, interval: str = _CSV_INTERVAL, apply_retention: bool = True) -> BarFrame:
     """
-    Load all locally stored CSVs for a symbol.
+    Load stored bars for a symbol as a BarFrame (memory-mapped, no parsing).
 
-    Returns list[Bar] sorted chronologically, deduplicated by timestamp.
+    Legacy CSVs not yet in the store are imported first. With
+    apply_retention, dates older than the retention period are skipped.
     """
-    sym_dir = _BARS_DIR / symbol.upper()
-    if not sym_dir.exists():
-        return []
+    symbol = symbol.upper()
+    if interval == _CSV_INTERVAL:
+        import_csv_bars(symbol, interval)
 
-    cutoff = date.today() - timedelta(days=_MAX_RETENTION_DAYS)
-    csv_files = sorted(sym_dir.glob("*.csv"))
-    if not csv_files:
-        return []
+    records = _read_store(_store_path(symbol, interval))
+    if apply_retention and len(records):
+        cutoff = date.today() - timedelta(days=_MAX_RETENTION_DAYS)
+        start = int(np.searchsorted(records["timestamp"], _day_number(cutoff) * _SECONDS_PER_DAY, side="left"))
+        records = records[start:]
 
-    all_bars: list[Bar] = []
-    for csv_path in csv_files:
-        # Skip files older than retention period
-        try:
-            file_date = date.fromisoformat(csv_path.stem)
-            if file_date < cutoff:
-                continue
-        except ValueError:
-            pass
-        try:
-            all_bars.extend(load_csv_bars(csv_path))
-        except Exception as e:
-            print(f"  Warning: failed to load {csv_path}: {e}")
+    return BarFrame(
+        timestamps=records["timestamp"],
+        open=records["open"],
+        high=records["high"],
+        low=records["low"],
+        close=records["close"],
+        volume=records["volume"],
+        symbol=symbol,
+        timeframe=interval,
+        int_volume=False,  # CSV loader returns float volume
+    )
 
-    # Deduplicate by timestamp and sort
-    seen: set[datetime] = set()
-    unique: list[Bar] = []
-    for b in sorted(all_bars, key=lambda b: b.timestamp):
-        if b.timestamp not in seen:
-            seen.add(b.timestamp)
-            unique.append(b)
 
-    return unique
+def load_local_bars(symbol: str, interval: str = _CSV_INTERVAL) -> list[Bar]:
+    """
+    Load all locally stored bars for a symbol.
+
+    Returns list[Bar] sorted chronologically, deduplicated by timestamp.
+    """
+    return load_local_frame(symbol, interval).to_bars()
 
 
 def load_bars_with_history(
@@ -138,8 +321,13 @@ def load_bars_with_history(
     live_bars = fetch_futures_bars(symbol=symbol, interval=interval, n_bars=n_bars)
 
     # Load local bars from disk
-    local_bars = load_local_bars(symbol)
+    local_bars = load_local_bars(symbol, interval)
+
+    return _merge_local_live(local_bars, live_bars)
+
 
+def _merge_local_live(local_bars: list[Bar], live_bars: list[Bar]) -> list[Bar]:
+    """Sort + deduplicate by timestamp; local bars win on duplicates."""
     if not local_bars:
         return live_bars
     if not live_bars:
@@ -155,3 +343,148 @@ def load_bars_with_history(
             unique.append(b)
 
     return unique
+
+
+class LiveBarCache:
+    """
+    Per-symbol rolling bar history for the live scan loop.
+
+    The first get_bars() call for a symbol does the same work as
+    load_bars_with_history() (disk history + n_bars live bars). Later calls
+    fetch only the bars since the last cached one plus a small overlap
+    (tradingview_loader.bars_to_cover), at most tail_bars, and merge them
+    in place: new
+    timestamps are appended and overlapping live bars are overwritten (the
+    previous cycle's last bar may still have been forming). Bars that came
+    from disk keep winning on duplicates, as in load_bars_with_history().
+
+    A full reload happens when:
+        - the fetched tail does not overlap the cached bars (missed cycles)
+        - the tail contains a bar older than the cached end that is missing
+        - the latest bar moved to a new date (picks up the EOD save)
+        - max_age_seconds passed since the last full reload
+
+    In event-driven mode, push() merges each closed bar as it arrives and
+    the following get_bars() skips the TradingView fetch.
+
+    Different symbols may be fetched from different threads at once (the
+    live scan pool); calls for the same symbol must not overlap.
+
+    With a timer (core.stage_timer.StageTimer), TradingView fetches and
+    disk history loads are timed per symbol as the tv_fetch and
+    history_load stages.
+    """
+
+    def __init__(
+        self,
+        interval: str = "3m",
+        n_bars: int = 500,
+        tail_bars: int = 30,
+        max_age_seconds: float = 6 * 3600,
+        timer=None,
+    ):
+        self.interval = interval
+        self.n_bars = n_bars
+        self.tail_bars = tail_bars
+        self.max_age_seconds = max_age_seconds
+        self.timer = timer
+        self._entries: dict[str, dict] = {}
+        self._counter_lock = threading.Lock()
+        self.full_reloads = 0
+        self.tail_merges = 0
+
+    def get_bars(self, symbol: str) -> list[Bar]:
+        """Merged history for symbol (a new list; safe to keep across cycles)."""
+        entry = self._entries.get(symbol)
+        if entry is None or time.monotonic() - entry['loaded_at'] > self.max_age_seconds:
+            return self._reload(symbol)
+        if entry.pop('pushed', False):
+            return list(entry['bars'])  # A pushed closed bar is newer than any fetch
+
+        n = min(self.tail_bars, bars_to_cover(entry['bars'][-1].timestamp, self.interval))
+        with self._stage('tv_fetch', symbol):
+            tail = fetch_futures_bars(symbol=symbol, interval=self.interval, n_bars=n)
+        if not tail:
+            return list(entry['bars'])
+        if not self._merge_tail(entry, tail):
+            return self._reload(symbol)
+
+        with self._counter_lock:
+            self.tail_merges += 1
+        return list(entry['bars'])
+
+    def push(self, symbol: str, bar: Bar) -> bool:
+        """
+        Merge a closed bar delivered by a bar-close event source.
+
+        The next get_bars() then returns the cache without fetching. Returns
+        False (the next get_bars() fetches as usual) if nothing is cached
+        yet, the bar is on a new date, or bars are missing before it.
+        """
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return False
+        last_ts = entry['bars'][-1].timestamp
+        if bar.timestamp.date() != last_ts.date():
+            return False
+        if bar.timestamp > last_ts:
+            if bar.timestamp - last_ts > timedelta(minutes=timeframe_minutes(self.interval)):
+                return False
+            entry['index'][bar.timestamp] = len(entry['bars'])
+            entry['bars'].append(bar)
+        elif not self._merge_tail(entry, [bar]):
+            return False
+        entry['pushed'] = True
+        return True
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Force a full reload on the next get_bars() (all symbols if None)."""
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(symbol, None)
+
+    def _reload(self, symbol: str) -> list[Bar]:
+        with self._stage('tv_fetch', symbol):
+            live_bars = fetch_futures_bars(symbol=symbol, interval=self.interval, n_bars=self.n_bars)
+        with self._stage('history_load', symbol):
+            local_bars = load_local_bars(symbol, self.interval)
+        bars = _merge_local_live(local_bars, live_bars)
+        with self._counter_lock:
+            self.full_reloads += 1
+        if not bars:
+            self._entries.pop(symbol, None)
+            return []
+
+        self._entries[symbol] = {
+            'bars': bars,
+            'index': {b.timestamp: i for i, b in enumerate(bars)},
+            'local': {b.timestamp for b in local_bars},
+            'loaded_at': time.monotonic(),
+        }
+        return list(bars)
+
+    def _stage(self, name: str, symbol: str):
+        return self.timer.stage(name, symbol) if self.timer is not None else nullcontext()
+
+    @staticmethod
+    def _merge_tail(entry: dict, tail: list[Bar]) -> bool:
+        """Merge tail bars into entry. Returns False if a full reload is needed."""
+        bars, index, local = entry['bars'], entry['index'], entry['local']
+        last_ts = bars[-1].timestamp
+        if tail[0].timestamp > last_ts:
+            return False  # Gap between cache and tail
+        if tail[-1].timestamp.date() != last_ts.date():
+            return False  # New date: reload so disk history is current
+
+        for b in sorted(tail, key=lambda b: b.timestamp):
+            i = index.get(b.timestamp)
+            if i is not None:
+                if b.timestamp not in local:
+                    bars[i] = b
+            elif b.timestamp > bars[-1].timestamp:
+                index[b.timestamp] = len(bars)
+                bars.append(b)
+            else:
+                return False  # Hole inside the cached range
+        return True
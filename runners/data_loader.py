@@ -2,15 +2,21 @@ from __future__ import annotations
 import csv
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
 
 from core.types import Bar
 
 def load_csv_bars(path: str | Path) -> list[Bar]:
+    return list(iter_csv_bars(path))
+
+def iter_csv_bars(path: str | Path) -> Iterator[Bar]:
+    """Yield the bars of a CSV file one row at a time (see load_csv_bars)."""
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"CSV not found: {p.resolve()}")
+    return _read_csv_rows(p)
 
-    bars: list[Bar] = []
+def _read_csv_rows(p: Path) -> Iterator[Bar]:
     with p.open("r", encoding="utf-8", newline="") as f:
         r = csv.DictReader(f)
         if not r.fieldnames:
@@ -28,16 +34,13 @@ def load_csv_bars(path: str | Path) -> list[Bar]:
             # handles "2026-01-13T09:30:00"
             timestamp = datetime.fromisoformat(ts)
 
-            bars.append(
-                Bar(
-                    timestamp=timestamp,
-                    open=float(row["open"]),
-                    high=float(row["high"]),
-                    low=float(row["low"]),
-                    close=float(row["close"]),
-                    volume=float(row["volume"]),
-                    symbol=row["symbol"].strip(),
-                    timeframe=row["timeframe"].strip(),
-                )
+            yield Bar(
+                timestamp=timestamp,
+                open=float(row["open"]),
+                high=float(row["high"]),
+                low=float(row["low"]),
+                close=float(row["close"]),
+                volume=float(row["volume"]),
+                symbol=row["symbol"].strip(),
+                timeframe=row["timeframe"].strip(),
             )
-    return bars
@@ -13,6 +13,7 @@ from version import STRATEGY_VERSION
 import os
 import html
 import requests
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -46,7 +47,8 @@ class TelegramNotifier:
                 "text": message,
                 "parse_mode": parse_mode,
             }
-            response = requests.post(url, data=data, timeout=10)
+            with _timed('telegram'):
+                response = requests.post(url, data=data, timeout=10)
             return response.status_code == 200
         except Exception as e:
             print(f"Telegram error: {e}")
@@ -194,6 +196,19 @@ class DiscordNotifier:
 # Global notifier instance
 _notifier: Optional[TelegramNotifier] = None
 
+# Optional core.stage_timer.StageTimer for Telegram sends (see set_stage_timer)
+_stage_timer = None
+
+
+def set_stage_timer(timer) -> None:
+    """Time every Telegram send as the 'telegram' stage of timer (None to stop)."""
+    global _stage_timer
+    _stage_timer = timer
+
+
+def _timed(name: str):
+    return _stage_timer.stage(name) if _stage_timer is not None else nullcontext()
+
 
 def get_notifier() -> TelegramNotifier:
     """Get or create the global notifier instance."""
@@ -0,0 +1,382 @@
+"""
+V10 Parameter Sweep - evaluate many run_session_v10 variants in one pass.
+
+Replaces the one-off compare_* scripts: bars are loaded once per symbol,
+each (symbol, day) is a unit of work that runs every variant on that day
+with a shared precomputed dict (FVGs + indicators are computed once per
+day, not once per variant), and days are spread over a process pool.
+
+Parameters:
+    Any get_symbol_config() key (min_risk, max_bos_risk, opp_fvg_exit,
+    trail_r_trigger, ...) is applied as a get_session_v10_kwargs()
+    override. Any other run_session_v10() keyword (fvg_mode,
+    post_t1_trail_r, entry_min_fvg_ticks, ...) is set directly.
+
+    name=a,b,c      choices
+    name=lo:hi:step range expanded to choices (grid) - inclusive
+    name=lo:hi      continuous range (random / lhs samplers only)
+
+Samplers:
+    grid    every combination of the choices
+    random  --samples N independent draws
+    lhs     --samples N Latin hypercube draws (each param's range split
+            into N strata, one draw per stratum)
+
+Each day runs generate_entries() once per distinct set of entry params
+and simulate_exits() once per variant, so variants that only change exit
+params share their entry candidates.
+
+Results (per variant per symbol): trades, win rate, P/L, profit factor
+and max drawdown (trade by trade, in date order). Printed sorted by P/L
+and optionally written to CSV in variant order.
+
+Usage:
+    python -m runners.param_sweep ES NQ --days 30 --workers 8 \\
+        --param trail_r_trigger=4,6,8 --param t1_r_target=2,3
+    python -m runners.param_sweep ES --sampler lhs --samples 40 \\
+        --param min_risk=1.0:3.0 --param consol_threshold=0:2 --out sweep.csv
+"""
+import sys
+sys.path.insert(0, '.')
+
+import argparse
+import csv
+import inspect
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import time as dt_time
+
+from runners.backtest_v10_multiday import build_history_windows, forming_bar_index, select_trading_dates
+from runners.bar_storage import load_bars_with_history
+from runners.run_v10_dual_entry import (
+    generate_entries,
+    memo_stats,
+    run_session_v10,
+    set_memoization,
+    simulate_exits,
+    split_session_kwargs,
+)
+from runners.symbol_defaults import get_symbol_config, get_session_v10_kwargs
+
+_SESSION_PARAMS = set(inspect.signature(run_session_v10).parameters) - {'session_bars', 'all_bars', 'precomputed'}
+
+RESULT_COLUMNS = ['trades', 'win_rate', 'pnl', 'profit_factor', 'max_drawdown']
+
+
+# =============================================================================
+# Parameter space
+# =============================================================================
+
+def _parse_value(text):
+    """'3' -> 3, '1.5' -> 1.5, 'true' -> True, 'none' -> None, else the string."""
+    lowered = text.strip().lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    if lowered == 'none':
+        return None
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text.strip()
+
+
+def parse_param_spec(spec):
+    """Parse 'name=...' into (name, {'choices': [...]}) or (name, {'range': (lo, hi)})."""
+    name, sep, values = spec.partition('=')
+    name = name.strip()
+    if not sep or not name or not values:
+        raise ValueError(f"Bad parameter spec {spec!r}, expected name=values")
+
+    if ':' in values and ',' not in values:
+        parts = [_parse_value(v) for v in values.split(':')]
+        if len(parts) not in (2, 3) or not all(isinstance(p, (int, float)) and not isinstance(p, bool) for p in parts):
+            raise ValueError(f"Bad range in {spec!r}, expected lo:hi or lo:hi:step")
+        if len(parts) == 2:
+            return name, {'range': (parts[0], parts[1])}
+        lo, hi, step = parts
+        if step <= 0 or hi < lo:
+            raise ValueError(f"Bad range in {spec!r}: need lo <= hi and step > 0")
+        count = int(round((hi - lo) / step)) + 1
+        choices = [lo + k * step for k in range(count)]
+        if all(isinstance(p, int) for p in parts):
+            return name, {'choices': choices}
+        return name, {'choices': [round(c, 10) for c in choices]}
+
+    return name, {'choices': [_parse_value(v) for v in values.split(',')]}
+
+
+def _draw(dim, u):
+    """Value of a parameter dimension at quantile u in [0, 1)."""
+    if 'choices' in dim:
+        choices = dim['choices']
+        return choices[min(int(u * len(choices)), len(choices) - 1)]
+    lo, hi = dim['range']
+    if isinstance(lo, int) and isinstance(hi, int):
+        return min(lo + int(u * (hi - lo + 1)), hi)
+    return lo + u * (hi - lo)
+
+
+def grid_variants(space):
+    """Every combination of the choices in space (dict name -> dimension)."""
+    for name, dim in space.items():
+        if 'choices' not in dim:
+            raise ValueError(f"Grid sampler needs choices or lo:hi:step for '{name}'")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[n]['choices'] for n in names))]
+
+
+def random_variants(space, samples, seed=0):
+    """samples independent uniform draws from space."""
+    rnd = random.Random(seed)
+    return [{name: _draw(dim, rnd.random()) for name, dim in space.items()} for _ in range(samples)]
+
+
+def lhs_variants(space, samples, seed=0):
+    """samples Latin hypercube draws: every parameter hits each of its samples strata once."""
+    rnd = random.Random(seed)
+    columns = {}
+    for name, dim in space.items():
+        strata = list(range(samples))
+        rnd.shuffle(strata)
+        columns[name] = [_draw(dim, (k + rnd.random()) / samples) for k in strata]
+    return [{name: columns[name][i] for name in space} for i in range(samples)]
+
+
+SAMPLERS = {'grid': grid_variants, 'random': random_variants, 'lhs': lhs_variants}
+
+
+def build_variant_kwargs(symbol, overrides):
+    """run_session_v10 kwargs for symbol with a variant's overrides applied.
+
+    Raises:
+        ValueError: If an override is neither a symbol config key nor a
+            run_session_v10 parameter.
+    """
+    config_keys = set(get_symbol_config(symbol))
+    config_overrides = {k: v for k, v in overrides.items() if k in config_keys}
+    kwargs = get_session_v10_kwargs(symbol, **config_overrides)
+    for name, value in overrides.items():
+        if name in config_keys:
+            continue
+        if name not in _SESSION_PARAMS:
+            raise ValueError(f"Unknown sweep parameter '{name}' (not a symbol config key "
+                             f"or run_session_v10 parameter)")
+        kwargs[name] = value
+    return kwargs
+
+
+# =============================================================================
+# Evaluation
+# =============================================================================
+
+# Per-process inputs (set once by _init_sweep_worker)
+_worker_inputs = {}
+
+
+def run_sweep_day(target_date, all_bars, variant_kwargs, window=None, drop_last_bar=False):
+    """Run every variant on one day, sharing FVGs/indicators and entry candidates.
+
+    Returns:
+        One list of per-trade total_dollars (entry order) per variant.
+    """
+    day_bars = [b for b in all_bars if b.timestamp.date() == target_date]
+    session_bars = [b for b in day_bars if dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+    if not session_bars:
+        return [[] for _ in variant_kwargs]
+    start, end = window if window is not None else (0, len(all_bars))
+    if drop_last_bar:
+        end = min(end, forming_bar_index(all_bars, session_bars))
+        session_bars = session_bars[:-1]
+    history = all_bars[start:end]
+    if not session_bars:
+        return [[] for _ in variant_kwargs]
+
+    precomputed = {}
+    candidates_by_entry = {}
+    results = []
+    for kwargs in variant_kwargs:
+        entry_kwargs, exit_kwargs = split_session_kwargs(kwargs)
+        entry_key = tuple(sorted(entry_kwargs.items()))
+        if entry_key not in candidates_by_entry:
+            candidates_by_entry[entry_key] = generate_entries(session_bars, history, precomputed=precomputed, **entry_kwargs)
+        trades = simulate_exits(candidates_by_entry[entry_key], session_bars, **exit_kwargs)
+        results.append([r['total_dollars'] for r in trades])
+    return results
+
+
+def _init_sweep_worker(inputs):
+    _worker_inputs.update(inputs)
+    set_memoization(True)
+
+
+def _run_sweep_job(job):
+    symbol, target_date = job
+    inputs = _worker_inputs[symbol]
+    window = inputs['windows'][target_date] if inputs['windows'] is not None else None
+    return run_sweep_day(target_date, inputs['all_bars'], inputs['variant_kwargs'],
+                         window, inputs['drop_last_bar'])
+
+
+def summarize_trades(trade_pnls):
+    """Totals for one variant from its per-trade P/L list (in trade order)."""
+    wins = [p for p in trade_pnls if p > 0]
+    losses = [p for p in trade_pnls if p < 0]
+    gross_loss = abs(sum(losses))
+
+    equity = 0.0
+    peak = 0.0
+    max_drawdown = 0.0
+    for p in trade_pnls:
+        equity += p
+        peak = max(peak, equity)
+        max_drawdown = max(max_drawdown, peak - equity)
+
+    return {
+        'trades': len(trade_pnls),
+        'win_rate': len(wins) / len(trade_pnls) * 100 if trade_pnls else 0.0,
+        'pnl': sum(trade_pnls),
+        'profit_factor': sum(wins) / gross_loss if gross_loss > 0 else float('inf'),
+        'max_drawdown': max_drawdown,
+    }
+
+
+def run_sweep(symbols, variants, days=30, workers=1, window_days=None, drop_last_bar=False, bars_by_symbol=None):
+    """Evaluate variants (list of override dicts) on each symbol.
+
+    Args:
+        bars_by_symbol: Optional preloaded bars (symbol -> list[Bar]); symbols
+            missing from it are loaded with load_bars_with_history().
+
+    Returns:
+        Rows (dicts) in symbol then variant order: symbol, variant index,
+        the overrides, and RESULT_COLUMNS.
+    """
+    inputs = {}
+    jobs = []
+    for symbol in symbols:
+        all_bars = (bars_by_symbol or {}).get(symbol)
+        if all_bars is None:
+            print(f'Loading {symbol} 3m data (local + live)...')
+            all_bars = load_bars_with_history(symbol=symbol, interval='3m', n_bars=10000)
+        if not all_bars:
+            print(f'  No data for {symbol}, skipped')
+            continue
+        trading_dates, _ = select_trading_dates(all_bars, days)
+        inputs[symbol] = {
+            'all_bars': all_bars,
+            'variant_kwargs': [build_variant_kwargs(symbol, v) for v in variants],
+            'windows': build_history_windows(all_bars, trading_dates, window_days) if window_days is not None else None,
+            'drop_last_bar': drop_last_bar,
+        }
+        jobs += [(symbol, d) for d in trading_dates]
+        print(f'  {symbol}: {len(trading_dates)} days x {len(variants)} variants')
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker, initargs=(inputs,)) as pool:
+            day_results = list(pool.map(_run_sweep_job, jobs))
+    else:
+        memos_were_on = set_memoization(True)
+        _init_sweep_worker(inputs)
+        try:
+            day_results = [_run_sweep_job(job) for job in jobs]
+        finally:
+            _worker_inputs.clear()
+            set_memoization(memos_were_on)
+
+    # Concatenate each variant's trades in date order
+    trades = {symbol: [[] for _ in variants] for symbol in inputs}
+    for (symbol, _), per_variant in zip(jobs, day_results):
+        for k, pnls in enumerate(per_variant):
+            trades[symbol][k].extend(pnls)
+
+    rows = []
+    for symbol in inputs:
+        for k, overrides in enumerate(variants):
+            rows.append({'symbol': symbol, 'variant': k, **overrides, **summarize_trades(trades[symbol][k])})
+    return rows
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def _format_params(row, param_names):
+    def fmt(v):
+        return f'{v:.4g}' if isinstance(v, float) else str(v)
+    return ' '.join(f'{n}={fmt(row[n])}' for n in param_names if n in row) or '(defaults)'
+
+
+def print_results(rows, param_names, top=None):
+    """Per-symbol table sorted by P/L (best first)."""
+    for symbol in dict.fromkeys(r['symbol'] for r in rows):
+        ranked = sorted((r for r in rows if r['symbol'] == symbol), key=lambda r: -r['pnl'])
+        if top:
+            ranked = ranked[:top]
+        print()
+        print('=' * 100)
+        print(f'{symbol} PARAMETER SWEEP - {len(ranked)} variant(s), sorted by P/L')
+        print('=' * 100)
+        print(f'{"#":>4} {"Trades":>7} {"Win%":>6} {"P/L":>12} {"PF":>6} {"Max DD":>10}  Params')
+        print('-' * 100)
+        for r in ranked:
+            pf = f"{r['profit_factor']:.2f}" if r['profit_factor'] != float('inf') else 'inf'
+            print(f"{r['variant']:>4} {r['trades']:>7} {r['win_rate']:>5.1f}% ${r['pnl']:>+10,.0f} {pf:>6} "
+                  f"${r['max_drawdown']:>8,.0f}  {_format_params(r, param_names)}")
+
+
+def write_results_csv(rows, param_names, path):
+    """Write rows (variant order) to CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['symbol', 'variant', *param_names, *RESULT_COLUMNS])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow({k: r.get(k) for k in writer.fieldnames})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='V10 parameter sweep over run_session_v10 overrides')
+    parser.add_argument('symbols', nargs='*', default=['ES'], help='Symbols to sweep (default: ES)')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUES',
+                        help='Parameter values: a,b,c | lo:hi:step | lo:hi (repeatable)')
+    parser.add_argument('--sampler', choices=sorted(SAMPLERS), default='grid')
+    parser.add_argument('--samples', type=int, default=20, help='Variants for random/lhs (default: 20)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--window-days', type=int, default=None,
+                        help='Bounded history window per day (see backtest_v10_multiday)')
+    parser.add_argument('--drop-last-bar', action='store_true')
+    parser.add_argument('--no-baseline', action='store_true', help='Do not add the default config as variant 0')
+    parser.add_argument('--top', type=int, default=None, help='Only print the best N variants per symbol')
+    parser.add_argument('--out', default=None, help='Write all rows to this CSV file')
+    args = parser.parse_args()
+
+    space = dict(parse_param_spec(spec) for spec in args.param)
+    if args.sampler == 'grid':
+        variants = grid_variants(space)
+    else:
+        variants = SAMPLERS[args.sampler](space, args.samples, seed=args.seed)
+    if not args.no_baseline and {} not in variants:
+        variants.insert(0, {})
+
+    for symbol in args.symbols:
+        for v in variants:
+            build_variant_kwargs(symbol, v)  # Fail fast on unknown names
+
+    set_memoization(True)  # Kept on after run_sweep so the counters below survive
+    rows = run_sweep(args.symbols, variants, days=args.days, workers=args.workers,
+                     window_days=args.window_days, drop_last_bar=args.drop_last_bar)
+    print_results(rows, list(space), top=args.top)
+    if args.workers <= 1:
+        stats = memo_stats()['entries']
+        print(f"\nEntry memo: {stats['hits']} hits, {stats['misses']} misses")
+    if args.out:
+        write_results_csv(rows, list(space), args.out)
+        print(f'\nWrote {len(rows)} rows to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
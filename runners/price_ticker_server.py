@@ -26,10 +26,15 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 
+import numpy as np
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from runners.tradingview_loader import _get_tv_client, _fetch_with_timeout
+from core.bar_frame import BarFrame
+from core.bar_ingest import frame_from_dataframe, index_epoch_seconds
+from core.resample import timeframe_minutes
+from runners.tradingview_loader import _get_tv_client, _fetch_with_timeout, fetch_timeframes
 from tvDatafeed import Interval
 
 # ── Symbol config ──────────────────────────────────────────────────────
@@ -50,13 +55,15 @@ BAR_DATASETS = {
     "VIX_daily":  {"tv_symbol": "VIX",  "exchange": "TVC",      "interval": Interval.in_daily,  "n_bars": 260, "refresh": 1800},
     "SPY_daily":  {"tv_symbol": "SPY",  "exchange": "AMEX",     "interval": Interval.in_daily,  "n_bars": 260, "refresh": 1800},
     "RSP_daily":  {"tv_symbol": "RSP",  "exchange": "AMEX",     "interval": Interval.in_daily,  "n_bars": 260, "refresh": 1800},
-    # Intraday bars for HTF bias (4H, 1H, 15M)
+    # Intraday bars for HTF bias (4H, 1H, 15M). 15M is resampled from the
+    # symbol's 1m stream (see _fetch_resampled_dataset); 100 1H/4H bars need
+    # more minutes than one TradingView request returns, so they stay native.
     "ES_4h":      {"tv_symbol": "ES1!", "exchange": "CME_MINI", "interval": Interval.in_4_hour,    "n_bars": 100, "refresh": 1800},
     "ES_1h":      {"tv_symbol": "ES1!", "exchange": "CME_MINI", "interval": Interval.in_1_hour,    "n_bars": 100, "refresh": 900},
-    "ES_15m":     {"tv_symbol": "ES1!", "exchange": "CME_MINI", "interval": Interval.in_15_minute, "n_bars": 100, "refresh": 600},
+    "ES_15m":     {"symbol": "ES", "resample": "15m", "n_bars": 100, "refresh": 600},
     "NQ_4h":      {"tv_symbol": "NQ1!", "exchange": "CME_MINI", "interval": Interval.in_4_hour,    "n_bars": 100, "refresh": 1800},
     "NQ_1h":      {"tv_symbol": "NQ1!", "exchange": "CME_MINI", "interval": Interval.in_1_hour,    "n_bars": 100, "refresh": 900},
-    "NQ_15m":     {"tv_symbol": "NQ1!", "exchange": "CME_MINI", "interval": Interval.in_15_minute, "n_bars": 100, "refresh": 600},
+    "NQ_15m":     {"symbol": "NQ", "resample": "15m", "n_bars": 100, "refresh": 600},
 }
 
 # Map request params to dataset key: (symbol, interval) -> dataset key
@@ -76,10 +83,12 @@ _daily_closes = {}  # symbol -> previous close price
 _bar_data = {}          # dataset_key -> list of bar dicts
 _bar_lock = threading.Lock()
 _bar_fetch_times = {}   # dataset_key -> last fetch timestamp
+_bar_1m_cache = {}      # (symbol, "1m") -> bars, kept current by fetch_timeframes
 
 DISK_PATH = Path("/opt/tradovate-bot/data/ticker/prices.json")
 TRADE_STATE_PATH = Path("/opt/tradovate-bot/data/ticker/trade_state.json")
 SIGNAL_STATE_PATH = Path("/opt/tradovate-bot/data/ticker/signal_state.json")
+PERF_STATE_PATH = Path("/opt/tradovate-bot/data/ticker/perf_state.json")
 BAR_DISK_DIR = Path("/opt/tradovate-bot/data/ticker/bars")
 FETCH_INTERVAL = 30  # seconds between price fetches
 DAILY_REFRESH_INTERVAL = 3600  # refresh daily bars every hour
@@ -145,39 +154,67 @@ def _save_bars_to_disk(key, bars):
         print(f"[bars] Could not save {key} to disk: {e}", flush=True)
 
 
+def _dataframe_to_bar_dicts(df, intraday: bool) -> list[dict]:
+    """Convert a tvDatafeed DataFrame to the /bars JSON rows (column-wise)."""
+    frame = frame_from_dataframe(df, symbol="", timeframe="")
+    # "ts" as pandas Timestamp.timestamp(): wall-clock seconds for a naive
+    # index (tvDatafeed), UTC seconds for an aware one - the frame's epochs
+    wall, _ = index_epoch_seconds(df, strip_tz=True)
+    stamps = np.datetime_as_string(wall.astype("datetime64[s]"), unit="s").tolist()
+
+    bars = []
+    for stamp, t, o, h, l, c, v in zip(
+        stamps, frame.timestamps.tolist(), frame.open.tolist(), frame.high.tolist(), frame.low.tolist(),
+        frame.close.tolist(), frame.volume.astype(np.int64).tolist(),
+    ):
+        bar = {"date": stamp[:10], "ts": t, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        # Include datetime for intraday bars
+        if intraday:
+            bar["datetime"] = stamp.replace("T", " ")
+        bars.append(bar)
+    return bars
+
+
+def _bars_to_bar_dicts(bars) -> list[dict]:
+    """Convert intraday Bars to the /bars JSON rows (same fields as _dataframe_to_bar_dicts)."""
+    frame = BarFrame.from_bars(bars)
+    rows = []
+    for b, t in zip(bars, frame.timestamps.tolist()):
+        stamp = b.timestamp.replace(tzinfo=None).isoformat(sep=" ", timespec="seconds")
+        rows.append({"date": stamp[:10], "ts": t, "open": b.open, "high": b.high, "low": b.low,
+                     "close": b.close, "volume": int(b.volume), "datetime": stamp})
+    return rows
+
+
+def _fetch_resampled_dataset(cfg):
+    """Bar rows for a dataset built from the symbol's 1m stream (only new minutes are fetched)."""
+    minutes = timeframe_minutes(cfg["resample"])
+    # One extra bucket: a partial first bucket is dropped
+    max_bars = (cfg["n_bars"] + 1) * minutes
+    bars = fetch_timeframes(cfg["symbol"], [cfg["resample"]], _bar_1m_cache, max_bars=max_bars)[cfg["resample"]]
+    return _bars_to_bar_dicts(bars[-cfg["n_bars"]:])
+
+
 def _fetch_bar_dataset(tv, key, cfg):
     """Fetch a single bar dataset from TradingView."""
     try:
-        df = _fetch_with_timeout(
-            tv=tv,
-            symbol=cfg["tv_symbol"],
-            exchange=cfg["exchange"],
-            interval=cfg["interval"],
-            n_bars=cfg["n_bars"],
-            timeout=30,
-        )
-        if df is None or df.empty:
+        if "resample" in cfg:
+            bars = _fetch_resampled_dataset(cfg)
+        else:
+            df = _fetch_with_timeout(
+                tv=tv,
+                symbol=cfg["tv_symbol"],
+                exchange=cfg["exchange"],
+                interval=cfg["interval"],
+                n_bars=cfg["n_bars"],
+                timeout=30,
+            )
+            bars = [] if df is None or df.empty else _dataframe_to_bar_dicts(
+                df, intraday=cfg["interval"] not in (Interval.in_daily, Interval.in_weekly))
+        if not bars:
             print(f"[bars] {key}: no data returned", flush=True)
             return None
 
-        bars = []
-        for idx, row in df.iterrows():
-            # idx is a datetime index from tvDatafeed
-            dt = idx
-            bar = {
-                "date": dt.strftime("%Y-%m-%d"),
-                "ts": int(dt.timestamp()),
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": int(row["volume"]) if row.get("volume") else 0,
-            }
-            # Include datetime for intraday bars
-            if cfg["interval"] not in (Interval.in_daily, Interval.in_weekly):
-                bar["datetime"] = dt.strftime("%Y-%m-%d %H:%M:%S")
-            bars.append(bar)
-
         with _bar_lock:
             _bar_data[key] = bars
             _bar_fetch_times[key] = time.time()
@@ -510,6 +547,7 @@ class TickerHandler(BaseHTTPRequestHandler):
             "uptime_s": round(time.time() - _start_time, 1),
             "bar_datasets": bar_datasets,
             "bar_ages_s": bar_ages,
+            "bot": _read_perf_state(),
         })
 
         self.send_response(200 if healthy else 503)
@@ -526,6 +564,18 @@ class TickerHandler(BaseHTTPRequestHandler):
 _start_time = time.time()
 
 
+def _read_perf_state() -> dict | None:
+    """Live bot per-stage cycle timings written by run_live.py (None if unavailable)."""
+    try:
+        if not PERF_STATE_PATH.exists():
+            return None
+        data = json.loads(PERF_STATE_PATH.read_text())
+    except Exception:
+        return None
+    data["age_s"] = round(time.time() - data.get("ts", 0), 1)
+    return data
+
+
 def main():
     parser = argparse.ArgumentParser(description="TradingView Price Ticker Server")
     parser.add_argument("--port", type=int, default=8080, help="HTTP port (default: 8080)")
@@ -17,6 +17,7 @@ from version import STRATEGY_VERSION
 import argparse
 import time
 import signal
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, time as dt_time
 from enum import Enum
@@ -30,11 +31,11 @@ from runners.prop_firm.symbol_defaults import get_live_futures_config, get_sessi
 
 # Shared imports (unchanged)
 from runners.tradingview_loader import fetch_futures_bars
-from strategies.ict.signals.fvg import detect_fvgs, update_fvg_mitigation
+from strategies.ict.signals.fvg import detect_fvgs, update_all_fvg_mitigations
 from runners.tradovate_client import TradovateClient, create_client
 from runners.order_manager import OrderManager
 from runners.notifier import notify_entry, notify_exit, notify_daily_summary, notify_status, notify_next_day_outlook
-from runners.bar_storage import save_daily_bars, load_bars_with_history
+from runners.bar_storage import save_daily_bars, LiveBarCache
 from runners.webhook_executor import WebhookExecutor
 from runners.executor_interface import ExecutorInterface
 from runners.divergence_tracker import save_live_trades, compare_day, format_console_report, format_telegram_alert
@@ -189,6 +190,7 @@ class LiveTrader:
         paper_mode: bool = True,
         symbols: List[str] = None,
         executor: Optional[ExecutorInterface] = None,
+        scan_workers: Optional[int] = None,
     ):
         """
         Initialize prop firm live trader (futures only).
@@ -199,6 +201,8 @@ class LiveTrader:
             paper_mode: If True, only log signals without executing
             symbols: List of futures symbols to trade (default: ['ES', 'MES'])
             executor: Executor backend (WebhookExecutor). None = no broker execution.
+            scan_workers: Threads for the parallel symbol scan
+                          (default: one per symbol)
         """
         self.client = client
         self.risk_manager = risk_manager or create_default_risk_manager()
@@ -236,6 +240,17 @@ class LiveTrader:
         self._last_broker_health_check: Optional[datetime] = None
         self._broker_health_interval = 900  # 15 minutes between health checks
 
+        # Rolling per-symbol bar history (disk loaded once, live tail merged each cycle)
+        self.bar_cache = LiveBarCache(interval='3m', n_bars=500)
+
+        # Parallel fetch/evaluate stage of each scan cycle (see _scan_symbols)
+        self._scan_pool = ThreadPoolExecutor(max_workers=scan_workers or max(1, len(self.symbols)),
+                                             thread_name_prefix='scan')
+        self.scan_latency: Dict[str, float] = {}  # symbol -> seconds for the last fetch + evaluate
+
+        # Latest bars per symbol, filled by the scan and reused by trade management
+        self._bar_snapshot: Dict[str, Dict] = {}  # symbol -> {'bars': [...], 'fetched_at': epoch seconds}
+
         # Cached bars and FVGs for opposing FVG exit (refreshed each scan cycle)
         self._cached_all_bars: Dict[str, list] = {}
         self._cached_fvgs: Dict[str, list] = {}
@@ -482,6 +497,7 @@ class LiveTrader:
         """Stop the trading loop."""
         self.running = False
         print("\nStopping trader...")
+        self._scan_pool.shutdown(wait=False)
 
         # Close any open positions if in live mode
         if not self.paper_mode and self.order_manager:
@@ -562,13 +578,7 @@ class LiveTrader:
                 # Scan for new entries
                 # Even if globally blocked, scan anyway — per-symbol limits may allow some symbols
                 # can_enter_trade() in risk_manager gates each symbol individually
-                for symbol in self.futures_symbols:
-                    if not self.running:
-                        break
-                    try:
-                        self._scan_futures_symbol(symbol)
-                    except Exception as e:
-                        log(f"  Error scanning {symbol}: {e}")
+                self._scan_symbols()
 
                 for symbol in self.equity_symbols:
                     if not self.running:
@@ -670,19 +680,71 @@ class LiveTrader:
 
         return False
 
+    def _snapshot_bars(self, symbol: str, n_bars: int = 20) -> list:
+        """
+        Last n_bars bars of symbol from the current cycle's market snapshot.
+
+        The scan stage stores every symbol's bars. A symbol is fetched here
+        only if its snapshot predates the last 3m bar close (scan failed or
+        symbol not scanned), and the fetch is stored, so each symbol costs
+        at most one TradingView call per cycle.
+        """
+        entry = self._bar_snapshot.get(symbol)
+        now = time.time()
+        if entry is None or entry['fetched_at'] < now - now % 180:
+            bars = fetch_futures_bars(symbol, interval='3m', n_bars=20, timeout=15) or []
+            entry = {'bars': bars, 'fetched_at': now}
+            self._bar_snapshot[symbol] = entry
+        return entry['bars'][-n_bars:]
+
+    def _scan_symbols(self):
+        """
+        Scan every futures symbol: fetch + evaluate in parallel, apply serially.
+
+        Bar fetches and strategy runs happen on the scan pool and touch no
+        trader state. Their results are then applied on this thread in
+        symbol order, so signal processing, risk checks and paper trade
+        updates happen exactly as in a sequential scan.
+        """
+        if not self.futures_symbols:
+            return
+
+        pending = [(symbol, self._scan_pool.submit(self._evaluate_futures_symbol, symbol))
+                   for symbol in self.futures_symbols]
+        for symbol, future in pending:
+            if not self.running:
+                break
+            try:
+                self._apply_futures_scan(future.result())
+            except Exception as e:
+                log(f"  Error scanning {symbol}: {e}")
+
+        latencies = ', '.join(f"{s} {self.scan_latency[s]:.2f}s" for s in self.futures_symbols if s in self.scan_latency)
+        log(f"  Scan latency: {latencies}")
+
     def _scan_futures_symbol(self, symbol: str):
         """Scan a futures symbol for trading signals."""
+        self._apply_futures_scan(self._evaluate_futures_symbol(symbol))
+
+    def _evaluate_futures_symbol(self, symbol: str) -> Optional[Dict]:
+        """
+        Fetch bars and run the strategy for a futures symbol.
+
+        Runs on the scan pool: reads config only, never trader state.
+        Returns a scan dict for _apply_futures_scan(), or None if the
+        symbol is not configured.
+        """
         config = self.FUTURES_SYMBOLS.get(symbol)
         if not config:
-            return
+            return None
 
-        log(f"\n[{get_est_now().strftime('%H:%M:%S')}] Scanning {symbol} (futures)...")
+        started = time.monotonic()
+        scan = {'symbol': symbol, 'config': config, 'results': None,
+                'log': [f"\n[{get_est_now().strftime('%H:%M:%S')}] Scanning {symbol} (futures)..."]}
 
-        # Fetch bars with local history merge for instant indicator warmup
-        bars = load_bars_with_history(symbol, interval='3m', n_bars=500)
-        if not bars:
-            log(f"  No data for {symbol}")
-            return
+        # Local history + live tail, merged incrementally by the bar cache
+        bars = self.bar_cache.get_bars(symbol)
+        scan['fetched_at'] = time.time()
 
         # Get today's session bars
         today = get_est_now().date()
@@ -692,39 +754,57 @@ class LiveTrader:
         rth_end = dt_time(16, 0)
         session_bars = [b for b in today_bars if premarket_start <= b.timestamp.time() <= rth_end]
 
-        if len(session_bars) < 1:
-            log(f"  No session bars yet for {symbol}")
+        scan['bars'] = bars
+        if not bars:
+            scan['log'].append(f"  No data for {symbol}")
+        elif len(session_bars) < 1:
+            scan['log'].append(f"  No session bars yet for {symbol}")
+        else:
+            scan['session_bars'] = session_bars
+            scan['log'].append(f"  {symbol}: {session_bars[-1].close:.2f} ({len(session_bars)} session bars, {len(bars)} total)")
+
+            # FVGs for opposing FVG exit in _manage_paper_trades
+            if config.get('opp_fvg_exit'):
+                fvg_config = {'min_fvg_ticks': 2, 'tick_size': config['tick_size'],
+                              'max_fvg_age_bars': 200, 'invalidate_on_close_through': True, 'fvg_mode': 'wick'}
+                fvgs = detect_fvgs(bars, fvg_config)
+                update_all_fvg_mitigations(fvgs, bars, fvg_config)
+                scan['fvgs'] = fvgs
+
+            # Run V10.16 strategy using centralized config (max_consec_losses=0 — handled by risk_manager)
+            kwargs = get_session_v10_kwargs(symbol, max_consec_losses=0)
+            scan['results'] = run_session_v10(
+                session_bars,
+                bars,
+                **kwargs,
+            )
+
+        scan['latency'] = time.monotonic() - started
+        return scan
+
+    def _apply_futures_scan(self, scan: Optional[Dict]):
+        """Apply a futures scan to trader state and process its signals (scan loop thread only)."""
+        if scan is None:
+            return
+        symbol = scan['symbol']
+        self.scan_latency[symbol] = scan['latency']
+        if scan.get('bars'):
+            self._bar_snapshot[symbol] = {'bars': scan['bars'], 'fetched_at': scan['fetched_at']}
+        for line in scan['log']:
+            log(line)
+        if scan['results'] is None:
             return
 
-        current_price = session_bars[-1].close
-        self.last_prices[symbol] = current_price
-        log(f"  {symbol}: {current_price:.2f} ({len(session_bars)} session bars, {len(bars)} total)")
+        self.last_prices[symbol] = scan['session_bars'][-1].close
 
         # Cache bars and FVGs for opposing FVG exit in _manage_paper_trades
-        self._cached_all_bars[symbol] = bars
-        if config.get('opp_fvg_exit'):
-            fvg_config = {'min_fvg_ticks': 2, 'tick_size': config['tick_size'],
-                          'max_fvg_age_bars': 200, 'invalidate_on_close_through': True, 'fvg_mode': 'wick'}
-            fvgs = detect_fvgs(bars, fvg_config)
-            for fvg in fvgs:
-                if not fvg.mitigated:
-                    for bar_idx in range(fvg.created_bar_index + 1, len(bars)):
-                        update_fvg_mitigation(fvg, bars[bar_idx], bar_idx, fvg_config)
-                        if fvg.mitigated:
-                            break
-            self._cached_fvgs[symbol] = fvgs
+        self._cached_all_bars[symbol] = scan['bars']
+        if 'fvgs' in scan:
+            self._cached_fvgs[symbol] = scan['fvgs']
             self._cached_fvgs_time[symbol] = get_est_now()
 
-        # Run V10.16 strategy using centralized config (max_consec_losses=0 — handled by risk_manager)
-        kwargs = get_session_v10_kwargs(symbol, max_consec_losses=0)
-        results = run_session_v10(
-            session_bars,
-            bars,
-            **kwargs,
-        )
-
         # Process signals
-        self._process_futures_signals(symbol, results, config)
+        self._process_futures_signals(symbol, scan['results'], scan['config'])
 
     def _scan_equity_symbol(self, symbol: str):
         """Scan an equity symbol for trading signals."""
@@ -734,8 +814,8 @@ class LiveTrader:
 
         log(f"\n[{get_est_now().strftime('%H:%M:%S')}] Scanning {symbol} (equity)...")
 
-        # Fetch bars with local history merge for instant indicator warmup
-        bars = load_bars_with_history(symbol, interval='3m', n_bars=500)
+        # Local history + live tail, merged incrementally by the bar cache
+        bars = self.bar_cache.get_bars(symbol)
         if not bars:
             log(f"  No data for {symbol}")
             return
@@ -1033,8 +1113,8 @@ class LiveTrader:
             if trade.status != PaperTradeStatus.OPEN:
                 continue
 
-            # Fetch current price (20 bars for swing detection context)
-            bars = fetch_futures_bars(trade.symbol, interval='3m', n_bars=20, timeout=15)
+            # Current price (20 bars for swing detection context)
+            bars = self._snapshot_bars(trade.symbol, n_bars=20)
             if not bars or len(bars) < 1:
                 log(f"    [WARNING] No bars for {trade.symbol} ({trade.id}) — trade unmanaged this cycle")
                 continue
@@ -1775,8 +1855,8 @@ class LiveTrader:
             if base_symbol == 'ME':
                 base_symbol = trade.symbol[:3]  # MES, MNQ
 
-            # Fetch current price
-            bars = fetch_futures_bars(base_symbol, interval='3m', n_bars=10)
+            # Current price
+            bars = self._snapshot_bars(base_symbol, n_bars=10)
             if not bars:
                 continue
 
@@ -2126,7 +2206,8 @@ class LiveTrader:
                     bars = fetch_futures_bars(sym, interval='3m', n_bars=500, timeout=30)
                     created = save_daily_bars(sym, bars)
                     if created:
-                        log(f"  [BARS] Saved {len(created)} CSV(s) for {sym}")
+                        log(f"  [BARS] Saved {len(created)} date(s) for {sym}")
+                        self.bar_cache.invalidate(sym)
                 except Exception as e:
                     log(f"  [BARS] Error saving {sym} bars: {e}")
 
@@ -2147,6 +2228,8 @@ def main():
     parser.add_argument('--paper', action='store_true', help='Paper trading mode (signals only)')
     parser.add_argument('--symbols', nargs='+', default=['ES', 'MES'],
                        help='Futures symbols to trade (ES, NQ, MES, MNQ)')
+    parser.add_argument('--scan-workers', type=int, default=None,
+                       help='Threads for parallel symbol scanning (default: one per symbol)')
     parser.add_argument('--webhook', action='store_true',
                        help='Enable PickMyTrade webhook execution')
     parser.add_argument('--strategy-group', default='ict_v10_prop',
@@ -2201,6 +2284,7 @@ def main():
         paper_mode=paper_mode,
         symbols=args.symbols,
         executor=broker_executor,
+        scan_workers=args.scan_workers,
     )
 
     # Start trading
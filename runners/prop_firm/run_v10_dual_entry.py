@@ -60,7 +60,7 @@ except ImportError:
     from backports.zoneinfo import ZoneInfo
 from runners.tradingview_loader import fetch_futures_bars
 from runners.prop_firm.symbol_defaults import get_symbol_config, get_session_v10_kwargs
-from strategies.ict.signals.fvg import detect_fvgs, update_fvg_mitigation
+from strategies.ict.signals.fvg import detect_fvgs, update_all_fvg_mitigations
 
 
 # EST timezone for time-based filters
@@ -207,6 +207,30 @@ def is_consolidating(bars, lookback=10, atr_period=14, threshold=0.0):
     return ratio < threshold, ratio
 
 
+def map_session_indices(session_bars, all_bars):
+    """Map session_bars positions to all_bars positions by timestamp.
+
+    Uses a timestamp -> index hash over all_bars (first occurrence wins),
+    so the cost is O(len(all_bars) + len(session_bars)) instead of a
+    nested scan of every session bar against the full history.
+
+    Returns:
+        (session_to_all_idx, all_to_session_idx) dicts
+    """
+    ts_to_all_idx = {}
+    for j, abar in enumerate(all_bars):
+        ts_to_all_idx.setdefault(abar.timestamp, j)
+
+    session_to_all_idx = {}
+    all_to_session_idx = {}
+    for i, sbar in enumerate(session_bars):
+        j = ts_to_all_idx.get(sbar.timestamp)
+        if j is not None:
+            session_to_all_idx[i] = j
+            all_to_session_idx[j] = i
+    return session_to_all_idx, all_to_session_idx
+
+
 def is_swing_high(bars, idx, lookback=2):
     """Check if bar at idx is a swing high."""
     if idx < lookback or idx >= len(bars) - lookback:
@@ -454,24 +478,10 @@ def run_session_v10(
 
     # Update FVG mitigation status for all detected FVGs
     # This fixes the bug where mitigated FVGs were still being used for entries
-    for fvg in all_fvgs:
-        if fvg.mitigated:
-            continue
-        # Check all bars after FVG creation for mitigation
-        for bar_idx in range(fvg.created_bar_index + 1, len(all_bars)):
-            update_fvg_mitigation(fvg, all_bars[bar_idx], bar_idx, fvg_config)
-            if fvg.mitigated:
-                break  # Stop once mitigated
+    update_all_fvg_mitigations(all_fvgs, all_bars, fvg_config)
 
     # Create mappings between session_bars and all_bars indices
-    session_to_all_idx = {}
-    all_to_session_idx = {}
-    for i, sbar in enumerate(session_bars):
-        for j, abar in enumerate(all_bars):
-            if abar.timestamp == sbar.timestamp:
-                session_to_all_idx[i] = j
-                all_to_session_idx[j] = i
-                break
+    session_to_all_idx, all_to_session_idx = map_session_indices(session_bars, all_bars)
 
     # Track valid entries for each type
     valid_entries = {'LONG': [], 'SHORT': []}
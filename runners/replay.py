@@ -1,13 +1,56 @@
+"""
+Bar replay engines.
+
+    ReplayEngine        one strategy over one list of bars
+    BatchReplayEngine   many strategies over one pass of one or more bar
+                        streams: each bar is read once and handed to every
+                        strategy subscribed to its (symbol, timeframe)
+
+Streams are any iterables of Bars in time order, so they can be consumed
+lazily - iter_csv_bars() (runners.data_loader) or a stored BarFrame's
+iter_bars() (runners.bar_storage.load_local_frame) - and the full history
+is never materialized. Running ten configs costs one read of the data plus
+ten on_bar calls per bar.
+
+Usage:
+    from runners.bar_storage import load_local_frame
+    from runners.data_loader import iter_csv_bars
+    from runners.replay import BatchReplayEngine, Feed
+    from strategies.ict_ote.strategy import ICTOTEStrategy
+
+    engine = BatchReplayEngine()
+    engine.add_yaml("config/strategies/ict_es.yaml", timeframe="1m")
+    engine.add_yaml("config/strategies/ict_sweep.yaml", symbol="ES")
+    engine.add("ote_es", ICTOTEStrategy(config), [
+        Feed("ES", "5m", "update_htf", signals=False),
+        Feed("ES", "3m", "update_ltf"),
+    ])
+    result = engine.run({
+        ("ES", "1m"): iter_csv_bars("data/es_1m.csv"),
+        ("ES", "3m"): load_local_frame("ES", "3m").iter_bars(),
+        ("ES", "5m"): load_local_frame("ES", "5m").iter_bars(),
+    })
+    for name, run in result.results.items():
+        print(name, len(run.signals), f"{run.seconds:.2f}s")
+"""
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Iterable
 
 from core.types import Bar, Signal
 
+
 @dataclass
 class ReplayResult:
     signals: list[Signal]
     bars_processed: int
+    seconds: float = 0.0  # Time spent in the strategy
+
 
 class ReplayEngine:
     def __init__(self, strategy: Any):
@@ -16,9 +59,199 @@ class ReplayEngine:
     def run(self, bars: list[Bar]) -> ReplayResult:
         signals: list[Signal] = []
 
+        start = time.perf_counter()
         for bar in bars:
             out = self.strategy.on_bar(bar)  # your ICTStrategy returns list[Signal] or []
             if out:
                 signals.extend(out)
 
-        return ReplayResult(signals=signals, bars_processed=len(bars))
+        return ReplayResult(signals=signals, bars_processed=len(bars), seconds=time.perf_counter() - start)
+
+
+# =============================================================================
+# Batch replay
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Feed:
+    """
+    One bar stream a strategy consumes.
+
+    Attributes:
+        symbol, timeframe: Stream key (as passed to BatchReplayEngine.run).
+        method: Strategy method called with each bar of the stream.
+        signals: Collect what the method returns (a list, one object or None).
+    """
+    symbol: str
+    timeframe: str
+    method: str = "on_bar"
+    signals: bool = True
+
+
+@dataclass
+class _Slot:
+    name: str
+    strategy: Any
+    feeds: list[Feed]
+    reset_daily: bool
+    handlers: list = field(default_factory=list)  # (stream key, bound method, collect), feed order
+    result: ReplayResult = field(default_factory=lambda: ReplayResult(signals=[], bars_processed=0))
+    last_date: Any = None
+
+
+@dataclass
+class BatchReplayResult:
+    results: dict[str, ReplayResult]  # Per strategy name, in the order added
+    bars_read: int
+    seconds: float  # Wall time of the whole pass (reading + every strategy)
+
+    @property
+    def strategy_seconds(self) -> float:
+        return sum(r.seconds for r in self.results.values())
+
+
+class BatchReplayEngine:
+    """
+    Fan one pass over bar streams out to many strategy instances.
+
+    Bars of all streams are merged by timestamp. Bars sharing a timestamp
+    are delivered to each strategy in the order of its feeds (list the
+    stream a strategy must see first - an MTF or HTF stream - first).
+    """
+
+    def __init__(self):
+        self._slots: list[_Slot] = []
+
+    def add(self, name: str, strategy: Any, feeds: list[Feed], reset_daily: bool = False) -> None:
+        """
+        Add a strategy instance.
+
+        Args:
+            name: Unique name for the results.
+            strategy: ICTStrategy, ICTSweepStrategy, ICTOTEStrategy, ...
+            feeds: Streams it consumes and the method each bar goes to.
+            reset_daily: Call strategy.reset_daily() when the date of the
+                bars changes (strategies that do not track the day
+                themselves).
+        """
+        if any(slot.name == name for slot in self._slots):
+            raise ValueError(f"Duplicate strategy name: {name}")
+        if not feeds:
+            raise ValueError(f"Strategy {name} has no feeds")
+        slot = _Slot(name=name, strategy=strategy, feeds=list(feeds), reset_daily=reset_daily)
+        for feed in slot.feeds:
+            method = getattr(strategy, feed.method, None)
+            if method is None:
+                raise ValueError(f"{type(strategy).__name__} has no method {feed.method!r} (strategy {name})")
+            slot.handlers.append(((feed.symbol, feed.timeframe), method, feed.signals))
+        self._slots.append(slot)
+
+    def add_yaml(
+        self,
+        config_path: str | Path,
+        symbol: str | None = None,
+        timeframe: str = "1m",
+        name: str | None = None,
+    ) -> str:
+        """
+        Add a strategy built from a YAML config in config/strategies/.
+
+        Configs with per-symbol overrides (a `symbols` section, as
+        ict_sweep.yaml) build an ICTSweepStrategy for symbol on the
+        config's `timeframe`, fed its `mtf_timeframe` stream too when
+        use_mtf_fvg is set. Other configs build an ICTStrategy (as
+        strategies.factory.build_ict_from_yaml) on timeframe.
+
+        Returns:
+            The strategy name (default: "<config stem>_<symbol>").
+        """
+        from config.loader import load_yaml
+
+        cfg = load_yaml(config_path)
+        stem = Path(config_path).stem
+
+        if "symbols" in cfg:
+            from strategies.ict_sweep.strategy import ICTSweepStrategy
+
+            symbol = (symbol or "ES").upper()
+            # Base config + per-symbol overrides (as run_ict_sweep)
+            config = {k: v for k, v in cfg.items() if k != "symbols"}
+            config.update(cfg["symbols"].get(symbol) or {})
+            strategy = ICTSweepStrategy(config)
+            feeds = [Feed(symbol, config.get("timeframe", "5m"), "process_bar")]
+            if config.get("use_mtf_fvg", False):
+                feeds.insert(0, Feed(symbol, config.get("mtf_timeframe", "3m"), "process_mtf_bar", signals=False))
+            reset_daily = True
+        else:
+            from strategies.ict.ict_strategy import ICTStrategy
+
+            instrument_cfg = cfg.get("instrument", {})
+            symbol = (symbol or instrument_cfg.get("symbol", "ES")).upper()
+            instrument = {"symbol": symbol, "tick_size": float(instrument_cfg.get("tick_size", 0.25))}
+            strategy = ICTStrategy(config=cfg, instrument=instrument, risk_manager=None)
+            feeds = [Feed(symbol, timeframe)]
+            reset_daily = False  # ICTStrategy resets itself on a new date
+
+        name = name or f"{stem}_{symbol}"
+        self.add(name, strategy, feeds, reset_daily=reset_daily)
+        return name
+
+    def run(self, streams: dict[tuple[str, str], Iterable[Bar]]) -> BatchReplayResult:
+        """
+        Replay every stream once.
+
+        Args:
+            streams: (symbol, timeframe) -> bars in time order. Streams no
+                strategy subscribes to are not read.
+        """
+        wanted = sorted({key for slot in self._slots for key, _, _ in slot.handlers})
+        missing = [key for key in wanted if key not in streams]
+        if missing:
+            raise ValueError(f"No stream for {missing}")
+
+        merged = heapq.merge(*(_tagged(key, streams[key]) for key in wanted), key=lambda item: item[0])
+
+        bars_read = 0
+        start = time.perf_counter()
+        for ts, group in groupby(merged, key=lambda item: item[0]):
+            by_key: dict[tuple[str, str], list[Bar]] = {}
+            for _, key, bar in group:
+                by_key.setdefault(key, []).append(bar)
+                bars_read += 1
+            for slot in self._slots:
+                self._deliver(slot, ts, by_key)
+
+        return BatchReplayResult(
+            results={slot.name: slot.result for slot in self._slots},
+            bars_read=bars_read,
+            seconds=time.perf_counter() - start,
+        )
+
+    @staticmethod
+    def _deliver(slot: _Slot, ts, by_key: dict[tuple[str, str], list[Bar]]) -> None:
+        """Hand one timestamp's bars to a strategy, feed by feed."""
+        if not any(key in by_key for key, _, _ in slot.handlers):
+            return
+        result = slot.result
+        t0 = time.perf_counter()
+        if slot.reset_daily:
+            day = ts.date()
+            if slot.last_date is not None and day != slot.last_date:
+                slot.strategy.reset_daily()
+            slot.last_date = day
+        for key, method, collect in slot.handlers:
+            for bar in by_key.get(key, ()):
+                out = method(bar)
+                result.bars_processed += 1
+                if collect and out:
+                    if isinstance(out, list):
+                        result.signals.extend(out)
+                    else:
+                        result.signals.append(out)
+        result.seconds += time.perf_counter() - t0
+
+
+def _tagged(key: tuple[str, str], bars: Iterable[Bar]):
+    for bar in bars:
+        yield bar.timestamp, key, bar
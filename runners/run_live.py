@@ -26,24 +26,27 @@ import json
 import os
 import time
 import signal
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, time as dt_time
+from datetime import datetime, time as dt_time, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Dict, List
 from zoneinfo import ZoneInfo
 
+from core.stage_timer import StageTimer, profile_call
 from runners.tradingview_loader import fetch_futures_bars
 from runners.run_v10_dual_entry import run_session_v10, is_swing_high, is_swing_low
-from strategies.ict.signals.fvg import detect_fvgs, update_fvg_mitigation
+from strategies.ict.signals.fvg import detect_fvgs, update_all_fvg_mitigations
 from strategies.ict.signals.sweep import find_swing_highs, find_swing_lows, detect_sweeps, SessionLevels
 from strategies.ict.signals.mss import detect_mss
 from runners.run_v10_equity import run_session_v10_equity
 from runners.tradovate_client import TradovateClient, create_client
 from runners.order_manager import OrderManager
 from runners.risk_manager import RiskManager, create_default_risk_manager
-from runners.notifier import notify_entry, notify_exit, notify_daily_summary, notify_status, notify_next_day_outlook
-from runners.bar_storage import save_daily_bars, load_bars_with_history
+from runners.notifier import notify_entry, notify_exit, notify_daily_summary, notify_status, notify_next_day_outlook, set_stage_timer
+from runners.bar_storage import save_daily_bars, LiveBarCache
+from runners.bar_events import BarCloseQueue
 from runners.webhook_executor import WebhookExecutor
 from runners.executor_interface import ExecutorInterface
 from runners.divergence_tracker import save_live_trades, compare_day, format_console_report, format_telegram_alert
@@ -89,6 +92,16 @@ def log(msg: str):
     sys.stdout.flush()
 
 
+def _run_inline(fn, *args) -> Future:
+    """Call fn(*args) now and return its outcome as a completed Future (ThreadPoolExecutor.submit stand-in)."""
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
 class PaperTradeStatus(Enum):
     """Status of a paper trade."""
     PENDING = "pending"       # Waiting for entry fill
@@ -206,6 +219,9 @@ class LiveTrader:
         symbols: List[str] = None,
         equity_risk: int = 500,
         executor: Optional[ExecutorInterface] = None,
+        scan_workers: Optional[int] = None,
+        profile_first_cycle: bool = False,
+        bar_source=None,
     ):
         """
         Initialize live trader.
@@ -218,6 +234,13 @@ class LiveTrader:
             equity_risk: Risk per trade for equities in dollars
             executor: Executor backend (TradovateExecutor, WebhookExecutor,
                       or MultiExecutor). None = no broker execution.
+            scan_workers: Threads for the parallel symbol scan
+                          (default: one per symbol)
+            profile_first_cycle: Run the first scan cycle under cProfile
+                                 (later cycles: send SIGUSR1)
+            bar_source: Bar-close event source (runners.bar_events). Scans
+                        run as soon as it reports a closed bar; None =
+                        poll on the 3m schedule
         """
         self.client = client
         self.risk_manager = risk_manager or create_default_risk_manager()
@@ -260,6 +283,23 @@ class LiveTrader:
         self._last_broker_health_check: Optional[datetime] = None
         self._broker_health_interval = 900  # 15 minutes between health checks
 
+        # Per-stage cycle timings (rolling p50/p95/max, see _write_perf_state)
+        self.timings = StageTimer(window=200)
+        set_stage_timer(self.timings)
+        self._profile_next_cycle = profile_first_cycle
+        self._scan_inline = False  # Evaluate symbols on the loop thread (profiled cycles)
+
+        # Rolling per-symbol bar history (disk loaded once, live tail merged each cycle)
+        self.bar_cache = LiveBarCache(interval='3m', n_bars=500, timer=self.timings)
+
+        # Parallel fetch/evaluate stage of each scan cycle (see _scan_symbols)
+        self._scan_pool = ThreadPoolExecutor(max_workers=scan_workers or max(1, len(self.symbols)),
+                                             thread_name_prefix='scan')
+        self.scan_latency: Dict[str, float] = {}  # symbol -> seconds for the last fetch + evaluate
+
+        # Latest bars per symbol, filled by the scan and reused by trade management
+        self._bar_snapshot: Dict[str, Dict] = {}  # symbol -> {'bars': [...], 'fetched_at': epoch seconds}
+
         # Cached bars and FVGs for opposing FVG exit (refreshed each scan cycle)
         self._cached_all_bars: Dict[str, list] = {}
         self._cached_fvgs: Dict[str, list] = {}
@@ -274,13 +314,23 @@ class LiveTrader:
         # Scan interval (3 minutes to match bar interval)
         self.scan_interval = 180  # seconds
 
+        # Event-driven scans: closed bars from bar_source, polling as fallback
+        self.bar_source = bar_source
+        self._bar_closes = BarCloseQueue(self.futures_symbols)
+        self.bar_event_grace = 15  # seconds past the bar close before falling back to polling
+
         # Signal for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        # kill -USR1 <pid>: profile the next scan cycle
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self._profile_signal_handler)
 
     # Path for trade state JSON (same dir as prices.json on the droplet)
     TRADE_STATE_PATH = Path("/opt/tradovate-bot/data/ticker/trade_state.json")
     SIGNAL_STATE_PATH = Path("/opt/tradovate-bot/data/ticker/signal_state.json")
+    PERF_STATE_PATH = Path("/opt/tradovate-bot/data/ticker/perf_state.json")
+    PROFILE_DIR = Path("/opt/tradovate-bot/data/profiles")
 
     def _write_trade_state(self):
         """Write current trade state to JSON for the copilot to consume.
@@ -383,6 +433,25 @@ class LiveTrader:
         except Exception as e:
             log(f"  [SIGNAL_STATE] Error writing state: {e}")
 
+    def _write_perf_state(self):
+        """Write rolling per-stage cycle timings to JSON (served by price_ticker_server /health).
+
+        Called at the end of every scan cycle.
+        """
+        try:
+            state = {
+                'ts': int(time.time()),
+                'cycle_budget_s': self.scan_interval,
+                'last_cycle_s': self.timings.last('cycle'),
+                **self.timings.summary(),
+            }
+            if hasattr(self.bar_source, 'throughput'):
+                state['market_data'] = self.bar_source.throughput()
+            self.PERF_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            self.PERF_STATE_PATH.write_text(json.dumps(state))
+        except Exception as e:
+            log(f"  [PERF_STATE] Error writing state: {e}")
+
     def _compute_signal_conditions(self, symbol, base_sym, bars, tick_size, price):
         """Compute ICT signal conditions for a single symbol from cached data."""
 
@@ -774,6 +843,10 @@ class LiveTrader:
         print("\nShutdown signal received...")
         self.stop()
 
+    def _profile_signal_handler(self, signum, frame):
+        """SIGUSR1: profile the next scan cycle."""
+        self._profile_next_cycle = True
+
     def start(self):
         """Start the live trading loop."""
         self.running = True
@@ -790,7 +863,10 @@ class LiveTrader:
             print(f"Futures: {', '.join(self.futures_symbols)} (2-tick buffer)")
         if self.equity_symbols:
             print(f"Equities: {', '.join(self.equity_symbols)} (${self.equity_risk}/trade, ATR buffer)")
-        print(f"Scan: bar-aligned (3m close + 5s buffer)")
+        if self.bar_source:
+            print(f"Scan: on bar close ({type(self.bar_source).__name__}), polling fallback")
+        else:
+            print(f"Scan: bar-aligned (3m close + 5s buffer)")
         print(f"Timezone: EST (Current: {get_est_now().strftime('%H:%M:%S')})")
         print("Futures hours: 4:00-16:00 ET | Equities: 9:30-16:00 ET")
         print("=" * 70)
@@ -815,12 +891,18 @@ class LiveTrader:
         # Write initial trade state (zeros) for copilot
         self._write_trade_state()
 
+        if self.bar_source:
+            self.bar_source.start(self._bar_closes.put)
+
         self._trading_loop()
 
     def stop(self):
         """Stop the trading loop."""
         self.running = False
         print("\nStopping trader...")
+        self._scan_pool.shutdown(wait=False)
+        if self.bar_source:
+            self.bar_source.stop()
 
         # Close any open positions if in live mode
         if not self.paper_mode and self.order_manager:
@@ -898,70 +980,95 @@ class LiveTrader:
                     status = self.risk_manager.get_summary()
                     log(f"[{current_time.strftime('%H:%M:%S')}] Trading blocked: {status['blocked_reason']}")
 
-                # Scan for new entries
-                # Even if globally blocked, scan anyway — per-symbol limits may allow some symbols
-                # can_enter_trade() in risk_manager gates each symbol individually
-                for symbol in self.futures_symbols:
-                    if not self.running:
-                        break
-                    try:
-                        self._scan_futures_symbol(symbol)
-                    except Exception as e:
-                        log(f"  Error scanning {symbol}: {e}")
+                if self._profile_next_cycle:
+                    self._profile_next_cycle = False
+                    self._profile_cycle()
+                else:
+                    self._run_cycle()
 
-                for symbol in self.equity_symbols:
-                    if not self.running:
-                        break
-                    try:
-                        self._scan_equity_symbol(symbol)
-                    except Exception as e:
-                        log(f"  Error scanning {symbol}: {e}")
+                self._wait_for_next_cycle()
 
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                log(f"Error in trading loop: {e}")
+                import traceback
+                traceback.print_exc()
                 sys.stdout.flush()
+                self._interruptible_sleep(10)
+
+    def _run_cycle(self):
+        """One scan cycle: scan, manage trades, write state. Each stage is timed."""
+        timings = self.timings
+        with timings.stage('cycle'):
+            # Scan for new entries
+            # Even if globally blocked, scan anyway — per-symbol limits may allow some symbols
+            # can_enter_trade() in risk_manager gates each symbol individually
+            with timings.stage('scan'):
+                self._scan_symbols()
 
-                # Manage active trades
-                if self.order_manager:
+            sys.stdout.flush()
+
+            # Manage active trades
+            if self.order_manager:
+                with timings.stage('manage_active_trades'):
                     self._manage_active_trades()
 
-                # Manage paper trades (in paper mode)
-                if self.paper_mode and self.paper_trades:
+            # Manage paper trades (in paper mode)
+            if self.paper_mode and self.paper_trades:
+                with timings.stage('manage_paper_trades'):
                     self._manage_paper_trades()
 
-                # Retry any failed broker operations
-                if self.executor:
+            # Retry any failed broker operations
+            if self.executor:
+                with timings.stage('broker_retry'):
                     self._retry_pending_broker_ops()
 
-                # Print status
-                try:
-                    self._print_status()
-                except Exception as e:
-                    import traceback
-                    log(f"  Error in _print_status: {e}")
-                    for line in traceback.format_exc().splitlines():
-                        log(f"  {line}")
-                    # Debug: dump paper_trades contents
-                    for tid, t in self.paper_trades.items():
-                        log(f"  paper_trades[{tid}] = {type(t).__name__}: {t!r}")
-
-                # Write ICT signal state for copilot
-                try:
+            # Print status
+            try:
+                self._print_status()
+            except Exception as e:
+                import traceback
+                log(f"  Error in _print_status: {e}")
+                for line in traceback.format_exc().splitlines():
+                    log(f"  {line}")
+                # Debug: dump paper_trades contents
+                for tid, t in self.paper_trades.items():
+                    log(f"  paper_trades[{tid}] = {type(t).__name__}: {t!r}")
+
+            # Write ICT signal state for copilot
+            try:
+                with timings.stage('write_signal_state'):
                     self._write_signal_state()
-                except Exception as e:
-                    log(f"  Error in _write_signal_state: {e}")
+            except Exception as e:
+                log(f"  Error in _write_signal_state: {e}")
 
-                # Periodic broker health check (every 15 min)
+            # Periodic broker health check (every 15 min)
+            with timings.stage('broker_health'):
                 self._check_broker_health()
 
-                self._sleep_until_next_bar_close()
+        cycle = timings.last('cycle')
+        if cycle > self.scan_interval:
+            timings.count('cycles_over_budget')
+            log(f"  [PERF] Cycle took {cycle:.1f}s (budget {self.scan_interval}s)")
+        self._write_perf_state()
 
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                log(f"Error in trading loop: {e}")
-                import traceback
-                traceback.print_exc()
-                sys.stdout.flush()
-                self._interruptible_sleep(10)
+    def _profile_cycle(self):
+        """
+        Run one scan cycle under cProfile; stats go to PROFILE_DIR, the top of the report to the log.
+
+        cProfile only sees the thread it runs on, so this cycle evaluates the
+        symbols on the loop thread instead of the scan pool.
+        """
+        path = self.PROFILE_DIR / f"cycle_{get_est_now().strftime('%Y%m%d_%H%M%S')}.prof"
+        log(f"  [PERF] Profiling this cycle -> {path} (symbols evaluated serially)")
+        self._scan_inline = True
+        try:
+            report = profile_call(self._run_cycle, path, top=30)
+        finally:
+            self._scan_inline = False
+        for line in report.splitlines():
+            log(f"  {line}")
 
     def _interruptible_sleep(self, seconds: int):
         """Sleep in small increments, allowing for interrupt."""
@@ -971,19 +1078,52 @@ class LiveTrader:
             time.sleep(sleep_chunk)
             elapsed += sleep_chunk
 
-    def _sleep_until_next_bar_close(self):
-        """Sleep until the next 3-minute bar close + 5s buffer.
-
-        Aligns scans to bar boundaries so the bot always processes
-        finalized OHLC data, matching backtest behavior.
-        """
+    def _seconds_until_next_bar_close(self) -> int:
+        """Seconds to the next 3-minute bar close + 5s buffer (at least 10s)."""
         now = datetime.now()
         total_seconds = now.minute * 60 + now.second
         seconds_into_bar = total_seconds % 180
         sleep_seconds = 180 - seconds_into_bar + 5  # 5s after bar close
         if sleep_seconds < 10:
             sleep_seconds += 180  # Don't scan too quickly if we're right at boundary
-        self._interruptible_sleep(sleep_seconds)
+        return sleep_seconds
+
+    def _sleep_until_next_bar_close(self):
+        """Sleep until the next 3-minute bar close + 5s buffer.
+
+        Aligns scans to bar boundaries so the bot always processes
+        finalized OHLC data, matching backtest behavior.
+        """
+        self._interruptible_sleep(self._seconds_until_next_bar_close())
+
+    def _wait_for_next_cycle(self):
+        """
+        Wait for the next scan.
+
+        With a bar source: until it reports a closed bar, which is pushed
+        into the bar cache so the scan uses it without a TradingView fetch.
+        If no bar arrives by the polling schedule + bar_event_grace, fall
+        back to polling for this cycle. Without a source: polling sleep.
+        """
+        if self.bar_source is None:
+            self._sleep_until_next_bar_close()
+            return
+
+        timeout = self._seconds_until_next_bar_close() + self.bar_event_grace
+        bars = self._bar_closes.wait(timeout, should_stop=lambda: not self.running)
+        if not self.running:
+            return
+        if not bars:
+            self.timings.count('bar_event_fallbacks')
+            log("  [EVENTS] No bar close event, polling TradingView")
+            return
+
+        for bar in bars:
+            closed_at = (bar.timestamp + timedelta(seconds=self.scan_interval)).timestamp()
+            self.timings.record('bar_event_latency', max(0.0, time.time() - closed_at), bar.symbol)
+            if not self.bar_cache.push(bar.symbol, bar):
+                self.timings.count('bar_event_misses')
+        self.timings.count('bar_events', len(bars))
 
     def _is_trading_hours(self, dt: datetime) -> bool:
         """Check if within trading hours (EST).
@@ -1015,19 +1155,71 @@ class LiveTrader:
 
         return False
 
-    def _scan_futures_symbol(self, symbol: str):
-        """Scan a futures symbol for trading signals."""
-        config = self.FUTURES_SYMBOLS.get(symbol)
-        if not config:
+    def _snapshot_bars(self, symbol: str, n_bars: int = 20) -> list:
+        """
+        Last n_bars bars of symbol from the current cycle's market snapshot.
+
+        The scan stage stores every symbol's bars. A symbol is fetched here
+        only if its snapshot predates the last 3m bar close (scan failed or
+        symbol not scanned), and the fetch is stored, so each symbol costs
+        at most one TradingView call per cycle.
+        """
+        entry = self._bar_snapshot.get(symbol)
+        now = time.time()
+        if entry is None or entry['fetched_at'] < now - now % 180:
+            bars = fetch_futures_bars(symbol, interval='3m', n_bars=20, timeout=15) or []
+            entry = {'bars': bars, 'fetched_at': now}
+            self._bar_snapshot[symbol] = entry
+        return entry['bars'][-n_bars:]
+
+    def _scan_symbols(self):
+        """
+        Scan every symbol: fetch + evaluate in parallel, apply serially.
+
+        Bar fetches and strategy runs happen on the scan pool and touch no
+        trader state. Their results are then applied on this thread in
+        symbol order (futures first, then equities), so signal processing,
+        risk checks and paper trade updates happen exactly as in a
+        sequential scan. A profiled cycle evaluates on this thread too.
+        """
+        jobs = [(s, self._evaluate_futures_symbol, self._apply_futures_scan) for s in self.futures_symbols]
+        jobs += [(s, self._evaluate_equity_symbol, self._apply_equity_scan) for s in self.equity_symbols]
+        if not jobs:
             return
 
-        log(f"\n[{get_est_now().strftime('%H:%M:%S')}] Scanning {symbol} (futures)...")
+        submit = _run_inline if self._scan_inline else self._scan_pool.submit
+        pending = [(symbol, submit(evaluate, symbol), apply)
+                   for symbol, evaluate, apply in jobs]
+        for symbol, future, apply in pending:
+            if not self.running:
+                break
+            try:
+                scan = future.result()
+                with self.timings.stage('apply_signals', symbol):
+                    apply(scan)
+            except Exception as e:
+                log(f"  Error scanning {symbol}: {e}")
+
+        latencies = ', '.join(f"{s} {self.scan_latency[s]:.2f}s" for s, _, _ in jobs if s in self.scan_latency)
+        log(f"  Scan latency: {latencies}")
 
-        # Fetch bars with local history merge for instant indicator warmup
-        bars = load_bars_with_history(symbol, interval='3m', n_bars=500)
+    def _scan_futures_symbol(self, symbol: str):
+        """Scan a futures symbol for trading signals."""
+        self._apply_futures_scan(self._evaluate_futures_symbol(symbol))
+
+    def _scan_equity_symbol(self, symbol: str):
+        """Scan an equity symbol for trading signals."""
+        self._apply_equity_scan(self._evaluate_equity_symbol(symbol))
+
+    def _fetch_session_bars(self, symbol: str, scan: Dict) -> bool:
+        """Fill scan['bars'] and scan['session_bars'] (today's 4:00-16:00 bars). False if no session bars."""
+        # Local history + live tail, merged incrementally by the bar cache
+        bars = self.bar_cache.get_bars(symbol)
+        scan['fetched_at'] = time.time()
+        scan['bars'] = bars
         if not bars:
-            log(f"  No data for {symbol}")
-            return
+            scan['log'].append(f"  No data for {symbol}")
+            return False
 
         # Get today's session bars
         today = get_est_now().date()
@@ -1038,79 +1230,118 @@ class LiveTrader:
         session_bars = [b for b in today_bars if premarket_start <= b.timestamp.time() <= rth_end]
 
         if len(session_bars) < 1:
-            log(f"  No session bars yet for {symbol}")
+            scan['log'].append(f"  No session bars yet for {symbol}")
+            return False
+
+        scan['session_bars'] = session_bars
+        return True
+
+    def _evaluate_futures_symbol(self, symbol: str) -> Optional[Dict]:
+        """
+        Fetch bars and run the strategy for a futures symbol.
+
+        Runs on the scan pool: reads config only, never trader state.
+        Returns a scan dict for _apply_futures_scan(), or None if the
+        symbol is not configured.
+        """
+        config = self.FUTURES_SYMBOLS.get(symbol)
+        if not config:
+            return None
+
+        started = time.monotonic()
+        scan = {'symbol': symbol, 'config': config, 'results': None,
+                'log': [f"\n[{get_est_now().strftime('%H:%M:%S')}] Scanning {symbol} (futures)..."]}
+        if self._fetch_session_bars(symbol, scan):
+            bars = scan['bars']
+            session_bars = scan['session_bars']
+            scan['log'].append(f"  {symbol}: {session_bars[-1].close:.2f} ({len(session_bars)} session bars, {len(bars)} total)")
+
+            # FVGs for opposing FVG exit in _manage_paper_trades
+            if config.get('opp_fvg_exit'):
+                fvg_config = {'min_fvg_ticks': 2, 'tick_size': config['tick_size'],
+                              'max_fvg_age_bars': 200, 'invalidate_on_close_through': True, 'fvg_mode': 'wick'}
+                with self.timings.stage('detect_fvgs', symbol):
+                    fvgs = detect_fvgs(bars, fvg_config)
+                    update_all_fvg_mitigations(fvgs, bars, fvg_config)
+                scan['fvgs'] = fvgs
+
+            # Run V10.16 strategy using centralized config (max_consec_losses=0 — handled by risk_manager)
+            kwargs = get_session_v10_kwargs(symbol, max_consec_losses=0)
+            with self.timings.stage('run_session_v10', symbol):
+                scan['results'] = run_session_v10(
+                    session_bars,
+                    bars,
+                    **kwargs,
+                )
+        scan['latency'] = time.monotonic() - started
+        return scan
+
+    def _apply_futures_scan(self, scan: Optional[Dict]):
+        """Apply a futures scan to trader state and process its signals (scan loop thread only)."""
+        if scan is None:
+            return
+        symbol = scan['symbol']
+        self.scan_latency[symbol] = scan['latency']
+        if scan.get('bars'):
+            self._bar_snapshot[symbol] = {'bars': scan['bars'], 'fetched_at': scan['fetched_at']}
+        for line in scan['log']:
+            log(line)
+        if scan['results'] is None:
             return
 
-        current_price = session_bars[-1].close
-        self.last_prices[symbol] = current_price
-        log(f"  {symbol}: {current_price:.2f} ({len(session_bars)} session bars, {len(bars)} total)")
+        self.last_prices[symbol] = scan['session_bars'][-1].close
 
         # Cache bars and FVGs for opposing FVG exit in _manage_paper_trades
-        self._cached_all_bars[symbol] = bars
-        if config.get('opp_fvg_exit'):
-            fvg_config = {'min_fvg_ticks': 2, 'tick_size': config['tick_size'],
-                          'max_fvg_age_bars': 200, 'invalidate_on_close_through': True, 'fvg_mode': 'wick'}
-            fvgs = detect_fvgs(bars, fvg_config)
-            for fvg in fvgs:
-                if not fvg.mitigated:
-                    for bar_idx in range(fvg.created_bar_index + 1, len(bars)):
-                        update_fvg_mitigation(fvg, bars[bar_idx], bar_idx, fvg_config)
-                        if fvg.mitigated:
-                            break
-            self._cached_fvgs[symbol] = fvgs
+        self._cached_all_bars[symbol] = scan['bars']
+        if 'fvgs' in scan:
+            self._cached_fvgs[symbol] = scan['fvgs']
             self._cached_fvgs_time[symbol] = get_est_now()
 
-        # Run V10.16 strategy using centralized config (max_consec_losses=0 — handled by risk_manager)
-        kwargs = get_session_v10_kwargs(symbol, max_consec_losses=0)
-        results = run_session_v10(
-            session_bars,
-            bars,
-            **kwargs,
-        )
-
         # Process signals
-        self._process_futures_signals(symbol, results, config)
+        self._process_futures_signals(symbol, scan['results'], scan['config'])
 
-    def _scan_equity_symbol(self, symbol: str):
-        """Scan an equity symbol for trading signals."""
+    def _evaluate_equity_symbol(self, symbol: str) -> Optional[Dict]:
+        """Fetch bars and run the equity strategy (scan pool; see _evaluate_futures_symbol)."""
         config = self.EQUITY_SYMBOLS.get(symbol)
         if not config:
-            return
-
-        log(f"\n[{get_est_now().strftime('%H:%M:%S')}] Scanning {symbol} (equity)...")
+            return None
+
+        started = time.monotonic()
+        scan = {'symbol': symbol, 'config': config, 'results': None,
+                'log': [f"\n[{get_est_now().strftime('%H:%M:%S')}] Scanning {symbol} (equity)..."]}
+        if self._fetch_session_bars(symbol, scan):
+            bars = scan['bars']
+            session_bars = scan['session_bars']
+            scan['log'].append(f"  {symbol}: ${session_bars[-1].close:.2f} ({len(session_bars)} session bars, {len(bars)} total)")
+
+            # Run V10.16 equity strategy using centralized config
+            eq_kwargs = get_session_v10_equity_kwargs(symbol, risk_per_trade=config['risk_per_trade'])
+            with self.timings.stage('run_session_v10_equity', symbol):
+                scan['results'] = run_session_v10_equity(
+                    session_bars,
+                    bars,
+                    **eq_kwargs,
+                )
+        scan['latency'] = time.monotonic() - started
+        return scan
 
-        # Fetch bars with local history merge for instant indicator warmup
-        bars = load_bars_with_history(symbol, interval='3m', n_bars=500)
-        if not bars:
-            log(f"  No data for {symbol}")
+    def _apply_equity_scan(self, scan: Optional[Dict]):
+        """Apply an equity scan to trader state and process its signals (scan loop thread only)."""
+        if scan is None:
             return
-
-        # Get today's session bars
-        today = get_est_now().date()
-        today_bars = [b for b in bars if b.timestamp.date() == today]
-
-        premarket_start = dt_time(4, 0)
-        rth_end = dt_time(16, 0)
-        session_bars = [b for b in today_bars if premarket_start <= b.timestamp.time() <= rth_end]
-
-        if len(session_bars) < 1:
-            log(f"  No session bars yet for {symbol}")
+        symbol = scan['symbol']
+        self.scan_latency[symbol] = scan['latency']
+        if scan.get('bars'):
+            self._bar_snapshot[symbol] = {'bars': scan['bars'], 'fetched_at': scan['fetched_at']}
+        for line in scan['log']:
+            log(line)
+        if scan['results'] is None:
             return
 
-        current_price = session_bars[-1].close
-        self.last_prices[symbol] = current_price
-        log(f"  {symbol}: ${current_price:.2f} ({len(session_bars)} session bars, {len(bars)} total)")
-
-        # Run V10.16 equity strategy using centralized config
-        eq_kwargs = get_session_v10_equity_kwargs(symbol, risk_per_trade=config['risk_per_trade'])
-        results = run_session_v10_equity(
-            session_bars,
-            bars,
-            **eq_kwargs,
-        )
+        self.last_prices[symbol] = scan['session_bars'][-1].close
 
         # Process signals
-        self._process_equity_signals(symbol, results, config)
+        self._process_equity_signals(symbol, scan['results'], scan['config'])
 
     def _process_futures_signals(self, symbol: str, results: List[Dict], config: Dict):
         """Process signals from futures strategy."""
@@ -1384,8 +1615,8 @@ class LiveTrader:
             if trade.status != PaperTradeStatus.OPEN:
                 continue
 
-            # Fetch current price (20 bars for swing detection context)
-            bars = fetch_futures_bars(trade.symbol, interval='3m', n_bars=20, timeout=15)
+            # Current price (20 bars for swing detection context)
+            bars = self._snapshot_bars(trade.symbol, n_bars=20)
             if not bars or len(bars) < 1:
                 log(f"    [WARNING] No bars for {trade.symbol} ({trade.id}) — trade unmanaged this cycle")
                 continue
@@ -2096,8 +2327,8 @@ class LiveTrader:
             if base_symbol == 'ME':
                 base_symbol = trade.symbol[:3]  # MES, MNQ
 
-            # Fetch current price
-            bars = fetch_futures_bars(base_symbol, interval='3m', n_bars=10)
+            # Current price
+            bars = self._snapshot_bars(base_symbol, n_bars=10)
             if not bars:
                 continue
 
@@ -2456,7 +2687,8 @@ class LiveTrader:
                     bars = fetch_futures_bars(sym, interval='3m', n_bars=500, timeout=30)
                     created = save_daily_bars(sym, bars)
                     if created:
-                        log(f"  [BARS] Saved {len(created)} CSV(s) for {sym}")
+                        log(f"  [BARS] Saved {len(created)} date(s) for {sym}")
+                        self.bar_cache.invalidate(sym)
                 except Exception as e:
                     log(f"  [BARS] Error saving {sym} bars: {e}")
 
@@ -2482,6 +2714,13 @@ def main():
                        help='Symbols to trade (ES, NQ, MES, MNQ, SPY, QQQ)')
     parser.add_argument('--equity-risk', type=int, default=500,
                        help='Risk per trade for equities in dollars (default: 500)')
+    parser.add_argument('--scan-workers', type=int, default=None,
+                       help='Threads for parallel symbol scanning (default: one per symbol)')
+    parser.add_argument('--profile-cycle', action='store_true',
+                       help='Profile the first scan cycle with cProfile (later: kill -USR1 <pid>)')
+    parser.add_argument('--bar-source', choices=['poll', 'tradovate'], default='poll',
+                       help='Scan trigger: poll TradingView on the 3m schedule (default) or '
+                            'scan on Tradovate market data bar closes (polling as fallback)')
     parser.add_argument('--webhook', action='store_true',
                        help='Enable PickMyTrade webhook execution')
     parser.add_argument('--strategy-group', default='ict_v10',
@@ -2567,6 +2806,19 @@ def main():
     elif len(executors) == 1:
         broker_executor = executors[0]
 
+    # Bar-close event source (futures only; equities keep polling)
+    bar_source = None
+    if args.bar_source == 'tradovate' and futures:
+        try:
+            from broker.tradovate.api_client import TradovateClient as MarketDataClient
+            from runners.bar_events import FeedBarSource
+            contracts = {TradovateClient.CONTRACT_MAP[s]: s for s in futures}
+            bar_source = FeedBarSource(MarketDataClient(), contracts)
+            print(f"Bar source: Tradovate market data ({', '.join(contracts)})")
+        except Exception as e:
+            print(f"Failed to create Tradovate bar source: {e}")
+            print("Falling back to polling")
+
     # Create trader
     trader = LiveTrader(
         client=client,
@@ -2574,6 +2826,9 @@ def main():
         symbols=args.symbols,
         equity_risk=args.equity_risk,
         executor=broker_executor,
+        scan_workers=args.scan_workers,
+        profile_first_cycle=args.profile_cycle,
+        bar_source=bar_source,
     )
 
     # Start trading
@@ -178,7 +178,7 @@ class LiveTrader:
             print("\n\nShutting down...")
             self.running = False
             if self.feed:
-                self.feed.running = False
+                self.feed.stop()
 
         signal.signal(signal.SIGINT, signal_handler)
 
@@ -13,6 +13,7 @@ from pathlib import Path
 from datetime import datetime
 from tvDatafeed import Interval
 
+from core.bar_ingest import bars_from_dataframe
 from core.types import Bar
 from strategies.factory import build_ict_from_yaml
 from runners.tradingview_loader import _get_tv_client
@@ -46,20 +47,7 @@ def load_tv_credentials():
 
 def tv_to_bars(df, symbol: str, timeframe: str) -> list[Bar]:
     """Convert TradingView dataframe to Bar objects."""
-    bars = []
-    for idx, row in df.iterrows():
-        bar = Bar(
-            timestamp=idx.to_pydatetime(),
-            open=float(row["open"]),
-            high=float(row["high"]),
-            low=float(row["low"]),
-            close=float(row["close"]),
-            volume=int(row["volume"]),
-            symbol=symbol,
-            timeframe=timeframe
-        )
-        bars.append(bar)
-    return bars
+    return bars_from_dataframe(df, symbol=symbol, timeframe=timeframe)
 
 
 def analyze_symbol(tv, symbol_config: dict, strategy) -> dict:
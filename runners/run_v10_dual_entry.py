@@ -53,14 +53,21 @@ sys.path.insert(0, '.')
 
 from version import STRATEGY_VERSION
 
+import heapq
+import inspect
 from datetime import time as dt_time
+
+import numpy as np
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
     from backports.zoneinfo import ZoneInfo
 from runners.tradingview_loader import fetch_futures_bars
 from runners.symbol_defaults import get_symbol_config, get_session_v10_kwargs
-from strategies.ict.signals.fvg import detect_fvgs, update_fvg_mitigation
+from core.exit_kernel import first_true, price_arrays, swing_masks, trail_levels
+from core.swing_index import SwingIndex, is_swing_high, is_swing_low
+from core.memo import LRUMemo, bars_fingerprint
+from strategies.ict.signals.fvg import detect_fvgs, update_all_fvg_mitigations
 
 
 # EST timezone for time-based filters
@@ -207,47 +214,211 @@ def is_consolidating(bars, lookback=10, atr_period=14, threshold=0.0):
     return ratio < threshold, ratio
 
 
-def is_swing_high(bars, idx, lookback=2):
-    """Check if bar at idx is a swing high."""
-    if idx < lookback or idx >= len(bars) - lookback:
-        return False
-    bar_high = bars[idx].high
-    for i in range(1, lookback + 1):
-        if bar_high <= bars[idx - i].high or bar_high <= bars[idx + i].high:
-            return False
-    return True
+class IndicatorSeries:
+    """EMA/ADX/DI/ATR series that grow one bar at a time.
 
+    After append(bar) for bars[0..k], series[...][k] holds exactly the value
+    calculate_ema/calculate_adx/calculate_atr return for bars[:k+1] (same
+    operations in the same order, so filter decisions are bit-identical).
+    precompute_indicators() is this class run over a whole list; the
+    streaming SessionV10Engine keeps one alive and appends each new bar.
 
-def is_swing_low(bars, idx, lookback=2):
-    """Check if bar at idx is a swing low."""
-    if idx < lookback or idx >= len(bars) - lookback:
-        return False
-    bar_low = bars[idx].low
-    for i in range(1, lookback + 1):
-        if bar_low >= bars[idx - i].low or bar_low >= bars[idx + i].low:
-            return False
-    return True
+    Only the last max(adx_period, atr_period) true ranges and adx_period DX
+    values are kept, so per-bar cost and memory are constant.
+    """
+
+    def __init__(self, ema_periods=(20, 50), adx_period=14, atr_period=14):
+        self.ema_periods = tuple(ema_periods)
+        self.adx_period = adx_period
+        self.atr_period = atr_period
+        self.series = {
+            'ema': {period: [] for period in self.ema_periods},
+            'adx': [],
+            'plus_di': [],
+            'minus_di': [],
+            'atr': [],
+        }
+        self._n = 0
+        self._prev_bar = None
+        self._seed_closes = []  # First max(ema_periods) closes (EMA SMA seed)
+        self._ema_value = {}
+        # True range / directional movement windows (element describes bar k)
+        self._tr = []
+        self._plus_dm = []
+        self._minus_dm = []
+        self._window = max(adx_period, atr_period)
+        # Wilder smoothing state
+        self._atr_s = self._plus_s = self._minus_s = None
+        self._dx = []
+        self._dx_count = 0
+        self._plus_di = 0
+        self._minus_di = 0
+
+    def __len__(self):
+        return self._n
+
+    def extend(self, bars):
+        for bar in bars:
+            self.append(bar)
+        return self
+
+    def append(self, bar):
+        k = self._n
+        self._n += 1
+        series = self.series
+
+        if len(self._seed_closes) < max(self.ema_periods, default=0):
+            self._seed_closes.append(bar.close)
+        for period in self.ema_periods:
+            value = None
+            if k == period - 1:
+                value = sum(self._seed_closes[:period]) / period
+            elif k >= period:
+                prev = self._ema_value[period]
+                value = (bar.close - prev) * (2 / (period + 1)) + prev
+            if value is not None:
+                self._ema_value[period] = value
+            series['ema'][period].append(value)
+
+        prev = self._prev_bar
+        self._prev_bar = bar
+        if prev is not None:
+            high = bar.high
+            low = bar.low
+            close_prev = prev.close
+            self._tr.append(max(high - low, abs(high - close_prev), abs(low - close_prev)))
+
+            up_move = high - prev.high
+            down_move = prev.low - low
+            self._plus_dm.append(up_move if up_move > down_move and up_move > 0 else 0)
+            self._minus_dm.append(down_move if down_move > up_move and down_move > 0 else 0)
+
+        # ATR (SMA of the last atr_period true ranges)
+        atr_period = self.atr_period
+        series['atr'].append(sum(self._tr[-atr_period:]) / atr_period if k >= atr_period else None)
+
+        # ADX/DI (Wilder smoothing is prefix-causal)
+        adx_period = self.adx_period
+        adx = plus_di_out = minus_di_out = None
+        if k >= adx_period:
+            if k == adx_period:
+                self._atr_s = sum(self._tr[:adx_period])
+                self._plus_s = sum(self._plus_dm[:adx_period])
+                self._minus_s = sum(self._minus_dm[:adx_period])
+            else:
+                self._atr_s = self._atr_s - (self._atr_s / adx_period) + self._tr[-1]
+                self._plus_s = self._plus_s - (self._plus_s / adx_period) + self._plus_dm[-1]
+                self._minus_s = self._minus_s - (self._minus_s / adx_period) + self._minus_dm[-1]
+            if self._atr_s != 0:
+                self._plus_di = 100 * self._plus_s / self._atr_s
+                self._minus_di = 100 * self._minus_s / self._atr_s
+                di_sum = self._plus_di + self._minus_di
+                if di_sum != 0:
+                    self._dx.append(100 * abs(self._plus_di - self._minus_di) / di_sum)
+                    self._dx_count += 1
+                    if len(self._dx) > adx_period:
+                        del self._dx[0]
+            if k + 1 >= adx_period * 2 and self._dx_count >= adx_period:
+                adx = sum(self._dx) / adx_period
+                plus_di_out = self._plus_di
+                minus_di_out = self._minus_di
+        series['adx'].append(adx)
+        series['plus_di'].append(plus_di_out)
+        series['minus_di'].append(minus_di_out)
+
+        if len(self._tr) > self._window:
+            del self._tr[0]
+            del self._plus_dm[0]
+            del self._minus_dm[0]
+
+
+def precompute_indicators(bars, ema_periods=(20, 50), adx_period=14, atr_period=14):
+    """Precompute EMA/ADX/DI/ATR for every prefix of bars in a single pass.
+
+    Entry filters used to call calculate_ema/calculate_adx/calculate_atr on
+    a fresh bars[:idx+1] slice per candidate, which is O(N) per lookup.
+    Here index k holds exactly the value those functions return for
+    bars[:k+1] (see IndicatorSeries), and lookups are O(1).
+
+    Returns:
+        Dict with 'ema' ({period: list}), 'adx', 'plus_di', 'minus_di' and
+        'atr' lists, all len(bars) long. Entries are None where the
+        corresponding calculate_* function would return None.
+    """
+    return IndicatorSeries(ema_periods, adx_period, atr_period).extend(bars).series
+
+
+def is_consolidating_at(bars, indicators, idx, lookback=10, threshold=0.0):
+    """is_consolidating(bars[:idx+1]) using a precompute_indicators() ATR series."""
+    if threshold <= 0:
+        return False, 0.0
+
+    atr = indicators['atr'][idx]
+    if idx + 1 < lookback or atr is None or atr <= 0:
+        return False, 0.0
 
+    recent = bars[idx + 1 - lookback:idx + 1]
+    range_high = max(b.high for b in recent)
+    range_low = min(b.low for b in recent)
+    bar_range = range_high - range_low
+
+    ratio = bar_range / atr
+    return ratio < threshold, ratio
+
+
+def map_session_indices(session_bars, all_bars):
+    """Map session_bars positions to all_bars positions by timestamp.
+
+    Uses a timestamp -> index hash over all_bars (first occurrence wins),
+    so the cost is O(len(all_bars) + len(session_bars)) instead of a
+    nested scan of every session bar against the full history.
+
+    Returns:
+        (session_to_all_idx, all_to_session_idx) dicts
+    """
+    ts_to_all_idx = {}
+    for j, abar in enumerate(all_bars):
+        ts_to_all_idx.setdefault(abar.timestamp, j)
 
-def find_recent_swing_high(bars, end_idx, lookback=10, swing_lookback=2):
-    """Find most recent confirmed swing high before end_idx."""
+    session_to_all_idx = {}
+    all_to_session_idx = {}
+    for i, sbar in enumerate(session_bars):
+        j = ts_to_all_idx.get(sbar.timestamp)
+        if j is not None:
+            session_to_all_idx[i] = j
+            all_to_session_idx[j] = i
+    return session_to_all_idx, all_to_session_idx
+
+
+def find_recent_swing_high(bars, end_idx, lookback=10, swing_lookback=2, swings=None):
+    """Find most recent confirmed swing high before end_idx.
+
+    swings: Optional SwingIndex(swing_lookback) of bars (at least end_idx
+        bars appended) - answers with a bisect instead of scanning.
+    """
+    if swings is not None:
+        return swings.last_high(before=end_idx - swing_lookback, after=max(0, end_idx - lookback))
     for i in range(end_idx - swing_lookback - 1, max(0, end_idx - lookback), -1):
         if is_swing_high(bars, i, swing_lookback):
             return i, bars[i].high
     return None, None
 
 
-def find_recent_swing_low(bars, end_idx, lookback=10, swing_lookback=2):
-    """Find most recent confirmed swing low before end_idx."""
+def find_recent_swing_low(bars, end_idx, lookback=10, swing_lookback=2, swings=None):
+    """Find most recent confirmed swing low before end_idx (see find_recent_swing_high)."""
+    if swings is not None:
+        return swings.last_low(before=end_idx - swing_lookback, after=max(0, end_idx - lookback))
     for i in range(end_idx - swing_lookback - 1, max(0, end_idx - lookback), -1):
         if is_swing_low(bars, i, swing_lookback):
             return i, bars[i].low
     return None, None
 
 
-def detect_bos(bars, idx, lookback=10):
+def detect_bos(bars, idx, lookback=10, swings=None):
     """Detect Break of Structure at bar index.
 
+    swings: Optional SwingIndex(2) of bars, see find_recent_swing_high.
+
     Returns:
         ('BULLISH', swing_low_price) if price broke above recent swing high
         ('BEARISH', swing_high_price) if price broke below recent swing low
@@ -259,12 +430,12 @@ def detect_bos(bars, idx, lookback=10):
     bar = bars[idx]
 
     # Check for bullish BOS (broke above swing high)
-    sh_idx, sh_price = find_recent_swing_high(bars, idx, lookback)
+    sh_idx, sh_price = find_recent_swing_high(bars, idx, lookback, swings=swings)
     if sh_idx is not None and bar.close > sh_price:
         return 'BULLISH', sh_price
 
     # Check for bearish BOS (broke below swing low)
-    sl_idx, sl_price = find_recent_swing_low(bars, idx, lookback)
+    sl_idx, sl_price = find_recent_swing_low(bars, idx, lookback, swings=swings)
     if sl_idx is not None and bar.close < sl_price:
         return 'BEARISH', sl_price
 
@@ -357,132 +528,331 @@ def is_rejection_candle(bar, fvg, direction, tick_size=0.25, proximity_ticks=4):
         return True, entry_price, stop_price
 
 
-def run_session_v10(
-    session_bars,
-    all_bars,  # Include overnight bars for FVG tracking
-    tick_size=0.25,
-    tick_value=12.50,
-    contracts=3,
-    max_open_trades=3,  # V10.7: Increased from 2 to allow 3rd entry
-    max_losses_per_day=3,
-    displacement_threshold=1.0,
-    min_adx=11,  # V10.7: Lowered from 17 to catch earlier setups
-    min_risk_pts=0,
-    use_opposing_fvg_exit=False,
-    # V10 specific
-    enable_creation_entry=True,   # Entry Type A
-    enable_retracement_entry=True,  # Entry Type B
-    enable_bos_entry=True,  # Entry Type C: BOS + Session FVG Retracement
-    # V10 filters
-    retracement_morning_only=False,  # Only take retracement entries 9:30-12:00
-    retracement_trend_aligned=False,  # Only take retracement entries matching daily trend
-    overnight_retrace_min_adx=22,  # Min ADX for overnight retrace entries (0 to disable)
-    bos_lookback=10,  # Bars to look back for swing points
-    bos_fvg_window=5,  # Bars after BOS to look for FVG
-    # V10.2 time filters
-    midday_cutoff=True,  # No entries 12:00-14:00 (lunch lull)
-    pm_cutoff_nq=True,   # No NQ entries after 14:00
-    symbol='ES',         # Symbol for PM cutoff logic
-    # V10.4 risk caps for BOS entries
-    max_bos_risk_pts=None,  # Max risk for BOS entries (ES: 8, NQ: 20)
-    # V10.11: Reduce contracts for high-risk retrace entries
-    max_retrace_risk_pts=None,  # If retrace risk > this, force 1 contract (ES: 8, NQ: 20)
-    # V10.5 high displacement override
-    high_displacement_override=3.0,  # Skip ADX check if displacement >= 3x avg body
-    # V10.6 BOS controls
-    disable_bos_retrace=False,  # Disable BOS entries entirely (use for ES)
-    bos_daily_loss_limit=1,  # Stop BOS after N losses per day (0=no limit)
-    # Exit options
-    t1_fixed_4r=True,  # Hybrid: Take T1 profit at fixed R-target instead of trailing
-    # V10.8 Hybrid filters
-    use_hybrid_filters=True,  # Use 2 mandatory + 2/3 optional filter mode
-    # R-target tuning (V10.9: lowered from 4R/8R — +26% P/L, 90.6% WR in 11-day A/B test)
-    t1_r_target=3,      # R-multiple for T1 fixed exit (default: 3R)
-    trail_r_trigger=4,   # R-multiple for T2/Runner trail activation (V10.16: lowered from 6R)
-    # V10.12: Consolidation detection filter
-    consol_threshold=0.0,  # Range/ATR ratio threshold (0=disabled). Skip entries when ratio < threshold.
-    # V10.16: Global consecutive loss stop (ES/MES only)
-    max_consec_losses=0,  # Stop all entries after N consecutive losses across directions (0=disabled)
-    # FVG detection mode
-    fvg_mode="wick",  # "wick" (default, high/low) or "body" (open/close)
-    # Opposing FVG exit for T2/Runner
-    opposing_fvg_exit=False,          # Enable opposing FVG exit for T2/Runner
-    opposing_fvg_min_ticks=5,         # Min opposing FVG size in ticks
-    opposing_fvg_after_6r_only=False, # True = only after 6R, False = after T1
-    opposing_fvg_mode=None,           # FVG mode for opposing detection: None=same as fvg_mode, "body", "wick"
-    # FVG size filter (A/B testing)
-    entry_min_fvg_ticks=5,            # Min FVG size in ticks for entry (default: 5)
-    # Trail improvement A/B testing
-    post_t1_trail_r=0,                # Option B: After T1, trail at entry+NR instead of breakeven (0=breakeven)
-    t2_fixed_r=0,                     # Option C: Fixed T2 exit at this R-multiple (0=trail only)
-    time_decay_bars=0,                # Option D: Bars after T1 before tightening trail (0=disabled)
-    time_decay_r=0,                   # Option D: R-level to tighten to after decay
-    # FVG confirmation filter (simulate live scanner confirmation delay)
-    confirm_creation=False,           # Delay CREATION entries by 1 bar (simulate 2-scan confirmation)
-):
-    """V10: Quad entry mode with FVG creation + retracement + BOS.
+def _hybrid_filters_pass(indicators, idx, is_long, min_adx, use_hybrid_filters,
+                         disp_ok=True, high_disp=False):
+    """V10.8 hybrid filter system, evaluated at all_bars index idx.
 
-    Entry Type A (Creation): Enter when FVG forms (existing V9 logic)
-    Entry Type B1 (Overnight Retrace): Enter when price wicks into overnight FVG and rejects
-    Entry Type B2 (Intraday Retrace): Enter when price wicks into session FVG and rejects
-    Entry Type C (BOS): Enter when price retraces into session FVG after BOS
+    MANDATORY: DI direction (+DI > -DI for LONG, -DI > +DI for SHORT).
+    OPTIONAL (2 of 3, or all 3 when use_hybrid_filters is False):
+    displacement, ADX >= min_adx (>= 10 with high displacement), EMA20 vs
+    EMA50 alignment. Retracement/BOS entries pass disp_ok=True.
     """
+    ema_fast = indicators['ema'][20][idx]
+    ema_slow = indicators['ema'][50][idx]
+    adx = indicators['adx'][idx]
+    plus_di = indicators['plus_di'][idx]
+    minus_di = indicators['minus_di'][idx]
+
+    di_ok = adx is None or (plus_di > minus_di if is_long else minus_di > plus_di)
+    if not di_ok:
+        return False
 
-    # Calculate average body size from session bars (today only, like V9)
-    body_sizes = [abs(b.close - b.open) for b in session_bars[:50]]
-    avg_body_size = sum(body_sizes) / len(body_sizes) if body_sizes else tick_size * 4
+    ema_ok = ema_fast is None or ema_slow is None or (ema_fast > ema_slow if is_long else ema_fast < ema_slow)
+    # V10.5: High displacement override still applies
+    adx_ok = adx is None or adx >= min_adx or (high_disp and adx is not None and adx >= 10)
 
-    # V10.12: Consolidation skip counter
-    consol_skips = 0
+    if use_hybrid_filters:
+        # Hybrid mode: 2 of 3 optional filters must pass
+        return sum([disp_ok, adx_ok, ema_ok]) >= 2
+    # Strict mode: all filters must pass
+    return disp_ok and adx_ok and ema_ok
 
-    fvg_config = {
-        'min_fvg_ticks': 2,  # Lower threshold to catch smaller overnight FVGs
-        'tick_size': tick_size,
-        'max_fvg_age_bars': 200,  # Extended for overnight FVGs
-        'invalidate_on_close_through': True,
-        'fvg_mode': fvg_mode,  # "wick" or "body"
-    }
 
-    # Detect FVGs from ALL bars (including overnight)
-    all_fvgs = detect_fvgs(all_bars, fvg_config)
+def _entry_time_blocked(timestamp, midday_cutoff, pm_cutoff_nq, symbol):
+    """V10.2 time filters (V10.7: use EST timezone)."""
+    entry_hour = get_est_hour(timestamp)
+    if midday_cutoff and 12 <= entry_hour < 14:
+        return True  # Skip lunch lull (12:00-14:00 EST)
+    if pm_cutoff_nq and symbol in ['NQ', 'MNQ'] and entry_hour >= 14:
+        return True  # Skip NQ afternoon entries (after 14:00 EST)
+    return False
 
-    # Opposing FVG exit: detect separate FVG list if mode differs from main
-    opp_fvg_mode_resolved = opposing_fvg_mode if opposing_fvg_mode else fvg_mode
-    if opposing_fvg_exit and opp_fvg_mode_resolved != fvg_mode:
-        opp_fvg_config = {**fvg_config, 'fvg_mode': opp_fvg_mode_resolved}
-        opp_fvgs = detect_fvgs(all_bars, opp_fvg_config)
-    else:
-        opp_fvgs = all_fvgs
 
+# Process-wide memos for repeated run_session_v10 calls on the same bars
+# (multi-day backtests over one history, A/B variants, parameter sweeps).
+# Bounded so a long sweep cannot grow memory without limit. Off by default:
+# the live scanner passes new bars every cycle, so it would only pay for the
+# fingerprints and keep dead entries alive. Sweeps and backtests opt in.
+FVG_MEMO = LRUMemo(maxsize=16)      # bars fingerprint + fvg_config -> FVG list
+ENTRY_MEMO = LRUMemo(maxsize=256)   # bars fingerprints + entry params -> entries
+_memos_enabled = False
+
+
+def set_memoization(enabled):
+    """Turn the run_session_v10 memos on or off for this process.
+
+    Turning them off also clears them. Returns the previous setting, so a
+    caller can restore it when done.
+    """
+    global _memos_enabled
+    previous = _memos_enabled
+    _memos_enabled = bool(enabled)
+    if not _memos_enabled:
+        FVG_MEMO.clear()
+        ENTRY_MEMO.clear()
+    return previous
+
+
+def memo_stats():
+    """Hit/miss counters of the run_session_v10 memos."""
+    return {'fvgs': FVG_MEMO.stats(), 'entries': ENTRY_MEMO.stats()}
+
+
+def _detect_mitigated_fvgs(all_bars, fvg_config):
+    fvgs = detect_fvgs(all_bars, fvg_config)
     # Update FVG mitigation status for all detected FVGs
     # This fixes the bug where mitigated FVGs were still being used for entries
-    for fvg in all_fvgs:
-        if fvg.mitigated:
-            continue
-        # Check all bars after FVG creation for mitigation
-        for bar_idx in range(fvg.created_bar_index + 1, len(all_bars)):
-            update_fvg_mitigation(fvg, all_bars[bar_idx], bar_idx, fvg_config)
-            if fvg.mitigated:
-                break  # Stop once mitigated
+    update_all_fvg_mitigations(fvgs, all_bars, fvg_config)
+    return fvgs
 
-    # Create mappings between session_bars and all_bars indices
-    session_to_all_idx = {}
-    all_to_session_idx = {}
-    for i, sbar in enumerate(session_bars):
-        for j, abar in enumerate(all_bars):
-            if abar.timestamp == sbar.timestamp:
-                session_to_all_idx[i] = j
-                all_to_session_idx[j] = i
-                break
+
+def is_duplicate_entry(accepted, entry_price, entry_bar_idx, tick_size):
+    """True if an accepted entry is at a similar price (< 4 ticks) and time (< 3 bars)."""
+    for existing in accepted:
+        if abs(existing['entry_price'] - entry_price) < tick_size * 4:
+            if abs(existing['entry_bar_idx'] - entry_bar_idx) < 3:
+                return True
+    return False
+
+
+def creation_entry(fvg, session_bar_idx, all_bars, indicators, avg_body_size, params):
+    """Entry Type A: judge one FVG created on session bar session_bar_idx.
+
+    Everything here only depends on bars up to the FVG (and avg_body_size);
+    run_session_v10 and SessionV10Engine both judge creation entries with it.
+
+    Args:
+        params: Entry params by name (generate_entries keywords).
+
+    Returns:
+        (entry dict or None, True if the consolidation filter skipped it)
+    """
+    tick_size = params['tick_size']
+    is_long = fvg.direction == 'BULLISH'
+
+    # Min FVG size filter for creation entries - MANDATORY
+    fvg_size_ticks = (fvg.high - fvg.low) / tick_size
+    if fvg_size_ticks < params['entry_min_fvg_ticks']:
+        return None, False
+
+    creating_bar = all_bars[fvg.created_bar_index]
+    body = abs(creating_bar.close - creating_bar.open)
+
+    entry_idx = fvg.created_bar_index
+
+    # V10.12: Consolidation filter (exempt 3x displacement — breakout candles break consolidation)
+    high_displacement_override = params['high_displacement_override']
+    high_disp_creation = high_displacement_override > 0 and body >= avg_body_size * high_displacement_override
+    if params['consol_threshold'] > 0 and not high_disp_creation:
+        consol, consol_ratio = is_consolidating_at(all_bars, indicators, entry_idx, threshold=params['consol_threshold'])
+        if consol:
+            return None, True
+
+    # V10.8 HYBRID FILTER SYSTEM (DI mandatory, 2/3 of displacement/ADX/EMA)
+    disp_ok = body > avg_body_size * params['displacement_threshold']
+    if not _hybrid_filters_pass(indicators, entry_idx, is_long, params['min_adx'], params['use_hybrid_filters'],
+                                disp_ok=disp_ok, high_disp=high_disp_creation):
+        return None, False
+
+    stop_buffer_ticks = 2
+    entry_price = fvg.midpoint
+    stop_price = fvg.low - (stop_buffer_ticks * tick_size) if is_long else fvg.high + (stop_buffer_ticks * tick_size)
+    risk = abs(entry_price - stop_price)
+
+    if params['min_risk_pts'] > 0 and risk < params['min_risk_pts']:
+        return None, False
+
+    # V10.2 time filters (V10.7: use EST timezone)
+    if _entry_time_blocked(creating_bar.timestamp, params['midday_cutoff'], params['pm_cutoff_nq'], params['symbol']):
+        return None, False
+
+    # FVG confirmation filter: delay CREATION by 1 bar (simulate live 2-scan confirmation)
+    confirmed_bar_idx = session_bar_idx + 1 if params['confirm_creation'] else session_bar_idx
+
+    return {
+        'fvg': fvg,
+        'direction': 'LONG' if is_long else 'SHORT',
+        'entry_type': 'CREATION',
+        'entry_bar_idx': confirmed_bar_idx,
+        'entry_time': creating_bar.timestamp,
+        'entry_price': entry_price,
+        'stop_price': stop_price,
+        'fvg_low': fvg.low,
+        'fvg_high': fvg.high,
+    }, False
+
+
+def retrace_entry(bar, i, all_bar_idx, fvg, direction, all_bars, indicators, params):
+    """Entry Type B: judge a rejection from fvg on session bar i (bars[all_bar_idx]).
+
+    Only the checks that depend on bars up to i: the caller applies FVG
+    mitigation, trend alignment and the duplicate check, which depend on
+    the whole session.
+
+    Returns:
+        (entry dict or None, True if the consolidation filter skipped it)
+    """
+    tick_size = params['tick_size']
+    is_long = direction == 'LONG'
+
+    # Check if this bar shows rejection from the FVG
+    is_rejection, entry_price, stop_price = is_rejection_candle(bar, fvg, direction, tick_size)
+
+    if not is_rejection:
+        return None, False
+
+    # Apply filters at rejection time
+    # V10.12: Consolidation filter (no exemption for retrace entries)
+    if params['consol_threshold'] > 0:
+        consol, consol_ratio = is_consolidating_at(all_bars, indicators, all_bar_idx, threshold=params['consol_threshold'])
+        if consol:
+            return None, True
+
+    # V10.8 HYBRID FILTER SYSTEM
+    # MANDATORY: FVG Size (must pass)
+    fvg_size_ticks = (fvg.high - fvg.low) / tick_size
+    if fvg_size_ticks < params['entry_min_fvg_ticks']:
+        return None, False
+
+    # DI mandatory, 2/3 optional (displacement already checked via rejection candle)
+    if not _hybrid_filters_pass(indicators, all_bar_idx, is_long, params['min_adx'], params['use_hybrid_filters']):
+        return None, False
+
+    risk = abs(entry_price - stop_price)
+    if params['min_risk_pts'] > 0 and risk < params['min_risk_pts']:
+        return None, False
+
+    # Determine if overnight or intraday FVG
+    fvg_created_time = all_bars[fvg.created_bar_index].timestamp.time()
+    is_intraday = fvg_created_time >= dt_time(9, 30)
+    entry_label = 'INTRADAY_RETRACE' if is_intraday else 'RETRACEMENT'
+
+    # ADX filter for overnight retrace entries only
+    overnight_retrace_min_adx = params['overnight_retrace_min_adx']
+    if not is_intraday and overnight_retrace_min_adx > 0:
+        adx = indicators['adx'][all_bar_idx]
+        if adx is None or adx < overnight_retrace_min_adx:
+            return None, False  # Skip overnight retrace if ADX too low
+
+    # V10.2 time filters (V10.7: use EST timezone)
+    if _entry_time_blocked(bar.timestamp, params['midday_cutoff'], params['pm_cutoff_nq'], params['symbol']):
+        return None, False
+
+    return {
+        'fvg': fvg,
+        'direction': direction,
+        'entry_type': entry_label,
+        'entry_bar_idx': i,
+        'entry_time': bar.timestamp,
+        'entry_price': entry_price,
+        'stop_price': stop_price,
+        'fvg_low': fvg.low,
+        'fvg_high': fvg.high,
+        'rejection_bar': bar,
+    }, False
+
+
+def bos_retrace_entry(bar, i, all_bar_idx, fvg, all_bars, indicators, params):
+    """Entry Type C: judge a retracement into a BOS FVG on session bar i.
+
+    The caller picks the BOS FVGs, applies the duplicate check and adds
+    bos_bar_idx (see retrace_entry).
+
+    Returns:
+        (entry dict or None, True if the consolidation filter skipped it)
+    """
+    tick_size = params['tick_size']
+    is_long = fvg.direction == 'BULLISH'
+
+    # Check if bar retraces into FVG
+    if is_long:
+        # For LONG: price dips into FVG (low touches FVG zone)
+        touches_fvg = bar.low <= fvg.high and bar.low >= fvg.low - (tick_size * 2)
+        if not touches_fvg:
+            return None, False
+
+        # Entry at FVG midpoint or bar close (whichever is higher for safety)
+        entry_price = max(fvg.midpoint, bar.close)
+        stop_price = fvg.low - (2 * tick_size)
+    else:
+        # For SHORT: price rallies into FVG (high touches FVG zone)
+        touches_fvg = bar.high >= fvg.low and bar.high <= fvg.high + (tick_size * 2)
+        if not touches_fvg:
+            return None, False
+
+        # Entry at FVG midpoint or bar close (whichever is lower for safety)
+        entry_price = min(fvg.midpoint, bar.close)
+        stop_price = fvg.high + (2 * tick_size)
+
+    # Apply filters
+    # V10.12: Consolidation filter (no exemption for BOS entries)
+    if params['consol_threshold'] > 0:
+        consol, consol_ratio = is_consolidating_at(all_bars, indicators, all_bar_idx, threshold=params['consol_threshold'])
+        if consol:
+            return None, True
+
+    # V10.8 HYBRID FILTER SYSTEM (BOS already confirms momentum)
+    if not _hybrid_filters_pass(indicators, all_bar_idx, is_long, params['min_adx'], params['use_hybrid_filters']):
+        return None, False
+
+    risk = abs(entry_price - stop_price)
+    if params['min_risk_pts'] > 0 and risk < params['min_risk_pts']:
+        return None, False
+
+    # V10.4: Cap max risk for BOS entries to avoid oversized losses
+    if params['max_bos_risk_pts'] and risk > params['max_bos_risk_pts']:
+        return None, False  # Skip BOS entries with excessive risk
+
+    # V10.2 time filters (V10.7: use EST timezone)
+    if _entry_time_blocked(bar.timestamp, params['midday_cutoff'], params['pm_cutoff_nq'], params['symbol']):
+        return None, False
+
+    return {
+        'fvg': fvg,
+        'direction': 'LONG' if is_long else 'SHORT',
+        'entry_type': 'BOS_RETRACE',
+        'entry_bar_idx': i,
+        'entry_time': bar.timestamp,
+        'entry_price': entry_price,
+        'stop_price': stop_price,
+        'fvg_low': fvg.low,
+        'fvg_high': fvg.high,
+    }, False
+
+
+def _find_entries(session_bars, all_bars, all_fvgs, indicators, session_to_all_idx, all_to_session_idx, params):
+    """Entry phase of run_session_v10 (creation, retracement and BOS entries).
+
+    Each candidate is judged by creation_entry / retrace_entry /
+    bos_retrace_entry; this adds the session-wide checks (mitigation,
+    trend bias, duplicates, one entry per BOS FVG).
+
+    Args:
+        params: Entry params by name (generate_entries keywords).
+
+    Returns:
+        (entries sorted by entry_bar_idx, consolidation filter skip count).
+        Entries are only read by trade management, so they can be shared.
+    """
+    tick_size = params['tick_size']
+    entry_min_fvg_ticks = params['entry_min_fvg_ticks']
+    bos_lookback = params['bos_lookback']
+    bos_fvg_window = params['bos_fvg_window']
+
+    # Calculate average body size from session bars (today only, like V9)
+    body_sizes = [abs(b.close - b.open) for b in session_bars[:50]]
+    avg_body_size = sum(body_sizes) / len(body_sizes) if body_sizes else tick_size * 4
+
+    # V10.12: Consolidation skip counter
+    consol_skips = 0
 
     # Track valid entries for each type
     valid_entries = {'LONG': [], 'SHORT': []}
 
     # === Entry Type A: FVG Creation ===
-    if enable_creation_entry:
+    if params['enable_creation_entry']:
         for direction in ['LONG', 'SHORT']:
-            is_long = direction == 'LONG'
-            fvg_dir = 'BULLISH' if is_long else 'BEARISH'
+            fvg_dir = 'BULLISH' if direction == 'LONG' else 'BEARISH'
 
             for fvg in all_fvgs:
                 if fvg.direction != fvg_dir:
@@ -493,85 +863,17 @@ def run_session_v10(
                 if session_bar_idx is None:
                     continue
 
-                # Min FVG size filter for creation entries - MANDATORY
-                fvg_size_ticks = (fvg.high - fvg.low) / tick_size
-                if fvg_size_ticks < entry_min_fvg_ticks:
+                entry, consol = creation_entry(fvg, session_bar_idx, all_bars, indicators, avg_body_size, params)
+                consol_skips += consol
+                if entry is None:
                     continue
-
-                creating_bar = all_bars[fvg.created_bar_index]
-                body = abs(creating_bar.close - creating_bar.open)
-
-                bars_to_entry = all_bars[:fvg.created_bar_index + 1]
-
-                # V10.12: Consolidation filter (exempt 3x displacement — breakout candles break consolidation)
-                high_disp_creation = high_displacement_override > 0 and body >= avg_body_size * high_displacement_override
-                if consol_threshold > 0 and not high_disp_creation:
-                    consol, consol_ratio = is_consolidating(bars_to_entry, threshold=consol_threshold)
-                    if consol:
-                        consol_skips += 1
-                        continue
-
-                ema_fast = calculate_ema(bars_to_entry, 20)
-                ema_slow = calculate_ema(bars_to_entry, 50)
-                adx, plus_di, minus_di = calculate_adx(bars_to_entry, 14)
-
-                # V10.8 HYBRID FILTER SYSTEM
-                # MANDATORY: DI Direction (must pass)
-                di_ok = adx is None or (plus_di > minus_di if is_long else minus_di > plus_di)
-                if not di_ok:
-                    continue
-
-                # OPTIONAL filters (2/3 must pass)
-                disp_ok = body > avg_body_size * displacement_threshold
-                ema_ok = ema_fast is None or ema_slow is None or (ema_fast > ema_slow if is_long else ema_fast < ema_slow)
-                # V10.5: High displacement override still applies
-                high_disp = high_displacement_override > 0 and body >= avg_body_size * high_displacement_override
-                adx_ok = adx is None or adx >= min_adx or (high_disp and adx is not None and adx >= 10)
-
-                if use_hybrid_filters:
-                    # Hybrid mode: 2 of 3 optional filters must pass
-                    optional_passed = sum([disp_ok, adx_ok, ema_ok])
-                    if optional_passed < 2:
-                        continue
-                else:
-                    # Strict mode: all filters must pass
-                    if not (disp_ok and adx_ok and ema_ok):
-                        continue
-
-                stop_buffer_ticks = 2
-                entry_price = fvg.midpoint
-                stop_price = fvg.low - (stop_buffer_ticks * tick_size) if is_long else fvg.high + (stop_buffer_ticks * tick_size)
-                risk = abs(entry_price - stop_price)
-
-                if min_risk_pts > 0 and risk < min_risk_pts:
-                    continue
-
-                # V10.2 time filters (V10.7: use EST timezone)
-                entry_hour = get_est_hour(creating_bar.timestamp)
-                if midday_cutoff and 12 <= entry_hour < 14:
-                    continue  # Skip lunch lull (12:00-14:00 EST)
-                if pm_cutoff_nq and symbol in ['NQ', 'MNQ'] and entry_hour >= 14:
-                    continue  # Skip NQ afternoon entries (after 14:00 EST)
-
-                # FVG confirmation filter: delay CREATION by 1 bar (simulate live 2-scan confirmation)
-                confirmed_bar_idx = session_bar_idx + 1 if confirm_creation else session_bar_idx
-                if confirm_creation and confirmed_bar_idx >= len(session_bars):
+                if params['confirm_creation'] and entry['entry_bar_idx'] >= len(session_bars):
                     continue  # FVG on last bar can't be confirmed
 
-                valid_entries[direction].append({
-                    'fvg': fvg,
-                    'direction': direction,
-                    'entry_type': 'CREATION',
-                    'entry_bar_idx': confirmed_bar_idx,
-                    'entry_time': creating_bar.timestamp,
-                    'entry_price': entry_price,
-                    'stop_price': stop_price,
-                    'fvg_low': fvg.low,
-                    'fvg_high': fvg.high,
-                })
+                valid_entries[direction].append(entry)
 
     # === Entry Type B: FVG Retracement + Rejection (Overnight + Intraday) ===
-    if enable_retracement_entry:
+    if params['enable_retracement_entry']:
         rth_start = dt_time(9, 30)
 
         # Get FVGs from overnight/premarket (before RTH 9:30)
@@ -582,6 +884,17 @@ def run_session_v10(
         session_fvgs = [f for f in all_fvgs
                         if all_bars[f.created_bar_index].timestamp.time() >= rth_start]
 
+        # Calculate daily trend bias (same for every bar, so computed once)
+        daily_bias = None
+        if params['retracement_trend_aligned']:
+            # Use EMA from 30 bars into session for stable trend reading
+            trend_check_idx = min(120, len(session_bars) - 1)  # ~6 hours into session
+            trend_bars = session_bars[:trend_check_idx + 1]
+            trend_ema20 = calculate_ema(trend_bars, 20)
+            trend_ema50 = calculate_ema(trend_bars, 50)
+            if trend_ema20 and trend_ema50:
+                daily_bias = 'BULLISH' if trend_ema20 > trend_ema50 else 'BEARISH'
+
         for i, bar in enumerate(session_bars):
             if i < 1:  # Need at least 1 bar of context
                 continue
@@ -597,23 +910,11 @@ def run_session_v10(
 
             all_bar_idx = session_to_all_idx.get(i, i)
 
-            # Calculate daily trend bias (EMA at 9:45 - 15 mins into RTH)
-            daily_bias = None
-            if retracement_trend_aligned:
-                # Use EMA from 30 bars into session for stable trend reading
-                trend_check_idx = min(120, len(session_bars) - 1)  # ~6 hours into session
-                trend_bars = session_bars[:trend_check_idx + 1]
-                trend_ema20 = calculate_ema(trend_bars, 20)
-                trend_ema50 = calculate_ema(trend_bars, 50)
-                if trend_ema20 and trend_ema50:
-                    daily_bias = 'BULLISH' if trend_ema20 > trend_ema50 else 'BEARISH'
-
             for direction in ['LONG', 'SHORT']:
-                is_long = direction == 'LONG'
-                fvg_dir = 'BULLISH' if is_long else 'BEARISH'
+                fvg_dir = 'BULLISH' if direction == 'LONG' else 'BEARISH'
 
                 # Trend alignment filter - skip if direction doesn't match daily bias
-                if retracement_trend_aligned and daily_bias:
+                if daily_bias:
                     expected_dir = 'LONG' if daily_bias == 'BULLISH' else 'SHORT'
                     if direction != expected_dir:
                         continue
@@ -622,7 +923,7 @@ def run_session_v10(
                 fvgs_to_check = []
 
                 # Add overnight FVGs (only in morning if filter enabled)
-                if not retracement_morning_only or is_morning:
+                if not params['retracement_morning_only'] or is_morning:
                     fvgs_to_check.extend(overnight_fvgs)
 
                 # Add intraday FVGs created at least 2 bars ago (V10.7: reduced from 5 for quicker retrace)
@@ -639,100 +940,23 @@ def run_session_v10(
                     if fvg.mitigated:
                         continue
 
-                    # Check if this bar shows rejection from the FVG
-                    is_rejection, entry_price, stop_price = is_rejection_candle(bar, fvg, direction, tick_size)
-
-                    if not is_rejection:
-                        continue
-
-                    # Apply filters at rejection time
-                    bars_to_entry = all_bars[:all_bar_idx + 1]
-
-                    # V10.12: Consolidation filter (no exemption for retrace entries)
-                    if consol_threshold > 0:
-                        consol, consol_ratio = is_consolidating(bars_to_entry, threshold=consol_threshold)
-                        if consol:
-                            consol_skips += 1
-                            continue
-
-                    ema_fast = calculate_ema(bars_to_entry, 20)
-                    ema_slow = calculate_ema(bars_to_entry, 50)
-                    adx, plus_di, minus_di = calculate_adx(bars_to_entry, 14)
-
-                    # V10.8 HYBRID FILTER SYSTEM
-                    # MANDATORY: FVG Size (must pass)
-                    fvg_size_ticks = (fvg.high - fvg.low) / tick_size
-                    if fvg_size_ticks < entry_min_fvg_ticks:
-                        continue
-
-                    # MANDATORY: DI Direction (must pass)
-                    di_ok = adx is None or (plus_di > minus_di if is_long else minus_di > plus_di)
-                    if not di_ok:
-                        continue
-
-                    # OPTIONAL filters (2/3 must pass)
-                    ema_ok = ema_fast is None or ema_slow is None or (ema_fast > ema_slow if is_long else ema_fast < ema_slow)
-                    adx_ok = adx is None or adx >= min_adx
-                    disp_ok = True  # Displacement already checked via rejection candle
-
-                    if use_hybrid_filters:
-                        optional_passed = sum([disp_ok, adx_ok, ema_ok])
-                        if optional_passed < 2:
-                            continue
-                    else:
-                        if not (ema_ok and adx_ok):
-                            continue
-
-                    risk = abs(entry_price - stop_price)
-                    if min_risk_pts > 0 and risk < min_risk_pts:
+                    entry, consol = retrace_entry(bar, i, all_bar_idx, fvg, direction, all_bars, indicators, params)
+                    consol_skips += consol
+                    if entry is None:
                         continue
 
                     # Check if we already have an entry at similar price/time
-                    duplicate = False
-                    for existing in valid_entries[direction]:
-                        if abs(existing['entry_price'] - entry_price) < tick_size * 4:
-                            if abs(existing['entry_bar_idx'] - i) < 3:
-                                duplicate = True
-                                break
-
-                    if not duplicate:
-                        # Determine if overnight or intraday FVG
-                        fvg_created_time = all_bars[fvg.created_bar_index].timestamp.time()
-                        is_intraday = fvg_created_time >= rth_start
-                        entry_label = 'INTRADAY_RETRACE' if is_intraday else 'RETRACEMENT'
-
-                        # ADX filter for overnight retrace entries only
-                        if not is_intraday and overnight_retrace_min_adx > 0:
-                            if adx is None or adx < overnight_retrace_min_adx:
-                                continue  # Skip overnight retrace if ADX too low
-
-                        # V10.2 time filters (V10.7: use EST timezone)
-                        entry_hour = get_est_hour(bar.timestamp)
-                        if midday_cutoff and 12 <= entry_hour < 14:
-                            continue  # Skip lunch lull (12:00-14:00 EST)
-                        if pm_cutoff_nq and symbol in ['NQ', 'MNQ'] and entry_hour >= 14:
-                            continue  # Skip NQ afternoon entries (after 14:00 EST)
-
-                        valid_entries[direction].append({
-                            'fvg': fvg,
-                            'direction': direction,
-                            'entry_type': entry_label,
-                            'entry_bar_idx': i,
-                            'entry_time': bar.timestamp,
-                            'entry_price': entry_price,
-                            'stop_price': stop_price,
-                            'fvg_low': fvg.low,
-                            'fvg_high': fvg.high,
-                            'rejection_bar': bar,
-                        })
+                    if not is_duplicate_entry(valid_entries[direction], entry['entry_price'], i, tick_size):
+                        valid_entries[direction].append(entry)
 
     # === Entry Type C: BOS + Session FVG Retracement ===
     # V10.6: Skip BOS_RETRACE entries entirely (25% win rate drag)
-    if enable_bos_entry and not disable_bos_retrace:
+    if params['enable_bos_entry'] and not params['disable_bos_retrace']:
         rth_start = dt_time(9, 30)
 
         # Track BOS events and their associated FVGs
         bos_fvgs = []  # List of (bos_bar_idx, bos_direction, fvg)
+        swings = SwingIndex.from_bars(session_bars, 2)
 
         # First pass: find BOS events and FVGs that form after them
         for i in range(bos_lookback, len(session_bars)):
@@ -746,7 +970,7 @@ def run_session_v10(
                 continue
 
             # Check for BOS at this bar
-            bos_dir, bos_level = detect_bos(session_bars, i, bos_lookback)
+            bos_dir, bos_level = detect_bos(session_bars, i, bos_lookback, swings=swings)
             if bos_dir is None:
                 continue
 
@@ -788,7 +1012,6 @@ def run_session_v10(
                 continue
 
             direction = 'LONG' if bos_dir == 'BULLISH' else 'SHORT'
-            is_long = direction == 'LONG'
 
             # Look for retracement after FVG creation
             for i in range(fvg_session_idx + 1, len(session_bars)):
@@ -797,414 +1020,768 @@ def run_session_v10(
                 if all_bar_idx is None:
                     continue
 
-                # Check if bar retraces into FVG
-                if is_long:
-                    # For LONG: price dips into FVG (low touches FVG zone)
-                    touches_fvg = bar.low <= fvg.high and bar.low >= fvg.low - (tick_size * 2)
-                    if not touches_fvg:
-                        continue
+                entry, consol = bos_retrace_entry(bar, i, all_bar_idx, fvg, all_bars, indicators, params)
+                consol_skips += consol
+                if entry is None:
+                    continue
 
-                    # Entry at FVG midpoint or bar close (whichever is higher for safety)
-                    entry_price = max(fvg.midpoint, bar.close)
-                    stop_price = fvg.low - (2 * tick_size)
-                else:
-                    # For SHORT: price rallies into FVG (high touches FVG zone)
-                    touches_fvg = bar.high >= fvg.low and bar.high <= fvg.high + (tick_size * 2)
-                    if not touches_fvg:
-                        continue
+                # Check for duplicate entries
+                if not is_duplicate_entry(valid_entries[direction], entry['entry_price'], i, tick_size):
+                    valid_entries[direction].append({**entry, 'bos_bar_idx': bos_bar_idx})
+                    break  # Only one entry per BOS FVG
+
+    # Combine and sort all entries by bar index
+    all_valid_entries = valid_entries['LONG'] + valid_entries['SHORT']
+    all_valid_entries.sort(key=lambda x: x['entry_bar_idx'])
 
-                    # Entry at FVG midpoint or bar close (whichever is lower for safety)
-                    entry_price = min(fvg.midpoint, bar.close)
-                    stop_price = fvg.high + (2 * tick_size)
+    return all_valid_entries, consol_skips
 
-                # Apply filters
-                bars_to_entry = all_bars[:all_bar_idx + 1]
 
-                # V10.12: Consolidation filter (no exemption for BOS entries)
-                if consol_threshold > 0:
-                    consol, consol_ratio = is_consolidating(bars_to_entry, threshold=consol_threshold)
-                    if consol:
-                        consol_skips += 1
-                        continue
+def generate_entries(
+    session_bars,
+    all_bars,  # Include overnight bars for FVG tracking
+    tick_size=0.25,
+    displacement_threshold=1.0,
+    min_adx=11,
+    min_risk_pts=0,
+    enable_creation_entry=True,
+    enable_retracement_entry=True,
+    enable_bos_entry=True,
+    retracement_morning_only=False,
+    retracement_trend_aligned=False,
+    overnight_retrace_min_adx=22,
+    bos_lookback=10,
+    bos_fvg_window=5,
+    midday_cutoff=True,
+    pm_cutoff_nq=True,
+    symbol='ES',
+    max_bos_risk_pts=None,
+    high_displacement_override=3.0,
+    disable_bos_retrace=False,
+    use_hybrid_filters=True,
+    consol_threshold=0.0,
+    fvg_mode="wick",
+    entry_min_fvg_ticks=5,
+    confirm_creation=False,
+    precomputed=None,
+):
+    """Stage one of run_session_v10: FVG detection and entry candidates.
 
-                ema_fast = calculate_ema(bars_to_entry, 20)
-                ema_slow = calculate_ema(bars_to_entry, 50)
-                adx, plus_di, minus_di = calculate_adx(bars_to_entry, 14)
+    Takes the entry keywords of run_session_v10 (same defaults). The result
+    only depends on the bars and these params, so it can be computed once
+    and passed to simulate_exits() for any number of exit variants.
 
-                # V10.8 HYBRID FILTER SYSTEM
-                # MANDATORY: DI Direction (must pass)
-                di_ok = adx is None or (plus_di > minus_di if is_long else minus_di > plus_di)
-                if not di_ok:
-                    continue
+    Returns:
+        Candidate dict (read-only for callers):
+            entries: entry dicts sorted by entry_bar_idx
+            session_to_all_idx: session index -> all_bars index map
+            fvgs: mitigated FVGs over all_bars (fvg_mode)
+            fvg_config: config the FVGs were detected with
+            bars_key: bars_fingerprint(all_bars), None when memos are off
+            all_bars: all_bars (for opposing FVGs in another mode)
+            consol_skips: entries skipped by the consolidation filter
+            kernel_cache: exit kernel arrays, filled by simulate_exits()
+    """
+    fvg_config = {
+        'min_fvg_ticks': 2,  # Lower threshold to catch smaller overnight FVGs
+        'tick_size': tick_size,
+        'max_fvg_age_bars': 200,  # Extended for overnight FVGs
+        'invalidate_on_close_through': True,
+        'fvg_mode': fvg_mode,  # "wick" or "body"
+    }
 
-                # OPTIONAL filters (2/3 must pass)
-                ema_ok = ema_fast is None or ema_slow is None or (ema_fast > ema_slow if is_long else ema_fast < ema_slow)
-                adx_ok = adx is None or adx >= min_adx
-                disp_ok = True  # BOS already confirms momentum
+    # FVGs and indicators only depend on all_bars, tick size and FVG mode, so
+    # a sweep over other params reuses them through the precomputed dict.
+    # With set_memoization(True) they are also memoized across calls by bars
+    # fingerprint (FVG_MEMO).
+    cache = {} if precomputed is None else precomputed
+    all_bars_key = None
+    if _memos_enabled:
+        if 'fingerprint' not in cache:
+            cache['fingerprint'] = bars_fingerprint(all_bars)
+        all_bars_key = cache['fingerprint']
 
-                if use_hybrid_filters:
-                    optional_passed = sum([disp_ok, adx_ok, ema_ok])
-                    if optional_passed < 2:
-                        continue
-                else:
-                    if not (ema_ok and adx_ok):
-                        continue
+    # Detect FVGs from ALL bars (including overnight)
+    fvg_key = ('fvgs', tick_size, fvg_mode)
+    if fvg_key not in cache:
+        if _memos_enabled:
+            cache[fvg_key] = FVG_MEMO.get_or_compute(
+                (all_bars_key, 'mitigated', tuple(sorted(fvg_config.items()))),
+                lambda: _detect_mitigated_fvgs(all_bars, fvg_config),
+            )
+        else:
+            cache[fvg_key] = _detect_mitigated_fvgs(all_bars, fvg_config)
+    all_fvgs = cache[fvg_key]
+
+    # Entry candidates depend on the bars and the entry params only, so
+    # variants that differ in exit params reuse them (ENTRY_MEMO)
+    entry_params = {
+        'tick_size': tick_size,
+        'displacement_threshold': displacement_threshold,
+        'min_adx': min_adx,
+        'min_risk_pts': min_risk_pts,
+        'enable_creation_entry': enable_creation_entry,
+        'enable_retracement_entry': enable_retracement_entry,
+        'enable_bos_entry': enable_bos_entry,
+        'retracement_morning_only': retracement_morning_only,
+        'retracement_trend_aligned': retracement_trend_aligned,
+        'overnight_retrace_min_adx': overnight_retrace_min_adx,
+        'bos_lookback': bos_lookback,
+        'bos_fvg_window': bos_fvg_window,
+        'midday_cutoff': midday_cutoff,
+        'pm_cutoff_nq': pm_cutoff_nq,
+        'symbol': symbol,
+        'max_bos_risk_pts': max_bos_risk_pts,
+        'high_displacement_override': high_displacement_override,
+        'disable_bos_retrace': disable_bos_retrace,
+        'use_hybrid_filters': use_hybrid_filters,
+        'consol_threshold': consol_threshold,
+        'entry_min_fvg_ticks': entry_min_fvg_ticks,
+        'confirm_creation': confirm_creation,
+    }
 
-                risk = abs(entry_price - stop_price)
-                if min_risk_pts > 0 and risk < min_risk_pts:
-                    continue
+    def find_entries():
+        # EMA/ADX/DI/ATR for every all_bars prefix, looked up by index per candidate
+        if 'indicators' not in cache:
+            cache['indicators'] = precompute_indicators(all_bars)
+
+        # Create mappings between session_bars and all_bars indices
+        session_to_all_idx, all_to_session_idx = map_session_indices(session_bars, all_bars)
+
+        entries, consol_skips = _find_entries(session_bars, all_bars, all_fvgs, cache['indicators'],
+                                              session_to_all_idx, all_to_session_idx, entry_params)
+        return {
+            'entries': entries,
+            'session_to_all_idx': session_to_all_idx,
+            'fvg_config': fvg_config,
+            'bars_key': all_bars_key,
+            'consol_skips': consol_skips,
+        }
+
+    if _memos_enabled:
+        candidates = ENTRY_MEMO.get_or_compute(
+            (all_bars_key, bars_fingerprint(session_bars), fvg_config['fvg_mode'], tuple(entry_params.values())),
+            find_entries,
+        )
+    else:
+        candidates = find_entries()
+    # Bars, FVGs and kernel arrays are attached per call: a memoized entry
+    # only holds the candidates, and the FVG list stays owned by FVG_MEMO
+    return {**candidates, 'fvgs': all_fvgs, 'all_bars': all_bars, 'kernel_cache': {}}
 
-                # V10.4: Cap max risk for BOS entries to avoid oversized losses
-                if max_bos_risk_pts and risk > max_bos_risk_pts:
-                    continue  # Skip BOS entries with excessive risk
 
-                # Check for duplicate entries
-                duplicate = False
-                for existing in valid_entries[direction]:
-                    if abs(existing['entry_price'] - entry_price) < tick_size * 4:
-                        if abs(existing['entry_bar_idx'] - i) < 3:
-                            duplicate = True
-                            break
-
-                if not duplicate:
-                    # V10.2 time filters (V10.7: use EST timezone)
-                    entry_hour = get_est_hour(bar.timestamp)
-                    if midday_cutoff and 12 <= entry_hour < 14:
-                        continue  # Skip lunch lull (12:00-14:00 EST)
-                    if pm_cutoff_nq and symbol in ['NQ', 'MNQ'] and entry_hour >= 14:
-                        continue  # Skip NQ afternoon entries (after 14:00 EST)
-
-                    valid_entries[direction].append({
-                        'fvg': fvg,
-                        'direction': direction,
-                        'entry_type': 'BOS_RETRACE',
-                        'entry_bar_idx': i,
-                        'entry_time': bar.timestamp,
-                        'entry_price': entry_price,
-                        'stop_price': stop_price,
-                        'fvg_low': fvg.low,
-                        'fvg_high': fvg.high,
-                        'bos_bar_idx': bos_bar_idx,
-                    })
-                    break  # Only one entry per BOS FVG
+def simulate_exits(
+    candidates,
+    session_bars,
+    tick_size=0.25,
+    tick_value=12.50,
+    contracts=3,
+    max_open_trades=3,
+    max_losses_per_day=3,
+    max_retrace_risk_pts=None,
+    bos_daily_loss_limit=1,
+    t1_fixed_4r=True,
+    t1_r_target=3,
+    trail_r_trigger=4,
+    max_consec_losses=0,
+    opposing_fvg_exit=False,
+    opposing_fvg_min_ticks=5,
+    opposing_fvg_after_6r_only=False,
+    opposing_fvg_mode=None,
+    post_t1_trail_r=0,
+    t2_fixed_r=0,
+    time_decay_bars=0,
+    time_decay_r=0,
+):
+    """Stage two of run_session_v10: trade management over the session.
 
-    # Combine and sort all entries by bar index
-    all_valid_entries = valid_entries['LONG'] + valid_entries['SHORT']
-    all_valid_entries.sort(key=lambda x: x['entry_bar_idx'])
+    Takes the exit keywords of run_session_v10 (same defaults) and the
+    candidates from generate_entries() for the same session_bars. The
+    candidates are not modified, so one set serves every exit variant.
 
-    # Rest of the trade management logic (same as V9)
-    active_trades = []
-    completed_results = []
-    entries_taken = {'LONG': 0, 'SHORT': 0}
-    loss_count = {'LONG': 0, 'SHORT': 0}
-    bos_loss_count = 0  # V10.6: Track BOS losses for daily limit
-    global_consec_losses = 0  # V10.16: Consecutive loss counter (resets on any win)
+    Returns:
+        Trade result dicts, same as run_session_v10.
+    """
+    fvg_config = candidates['fvg_config']
+    opp_fvgs = candidates['fvgs']
 
-    # V10.7: T1/T2/runner splits are now calculated per-trade based on trade's contract count
-    # For 3 contracts: T1=1, T2=1, Runner=1
-    # For 2 contracts: T1=1, T2=1, Runner=0
+    # Opposing FVG exit: detect separate FVG list if mode differs from main
+    opp_fvg_mode_resolved = opposing_fvg_mode if opposing_fvg_mode else fvg_config['fvg_mode']
+    if opposing_fvg_exit and opp_fvg_mode_resolved != fvg_config['fvg_mode']:
+        opp_fvg_config = {**fvg_config, 'fvg_mode': opp_fvg_mode_resolved}
+        if candidates['bars_key'] is not None:
+            opp_fvgs = FVG_MEMO.get_or_compute(
+                (candidates['bars_key'], 'detected', tuple(sorted(opp_fvg_config.items()))),
+                lambda: detect_fvgs(candidates['all_bars'], opp_fvg_config),
+            )
+        else:
+            opp_fvgs = detect_fvgs(candidates['all_bars'], opp_fvg_config)
+
+    # Trade management (same as V9), event bar to event bar
+    exit_params = {
+        'tick_size': tick_size,
+        'contracts': contracts,
+        'max_open_trades': max_open_trades,
+        'max_losses_per_day': max_losses_per_day,
+        'max_retrace_risk_pts': max_retrace_risk_pts,
+        'bos_daily_loss_limit': bos_daily_loss_limit,
+        't1_fixed_4r': t1_fixed_4r,
+        't1_r_target': t1_r_target,
+        'trail_r_trigger': trail_r_trigger,
+        'max_consec_losses': max_consec_losses,
+        'opposing_fvg_exit': opposing_fvg_exit,
+        'opposing_fvg_min_ticks': opposing_fvg_min_ticks,
+        'opposing_fvg_after_6r_only': opposing_fvg_after_6r_only,
+        'post_t1_trail_r': post_t1_trail_r,
+        't2_fixed_r': t2_fixed_r,
+        'time_decay_bars': time_decay_bars,
+        'time_decay_r': time_decay_r,
+    }
+    # Kernel arrays depend on stage one only: kept with the candidates for the next variant
+    kernel_cache = candidates['kernel_cache']
+    arrays = opp_created = None
+    if candidates['entries']:
+        if 'arrays' not in kernel_cache:
+            kernel_cache['arrays'] = _exit_arrays(session_bars, candidates['session_to_all_idx'])
+        arrays = kernel_cache['arrays']
+        if opposing_fvg_exit:
+            opp_key = ('opp_created', opp_fvg_mode_resolved, opposing_fvg_min_ticks * tick_size)
+            if opp_key not in kernel_cache:
+                kernel_cache[opp_key] = _opposing_fvg_index(opp_fvgs, exit_params)
+            opp_created = kernel_cache[opp_key]
+
+    state = replay_trades_vectorized(session_bars, candidates['entries'], exit_params, opp_fvgs,
+                                     candidates['session_to_all_idx'], arrays, opp_created)
+    return build_session_results(state, session_bars, tick_size, tick_value, contracts)
+
+
+# Keywords of each stage; run_session_v10 takes the union
+ENTRY_KWARG_NAMES = tuple(inspect.signature(generate_entries).parameters)[2:]
+EXIT_KWARG_NAMES = tuple(inspect.signature(simulate_exits).parameters)[2:]
+
+
+def split_session_kwargs(kwargs):
+    """Split run_session_v10 kwargs into (generate_entries kwargs, simulate_exits kwargs).
+
+    Keys used by neither stage (session_bars, all_bars, the unused
+    use_opposing_fvg_exit) are dropped; tick_size goes to both.
+    """
+    entry_kwargs = {k: v for k, v in kwargs.items() if k in ENTRY_KWARG_NAMES}
+    exit_kwargs = {k: v for k, v in kwargs.items() if k in EXIT_KWARG_NAMES}
+    return entry_kwargs, exit_kwargs
 
-    for i in range(len(session_bars)):
-        bar = session_bars[i]
 
-        # Manage active trades
-        trades_to_remove = []
-        for trade in active_trades:
-            is_long = trade['direction'] == 'LONG'
-            remaining = trade['remaining']
+def run_session_v10(
+    session_bars,
+    all_bars,  # Include overnight bars for FVG tracking
+    tick_size=0.25,
+    tick_value=12.50,
+    contracts=3,
+    max_open_trades=3,  # V10.7: Increased from 2 to allow 3rd entry
+    max_losses_per_day=3,
+    displacement_threshold=1.0,
+    min_adx=11,  # V10.7: Lowered from 17 to catch earlier setups
+    min_risk_pts=0,
+    use_opposing_fvg_exit=False,
+    # V10 specific
+    enable_creation_entry=True,   # Entry Type A
+    enable_retracement_entry=True,  # Entry Type B
+    enable_bos_entry=True,  # Entry Type C: BOS + Session FVG Retracement
+    # V10 filters
+    retracement_morning_only=False,  # Only take retracement entries 9:30-12:00
+    retracement_trend_aligned=False,  # Only take retracement entries matching daily trend
+    overnight_retrace_min_adx=22,  # Min ADX for overnight retrace entries (0 to disable)
+    bos_lookback=10,  # Bars to look back for swing points
+    bos_fvg_window=5,  # Bars after BOS to look for FVG
+    # V10.2 time filters
+    midday_cutoff=True,  # No entries 12:00-14:00 (lunch lull)
+    pm_cutoff_nq=True,   # No NQ entries after 14:00
+    symbol='ES',         # Symbol for PM cutoff logic
+    # V10.4 risk caps for BOS entries
+    max_bos_risk_pts=None,  # Max risk for BOS entries (ES: 8, NQ: 20)
+    # V10.11: Reduce contracts for high-risk retrace entries
+    max_retrace_risk_pts=None,  # If retrace risk > this, force 1 contract (ES: 8, NQ: 20)
+    # V10.5 high displacement override
+    high_displacement_override=3.0,  # Skip ADX check if displacement >= 3x avg body
+    # V10.6 BOS controls
+    disable_bos_retrace=False,  # Disable BOS entries entirely (use for ES)
+    bos_daily_loss_limit=1,  # Stop BOS after N losses per day (0=no limit)
+    # Exit options
+    t1_fixed_4r=True,  # Hybrid: Take T1 profit at fixed R-target instead of trailing
+    # V10.8 Hybrid filters
+    use_hybrid_filters=True,  # Use 2 mandatory + 2/3 optional filter mode
+    # R-target tuning (V10.9: lowered from 4R/8R — +26% P/L, 90.6% WR in 11-day A/B test)
+    t1_r_target=3,      # R-multiple for T1 fixed exit (default: 3R)
+    trail_r_trigger=4,   # R-multiple for T2/Runner trail activation (V10.16: lowered from 6R)
+    # V10.12: Consolidation detection filter
+    consol_threshold=0.0,  # Range/ATR ratio threshold (0=disabled). Skip entries when ratio < threshold.
+    # V10.16: Global consecutive loss stop (ES/MES only)
+    max_consec_losses=0,  # Stop all entries after N consecutive losses across directions (0=disabled)
+    # FVG detection mode
+    fvg_mode="wick",  # "wick" (default, high/low) or "body" (open/close)
+    # Opposing FVG exit for T2/Runner
+    opposing_fvg_exit=False,          # Enable opposing FVG exit for T2/Runner
+    opposing_fvg_min_ticks=5,         # Min opposing FVG size in ticks
+    opposing_fvg_after_6r_only=False, # True = only after 6R, False = after T1
+    opposing_fvg_mode=None,           # FVG mode for opposing detection: None=same as fvg_mode, "body", "wick"
+    # FVG size filter (A/B testing)
+    entry_min_fvg_ticks=5,            # Min FVG size in ticks for entry (default: 5)
+    # Trail improvement A/B testing
+    post_t1_trail_r=0,                # Option B: After T1, trail at entry+NR instead of breakeven (0=breakeven)
+    t2_fixed_r=0,                     # Option C: Fixed T2 exit at this R-multiple (0=trail only)
+    time_decay_bars=0,                # Option D: Bars after T1 before tightening trail (0=disabled)
+    time_decay_r=0,                   # Option D: R-level to tighten to after decay
+    # FVG confirmation filter (simulate live scanner confirmation delay)
+    confirm_creation=False,           # Delay CREATION entries by 1 bar (simulate 2-scan confirmation)
+    # Parameter sweeps: dict shared by every call on the same all_bars
+    precomputed=None,                 # Caches FVGs/indicators across calls (None = compute fresh)
+):
+    """V10: Quad entry mode with FVG creation + retracement + BOS.
 
-            # V10.7: Calculate T1/T2/runner based on this trade's contract count
-            trade_cts = trade.get('contracts', contracts)
-            cts_t1 = 1
-            cts_t2 = 1
-            cts_runner = max(0, trade_cts - cts_t1 - cts_t2)
+    Entry Type A (Creation): Enter when FVG forms (existing V9 logic)
+    Entry Type B1 (Overnight Retrace): Enter when price wicks into overnight FVG and rejects
+    Entry Type B2 (Intraday Retrace): Enter when price wicks into session FVG and rejects
+    Entry Type C (BOS): Enter when price retraces into session FVG after BOS
 
-            if remaining <= 0:
-                trades_to_remove.append(trade)
-                continue
+    Runs generate_entries() then simulate_exits(); callers that evaluate
+    many exit variants of one session can call the two stages directly.
+    """
+    entry_kwargs, exit_kwargs = split_session_kwargs(locals())
+    candidates = generate_entries(session_bars, all_bars, **entry_kwargs)
+    final_results = simulate_exits(candidates, session_bars, **exit_kwargs)
 
-            # Update T1 fast structure trail after 4R
-            if trade['touched_4r'] and not trade['t1_exited']:
-                check_idx = i - 2
-                if check_idx > trade['entry_bar_idx']:
-                    if is_long and is_swing_low(session_bars, check_idx, lookback=2):
-                        swing = session_bars[check_idx].low
-                        if swing > trade['t1_last_swing']:
-                            new_trail = swing - (2 * tick_size)
-                            if new_trail > trade['t1_trail_stop']:
-                                trade['t1_trail_stop'] = new_trail
-                                trade['t1_last_swing'] = swing
-                    elif not is_long and is_swing_high(session_bars, check_idx, lookback=2):
-                        swing = session_bars[check_idx].high
-                        if swing < trade['t1_last_swing']:
-                            new_trail = swing + (2 * tick_size)
-                            if new_trail < trade['t1_trail_stop']:
-                                trade['t1_trail_stop'] = new_trail
-                                trade['t1_last_swing'] = swing
-
-            # Update T2 structure trail after 8R
-            if trade['touched_8r'] and not trade['t2_exited']:
-                check_idx = i - 2
-                if check_idx > trade['entry_bar_idx']:
-                    if is_long and is_swing_low(session_bars, check_idx, lookback=2):
-                        swing = session_bars[check_idx].low
-                        if swing > trade['t2_last_swing']:
-                            new_trail = swing - (4 * tick_size)
-                            if new_trail > trade['t2_trail_stop']:
-                                trade['t2_trail_stop'] = new_trail
-                                trade['t2_last_swing'] = swing
-                    elif not is_long and is_swing_high(session_bars, check_idx, lookback=2):
-                        swing = session_bars[check_idx].high
-                        if swing < trade['t2_last_swing']:
-                            new_trail = swing + (4 * tick_size)
-                            if new_trail < trade['t2_trail_stop']:
-                                trade['t2_trail_stop'] = new_trail
-                                trade['t2_last_swing'] = swing
-
-            # Update Runner structure trail after 8R (6-tick buffer, wider than T2)
-            if trade['touched_8r'] and trade['t1_exited'] and trade['t2_exited']:
-                check_idx = i - 2
-                if check_idx > trade['entry_bar_idx']:
-                    if is_long and is_swing_low(session_bars, check_idx, lookback=2):
-                        swing = session_bars[check_idx].low
-                        if swing > trade.get('runner_last_swing', trade['entry_price']):
-                            new_trail = swing - (6 * tick_size)
-                            if new_trail > trade['runner_stop']:
-                                trade['runner_stop'] = new_trail
-                                trade['runner_last_swing'] = swing
-                    elif not is_long and is_swing_high(session_bars, check_idx, lookback=2):
-                        swing = session_bars[check_idx].high
-                        if swing < trade.get('runner_last_swing', trade['entry_price']):
-                            new_trail = swing + (6 * tick_size)
-                            if new_trail < trade['runner_stop']:
-                                trade['runner_stop'] = new_trail
-                                trade['runner_last_swing'] = swing
-
-            # Check 4R touch
-            if not trade['touched_4r']:
-                t4r_hit = bar.high >= trade['target_4r'] if is_long else bar.low <= trade['target_4r']
-                if t4r_hit:
-                    trade['touched_4r'] = True
-                    trade['t4r_bar_idx'] = i  # Track bar index for time decay (Option D)
-                    # Option B: Trail at entry+NR instead of breakeven after T1
-                    if post_t1_trail_r > 0:
-                        trail_level = trade['entry_price'] + (post_t1_trail_r * trade['risk']) if is_long else trade['entry_price'] - (post_t1_trail_r * trade['risk'])
-                        trade['t1_trail_stop'] = trail_level
-                    else:
-                        trade['t1_trail_stop'] = trade['entry_price']
-                    trade['t1_last_swing'] = trade['entry_price']
-
-                    # HYBRID: Take T1 profit at 4R immediately
-                    if t1_fixed_4r and not trade['t1_exited'] and remaining > 0:
-                        exit_cts = min(cts_t1, remaining)
-                        pnl = (trade['target_4r'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['target_4r']) * exit_cts
-                        trade['exits'].append({'type': '4R_PARTIAL', 'pnl': pnl, 'price': trade['target_4r'], 'time': bar.timestamp, 'cts': exit_cts})
-                        trade['remaining'] -= exit_cts
-                        trade['t1_exited'] = True
-                        remaining = trade['remaining']
-
-            # Check 8R touch
-            if trade['touched_4r'] and not trade['touched_8r']:
-                t8r_hit = bar.high >= trade['target_8r'] if is_long else bar.low <= trade['target_8r']
-                if t8r_hit:
-                    trade['touched_8r'] = True
-                    trade['t2_trail_stop'] = trade['plus_4r']
-                    trade['t2_last_swing'] = bar.high if is_long else bar.low
-                    trade['runner_stop'] = trade['plus_4r']
-                    trade['runner_last_swing'] = bar.high if is_long else bar.low
-
-            # Check stops
-            if not trade['touched_4r'] and remaining > 0:
-                stop_hit = bar.low <= trade['stop_price'] if is_long else bar.high >= trade['stop_price']
-                if stop_hit:
-                    pnl = (trade['stop_price'] - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - trade['stop_price']) * remaining
-                    trade['exits'].append({'type': 'STOP', 'pnl': pnl, 'price': trade['stop_price'], 'time': bar.timestamp, 'cts': remaining})
-                    trade['remaining'] = 0
-                    loss_count[trade['direction']] += 1
-                    global_consec_losses += 1  # V10.16
-                    # V10.6: Track BOS losses for daily limit
-                    if 'BOS' in trade.get('entry_type', ''):
-                        bos_loss_count += 1
-                    remaining = 0
+    # V10.12: Report consolidation filter skips
+    if candidates['consol_skips'] > 0:
+        print(f"  [V10.12] Consolidation filter: {candidates['consol_skips']} entries skipped (threshold={consol_threshold})")
 
-            # Option C: Fixed T2 exit at specified R-multiple (between T1 and trail trigger)
-            if t2_fixed_r > 0 and trade['touched_4r'] and not trade['t2_exited'] and remaining > 0:
-                t2_target = trade['entry_price'] + (t2_fixed_r * trade['risk']) if is_long else trade['entry_price'] - (t2_fixed_r * trade['risk'])
-                t2_fixed_hit = bar.high >= t2_target if is_long else bar.low <= t2_target
-                if t2_fixed_hit:
-                    exit_cts = min(cts_t2, remaining)
-                    pnl = (t2_target - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - t2_target) * exit_cts
-                    trade['exits'].append({'type': 'T2_FIXED', 'pnl': pnl, 'price': t2_target, 'time': bar.timestamp, 'cts': exit_cts})
-                    trade['remaining'] -= exit_cts
-                    trade['t2_exited'] = True
-                    remaining = trade['remaining']
-
-            # Option D: Time decay — tighten trail after N bars past T1 without hitting trail trigger
-            if time_decay_bars > 0 and trade['touched_4r'] and not trade['touched_8r'] and remaining > 0:
-                bars_since_t1 = i - trade.get('t4r_bar_idx', i)
-                if bars_since_t1 >= time_decay_bars and time_decay_r > 0:
-                    decay_level = trade['entry_price'] + (time_decay_r * trade['risk']) if is_long else trade['entry_price'] - (time_decay_r * trade['risk'])
-                    if is_long:
-                        trade['t1_trail_stop'] = max(trade['t1_trail_stop'], decay_level)
-                    else:
-                        trade['t1_trail_stop'] = min(trade['t1_trail_stop'], decay_level)
-
-            # After 4R but before 8R
-            if trade['touched_4r'] and not trade['touched_8r'] and remaining > 0:
-                t1_stop_hit = bar.low <= trade['t1_trail_stop'] if is_long else bar.high >= trade['t1_trail_stop']
-                if t1_stop_hit:
-                    if not trade['t1_exited']:
-                        exit_cts = min(cts_t1, remaining)
-                        pnl = (trade['t1_trail_stop'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['t1_trail_stop']) * exit_cts
-                        trade['exits'].append({'type': 'T1_STRUCT', 'pnl': pnl, 'price': trade['t1_trail_stop'], 'time': bar.timestamp, 'cts': exit_cts})
-                        trade['remaining'] -= exit_cts
-                        trade['t1_exited'] = True
-                        remaining = trade['remaining']
-
-                    if remaining > 0:
-                        pnl = (trade['t1_trail_stop'] - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - trade['t1_trail_stop']) * remaining
-                        trade['exits'].append({'type': 'TRAIL_STOP', 'pnl': pnl, 'price': trade['t1_trail_stop'], 'time': bar.timestamp, 'cts': remaining})
-                        trade['t2_exited'] = True
-                        trade['remaining'] = 0
-                        remaining = 0
-
-            # After 8R
-            if trade['touched_8r'] and remaining > 0:
-                if not trade['t1_exited']:
-                    t1_stop_hit = bar.low <= trade['t1_trail_stop'] if is_long else bar.high >= trade['t1_trail_stop']
-                    if t1_stop_hit:
-                        exit_cts = min(cts_t1, remaining)
-                        pnl = (trade['t1_trail_stop'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['t1_trail_stop']) * exit_cts
-                        trade['exits'].append({'type': 'T1_STRUCT', 'pnl': pnl, 'price': trade['t1_trail_stop'], 'time': bar.timestamp, 'cts': exit_cts})
-                        trade['remaining'] -= exit_cts
-                        trade['t1_exited'] = True
-                        remaining = trade['remaining']
-
-                if not trade['t2_exited'] and remaining > cts_runner:
-                    t2_stop_hit = bar.low <= trade['t2_trail_stop'] if is_long else bar.high >= trade['t2_trail_stop']
-                    if t2_stop_hit:
-                        exit_cts = min(cts_t2, remaining - cts_runner)
-                        pnl = (trade['t2_trail_stop'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['t2_trail_stop']) * exit_cts
-                        trade['exits'].append({'type': 'T2_STRUCT', 'pnl': pnl, 'price': trade['t2_trail_stop'], 'time': bar.timestamp, 'cts': exit_cts})
-                        trade['remaining'] -= exit_cts
-                        trade['t2_exited'] = True
-                        remaining = trade['remaining']
-
-                if trade['t1_exited'] and trade['t2_exited'] and remaining > 0:
-                    runner_stop_hit = bar.low <= trade['runner_stop'] if is_long else bar.high >= trade['runner_stop']
-                    if runner_stop_hit:
-                        pnl = (trade['runner_stop'] - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - trade['runner_stop']) * remaining
-                        trade['exits'].append({'type': 'RUNNER_STOP', 'pnl': pnl, 'price': trade['runner_stop'], 'time': bar.timestamp, 'cts': remaining})
-                        trade['remaining'] = 0
-                        remaining = 0
-
-            # Opposing FVG exit for T2/Runner
-            if opposing_fvg_exit and remaining > 0 and trade['t1_exited']:
-                # Check trigger: after T1 always, or only after 6R if configured
-                trigger_met = trade['touched_8r'] if opposing_fvg_after_6r_only else trade['touched_4r']
-                if trigger_met:
-                    opposing_dir = 'BULLISH' if not is_long else 'BEARISH'
-                    min_opp_size = opposing_fvg_min_ticks * tick_size
-                    entry_all_idx = session_to_all_idx.get(trade['entry_bar_idx'], 0)
-                    current_all_idx = session_to_all_idx.get(i, 0)
-                    for fvg in opp_fvgs:
-                        if (fvg.direction == opposing_dir
-                                and fvg.created_bar_index > entry_all_idx
-                                and fvg.created_bar_index <= current_all_idx
-                                and (fvg.high - fvg.low) >= min_opp_size):
-                            pnl = (bar.close - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - bar.close) * remaining
-                            trade['exits'].append({'type': 'OPP_FVG', 'pnl': pnl, 'price': bar.close, 'time': bar.timestamp, 'cts': remaining})
-                            trade['remaining'] = 0
-                            remaining = 0
-                            break
+    return final_results
 
-            if trade['remaining'] <= 0:
-                trades_to_remove.append(trade)
-
-        for trade in trades_to_remove:
-            if trade in active_trades:
-                active_trades.remove(trade)
-                completed_results.append(trade)
-                # V10.16: Reset consecutive loss counter on winning trade
-                trade_pnl = sum(e['pnl'] for e in trade['exits'])
-                if trade_pnl >= 0:
-                    global_consec_losses = 0
-
-        # Check for new entries
-        current_open = len(active_trades)
-
-        for entry in all_valid_entries:
-            if entry['entry_bar_idx'] != i:
-                continue
 
-            direction = entry['direction']
-            entry_type = entry.get('entry_type', '')
+# Per-trade exit parameters (run_session_v10 keyword arguments) used by manage_trades_on_bar
+EXIT_PARAM_NAMES = (
+    'tick_size', 'contracts', 'max_open_trades', 'max_losses_per_day', 'max_retrace_risk_pts',
+    'bos_daily_loss_limit', 't1_fixed_4r', 't1_r_target', 'trail_r_trigger', 'max_consec_losses',
+    'opposing_fvg_exit', 'opposing_fvg_min_ticks', 'opposing_fvg_after_6r_only',
+    'post_t1_trail_r', 't2_fixed_r', 'time_decay_bars', 'time_decay_r',
+)
+
+
+def new_trade_state():
+    """Empty trade-management state for manage_trades_on_bar()."""
+    return {
+        'active_trades': [],
+        'completed_results': [],
+        'entries_taken': {'LONG': 0, 'SHORT': 0},
+        'loss_count': {'LONG': 0, 'SHORT': 0},
+        'bos_loss_count': 0,  # V10.6: Track BOS losses for daily limit
+        'global_consec_losses': 0,  # V10.16: Consecutive loss counter (resets on any win)
+    }
 
-            # V10.16: Global consecutive loss stop (ES/MES only)
-            if max_consec_losses > 0 and global_consec_losses >= max_consec_losses:
-                continue
 
-            # Direction-aware circuit breaker: skip if this direction hit max losses
-            if loss_count[direction] >= max_losses_per_day:
-                continue
+def copy_trade_state(state):
+    """Independent copy of a new_trade_state() dict (open trades and counters copied).
 
-            # V10.6: Skip BOS entries if daily loss limit reached
-            if 'BOS' in entry_type and bos_daily_loss_limit > 0 and bos_loss_count >= bos_daily_loss_limit:
-                continue
+    Completed trades are shared: trade management never touches them again.
+    """
+    return {
+        **state,
+        'active_trades': [{**t, 'exits': list(t['exits'])} for t in state['active_trades']],
+        'completed_results': list(state['completed_results']),
+        'entries_taken': dict(state['entries_taken']),
+        'loss_count': dict(state['loss_count']),
+    }
 
-            if current_open >= max_open_trades:
-                continue
 
-            is_long = direction == 'LONG'
-            entry_price = entry['entry_price']
-            stop_price = entry['stop_price']
-            risk = abs(entry_price - stop_price)
-
-            # V10.7: Dynamic position sizing - scale down when multiple trades open
-            # 0 trades open: 3 contracts, 1+ trades open: 2 contracts
-            # This keeps max exposure at 6 contracts (vs 9 with fixed 3)
-            trade_contracts = contracts if current_open == 0 else max(2, contracts - 1)
-
-            # V10.11: Reduce to 1 contract if retrace entry exceeds max risk
-            if entry_type in ('RETRACEMENT', 'INTRADAY_RETRACE') and max_retrace_risk_pts and risk > max_retrace_risk_pts:
-                trade_contracts = 1
-
-            target_4r = entry_price + (t1_r_target * risk) if is_long else entry_price - (t1_r_target * risk)
-            target_8r = entry_price + (trail_r_trigger * risk) if is_long else entry_price - (trail_r_trigger * risk)
-            plus_4r = entry_price + (t1_r_target * risk) if is_long else entry_price - (t1_r_target * risk)
-
-            new_trade = {
-                'direction': direction,
-                'entry_type': entry['entry_type'],
-                'entry_bar_idx': i,
-                'entry_time': entry['entry_time'],
-                'entry_price': entry_price,
-                'stop_price': stop_price,
-                'fvg_low': entry['fvg_low'],
-                'fvg_high': entry['fvg_high'],
-                'risk': risk,
-                'target_4r': target_4r,
-                'target_8r': target_8r,
-                'plus_4r': plus_4r,
-                'touched_4r': False,
-                'touched_8r': False,
-                't1_trail_stop': stop_price,
-                't1_last_swing': entry_price,
-                't1_exited': False,
-                't2_trail_stop': plus_4r,
-                't2_last_swing': entry_price,
-                't2_exited': False,
-                'runner_stop': plus_4r,
-                'runner_last_swing': entry_price,
-                'is_2nd_entry': entries_taken[direction] > 0,
-                'remaining': trade_contracts,  # V10.7: Use dynamic size
-                'contracts': trade_contracts,  # V10.7: Store for reference
-                'exits': [],
-            }
-
-            active_trades.append(new_trade)
-            entries_taken[direction] += 1
-            current_open += 1
+def manage_trades_on_bar(state, i, session_bars, entries, params, opp_fvgs, session_to_all_idx):
+    """Advance trade management by one session bar (same as V9).
+
+    Manages the open trades in state on session_bars[i] (stops, R targets,
+    structure trails, opposing FVG exit), then opens the entries whose
+    entry_bar_idx is i. Only bars up to i are read, so run_session_v10 and
+    the streaming SessionV10Engine step through the same code.
+
+    Args:
+        state: Dict from new_trade_state(), updated in place
+        i: Session bar index
+        session_bars: Session bars (at least i + 1 of them)
+        entries: Valid entries for bar i, in entry order
+        params: Dict of EXIT_PARAM_NAMES values
+        opp_fvgs: FVGs checked by the opposing FVG exit
+        session_to_all_idx: session index -> all_bars index map
+    """
+    active_trades = state['active_trades']
+    completed_results = state['completed_results']
+    entries_taken = state['entries_taken']
+    loss_count = state['loss_count']
+    bos_loss_count = state['bos_loss_count']
+    global_consec_losses = state['global_consec_losses']
+
+    # Manage active trades
+    trades_to_remove = []
+    for trade in active_trades:
+        if trade['remaining'] <= 0:
+            trades_to_remove.append(trade)
+            continue
+
+        if manage_trade_on_bar(trade, i, session_bars, params, opp_fvgs, session_to_all_idx):
+            loss_count[trade['direction']] += 1
+            global_consec_losses += 1  # V10.16
+            # V10.6: Track BOS losses for daily limit
+            if 'BOS' in trade.get('entry_type', ''):
+                bos_loss_count += 1
+
+        if trade['remaining'] <= 0:
+            trades_to_remove.append(trade)
+
+    for trade in trades_to_remove:
+        if trade in active_trades:
+            active_trades.remove(trade)
+            completed_results.append(trade)
+            # V10.16: Reset consecutive loss counter on winning trade
+            trade_pnl = sum(e['pnl'] for e in trade['exits'])
+            if trade_pnl >= 0:
+                global_consec_losses = 0
+
+    state['bos_loss_count'] = bos_loss_count
+    state['global_consec_losses'] = global_consec_losses
+
+    # Check for new entries
+    current_open = len(active_trades)
+
+    for entry in entries:
+        if entry['entry_bar_idx'] != i:
+            continue
+
+        new_trade = open_trade(entry, i, state, current_open, params)
+        if new_trade is None:
+            continue
+
+        active_trades.append(new_trade)
+        entries_taken[new_trade['direction']] += 1
+        current_open += 1
+
+
+def open_trade(entry, i, state, current_open, params):
+    """Trade dict for entry on session bar i, or None if the daily limits block it.
+
+    Applies the loss limits in state (new_trade_state() counters) and sizes
+    the trade from the number of trades already open.
+    """
+    contracts = params['contracts']
+    max_open_trades = params['max_open_trades']
+    max_losses_per_day = params['max_losses_per_day']
+    max_retrace_risk_pts = params['max_retrace_risk_pts']
+    bos_daily_loss_limit = params['bos_daily_loss_limit']
+    t1_r_target = params['t1_r_target']
+    trail_r_trigger = params['trail_r_trigger']
+    max_consec_losses = params['max_consec_losses']
+
+    entries_taken = state['entries_taken']
+    loss_count = state['loss_count']
+    bos_loss_count = state['bos_loss_count']
+    global_consec_losses = state['global_consec_losses']
+
+    direction = entry['direction']
+    entry_type = entry.get('entry_type', '')
+
+    # V10.16: Global consecutive loss stop (ES/MES only)
+    if max_consec_losses > 0 and global_consec_losses >= max_consec_losses:
+        return None
+
+    # Direction-aware circuit breaker: skip if this direction hit max losses
+    if loss_count[direction] >= max_losses_per_day:
+        return None
+
+    # V10.6: Skip BOS entries if daily loss limit reached
+    if 'BOS' in entry_type and bos_daily_loss_limit > 0 and bos_loss_count >= bos_daily_loss_limit:
+        return None
+
+    if current_open >= max_open_trades:
+        return None
+
+    is_long = direction == 'LONG'
+    entry_price = entry['entry_price']
+    stop_price = entry['stop_price']
+    risk = abs(entry_price - stop_price)
+
+    # V10.7: Dynamic position sizing - scale down when multiple trades open
+    # 0 trades open: 3 contracts, 1+ trades open: 2 contracts
+    # This keeps max exposure at 6 contracts (vs 9 with fixed 3)
+    trade_contracts = contracts if current_open == 0 else max(2, contracts - 1)
+
+    # V10.11: Reduce to 1 contract if retrace entry exceeds max risk
+    if entry_type in ('RETRACEMENT', 'INTRADAY_RETRACE') and max_retrace_risk_pts and risk > max_retrace_risk_pts:
+        trade_contracts = 1
+
+    target_4r = entry_price + (t1_r_target * risk) if is_long else entry_price - (t1_r_target * risk)
+    target_8r = entry_price + (trail_r_trigger * risk) if is_long else entry_price - (trail_r_trigger * risk)
+    plus_4r = entry_price + (t1_r_target * risk) if is_long else entry_price - (t1_r_target * risk)
+
+    new_trade = {
+        'direction': direction,
+        'entry_type': entry['entry_type'],
+        'entry_bar_idx': i,
+        'entry_time': entry['entry_time'],
+        'entry_price': entry_price,
+        'stop_price': stop_price,
+        'fvg_low': entry['fvg_low'],
+        'fvg_high': entry['fvg_high'],
+        'risk': risk,
+        'target_4r': target_4r,
+        'target_8r': target_8r,
+        'plus_4r': plus_4r,
+        'touched_4r': False,
+        'touched_8r': False,
+        't1_trail_stop': stop_price,
+        't1_last_swing': entry_price,
+        't1_exited': False,
+        't2_trail_stop': plus_4r,
+        't2_last_swing': entry_price,
+        't2_exited': False,
+        'runner_stop': plus_4r,
+        'runner_last_swing': entry_price,
+        'is_2nd_entry': entries_taken[direction] > 0,
+        'remaining': trade_contracts,  # V10.7: Use dynamic size
+        'contracts': trade_contracts,  # V10.7: Store for reference
+        'exits': [],
+    }
+    return new_trade
+
+
+def manage_trade_on_bar(trade, i, session_bars, params, opp_fvgs, session_to_all_idx):
+    """Step one open trade through session_bars[i] (stops, R targets, trails).
+
+    The per-trade part of manage_trades_on_bar(); the vectorized exit kernel
+    calls it directly on the bars where something can happen to the trade.
+
+    Returns:
+        True if the trade was stopped out before T1 (STOP exit) on this bar.
+    """
+    tick_size = params['tick_size']
+    t1_fixed_4r = params['t1_fixed_4r']
+    opposing_fvg_exit = params['opposing_fvg_exit']
+    opposing_fvg_min_ticks = params['opposing_fvg_min_ticks']
+    opposing_fvg_after_6r_only = params['opposing_fvg_after_6r_only']
+    post_t1_trail_r = params['post_t1_trail_r']
+    t2_fixed_r = params['t2_fixed_r']
+    time_decay_bars = params['time_decay_bars']
+    time_decay_r = params['time_decay_r']
+
+    bar = session_bars[i]
+    is_long = trade['direction'] == 'LONG'
+    remaining = trade['remaining']
+    stopped = False
+
+    # V10.7: T1/T2/runner splits are calculated per-trade based on trade's contract count
+    # For 3 contracts: T1=1, T2=1, Runner=1
+    # For 2 contracts: T1=1, T2=1, Runner=0
+    trade_cts = trade.get('contracts', params['contracts'])
+    cts_t1 = 1
+    cts_t2 = 1
+    cts_runner = max(0, trade_cts - cts_t1 - cts_t2)
+
+    # Update T1 fast structure trail after 4R
+    if trade['touched_4r'] and not trade['t1_exited']:
+        check_idx = i - 2
+        if check_idx > trade['entry_bar_idx']:
+            if is_long and is_swing_low(session_bars, check_idx, lookback=2):
+                swing = session_bars[check_idx].low
+                if swing > trade['t1_last_swing']:
+                    new_trail = swing - (2 * tick_size)
+                    if new_trail > trade['t1_trail_stop']:
+                        trade['t1_trail_stop'] = new_trail
+                        trade['t1_last_swing'] = swing
+            elif not is_long and is_swing_high(session_bars, check_idx, lookback=2):
+                swing = session_bars[check_idx].high
+                if swing < trade['t1_last_swing']:
+                    new_trail = swing + (2 * tick_size)
+                    if new_trail < trade['t1_trail_stop']:
+                        trade['t1_trail_stop'] = new_trail
+                        trade['t1_last_swing'] = swing
+
+    # Update T2 structure trail after 8R
+    if trade['touched_8r'] and not trade['t2_exited']:
+        check_idx = i - 2
+        if check_idx > trade['entry_bar_idx']:
+            if is_long and is_swing_low(session_bars, check_idx, lookback=2):
+                swing = session_bars[check_idx].low
+                if swing > trade['t2_last_swing']:
+                    new_trail = swing - (4 * tick_size)
+                    if new_trail > trade['t2_trail_stop']:
+                        trade['t2_trail_stop'] = new_trail
+                        trade['t2_last_swing'] = swing
+            elif not is_long and is_swing_high(session_bars, check_idx, lookback=2):
+                swing = session_bars[check_idx].high
+                if swing < trade['t2_last_swing']:
+                    new_trail = swing + (4 * tick_size)
+                    if new_trail < trade['t2_trail_stop']:
+                        trade['t2_trail_stop'] = new_trail
+                        trade['t2_last_swing'] = swing
+
+    # Update Runner structure trail after 8R (6-tick buffer, wider than T2)
+    if trade['touched_8r'] and trade['t1_exited'] and trade['t2_exited']:
+        check_idx = i - 2
+        if check_idx > trade['entry_bar_idx']:
+            if is_long and is_swing_low(session_bars, check_idx, lookback=2):
+                swing = session_bars[check_idx].low
+                if swing > trade.get('runner_last_swing', trade['entry_price']):
+                    new_trail = swing - (6 * tick_size)
+                    if new_trail > trade['runner_stop']:
+                        trade['runner_stop'] = new_trail
+                        trade['runner_last_swing'] = swing
+            elif not is_long and is_swing_high(session_bars, check_idx, lookback=2):
+                swing = session_bars[check_idx].high
+                if swing < trade.get('runner_last_swing', trade['entry_price']):
+                    new_trail = swing + (6 * tick_size)
+                    if new_trail < trade['runner_stop']:
+                        trade['runner_stop'] = new_trail
+                        trade['runner_last_swing'] = swing
+
+    # Check 4R touch
+    if not trade['touched_4r']:
+        t4r_hit = bar.high >= trade['target_4r'] if is_long else bar.low <= trade['target_4r']
+        if t4r_hit:
+            trade['touched_4r'] = True
+            trade['t4r_bar_idx'] = i  # Track bar index for time decay (Option D)
+            # Option B: Trail at entry+NR instead of breakeven after T1
+            if post_t1_trail_r > 0:
+                trail_level = trade['entry_price'] + (post_t1_trail_r * trade['risk']) if is_long else trade['entry_price'] - (post_t1_trail_r * trade['risk'])
+                trade['t1_trail_stop'] = trail_level
+            else:
+                trade['t1_trail_stop'] = trade['entry_price']
+            trade['t1_last_swing'] = trade['entry_price']
+
+            # HYBRID: Take T1 profit at 4R immediately
+            if t1_fixed_4r and not trade['t1_exited'] and remaining > 0:
+                exit_cts = min(cts_t1, remaining)
+                pnl = (trade['target_4r'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['target_4r']) * exit_cts
+                trade['exits'].append({'type': '4R_PARTIAL', 'pnl': pnl, 'price': trade['target_4r'], 'time': bar.timestamp, 'cts': exit_cts})
+                trade['remaining'] -= exit_cts
+                trade['t1_exited'] = True
+                remaining = trade['remaining']
+
+    # Check 8R touch
+    if trade['touched_4r'] and not trade['touched_8r']:
+        t8r_hit = bar.high >= trade['target_8r'] if is_long else bar.low <= trade['target_8r']
+        if t8r_hit:
+            trade['touched_8r'] = True
+            trade['t2_trail_stop'] = trade['plus_4r']
+            trade['t2_last_swing'] = bar.high if is_long else bar.low
+            trade['runner_stop'] = trade['plus_4r']
+            trade['runner_last_swing'] = bar.high if is_long else bar.low
+
+    # Check stops
+    if not trade['touched_4r'] and remaining > 0:
+        stop_hit = bar.low <= trade['stop_price'] if is_long else bar.high >= trade['stop_price']
+        if stop_hit:
+            pnl = (trade['stop_price'] - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - trade['stop_price']) * remaining
+            trade['exits'].append({'type': 'STOP', 'pnl': pnl, 'price': trade['stop_price'], 'time': bar.timestamp, 'cts': remaining})
+            trade['remaining'] = 0
+            stopped = True
+            remaining = 0
+
+    # Option C: Fixed T2 exit at specified R-multiple (between T1 and trail trigger)
+    if t2_fixed_r > 0 and trade['touched_4r'] and not trade['t2_exited'] and remaining > 0:
+        t2_target = trade['entry_price'] + (t2_fixed_r * trade['risk']) if is_long else trade['entry_price'] - (t2_fixed_r * trade['risk'])
+        t2_fixed_hit = bar.high >= t2_target if is_long else bar.low <= t2_target
+        if t2_fixed_hit:
+            exit_cts = min(cts_t2, remaining)
+            pnl = (t2_target - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - t2_target) * exit_cts
+            trade['exits'].append({'type': 'T2_FIXED', 'pnl': pnl, 'price': t2_target, 'time': bar.timestamp, 'cts': exit_cts})
+            trade['remaining'] -= exit_cts
+            trade['t2_exited'] = True
+            remaining = trade['remaining']
+
+    # Option D: Time decay — tighten trail after N bars past T1 without hitting trail trigger
+    if time_decay_bars > 0 and trade['touched_4r'] and not trade['touched_8r'] and remaining > 0:
+        bars_since_t1 = i - trade.get('t4r_bar_idx', i)
+        if bars_since_t1 >= time_decay_bars and time_decay_r > 0:
+            decay_level = trade['entry_price'] + (time_decay_r * trade['risk']) if is_long else trade['entry_price'] - (time_decay_r * trade['risk'])
+            if is_long:
+                trade['t1_trail_stop'] = max(trade['t1_trail_stop'], decay_level)
+            else:
+                trade['t1_trail_stop'] = min(trade['t1_trail_stop'], decay_level)
+
+    # After 4R but before 8R
+    if trade['touched_4r'] and not trade['touched_8r'] and remaining > 0:
+        t1_stop_hit = bar.low <= trade['t1_trail_stop'] if is_long else bar.high >= trade['t1_trail_stop']
+        if t1_stop_hit:
+            if not trade['t1_exited']:
+                exit_cts = min(cts_t1, remaining)
+                pnl = (trade['t1_trail_stop'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['t1_trail_stop']) * exit_cts
+                trade['exits'].append({'type': 'T1_STRUCT', 'pnl': pnl, 'price': trade['t1_trail_stop'], 'time': bar.timestamp, 'cts': exit_cts})
+                trade['remaining'] -= exit_cts
+                trade['t1_exited'] = True
+                remaining = trade['remaining']
+
+            if remaining > 0:
+                pnl = (trade['t1_trail_stop'] - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - trade['t1_trail_stop']) * remaining
+                trade['exits'].append({'type': 'TRAIL_STOP', 'pnl': pnl, 'price': trade['t1_trail_stop'], 'time': bar.timestamp, 'cts': remaining})
+                trade['t2_exited'] = True
+                trade['remaining'] = 0
+                remaining = 0
+
+    # After 8R
+    if trade['touched_8r'] and remaining > 0:
+        if not trade['t1_exited']:
+            t1_stop_hit = bar.low <= trade['t1_trail_stop'] if is_long else bar.high >= trade['t1_trail_stop']
+            if t1_stop_hit:
+                exit_cts = min(cts_t1, remaining)
+                pnl = (trade['t1_trail_stop'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['t1_trail_stop']) * exit_cts
+                trade['exits'].append({'type': 'T1_STRUCT', 'pnl': pnl, 'price': trade['t1_trail_stop'], 'time': bar.timestamp, 'cts': exit_cts})
+                trade['remaining'] -= exit_cts
+                trade['t1_exited'] = True
+                remaining = trade['remaining']
+
+        if not trade['t2_exited'] and remaining > cts_runner:
+            t2_stop_hit = bar.low <= trade['t2_trail_stop'] if is_long else bar.high >= trade['t2_trail_stop']
+            if t2_stop_hit:
+                exit_cts = min(cts_t2, remaining - cts_runner)
+                pnl = (trade['t2_trail_stop'] - trade['entry_price']) * exit_cts if is_long else (trade['entry_price'] - trade['t2_trail_stop']) * exit_cts
+                trade['exits'].append({'type': 'T2_STRUCT', 'pnl': pnl, 'price': trade['t2_trail_stop'], 'time': bar.timestamp, 'cts': exit_cts})
+                trade['remaining'] -= exit_cts
+                trade['t2_exited'] = True
+                remaining = trade['remaining']
+
+        if trade['t1_exited'] and trade['t2_exited'] and remaining > 0:
+            runner_stop_hit = bar.low <= trade['runner_stop'] if is_long else bar.high >= trade['runner_stop']
+            if runner_stop_hit:
+                pnl = (trade['runner_stop'] - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - trade['runner_stop']) * remaining
+                trade['exits'].append({'type': 'RUNNER_STOP', 'pnl': pnl, 'price': trade['runner_stop'], 'time': bar.timestamp, 'cts': remaining})
+                trade['remaining'] = 0
+                remaining = 0
+
+    # Opposing FVG exit for T2/Runner
+    if opposing_fvg_exit and remaining > 0 and trade['t1_exited']:
+        # Check trigger: after T1 always, or only after 6R if configured
+        trigger_met = trade['touched_8r'] if opposing_fvg_after_6r_only else trade['touched_4r']
+        if trigger_met:
+            opposing_dir = 'BULLISH' if not is_long else 'BEARISH'
+            min_opp_size = opposing_fvg_min_ticks * tick_size
+            entry_all_idx = session_to_all_idx.get(trade['entry_bar_idx'], 0)
+            current_all_idx = session_to_all_idx.get(i, 0)
+            for fvg in opp_fvgs:
+                if (fvg.direction == opposing_dir
+                        and fvg.created_bar_index > entry_all_idx
+                        and fvg.created_bar_index <= current_all_idx
+                        and (fvg.high - fvg.low) >= min_opp_size):
+                    pnl = (bar.close - trade['entry_price']) * remaining if is_long else (trade['entry_price'] - bar.close) * remaining
+                    trade['exits'].append({'type': 'OPP_FVG', 'pnl': pnl, 'price': bar.close, 'time': bar.timestamp, 'cts': remaining})
+                    trade['remaining'] = 0
+                    remaining = 0
+                    break
+
+    return stopped
+
+
+def build_session_results(state, session_bars, tick_size, tick_value, contracts):
+    """Close trades still open at the last session bar (EOD) and build result dicts.
+
+    Mutates the trades in state; callers that keep stepping the state
+    (SessionV10Engine) pass a copy.
+    """
+    active_trades = state['active_trades']
+    completed_results = state['completed_results']
 
     # EOD exit
     last_bar = session_bars[-1]
@@ -1250,13 +1827,245 @@ def run_session_v10(
             'contracts': trade.get('contracts', contracts),  # V10.7: Actual contracts used
         })
 
-    # V10.12: Report consolidation filter skips
-    if consol_skips > 0:
-        print(f'  [V10.12] Consolidation filter: {consol_skips} entries skipped (threshold={consol_threshold})')
-
     return final_results
 
 
+def _exit_arrays(session_bars, session_to_all_idx):
+    """Price/swing arrays for the exit kernel, per trade direction.
+
+    Shorts get negated prices so one set of long-side comparisons serves
+    both ("up" = favourable extreme, "down" = adverse extreme). swing[i]
+    is the swing level the trails read on bar i (the swing at i - 2,
+    confirmed by bar i), -inf where there is none.
+    """
+    high, low, _ = price_arrays(session_bars)
+    swing_high, swing_low = swing_masks(high, low, lookback=2)
+    n = len(session_bars)
+
+    long_swing = np.full(n, -np.inf)
+    short_swing = np.full(n, -np.inf)
+    long_swing[2:] = np.where(swing_low[:-2], low[:-2], -np.inf)
+    short_swing[2:] = np.where(swing_high[:-2], -high[:-2], -np.inf)
+
+    return {
+        'LONG': {'up': high, 'down': low, 'swing': long_swing},
+        'SHORT': {'up': -low, 'down': -high, 'swing': short_swing},
+        'all_idx': np.array([session_to_all_idx.get(i, 0) for i in range(n)], dtype=np.int64),
+    }
+
+
+def _opposing_fvg_index(opp_fvgs, params):
+    """Sorted created_bar_index of the FVGs big enough for the opposing FVG exit, per direction."""
+    min_opp_size = params['opposing_fvg_min_ticks'] * params['tick_size']
+    created = {'BULLISH': [], 'BEARISH': []}
+    for fvg in opp_fvgs:
+        if fvg.direction in created and (fvg.high - fvg.low) >= min_opp_size:
+            created[fvg.direction].append(fvg.created_bar_index)
+    return {direction: np.array(sorted(idx), dtype=np.int64) for direction, idx in created.items()}
+
+
+def _advance_trail(trade, field, last_field, swing, levels, candidates, sign, end):
+    """Set a trail (and its last swing) to where the scalar loop leaves it after window bar end - 1."""
+    if end <= 0:
+        return
+    previous = np.empty(end)
+    previous[0] = sign * trade[field]
+    previous[1:] = levels[:end - 1]
+    updated = np.flatnonzero(candidates[:end] > previous)
+    trade[field] = sign * levels[end - 1]
+    if len(updated):
+        trade[last_field] = sign * swing[updated[-1]]
+
+
+def _next_trade_event(trade, start, arrays, params, opp_created):
+    """First bar >= start on which manage_trade_on_bar() can do more than move a trail.
+
+    Trail moves on the bars skipped over are applied to trade in bulk
+    (running max of the swing levels), so manage_trade_on_bar() sees the
+    same state on the event bar as the per-bar loop would.
+
+    Returns:
+        The event bar, or the session length if the trade runs to EOD.
+    """
+    n = len(arrays['all_idx'])
+    if start >= n:
+        return n
+
+    is_long = trade['direction'] == 'LONG'
+    sign = 1.0 if is_long else -1.0
+    side = arrays[trade['direction']]
+    up = side['up'][start:]
+    down = side['down'][start:]
+
+    # Before T1: only the R target or the stop can end the phase
+    if not trade['touched_4r']:
+        k = first_true((up >= sign * trade['target_4r']) | (down <= sign * trade['stop_price']))
+        return n if k < 0 else start + k
+
+    tick_size = params['tick_size']
+    swing = side['swing'][start:]
+    if start - 2 <= trade['entry_bar_idx']:
+        # Trails only read swings after the entry bar (check_idx > entry_bar_idx)
+        swing = np.where(np.arange(start, n) - 2 > trade['entry_bar_idx'], swing, -np.inf)
+    no_level = np.full(n - start, -np.inf)
+
+    def trail(field, last_field, buffer_ticks, updating):
+        candidates = no_level
+        if updating:
+            last = sign * trade[last_field]
+            candidates = np.where(swing > last, swing - (buffer_ticks * tick_size), -np.inf)
+        return candidates
+
+    trails = []  # (field, last_field, candidates, levels)
+    event = np.zeros(n - start, dtype=bool)
+    remaining = trade['remaining']
+    cts_runner = max(0, trade.get('contracts', params['contracts']) - 2)
+
+    if not trade['touched_8r']:
+        candidates = trail('t1_trail_stop', 't1_last_swing', 2, not trade['t1_exited'])
+        levels_in = candidates
+        # Option D: time decay floor once enough bars have passed since T1
+        if params['time_decay_bars'] > 0 and params['time_decay_r'] > 0:
+            decay_from = trade.get('t4r_bar_idx', start) + params['time_decay_bars']
+            decay_level = (trade['entry_price'] + (params['time_decay_r'] * trade['risk']) if is_long
+                           else trade['entry_price'] - (params['time_decay_r'] * trade['risk']))
+            levels_in = np.where(np.arange(start, n) >= decay_from,
+                                 np.maximum(candidates, sign * decay_level), candidates)
+        levels = trail_levels(levels_in, sign * trade['t1_trail_stop'])
+        trails.append(('t1_trail_stop', 't1_last_swing', candidates, levels))
+        event |= down <= levels
+        event |= up >= sign * trade['target_8r']
+    else:
+        if not trade['t1_exited']:
+            candidates = trail('t1_trail_stop', 't1_last_swing', 2, True)
+            levels = trail_levels(candidates, sign * trade['t1_trail_stop'])
+            trails.append(('t1_trail_stop', 't1_last_swing', candidates, levels))
+            event |= down <= levels
+        if not trade['t2_exited']:
+            candidates = trail('t2_trail_stop', 't2_last_swing', 4, True)
+            levels = trail_levels(candidates, sign * trade['t2_trail_stop'])
+            trails.append(('t2_trail_stop', 't2_last_swing', candidates, levels))
+            if remaining > cts_runner:
+                event |= down <= levels
+        if trade['t1_exited'] and trade['t2_exited']:
+            candidates = trail('runner_stop', 'runner_last_swing', 6, True)
+            levels = trail_levels(candidates, sign * trade['runner_stop'])
+            trails.append(('runner_stop', 'runner_last_swing', candidates, levels))
+            event |= down <= levels
+
+    # Option C: fixed T2 target
+    if params['t2_fixed_r'] > 0 and not trade['t2_exited']:
+        t2_target = (trade['entry_price'] + (params['t2_fixed_r'] * trade['risk']) if is_long
+                     else trade['entry_price'] - (params['t2_fixed_r'] * trade['risk']))
+        event |= up >= sign * t2_target
+
+    # Opposing FVG exit: first bar whose all_bars index reaches a qualifying FVG
+    if params['opposing_fvg_exit'] and trade['t1_exited']:
+        trigger_met = trade['touched_8r'] if params['opposing_fvg_after_6r_only'] else trade['touched_4r']
+        if trigger_met:
+            created = opp_created['BEARISH' if is_long else 'BULLISH']
+            entry_all_idx = arrays['all_idx'][trade['entry_bar_idx']]
+            k = np.searchsorted(created, entry_all_idx, side='right')
+            if k < len(created):
+                event |= arrays['all_idx'][start:] >= created[k]
+
+    k = first_true(event)
+    end = n - start if k < 0 else k
+    for field, last_field, candidates, levels in trails:
+        _advance_trail(trade, field, last_field, swing, levels, candidates, sign, end)
+    return n if k < 0 else start + k
+
+
+def replay_trades_vectorized(session_bars, entries, params, opp_fvgs, session_to_all_idx,
+                             arrays=None, opp_created=None):
+    """Trade management with the exit kernel.
+
+    Same result as calling manage_trades_on_bar() on every session bar.
+
+    Trades do not interact once open, so each admitted trade is simulated
+    to its exit straight away: _next_trade_event() jumps to the next bar
+    where a target, stop, trail stop or opposing FVG can fire, and only
+    that bar runs through manage_trade_on_bar(). Entries are admitted in
+    bar order against the loss counters and open count as of their bar.
+
+    Args:
+        arrays: _exit_arrays() of the session (computed if None)
+        opp_created: _opposing_fvg_index() of opp_fvgs (computed if None
+            and the opposing FVG exit is on)
+
+    Returns:
+        Trade state (new_trade_state() layout) after the last session bar.
+    """
+    n = len(session_bars)
+    if entries and arrays is None:
+        arrays = _exit_arrays(session_bars, session_to_all_idx)
+    if entries and opp_created is None and params['opposing_fvg_exit']:
+        opp_created = _opposing_fvg_index(opp_fvgs, params)
+
+    state = new_trade_state()
+    trades = []         # Admitted trades, in entry order
+    exit_bars = []      # Bar each trade closed on (None = open at EOD)
+    pending = []        # Heap of (exit bar, trade number) not yet removed
+    open_count = 0
+
+    def close_through(bar_idx):
+        # Same bookkeeping as the per-bar loop: STOPs count as losses on
+        # their bar, then any trade closing at >= 0 resets the streak
+        nonlocal open_count
+        while pending and pending[0][0] <= bar_idx:
+            exit_bar = pending[0][0]
+            stops = 0
+            winner = False
+            while pending and pending[0][0] == exit_bar:
+                _, k = heapq.heappop(pending)
+                trade = trades[k]
+                if any(e['type'] == 'STOP' for e in trade['exits']):
+                    stops += 1
+                    state['loss_count'][trade['direction']] += 1
+                    if 'BOS' in trade.get('entry_type', ''):
+                        state['bos_loss_count'] += 1
+                if sum(e['pnl'] for e in trade['exits']) >= 0:
+                    winner = True
+                open_count -= 1
+            state['global_consec_losses'] += stops
+            if winner:
+                state['global_consec_losses'] = 0
+
+    for entry in sorted(entries, key=lambda e: e['entry_bar_idx']):
+        i = entry['entry_bar_idx']
+        close_through(i)
+
+        trade = open_trade(entry, i, state, open_count, params)
+        if trade is None:
+            continue
+        state['entries_taken'][trade['direction']] += 1
+        open_count += 1
+
+        exit_bar = None
+        bar_idx = i + 1
+        while bar_idx < n:
+            bar_idx = _next_trade_event(trade, bar_idx, arrays, params, opp_created)
+            if bar_idx >= n:
+                break
+            manage_trade_on_bar(trade, bar_idx, session_bars, params, opp_fvgs, session_to_all_idx)
+            if trade['remaining'] <= 0:
+                exit_bar = bar_idx
+                break
+            bar_idx += 1
+
+        if exit_bar is not None:
+            heapq.heappush(pending, (exit_bar, len(trades)))
+        trades.append(trade)
+        exit_bars.append(exit_bar)
+    close_through(n)
+
+    # Closed trades in the order the per-bar loop completes them
+    closed = sorted((k for k in range(len(trades)) if exit_bars[k] is not None), key=lambda k: (exit_bars[k], k))
+    state['completed_results'] = [trades[k] for k in closed]
+    state['active_trades'] = [t for t, exit_bar in zip(trades, exit_bars) if exit_bar is None]
+    return state
+
+
 def run_today_v10(symbol='ES', contracts=3, max_open_trades=3, min_risk_pts=None,
                   enable_creation=True, enable_retracement=True, enable_bos=True,
                   interval='3m', retracement_morning_only=False, retracement_trend_aligned=False,
@@ -12,6 +12,7 @@ import time
 from datetime import datetime
 import yfinance as yf
 
+from core.bar_ingest import bars_from_dataframe
 from core.types import Bar
 from runners.run_today import calculate_ema, calculate_adx, is_in_killzone
 
@@ -31,21 +32,7 @@ def fetch_bars(yf_symbol: str, name: str) -> list[Bar]:
     if df is None or len(df) == 0:
         return []
 
-    bars = []
-    for idx, row in df.iterrows():
-        bar = Bar(
-            timestamp=idx.to_pydatetime().replace(tzinfo=None),
-            open=float(row['Open']),
-            high=float(row['High']),
-            low=float(row['Low']),
-            close=float(row['Close']),
-            volume=int(row['Volume']),
-            symbol=name,
-            timeframe='5m'
-        )
-        bars.append(bar)
-
-    return bars
+    return bars_from_dataframe(df, symbol=name, timeframe='5m', strip_tz=True)
 
 
 def analyze_market(bars: list[Bar], name: str) -> dict:
@@ -4,16 +4,19 @@ CLI script to backfill local bar storage with current TradingView data.
 Usage:
     python -m runners.save_bars ES NQ MES MNQ
     python -m runners.save_bars ES          # single symbol
+    python -m runners.save_bars ES --csv    # also export per-day CSVs
 """
 import sys
 sys.path.insert(0, '.')
 
 from runners.tradingview_loader import fetch_futures_bars
-from runners.bar_storage import save_daily_bars
+from runners.bar_storage import save_daily_bars, export_csv_bars
 
 
 def main():
-    symbols = sys.argv[1:] if len(sys.argv) > 1 else ['ES', 'NQ', 'MES', 'MNQ']
+    args = sys.argv[1:]
+    export_csv = '--csv' in args
+    symbols = [a for a in args if not a.startswith('--')] or ['ES', 'NQ', 'MES', 'MNQ']
 
     for symbol in symbols:
         print(f"Fetching {symbol} 3m bars from TradingView...")
@@ -27,11 +30,15 @@ def main():
 
         created = save_daily_bars(symbol, bars)
         if created:
-            print(f"  Saved {len(created)} new CSV files")
-            for p in created:
-                print(f"    {p}")
+            print(f"  Saved {len(created)} new dates")
+            for d in created:
+                print(f"    {d}")
         else:
-            print(f"  All dates already saved (no new files)")
+            print(f"  All dates already saved (nothing new)")
+
+        if export_csv:
+            written = export_csv_bars(symbol)
+            print(f"  Exported {len(written)} CSV files")
         print()
 
     print("Done.")
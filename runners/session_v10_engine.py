@@ -0,0 +1,622 @@
+"""
+Streaming V10 session engine.
+
+run_session_v10() replays the whole session from 4:00 AM on every call:
+it re-detects every FVG over all_bars, re-evaluates every rejection and
+BOS candidate and re-simulates every exit. The live loop calls it every
+3 minutes, so each scan costs O(session x history).
+
+SessionV10Engine keeps that work as state and advances it one bar at a
+time:
+    - IndicatorSeries grows by one bar (constant time)
+    - only unmitigated FVGs are checked for mitigation; new FVGs come from
+      the last three bars
+    - entry candidates are looked for on the new bar only, and judged by
+      the same creation_entry / retrace_entry / bos_retrace_entry
+      functions run_session_v10 uses
+    - trade management steps the open trades through the new bar
+
+Parity contract: after on_bar() has been called for every bar of
+all_bars (session and non-session alike), results() equals
+
+    run_session_v10(session_bars, all_bars, **kwargs)
+
+for the same kwargs, where session_bars are the bars of session_date
+between session_start and session_end (the live scanner's filter).
+
+run_session_v10 also judges entries with information from the whole
+prefix: FVG mitigation at the last bar, the duplicate check across entry
+types, the avg body of the first 50 session bars and the daily trend bias.
+The engine keeps that verdict per candidate and only re-judges the bars a
+change can reach. A duplicate is within 2 bars, so a changed entry on bar
+k re-judges the retracement candidates of bars k-2..k+2 and the change
+stops spreading as soon as a bar's verdicts stay the same. Mitigating an
+FVG re-judges the bars of its own candidates. The BOS entries (a few per
+session) are re-picked only when their FVGs, their candidates or an entry
+next to one of them change. A typical bar therefore costs the candidate
+search on that bar plus O(1) bookkeeping. The exceptions are the first 50
+session bars, where avg body changes re-judge every creation entry, and
+the first 120, where a trend bias flip re-judges every retracement.
+
+If an entry the trades were already stepped through changes, trade
+management restarts from the checkpoint taken before the last entry bar
+at or before the change (not from 4:00) and on_bar() reports
+revised=True.
+
+LiveTrader does not use the engine: its bars end with the still-forming
+bar, which changes between scans, and the engine only appends bars.
+
+Usage:
+    engine = SessionV10Engine(today, history_bars, **get_session_v10_kwargs('ES'))
+    for bar in closed_bars:
+        update = engine.on_bar(bar)
+        for trade in update['entries']: ...
+        for exit in update['exits']: ...
+    results = engine.results()
+"""
+from __future__ import annotations
+
+import heapq
+import inspect
+import math
+from bisect import bisect_right, insort
+from datetime import date, time as dt_time
+
+from core.swing_index import SwingIndex
+from core.types import Bar
+from runners.run_v10_dual_entry import (
+    EXIT_PARAM_NAMES,
+    IndicatorSeries,
+    bos_retrace_entry,
+    build_session_results,
+    calculate_ema,
+    copy_trade_state,
+    creation_entry,
+    detect_bos,
+    is_duplicate_entry,
+    manage_trades_on_bar,
+    new_trade_state,
+    retrace_entry,
+    run_session_v10,
+)
+from strategies.ict.signals.fvg import (
+    detect_fvg_on_bar,
+    detect_fvgs,
+    update_all_fvg_mitigations,
+    update_fvg_mitigation,
+)
+
+
+RTH_START = dt_time(9, 30)
+MORNING_END = dt_time(12, 0)
+DIRECTIONS = ('LONG', 'SHORT')
+
+# run_session_v10 keyword defaults (everything after session_bars/all_bars,
+# minus the batch-only precomputed cache)
+_DEFAULT_PARAMS = {
+    name: p.default
+    for name, p in inspect.signature(run_session_v10).parameters.items()
+    if p.default is not inspect.Parameter.empty and name != 'precomputed'
+}
+
+
+def _entry_key(entry):
+    """Fields of an entry that trade management depends on."""
+    if entry is None:
+        return None
+    return (entry['entry_bar_idx'], entry['direction'], entry['entry_type'], entry['entry_time'],
+            entry['entry_price'], entry['stop_price'], entry['fvg_low'], entry['fvg_high'])
+
+
+def _direction(fvg) -> str:
+    return 'LONG' if fvg.direction == 'BULLISH' else 'SHORT'
+
+
+class SessionV10Engine:
+    """
+    Stateful, bar-by-bar run_session_v10.
+
+    Args:
+        session_date: Trading date of the session.
+        history_bars: Bars before the first streamed bar (prior days,
+            overnight). Bars of the session itself may be included; they
+            are replayed through on_bar().
+        session_start, session_end: Session window on session_date
+            (default 4:00-16:00, same as LiveTrader's scan filter).
+        **kwargs: run_session_v10 keyword arguments
+            (e.g. get_session_v10_kwargs(symbol)).
+    """
+
+    def __init__(
+        self,
+        session_date: date,
+        history_bars: list[Bar] = (),
+        session_start: dt_time = dt_time(4, 0),
+        session_end: dt_time = dt_time(16, 0),
+        **kwargs,
+    ):
+        unknown = set(kwargs) - set(_DEFAULT_PARAMS)
+        if unknown:
+            raise TypeError(f"SessionV10Engine got unexpected keyword arguments: {sorted(unknown)}")
+        self.params = {**_DEFAULT_PARAMS, **kwargs}
+        self.session_date = session_date
+        self.session_start = session_start
+        self.session_end = session_end
+
+        p = self.params
+        self.tick_size = p['tick_size']
+        self.fvg_config = {
+            'min_fvg_ticks': 2,  # Lower threshold to catch smaller overnight FVGs
+            'tick_size': self.tick_size,
+            'max_fvg_age_bars': 200,  # Extended for overnight FVGs
+            'invalidate_on_close_through': True,
+            'fvg_mode': p['fvg_mode'],
+        }
+        opp_mode = p['opposing_fvg_mode'] or p['fvg_mode']
+        self._opp_config = None
+        if p['opposing_fvg_exit'] and opp_mode != p['fvg_mode']:
+            self._opp_config = {**self.fvg_config, 'fvg_mode': opp_mode}
+        self._exit_params = {name: p[name] for name in EXIT_PARAM_NAMES}
+        self._bos_enabled = p['enable_bos_entry'] and not p['disable_bos_retrace']
+
+        # Bars and index maps
+        self.all_bars: list[Bar] = []
+        self.session_bars: list[Bar] = []
+        self.session_to_all_idx: dict[int, int] = {}
+        self.all_to_session_idx: dict[int, int] = {}
+        self._session_swings = SwingIndex(2)  # Swings of session_bars for detect_bos
+        self._indicators = IndicatorSeries()
+        self.indicators = self._indicators.series
+
+        # FVG state
+        self.all_fvgs = []
+        self.opp_fvgs = self.all_fvgs if self._opp_config is None else []
+        self._unmitigated = []
+        self._overnight_open = []       # Unmitigated FVGs created before 9:30 (any day)
+        self._session_rth_fvgs = []     # Unmitigated (session_idx, fvg) created at/after 9:30 today
+        self._rth_session_idx = []      # Session indices eligible for retracement entries
+
+        # Entry Type A: one record per session FVG, judged again while avg body changes
+        self._creation = []             # {'fvg', 'session_idx', 'entry'}
+        self._creation_judged = 0       # Records judged with the current avg body
+        self._creation_at = {d: {} for d in DIRECTIONS}  # entry_bar_idx -> entry
+        self._avg_body = None
+
+        # Entry Type B: candidates that passed retrace_entry, with their current verdict
+        self._retrace_at = {d: {} for d in DIRECTIONS}   # bar -> [{'key', 'entry', 'accepted'}]
+        self._retrace_by_fvg = {}       # id(fvg) -> candidates, re-judged when it is mitigated
+        self._dirty = {d: [] for d in DIRECTIONS}        # Heaps of bars to re-judge
+        self._dirty_set = {d: set() for d in DIRECTIONS}
+        self._expected_dir = None       # Trend alignment (None = both directions)
+
+        # Entry Type C
+        self._bos_events = {}           # session_idx -> 'BULLISH'/'BEARISH'
+        self._bos_fvg_at = {}           # session_idx -> FVG big enough for a BOS entry
+        self._bos_by_price = {}         # (low, high) -> (bos_idx, created_idx, fvg, session_idx)
+        self._bos_winners = []          # run_session_v10's bos_fvgs, same order
+        self._bos_candidates = {}       # fvg session_idx -> [entry, ...] in bar order
+        self._bos_at = {}               # (direction, bar) -> picked entries
+        self._bos_open = set()          # BOS FVGs without an entry in the last pick
+        self._bos_watch = set()         # Bars the last pick looked at
+        self._bos_dirty = False
+
+        # Trade management
+        self._trade_state = new_trade_state()
+        self._sim_next = 0              # Session bars already stepped
+        self._checkpoints = []          # (bar, state before stepping it), bars with entries
+        self._changed_from = math.inf   # First bar whose entries changed since the last step
+        self.replays = 0
+
+        history_bars = list(history_bars)
+        split = next((k for k, b in enumerate(history_bars) if self._in_session(b)), len(history_bars))
+        self._load_history(history_bars[:split])
+        for bar in history_bars[split:]:
+            self.on_bar(bar)
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def on_bar(self, bar: Bar) -> dict:
+        """
+        Process one closed bar.
+
+        Returns:
+            Dict with 'entries' (trades opened on this bar), 'exits' (exit
+            records filled on this bar, tagged with the trade's direction /
+            entry_type / entry_time) and 'revised' (True if earlier results
+            changed and trade management was replayed).
+        """
+        if self.all_bars and bar.timestamp <= self.all_bars[-1].timestamp:
+            raise ValueError(f"Bars must arrive in timestamp order ({bar.timestamp} <= {self.all_bars[-1].timestamp})")
+
+        p = self.params
+        j = len(self.all_bars)
+        self.all_bars.append(bar)
+        self._indicators.append(bar)
+
+        i = None
+        if self._in_session(bar):
+            i = len(self.session_bars)
+            self.session_bars.append(bar)
+            self._session_swings.append(bar.high, bar.low)
+            self.session_to_all_idx[i] = j
+            self.all_to_session_idx[j] = i
+
+        for fvg in self._update_mitigations(bar, j):
+            for cand in self._retrace_by_fvg.get(id(fvg), ()):
+                if cand['accepted']:
+                    self._push(cand['entry']['direction'], cand['entry']['entry_bar_idx'])
+
+        fvg = detect_fvg_on_bar(self.all_bars, self.fvg_config)
+        if fvg:
+            self._add_fvg(fvg)
+        if self._opp_config is not None:
+            opp = detect_fvg_on_bar(self.all_bars, self._opp_config)
+            if opp:
+                self.opp_fvgs.append(opp)
+
+        if i is not None:
+            if p['enable_creation_entry']:
+                self._update_creation(i)
+            if p['enable_retracement_entry']:
+                if p['retracement_trend_aligned']:
+                    self._update_trend()
+                self._scan_retracements(i)
+            if self._bos_enabled:
+                self._scan_bos(i)
+
+        self._judge_dirty_retracements()
+        if self._bos_dirty:
+            self._pick_bos_entries()
+        return self._advance(i)
+
+    def results(self) -> list[dict]:
+        """run_session_v10 result list for the bars seen so far (open trades closed EOD)."""
+        if not self.session_bars:
+            return []
+        p = self.params
+        return build_session_results(copy_trade_state(self._trade_state), self.session_bars,
+                                     p['tick_size'], p['tick_value'], p['contracts'])
+
+    @property
+    def open_trades(self) -> list[dict]:
+        """Trades still being managed (live view, do not mutate)."""
+        return self._trade_state['active_trades']
+
+    # -------------------------------------------------------------------------
+    # Bars / FVGs
+    # -------------------------------------------------------------------------
+
+    def _in_session(self, bar: Bar) -> bool:
+        ts = bar.timestamp
+        return ts.date() == self.session_date and self.session_start <= ts.time() <= self.session_end
+
+    def _load_history(self, bars: list[Bar]) -> None:
+        """Bulk-load pre-session bars (array kernels instead of per-bar updates)."""
+        if not bars:
+            return
+        self.all_bars.extend(bars)
+        self._indicators.extend(bars)
+
+        fvgs = detect_fvgs(self.all_bars, self.fvg_config)
+        update_all_fvg_mitigations(fvgs, self.all_bars, self.fvg_config)
+        self.all_fvgs.extend(fvgs)
+        self._unmitigated = [f for f in fvgs if not f.mitigated]
+        self._overnight_open = [f for f in self._unmitigated
+                                if self.all_bars[f.created_bar_index].timestamp.time() < RTH_START]
+        if self._opp_config is not None:
+            self.opp_fvgs.extend(detect_fvgs(self.all_bars, self._opp_config))
+
+    def _update_mitigations(self, bar: Bar, j: int) -> list:
+        """Check the unmitigated FVGs against bar j and return the ones it mitigated."""
+        for fvg in self._unmitigated:
+            update_fvg_mitigation(fvg, bar, j, self.fvg_config)
+        mitigated = [f for f in self._unmitigated if f.mitigated]
+        if mitigated:
+            self._unmitigated = [f for f in self._unmitigated if not f.mitigated]
+            self._overnight_open = [f for f in self._overnight_open if not f.mitigated]
+            self._session_rth_fvgs = [(s, f) for s, f in self._session_rth_fvgs if not f.mitigated]
+        return mitigated
+
+    def _add_fvg(self, fvg) -> None:
+        p = self.params
+        self.all_fvgs.append(fvg)
+        self._unmitigated.append(fvg)
+        overnight = self.all_bars[fvg.created_bar_index].timestamp.time() < RTH_START
+
+        if overnight:
+            self._overnight_open.append(fvg)
+            # An overnight FVG formed after RTH bars were scanned (e.g. after
+            # midnight) also counts for those bars in run_session_v10
+            if self._rth_session_idx and p['enable_retracement_entry']:
+                for i in self._rth_session_idx:
+                    if self._morning_ok(self.session_bars[i]):
+                        self._add_retrace_candidate(i, fvg, _direction(fvg), group=0)
+
+        s = self.all_to_session_idx.get(fvg.created_bar_index)
+        if s is None:
+            return
+        if not overnight:
+            self._session_rth_fvgs.append((s, fvg))
+        if p['enable_creation_entry']:
+            self._creation.append({'fvg': fvg, 'session_idx': s, 'entry': None})
+        if self._bos_enabled and (fvg.high - fvg.low) / self.tick_size >= p['entry_min_fvg_ticks']:
+            self._bos_fvg_at[s] = fvg
+            for k in range(max(0, s - p['bos_fvg_window']), s + 1):
+                if self._bos_events.get(k) == fvg.direction:
+                    self._add_bos_fvg(k, fvg, s)
+                    break
+
+    # -------------------------------------------------------------------------
+    # Entry Type A: FVG Creation
+    # -------------------------------------------------------------------------
+
+    def _update_creation(self, i: int) -> None:
+        """Judge new creation records (all of them while the avg body changes)."""
+        body_sizes = [abs(b.close - b.open) for b in self.session_bars[:50]]
+        avg_body_size = sum(body_sizes) / len(body_sizes) if body_sizes else self.tick_size * 4
+        if avg_body_size != self._avg_body:
+            self._avg_body = avg_body_size
+            self._creation_judged = 0
+        for rec in self._creation[self._creation_judged:]:
+            self._judge_creation(rec)
+        self._creation_judged = len(self._creation)
+
+        # Confirmed creation entries for the previous bar's FVG become visible
+        if self.params['confirm_creation']:
+            for direction in DIRECTIONS:
+                if i in self._creation_at[direction]:
+                    self._entries_changed(direction, i, creation=True)
+
+    def _judge_creation(self, rec: dict) -> None:
+        entry, _ = creation_entry(rec['fvg'], rec['session_idx'], self.all_bars, self.indicators,
+                                  self._avg_body, self.params)
+        if _entry_key(entry) == _entry_key(rec['entry']):
+            return
+        rec['entry'] = entry
+        direction = _direction(rec['fvg'])
+        k = rec['session_idx'] + 1 if self.params['confirm_creation'] else rec['session_idx']
+        if entry is None:
+            self._creation_at[direction].pop(k, None)
+        else:
+            self._creation_at[direction][k] = entry
+        if k < len(self.session_bars):
+            self._entries_changed(direction, k, creation=True)
+
+    def _creation_near(self, direction: str, k: int) -> list[dict]:
+        """Visible creation entries that can be a duplicate of an entry on bar k."""
+        n = len(self.session_bars)
+        at = self._creation_at[direction]
+        return [at[b] for b in range(k - 2, min(k + 3, n)) if b in at]
+
+    # -------------------------------------------------------------------------
+    # Entry Type B: FVG Retracement + Rejection
+    # -------------------------------------------------------------------------
+
+    def _morning_ok(self, bar: Bar) -> bool:
+        return not self.params['retracement_morning_only'] or bar.timestamp.time() <= MORNING_END
+
+    def _update_trend(self) -> None:
+        """Daily trend bias as run_session_v10 sees it (final after 120 session bars)."""
+        n = len(self.session_bars)
+        if n > 121:
+            return
+        trend_bars = self.session_bars[:min(120, n - 1) + 1]
+        trend_ema20 = calculate_ema(trend_bars, 20)
+        trend_ema50 = calculate_ema(trend_bars, 50)
+        expected_dir = None
+        if trend_ema20 and trend_ema50:
+            expected_dir = 'LONG' if trend_ema20 > trend_ema50 else 'SHORT'
+        if expected_dir != self._expected_dir:
+            self._expected_dir = expected_dir
+            for direction in DIRECTIONS:
+                for k in self._retrace_at[direction]:
+                    self._push(direction, k)
+
+    def _scan_retracements(self, i: int) -> None:
+        """Entry Type B candidates on session bar i (overnight + intraday FVGs)."""
+        bar = self.session_bars[i]
+        if i < 1 or bar.timestamp.time() < RTH_START:
+            return
+        self._rth_session_idx.append(i)
+
+        for direction in DIRECTIONS:
+            fvg_dir = 'BULLISH' if direction == 'LONG' else 'BEARISH'
+            if self._morning_ok(bar):
+                for fvg in self._overnight_open:
+                    if fvg.direction == fvg_dir:
+                        self._add_retrace_candidate(i, fvg, direction, group=0)
+            # Intraday FVGs created at least 2 bars ago
+            for s, fvg in self._session_rth_fvgs:
+                if i - s >= 2 and fvg.direction == fvg_dir:
+                    self._add_retrace_candidate(i, fvg, direction, group=1)
+
+    def _add_retrace_candidate(self, i: int, fvg, direction: str, group: int) -> None:
+        entry, _ = retrace_entry(self.session_bars[i], i, self.session_to_all_idx[i], fvg, direction,
+                                 self.all_bars, self.indicators, self.params)
+        if entry is None:
+            return
+        # run_session_v10 checks overnight FVGs before intraday ones, each in creation order
+        cand = {'key': (group, fvg.created_bar_index), 'entry': entry, 'accepted': False}
+        insort(self._retrace_at[direction].setdefault(i, []), cand, key=lambda c: c['key'])
+        self._retrace_by_fvg.setdefault(id(fvg), []).append(cand)
+        self._push(direction, i)
+
+    def _accepted_retracements(self, direction: str, k: int) -> list[dict]:
+        return [c['entry'] for c in self._retrace_at[direction].get(k, ()) if c['accepted']]
+
+    def _push(self, direction: str, k: int) -> None:
+        """Queue the retracement candidates of bar k for judging."""
+        if k in self._retrace_at[direction] and k not in self._dirty_set[direction]:
+            self._dirty_set[direction].add(k)
+            heapq.heappush(self._dirty[direction], k)
+
+    def _judge_dirty_retracements(self) -> None:
+        """
+        Re-judge queued bars in bar order.
+
+        A bar's verdicts depend on the accepted entries of the two bars
+        before it, so a bar whose verdicts change queues the next two.
+        """
+        for direction in DIRECTIONS:
+            heap = self._dirty[direction]
+            while heap:
+                k = heapq.heappop(heap)
+                self._dirty_set[direction].discard(k)
+                if self._judge_retrace_bar(direction, k):
+                    self._entries_changed(direction, k)
+
+    def _judge_retrace_bar(self, direction: str, k: int) -> bool:
+        """Mitigation, trend and duplicate checks for the candidates of bar k. True if a verdict changed."""
+        accepted = (self._creation_near(direction, k)
+                    + self._accepted_retracements(direction, k - 2)
+                    + self._accepted_retracements(direction, k - 1))
+        trend_ok = self._expected_dir in (None, direction)
+        changed = False
+        for cand in self._retrace_at[direction][k]:
+            entry = cand['entry']
+            ok = (trend_ok and not entry['fvg'].mitigated
+                  and not is_duplicate_entry(accepted, entry['entry_price'], k, self.tick_size))
+            if ok:
+                accepted.append(entry)
+            if ok != cand['accepted']:
+                cand['accepted'] = ok
+                changed = True
+        return changed
+
+    # -------------------------------------------------------------------------
+    # Entry Type C: BOS + Session FVG Retracement
+    # -------------------------------------------------------------------------
+
+    def _scan_bos(self, i: int) -> None:
+        """BOS event on session bar i + retracement candidates into the BOS FVGs."""
+        p = self.params
+        bar = self.session_bars[i]
+
+        if i >= p['bos_lookback'] and bar.timestamp.time() >= RTH_START:
+            bos_dir, _ = detect_bos(self.session_bars, i, p['bos_lookback'], swings=self._session_swings)
+            if bos_dir is not None:
+                self._bos_events[i] = bos_dir
+                # Later FVGs look back for this event in _add_fvg; this bar's FVG is already in
+                fvg = self._bos_fvg_at.get(i)
+                if fvg is not None and fvg.direction == bos_dir:
+                    self._add_bos_fvg(i, fvg, i)
+
+        all_bar_idx = self.session_to_all_idx[i]
+        for _, _, fvg, s in self._bos_winners:
+            if s >= i:
+                continue
+            entry, _ = bos_retrace_entry(bar, i, all_bar_idx, fvg, self.all_bars, self.indicators, p)
+            if entry is None:
+                continue
+            self._bos_candidates.setdefault(s, []).append(entry)
+            if s in self._bos_open:
+                self._bos_dirty = True
+
+    def _add_bos_fvg(self, bos_idx: int, fvg, s: int) -> None:
+        """Track fvg for BOS event bos_idx unless an FVG at the same price was tracked first."""
+        winner = (bos_idx, fvg.created_bar_index, fvg, s)
+        price = (fvg.low, fvg.high)
+        current = self._bos_by_price.get(price)
+        if current is not None and current[:2] <= winner[:2]:
+            return
+        self._bos_by_price[price] = winner
+        self._bos_winners = sorted(self._bos_by_price.values(), key=lambda w: w[:2])
+        self._bos_dirty = True
+
+    def _pick_bos_entries(self) -> None:
+        """First non-duplicate candidate of each BOS FVG, in run_session_v10's order."""
+        self._bos_dirty = False
+        picked = {d: [] for d in DIRECTIONS}
+        bos_at = {}
+        self._bos_open = set()
+        self._bos_watch = set()
+        for bos_idx, _, fvg, s in self._bos_winners:
+            direction = _direction(fvg)
+            for cand in self._bos_candidates.get(s, ()):
+                k = cand['entry_bar_idx']
+                self._bos_watch.add(k)
+                near = (self._creation_near(direction, k) + picked[direction]
+                        + [e for b in range(k - 2, k + 3) for e in self._accepted_retracements(direction, b)])
+                if is_duplicate_entry(near, cand['entry_price'], k, self.tick_size):
+                    continue
+                entry = {**cand, 'bos_bar_idx': bos_idx}
+                picked[direction].append(entry)
+                bos_at.setdefault((direction, k), []).append(entry)
+                break  # Only one entry per BOS FVG
+            else:
+                self._bos_open.add(s)
+
+        def keys(entries):
+            return [(_entry_key(e), e['bos_bar_idx']) for e in entries]
+
+        for direction, k in bos_at.keys() | self._bos_at.keys():
+            if keys(bos_at.get((direction, k), ())) != keys(self._bos_at.get((direction, k), ())):
+                self._changed_from = min(self._changed_from, k)
+        self._bos_at = bos_at
+
+    # -------------------------------------------------------------------------
+    # Trade management
+    # -------------------------------------------------------------------------
+
+    def _entries_changed(self, direction: str, k: int, creation: bool = False) -> None:
+        """The valid entries of bar k changed: queue the duplicate checks they take part in."""
+        self._changed_from = min(self._changed_from, k)
+        # Retracements are checked against creation entries on both sides
+        # but only against earlier retracements
+        for b in range(k - 2 if creation else k + 1, k + 3):
+            self._push(direction, b)
+        if any(b in self._bos_watch for b in range(k - 2, k + 3)):
+            self._bos_dirty = True
+
+    def _entries_at(self, k: int) -> list[dict]:
+        """run_session_v10's valid entries for session bar k, in its order."""
+        entries = []
+        for direction in DIRECTIONS:
+            creation = self._creation_at[direction].get(k)
+            if creation is not None:
+                entries.append(creation)
+            entries.extend(self._accepted_retracements(direction, k))
+            entries.extend(self._bos_at.get((direction, k), ()))
+        return entries
+
+    def _restore(self, k: int) -> None:
+        """Rewind trade management to the last checkpoint at or before bar k."""
+        pos = bisect_right(self._checkpoints, k, key=lambda c: c[0])
+        if pos:
+            self._sim_next, self._trade_state = self._checkpoints[pos - 1]
+            del self._checkpoints[pos - 1:]
+        else:
+            self._sim_next, self._trade_state = 0, new_trade_state()
+            self._checkpoints.clear()
+
+    def _advance(self, i: int | None) -> dict:
+        update = {'entries': [], 'exits': [], 'revised': False}
+        changed_from, self._changed_from = self._changed_from, math.inf
+        if changed_from < self._sim_next:
+            # Entries the trades were already stepped through changed
+            self._restore(changed_from)
+            self.replays += 1
+            update['revised'] = True
+
+        state = self._trade_state
+        for k in range(self._sim_next, len(self.session_bars)):
+            entries = self._entries_at(k)
+            if entries:
+                self._checkpoints.append((k, copy_trade_state(state)))
+            capture = k == i
+            if capture:
+                before = [(t, len(t['exits'])) for t in state['active_trades']]
+            manage_trades_on_bar(state, k, self.session_bars, entries,
+                                 self._exit_params, self.opp_fvgs, self.session_to_all_idx)
+            if capture:
+                for trade, count in before:
+                    for exit_ in trade['exits'][count:]:
+                        update['exits'].append({'direction': trade['direction'], 'entry_type': trade['entry_type'],
+                                                'entry_time': trade['entry_time'], **exit_})
+                update['entries'] = [{**t, 'exits': list(t['exits'])}
+                                     for t in state['active_trades'] if t['entry_bar_idx'] == k]
+
+        self._sim_next = len(self.session_bars)
+        return update
@@ -10,18 +10,33 @@ Symbols:
 - RTY1! : E-mini Russell 2000 Futures (continuous)
 
 Exchange: CME_MINI
+
+Delta fetching: instead of re-pulling a fixed n_bars every cycle, keep the
+bars in a dict keyed by (symbol, interval) and let fetch_tail() request only
+the bars since the last one held, plus a small overlap so the forming bar
+(and any bar TradingView revised) is replaced:
+
+    cache = {}
+    bars = fetch_tail("ES", "3m", cache, max_bars=500)  # Full fetch (500)
+    bars = fetch_tail("ES", "3m", cache, max_bars=500)  # ~3 bars, merged
+
+fetch_timeframes() does the same for one 1m stream per symbol and derives
+every other timeframe from it (core.resample) instead of fetching each.
 """
 from __future__ import annotations
 
 import os
 import warnings
 import threading
-from datetime import datetime, date, time
+from bisect import bisect_left
+from datetime import datetime, date, time, timedelta
 from pathlib import Path
 
 from dotenv import load_dotenv
 from tvDatafeed import TvDatafeed, Interval
 
+from core.bar_ingest import bars_from_dataframe
+from core.resample import CME_SESSION, resample_bars
 from core.types import Bar
 
 # Load environment variables from config/.env
@@ -33,7 +48,7 @@ warnings.filterwarnings('ignore')
 # Interval mapping
 INTERVAL_MAP = {
     "1m": Interval.in_1_minute,
-    "2m": Interval.in_1_minute,  # Will aggregate 1m to 2m
+    "2m": Interval.in_1_minute,  # Will resample 1m to 2m
     "3m": Interval.in_3_minute,
     "5m": Interval.in_5_minute,
     "15m": Interval.in_15_minute,
@@ -43,6 +58,22 @@ INTERVAL_MAP = {
     "1d": Interval.in_daily,
 }
 
+# Bar length per interval (delta fetch sizing)
+INTERVAL_MINUTES = {
+    "1m": 1,
+    "2m": 2,
+    "3m": 3,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "4h": 240,
+    "1d": 1440,
+}
+
+# Bars before the last held bar re-requested by a delta fetch
+DELTA_OVERLAP_BARS = 2
+
 # Symbol mapping (clean name -> TradingView symbol)
 SYMBOL_MAP = {
     "ES": "ES1!",
@@ -71,6 +102,10 @@ STOCK_EXCHANGES = {
     "COIN": "NASDAQ",
 }
 
+# Exchanges trading the CME Globex session (18:00-17:00 ET)
+FUTURES_EXCHANGES = {"CME_MINI", "CME", "CBOT", "COMEX", "NYMEX"}
+
+
 def get_exchange(symbol: str) -> str:
     """Get exchange for a symbol."""
     sym = symbol.upper().replace("1!", "")
@@ -128,10 +163,10 @@ class TvDatafeedAuth(TvDatafeed):
         self.chart_session = self._TvDatafeed__generate_chart_session()
 
 
-# Global client singleton with thread lock
-_tv_client = None
+# One client per calling thread: TvDatafeed keeps its websocket on the
+# instance, so concurrent get_hist() calls must not share a client
+_tv_local = threading.local()
 _tv_client_lock = threading.Lock()
-_tv_client_created_at = None
 _TV_CLIENT_MAX_AGE = 300  # Recreate client every 5 minutes
 
 
@@ -139,47 +174,49 @@ def _get_tv_client(force_new: bool = False) -> TvDatafeed:
     """
     Get TvDatafeed client with saved session cookies.
 
-    Uses a singleton pattern with automatic refresh to avoid connection issues.
+    Uses a per-thread singleton with automatic refresh to avoid connection
+    issues (the live scanner fetches symbols from a thread pool).
     Tries to load session from browser login first, falls back to credentials.
     """
-    global _tv_client, _tv_client_created_at
-
-    with _tv_client_lock:
-        now = datetime.now()
-
-        # Check if we need a new client
-        need_new = (
-            force_new
-            or _tv_client is None
-            or _tv_client_created_at is None
-            or (now - _tv_client_created_at).total_seconds() > _TV_CLIENT_MAX_AGE
-        )
-
-        if need_new:
-            # Close existing websocket if any
-            if _tv_client is not None:
-                try:
-                    if hasattr(_tv_client, 'ws') and _tv_client.ws:
-                        _tv_client.ws.close()
-                except Exception:
-                    pass
-
+    now = datetime.now()
+    client = getattr(_tv_local, 'client', None)
+    created_at = getattr(_tv_local, 'created_at', None)
+
+    # Check if we need a new client
+    need_new = (
+        force_new
+        or client is None
+        or created_at is None
+        or (now - created_at).total_seconds() > _TV_CLIENT_MAX_AGE
+    )
+
+    if need_new:
+        # Close existing websocket if any
+        if client is not None:
+            try:
+                if hasattr(client, 'ws') and client.ws:
+                    client.ws.close()
+            except Exception:
+                pass
+
+        with _tv_client_lock:
             # Try saved browser session first
             auth_token = _get_auth_token_from_cookies()
             if auth_token:
-                _tv_client = TvDatafeedAuth(auth_token)
+                client = TvDatafeedAuth(auth_token)
             else:
                 # Fall back to username/password (may fail due to CAPTCHA)
                 tv_user = os.getenv("TV_USERNAME")
                 tv_pass = os.getenv("TV_PASSWORD")
                 if tv_user and tv_pass:
-                    _tv_client = TvDatafeed(username=tv_user, password=tv_pass)
+                    client = TvDatafeed(username=tv_user, password=tv_pass)
                 else:
-                    _tv_client = TvDatafeed()
+                    client = TvDatafeed()
 
-            _tv_client_created_at = now
+        _tv_local.client = client
+        _tv_local.created_at = now
 
-        return _tv_client
+    return client
 
 
 def _fetch_with_timeout(tv: TvDatafeed, symbol: str, exchange: str,
@@ -219,34 +256,6 @@ def _fetch_with_timeout(tv: TvDatafeed, symbol: str, exchange: str,
     return result[0]
 
 
-def _aggregate_bars(bars: list[Bar], target_minutes: int) -> list[Bar]:
-    """Aggregate bars to a larger timeframe."""
-    if not bars or target_minutes <= 1:
-        return bars
-
-    aggregated = []
-    chunk_size = target_minutes
-
-    for i in range(0, len(bars), chunk_size):
-        chunk = bars[i:i + chunk_size]
-        if not chunk:
-            continue
-
-        agg_bar = Bar(
-            timestamp=chunk[0].timestamp,
-            open=chunk[0].open,
-            high=max(b.high for b in chunk),
-            low=min(b.low for b in chunk),
-            close=chunk[-1].close,
-            volume=sum(b.volume for b in chunk),
-            symbol=chunk[0].symbol,
-            timeframe=f"{target_minutes}m",
-        )
-        aggregated.append(agg_bar)
-
-    return aggregated
-
-
 def fetch_futures_bars(
     symbol: str,
     interval: str = "3m",
@@ -276,12 +285,12 @@ def fetch_futures_bars(
 
     clean_symbol = symbol.upper().replace("1!", "").replace("=F", "")
 
-    # Handle 2m by fetching 1m and aggregating
-    aggregate_to = None
+    # Handle 2m by fetching 1m and resampling
+    resample_to = None
     if interval == "2m":
         tv_interval = Interval.in_1_minute
         n_bars = n_bars * 2  # Fetch more 1m bars
-        aggregate_to = 2
+        resample_to = "2m"
     else:
         tv_interval = INTERVAL_MAP.get(interval)
         if tv_interval is None:
@@ -314,28 +323,151 @@ def fetch_futures_bars(
         print(f"  No data returned for {tv_symbol}", flush=True)
         return []
 
-    # Convert to Bar objects
-    bars: list[Bar] = []
-    for idx, row in df.iterrows():
-        bar = Bar(
-            timestamp=idx.to_pydatetime(),
-            open=float(row["open"]),
-            high=float(row["high"]),
-            low=float(row["low"]),
-            close=float(row["close"]),
-            volume=int(row["volume"]) if row["volume"] else 0,
-            symbol=clean_symbol,
-            timeframe=interval,
-        )
-        bars.append(bar)
-
-    # Aggregate if needed (for 2m)
-    if aggregate_to:
-        bars = _aggregate_bars(bars, aggregate_to)
+    # Convert to Bar objects (column-wise, NaN volume -> 0)
+    bars = bars_from_dataframe(df, symbol=clean_symbol, timeframe=interval)
+
+    # Resample if needed (for 2m): clock-aligned buckets, CME session for futures
+    if resample_to:
+        session = CME_SESSION if exchange in FUTURES_EXCHANGES else None
+        bars = resample_bars(bars, resample_to, session=session)
 
     return bars
 
 
+def bars_to_cover(
+    last_ts: datetime,
+    interval: str,
+    overlap: int = DELTA_OVERLAP_BARS,
+    now: datetime | None = None,
+) -> int:
+    """
+    Bars a fetch must return to reach back to last_ts (inclusive) plus overlap.
+
+    Counts wall-clock bar slots from last_ts to now, so closed-market
+    stretches (maintenance break, weekend) are over-counted, never under.
+
+    Args:
+        last_ts: Timestamp of the last bar held (TradingView convention:
+            naive local time, or tz-aware).
+        interval: Bar interval (see INTERVAL_MINUTES).
+        overlap: Extra bars before last_ts to re-request.
+        now: Current time (default: now, in last_ts's timezone).
+    """
+    minutes = INTERVAL_MINUTES.get(interval)
+    if minutes is None:
+        raise ValueError(f"Invalid interval: {interval}. Valid: {list(INTERVAL_MINUTES.keys())}")
+    if now is None:
+        now = datetime.now(last_ts.tzinfo)
+    elapsed = max(now - last_ts, timedelta(0))
+    return elapsed // timedelta(minutes=minutes) + 1 + overlap
+
+
+def merge_tail(bars: list[Bar], tail: list[Bar]) -> list[Bar] | None:
+    """
+    Merge freshly fetched tail bars into held bars.
+
+    Tail bars replace every held bar from the tail's first timestamp on
+    (the forming bar and any revised bars) and extend the list.
+
+    Returns:
+        The merged list (bars is not modified), or None if the tail does not
+        start on a held bar - a gap, or bars on a different alignment - and
+        a full fetch is needed.
+    """
+    if not bars:
+        return None
+    if not tail:
+        return list(bars)
+    first = tail[0].timestamp
+    k = bisect_left(bars, first, key=lambda b: b.timestamp)
+    if k == len(bars) or bars[k].timestamp != first:
+        return None
+    return bars[:k] + tail
+
+
+def fetch_tail(
+    symbol: str,
+    interval: str,
+    cache: dict[tuple[str, str], list[Bar]],
+    max_bars: int = 500,
+    overlap: int = DELTA_OVERLAP_BARS,
+    timeout: int = 30,
+    now: datetime | None = None,
+) -> list[Bar]:
+    """
+    Fetch only the bars newer than the ones held in cache and merge them in.
+
+    cache maps (symbol, interval) to bars and is updated in place. With
+    nothing held, or when the tail cannot be merged (see merge_tail), it
+    falls back to a full fetch of max_bars. The held list is capped at the
+    last max_bars bars.
+
+    Args:
+        symbol: Symbol to fetch (ES, NQ, ...)
+        interval: Bar interval
+        cache: Caller-owned (symbol, interval) -> bars dict
+        max_bars: Full-fetch size and cap on the bars held
+        overlap: Bars before the last held bar to re-request
+        timeout: Timeout in seconds for each fetch attempt
+        now: Current time (for tests; default now)
+
+    Returns:
+        The held bars after the merge (the list stored in cache). On a
+        failed fetch, whatever was held before.
+    """
+    key = (symbol.upper(), interval)
+    held = cache.get(key)
+    if held:
+        n = min(bars_to_cover(held[-1].timestamp, interval, overlap, now), max_bars)
+        tail = fetch_futures_bars(symbol, interval=interval, n_bars=n, timeout=timeout)
+        if not tail:
+            return held
+        merged = merge_tail(held, tail)
+        if merged is not None:
+            cache[key] = merged[-max_bars:]
+            return cache[key]
+
+    bars = fetch_futures_bars(symbol, interval=interval, n_bars=max_bars, timeout=timeout)
+    if bars:
+        cache[key] = bars
+    return cache.get(key, [])
+
+
+def fetch_timeframes(
+    symbol: str,
+    timeframes: list[str],
+    cache: dict[tuple[str, str], list[Bar]],
+    max_bars: int = 5000,
+    timeout: int = 30,
+) -> dict[str, list[Bar]]:
+    """
+    Fetch one 1m stream and derive every timeframe from it locally.
+
+    The 1m bars are kept current in cache with fetch_tail() (so repeat calls
+    pull only the new minutes) and resampled on clock-aligned, session-aware
+    buckets (core.resample). History depth is limited to max_bars minutes:
+    fetch deep higher-timeframe history directly with fetch_futures_bars().
+    When the held minutes start partway through a bucket, that first bucket
+    is dropped rather than returned as a complete bar.
+
+    Args:
+        symbol: Symbol to fetch (ES, NQ, ...)
+        timeframes: Target timeframes ("1m", "3m", "5m", "1h", ...)
+        cache: Caller-owned cache (see fetch_tail)
+        max_bars: 1m bars to hold
+        timeout: Timeout in seconds for each fetch attempt
+
+    Returns:
+        timeframe -> bars (the last bar of each may still be forming)
+    """
+    bars_1m = fetch_tail(symbol, "1m", cache, max_bars=max_bars, timeout=timeout)
+    session = CME_SESSION if get_exchange(symbol) in FUTURES_EXCHANGES else None
+    return {
+        tf: list(bars_1m) if tf == "1m" else resample_bars(bars_1m, tf, session=session, drop_partial_first=True)
+        for tf in timeframes
+    }
+
+
 def fetch_rth_bars(
     symbol: str,
     interval: str = "3m",
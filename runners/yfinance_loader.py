@@ -10,6 +10,7 @@ Symbols:
 from __future__ import annotations
 import yfinance as yf
 from zoneinfo import ZoneInfo
+from core.bar_ingest import bars_from_dataframe
 from core.types import Bar
 
 # Eastern Time zone for futures trading
@@ -41,31 +42,12 @@ def fetch_futures_bars(
         print(f"No data returned for {symbol}")
         return []
 
-    bars = []
     # Map symbol to our format (ES=F -> ES)
     clean_symbol = symbol.replace("=F", "")
 
-    # Determine timeframe from interval
-    timeframe = interval
-
-    for idx, row in df.iterrows():
-        # yfinance returns timestamps in America/New_York already
-        # Just convert to naive datetime (strip timezone for simpler handling)
-        ts = idx.to_pydatetime().replace(tzinfo=None)
-
-        bar = Bar(
-            timestamp=ts,
-            open=float(row["Open"]),
-            high=float(row["High"]),
-            low=float(row["Low"]),
-            close=float(row["Close"]),
-            volume=int(row["Volume"]),
-            symbol=clean_symbol,
-            timeframe=timeframe
-        )
-        bars.append(bar)
-
-    return bars
+    # yfinance returns timestamps in America/New_York already
+    # Just convert to naive datetime (strip timezone for simpler handling)
+    return bars_from_dataframe(df, symbol=clean_symbol, timeframe=interval, strip_tz=True)
 
 
 def fetch_live_bars(
@@ -14,8 +14,11 @@ This file orchestrates the pipeline using the state machine.
 """
 
 import logging
+from collections import deque
 from typing import TYPE_CHECKING
 
+from core.bar_history import BarWindow
+from core.swing_index import SwingIndex
 from core.types import Direction, EntryType, Signal
 from strategies.base import Strategy
 from strategies.ict.filters.session import (
@@ -34,9 +37,8 @@ from strategies.ict.signals.bos import (
 )
 from strategies.ict.signals.fvg import (
     FVGZone,
-    DisplacementFVG,
+    DisplacementFVGTracker,
     check_fvg_entry,
-    check_retest_eligible,
     check_retest_entry,
     detect_displacement_fvg,
     detect_fvg_on_bar,
@@ -45,16 +47,14 @@ from strategies.ict.signals.fvg import (
 )
 from strategies.ict.signals.sweep import (
     KeyLiquidityLevels,
+    PriorSessionTracker,
     SessionLevels,
     SweepEvent,
     SwingPoint,
     calculate_key_levels,
     detect_sweep_at_key_levels,
     detect_sweep_on_bar,
-    find_swing_highs,
-    find_swing_lows,
     get_most_significant_sweep,
-    get_prior_session_levels,
 )
 from strategies.ict.signals.cisd import (
     CISDEvent,
@@ -185,7 +185,8 @@ class ICTStrategy(Strategy):
         self._trend_filter_mode: str = config.get("trend_filter_mode", "crossover")
         self._crossover_lookback_bars: int = config.get("crossover_lookback_bars", 10)
         self._current_ema: float | None = None
-        self._ema_history: list[float] = []  # Track EMA values for crossover detection
+        # Track EMA values for crossover detection
+        self._ema_history: deque[float] = deque(maxlen=self._crossover_lookback_bars + 10)
 
         # ICT Premium/Discount filter parameters
         self._enable_pd_filter: bool = config.get("enable_premium_discount_filter", False)
@@ -196,8 +197,18 @@ class ICTStrategy(Strategy):
         # State variables
         # -----------------------------------------------------------------
 
-        # Bar history for swing/level detection
-        self._bars: list["Bar"] = []
+        # Bar history for swing/level detection (max lookback + buffer)
+        self._max_history: int = self._lookback_bars * 3
+        self._bars: BarWindow = BarWindow(self._max_history)
+
+        # Running trend EMA over every bar (see _calculate_ema)
+        self._reset_ema()
+
+        # Prior session high/low of the bar history, kept per bar
+        self._prior_sessions = PriorSessionTracker(self._max_history)
+
+        # Confirmed swings of every bar seen (absolute bar numbers)
+        self._swing_index = SwingIndex(self._swing_left_bars, self._swing_right_bars)
 
         # Current session label (e.g., "NY_OPEN", "LONDON", "OFF")
         self.current_session: str = "OFF"
@@ -226,11 +237,13 @@ class ICTStrategy(Strategy):
         # Tracked zones
         # -----------------------------------------------------------------
 
-        # All detected FVG zones (updated each bar)
+        # Active FVG zones (updated each bar; mitigated and expired zones
+        # are dropped)
         self._all_fvgs: list[FVGZone] = []
 
-        # Displacement FVGs eligible for retest entries
-        self._displacement_fvgs: list[DisplacementFVG] = []
+        # Displacement FVGs awaiting a retest (created below, with the
+        # retest config)
+        self._displacement_fvgs: DisplacementFVGTracker
 
         # Pre-computed swing points (updated each bar)
         self._swing_highs: list[SwingPoint] = []
@@ -250,6 +263,16 @@ class ICTStrategy(Strategy):
         # List of (price, direction, bar_index) tuples
         self._recent_entries: list[tuple[float, str, int]] = []
 
+        # Detection configs (built once; the settings do not change per bar)
+        self._detection_config: dict = self._build_detection_config()
+        self._retest_config: dict = {
+            "tick_size": self._tick_size,
+            "retest_min_move_away_ticks": self._retest_min_move_away_ticks,
+            "retest_min_move_away_pct": self._retest_min_move_away_pct,
+            "retest_fvg_max_age_bars": self._retest_fvg_max_age_bars,
+        }
+        self._displacement_fvgs = DisplacementFVGTracker(self._retest_config, self._fvg_entry_mode)
+
     def reset_daily(self) -> None:
         """
         Reset all daily state at the start of a new trading day.
@@ -275,8 +298,11 @@ class ICTStrategy(Strategy):
         # Clear zones and history
         # -----------------------------------------------------------------
         self._all_fvgs = []
-        self._displacement_fvgs = []
-        self._bars = []
+        self._displacement_fvgs = DisplacementFVGTracker(self._retest_config, self._fvg_entry_mode)
+        self._bars = BarWindow(self._max_history)
+        self._reset_ema()
+        self._prior_sessions = PriorSessionTracker(self._max_history)
+        self._swing_index = SwingIndex(self._swing_left_bars, self._swing_right_bars)
         self._swing_highs = []
         self._swing_lows = []
         self._prior_session = None
@@ -344,29 +370,38 @@ class ICTStrategy(Strategy):
             "invalidate_on_close_through": self.config.get("invalidate_on_close_through", True),
         }
 
+    def _reset_ema(self) -> None:
+        """Restart the running trend EMA."""
+        self._ema_count: int = 0
+        self._ema_seed: float = 0
+        self._ema_value: float | None = None
+
+    def _update_ema(self, close: float) -> None:
+        """Advance the running trend EMA by one close."""
+        period = self._trend_ema_period
+        self._ema_count += 1
+        if self._ema_count <= period:
+            # Start with SMA for initial EMA
+            self._ema_seed += close
+            if self._ema_count == period:
+                self._ema_value = self._ema_seed / period
+        else:
+            # Standard EMA formula
+            multiplier = 2 / (period + 1)
+            self._ema_value = (close * multiplier) + (self._ema_value * (1 - multiplier))
+
     def _calculate_ema(self) -> float | None:
         """
-        Calculate Exponential Moving Average from bar history.
+        Exponential Moving Average of every bar since the last reset.
+
+        Kept up to date bar by bar (SMA seed, then the standard formula),
+        so this is O(1); until the bar history is first trimmed it equals
+        the EMA of the bars held.
 
         Returns:
             Current EMA value, or None if not enough bars.
         """
-        if len(self._bars) < self._trend_ema_period:
-            return None
-
-        closes = [b.close for b in self._bars]
-
-        # Calculate EMA using the standard formula
-        multiplier = 2 / (self._trend_ema_period + 1)
-
-        # Start with SMA for initial EMA
-        ema = sum(closes[:self._trend_ema_period]) / self._trend_ema_period
-
-        # Calculate EMA for remaining bars
-        for close in closes[self._trend_ema_period:]:
-            ema = (close * multiplier) + (ema * (1 - multiplier))
-
-        return ema
+        return self._ema_value
 
     def _check_trend_filter(self, direction: "Direction", current_price: float) -> bool:
         """
@@ -577,33 +612,54 @@ class ICTStrategy(Strategy):
         Update swing highs and lows from bar history.
 
         Called each bar to keep swing points current for sweep detection.
+        Reads the swing index on_bar keeps current instead of rescanning
+        the lookback window; same swings as find_swing_highs/lows on it.
         """
         if len(self._bars) < self._swing_left_bars + self._swing_right_bars + 1:
             return
 
-        # Use lookback window for swing detection
-        lookback_start = max(0, len(self._bars) - self._lookback_bars)
-        lookback_bars = self._bars[lookback_start:]
-
-        self._swing_highs = find_swing_highs(
-            lookback_bars, self._swing_left_bars, self._swing_right_bars
-        )
-        self._swing_lows = find_swing_lows(
-            lookback_bars, self._swing_left_bars, self._swing_right_bars
-        )
+        # Swings inside the lookback window (bar_index relative to its start).
+        # A swing needs its left bars inside the window too.
+        index = self._swing_index
+        offset = index.count - len(self._bars)  # Bar number of self._bars[0]
+        lookback_start = offset + max(0, len(self._bars) - self._lookback_bars)
+        first = lookback_start + self._swing_left_bars
+
+        self._swing_highs = [
+            SwingPoint(price=price, timestamp=self._bars[i - offset].timestamp,
+                       bar_index=i - lookback_start, swing_type="HIGH")
+            for i, price in index.highs(first)
+        ]
+        self._swing_lows = [
+            SwingPoint(price=price, timestamp=self._bars[i - offset].timestamp,
+                       bar_index=i - lookback_start, swing_type="LOW")
+            for i, price in index.lows(first)
+        ]
 
     def _update_fvg_mitigations(self, bar: "Bar", bar_index: int) -> None:
         """
         Update mitigation status for all tracked FVGs.
 
+        Zones that are mitigated (by price or by being used for an entry)
+        or older than max_fvg_age_bars can never become active again
+        (bar_index only grows between resets), so they are dropped here
+        and the list only holds zones get_active_fvgs can return.
+
         Args:
             bar: Current bar to check against.
             bar_index: Index of current bar.
         """
-        config = self._build_detection_config()
+        config = self._detection_config
+        max_age = self._max_fvg_age_bars
+        active = []
         for fvg in self._all_fvgs:
-            if not fvg.mitigated:
-                update_fvg_mitigation(fvg, bar, bar_index, config)
+            if fvg.mitigated:
+                continue
+            update_fvg_mitigation(fvg, bar, bar_index, config)
+            if fvg.mitigated or (max_age is not None and bar_index - fvg.created_bar_index > max_age):
+                continue
+            active.append(fvg)
+        self._all_fvgs = active
 
     def _calculate_stop_price(
         self,
@@ -762,16 +818,14 @@ class ICTStrategy(Strategy):
         # This must happen BEFORE trade limit check so history stays accurate.
         # -----------------------------------------------------------------
 
+        # History holds the last max lookback + buffer bars
         self._bars.append(bar)
+        self._swing_index.append(bar.high, bar.low)
+        self._swing_index.prune(self._swing_index.count - self._lookback_bars)
+        self._prior_sessions.append(bar)
+        self._update_ema(bar.close)
         current_bar_index = len(self._bars) - 1
 
-        # Trim history to max lookback + buffer
-        max_history = self._lookback_bars * 3
-        if len(self._bars) > max_history:
-            trim_count = len(self._bars) - max_history
-            self._bars = self._bars[trim_count:]
-            current_bar_index = len(self._bars) - 1
-
         # -----------------------------------------------------------------
         # STEP 1: CALCULATE KEY LEVELS (always, even if trade limit reached)
         # -----------------------------------------------------------------
@@ -869,31 +923,22 @@ class ICTStrategy(Strategy):
         # -----------------------------------------------------------------
         # STEP 2: UPDATE MARKET STRUCTURE
         # -----------------------------------------------------------------
-        # Compute swing points and prior session levels for sweep detection.
-        # These are pre-computed once per bar for efficiency.
+        # Prior session levels and the trend EMA are kept up to date as
+        # bars arrive; swing points are read off the swing index by the
+        # sweep detection that uses them.
         # -----------------------------------------------------------------
 
-        self._update_swing_points()
-
-        # Update EMA for trend filter
+        # Update EMA for trend filter (history is limited by its maxlen)
         if self._enable_trend_filter:
             self._current_ema = self._calculate_ema()
             if self._current_ema is not None:
                 self._ema_history.append(self._current_ema)
-                # Keep history limited
-                max_ema_history = self._crossover_lookback_bars + 10
-                if len(self._ema_history) > max_ema_history:
-                    self._ema_history = self._ema_history[-max_ema_history:]
 
         # Update prior session levels if we have enough history
         if len(self._bars) >= 2:
-            self._prior_session = get_prior_session_levels(
-                self._bars[:-1],  # Exclude current bar
-                bar,
-            )
+            self._prior_session = self._prior_sessions.levels()
 
-        # Build detection config
-        config = self._build_detection_config()
+        config = self._detection_config
 
         # -----------------------------------------------------------------
         # STEP 3: UPDATE FVG ZONES
@@ -929,16 +974,11 @@ class ICTStrategy(Strategy):
 
             if body_ticks >= self._retest_min_displacement_ticks:
                 # Strong displacement - check if it created an FVG
-                retest_config = {
-                    **config,
-                    "retest_min_move_away_ticks": self._retest_min_move_away_ticks,
-                    "retest_min_move_away_pct": self._retest_min_move_away_pct,
-                    "retest_fvg_max_age_bars": self._retest_fvg_max_age_bars,
-                }
+                retest_config = {**config, **self._retest_config}
                 disp_fvg = detect_displacement_fvg(self._bars, prev_bar_index, retest_config)
 
                 if disp_fvg:
-                    self._displacement_fvgs.append(disp_fvg)
+                    self._displacement_fvgs.add(disp_fvg)
                     logger.info(
                         f"ICTStrategy: Displacement FVG detected - "
                         f"{disp_fvg.displacement_direction} at "
@@ -947,16 +987,7 @@ class ICTStrategy(Strategy):
                     )
 
         # Update displacement FVGs - track price movement and eligibility
-        for disp_fvg in self._displacement_fvgs:
-            if not disp_fvg.fvg.mitigated:
-                disp_fvg.update_price_extremes(bar, current_bar_index)
-                retest_config = {
-                    "tick_size": self._tick_size,
-                    "retest_min_move_away_ticks": self._retest_min_move_away_ticks,
-                    "retest_min_move_away_pct": self._retest_min_move_away_pct,
-                    "retest_fvg_max_age_bars": self._retest_fvg_max_age_bars,
-                }
-                disp_fvg.retest_eligible = check_retest_eligible(disp_fvg, retest_config)
+        self._displacement_fvgs.update(bar, current_bar_index)
 
         # -----------------------------------------------------------------
         # STEP 4: LIQUIDITY SWEEP DETECTION (if enabled)
@@ -971,6 +1002,7 @@ class ICTStrategy(Strategy):
         # -----------------------------------------------------------------
 
         if self._require_sweep:
+            self._update_swing_points()
             sweeps: list[SweepEvent] = []
 
             # PROACTIVE: Check sweeps at pre-identified key levels first
@@ -1144,7 +1176,7 @@ class ICTStrategy(Strategy):
         # -----------------------------------------------------------------
 
         if self._enable_fvg_retest:
-            for disp_fvg in self._displacement_fvgs:
+            for disp_fvg in self._displacement_fvgs.retest_candidates(bar):
                 # Skip if already triggered or FVG already used
                 if disp_fvg.retest_triggered or disp_fvg.fvg.mitigated:
                     continue
@@ -1242,14 +1274,13 @@ class ICTStrategy(Strategy):
                         entry_fvg.mitigation_bar_index = current_bar_index
 
                         # Mark all overlapping displacement FVGs as triggered
-                        for other_fvg in self._displacement_fvgs:
-                            if not other_fvg.retest_triggered:
-                                # Check if FVGs overlap (within 2 ticks)
-                                overlap_threshold = 2 * self._tick_size
-                                if (abs(other_fvg.fvg.midpoint - entry_fvg.midpoint) < overlap_threshold
-                                    and other_fvg.displacement_direction == disp_fvg.displacement_direction):
-                                    other_fvg.retest_triggered = True
-                                    other_fvg.fvg.mitigated = True
+                        # (within 2 ticks)
+                        overlap_threshold = 2 * self._tick_size
+                        for other_fvg in self._displacement_fvgs.near_midpoint(
+                            entry_fvg.midpoint, overlap_threshold, disp_fvg.displacement_direction
+                        ):
+                            other_fvg.retest_triggered = True
+                            other_fvg.fvg.mitigated = True
 
                         # Only take one retest entry per bar
                         break
@@ -1538,6 +1569,7 @@ class ICTStrategy(Strategy):
         Returns:
             Dictionary with current state information.
         """
+        self._update_swing_points()
         return {
             "session": self.current_session,
             "has_traded_session": self.has_traded_session,
@@ -57,7 +57,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Literal
 
 from core.types import Bar
-from strategies.ict.signals.sweep import SwingPoint, find_swing_highs, find_swing_lows
+from strategies.ict.signals.sweep import SwingPoint, find_swing_highs, find_swing_lows, find_swing_points
 
 if TYPE_CHECKING:
     from strategies.ict.signals.sweep import SweepEvent
@@ -475,8 +475,7 @@ def detect_bos(
     lookback_bars_list = bars[lookback_start:-1]
 
     # Find all swing points in lookback window
-    swing_highs = find_swing_highs(lookback_bars_list, swing_left, swing_right)
-    swing_lows = find_swing_lows(lookback_bars_list, swing_left, swing_right)
+    swing_highs, swing_lows = find_swing_points(lookback_bars_list, swing_left, swing_right)
 
     # If sweep provided, only look for confirming BOS
     if sweep_event is not None:
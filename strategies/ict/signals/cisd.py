@@ -44,7 +44,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Literal
 
 from core.types import Bar
-from strategies.ict.signals.sweep import SwingPoint, find_swing_highs, find_swing_lows
+from strategies.ict.signals.sweep import SwingPoint, find_swing_points
 
 if TYPE_CHECKING:
     from strategies.ict.signals.sweep import SweepEvent
@@ -169,8 +169,7 @@ def detect_cisd(
     lookback_start = max(0, len(bars) - lookback)
     lookback_bars = bars[lookback_start:-1]
 
-    swing_highs = find_swing_highs(lookback_bars, swing_left, swing_right)
-    swing_lows = find_swing_lows(lookback_bars, swing_left, swing_right)
+    swing_highs, swing_lows = find_swing_points(lookback_bars, swing_left, swing_right)
 
     # Check for structure break with displacement
     broken_level = None
@@ -25,8 +25,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from core.swing_index import SwingIndexes
 from core.types import Bar
-from strategies.ict.signals.sweep import find_swing_highs, find_swing_lows
 
 
 # =============================================================================
@@ -283,41 +283,37 @@ def build_zigzag(
     bars: list[Bar],
     scale: int,
     rsi_values: list[float | None] | None = None,
+    swings: SwingIndexes | None = None,
 ) -> list[ZigzagPoint]:
     """
     Build alternating zigzag at given scale.
 
-    Uses find_swing_highs/lows with left_bars=scale, right_bars=1,
+    Uses the swing highs/lows with left_bars=scale, right_bars=1,
     merges chronologically, then enforces strict alternation (matching
     Pine's f_zzUpdate high-first logic).
+
+    swings: Optional SwingIndexes of bars, shared across scales.
     """
     if len(bars) < scale + 2:
         return []
 
-    highs = find_swing_highs(bars, left_bars=scale, right_bars=1)
-    lows = find_swing_lows(bars, left_bars=scale, right_bars=1)
+    if swings is None:
+        swings = SwingIndexes.from_bars(bars)
+    index = swings.get(scale, 1)
 
     # Merge into candidate list sorted by (bar_index, -direction)
     # so highs (+1) come before lows (-1) at the same bar index
     candidates: list[ZigzagPoint] = []
-    for sp in highs:
-        candidates.append(ZigzagPoint(
-            price=sp.price,
-            bar_index=sp.bar_index,
-            timestamp=sp.timestamp,
-            direction=1,
-            rsi=rsi_values[sp.bar_index] if rsi_values and sp.bar_index < len(rsi_values) else None,
-            volume=bars[sp.bar_index].volume if sp.bar_index < len(bars) else None,
-        ))
-    for sp in lows:
-        candidates.append(ZigzagPoint(
-            price=sp.price,
-            bar_index=sp.bar_index,
-            timestamp=sp.timestamp,
-            direction=-1,
-            rsi=rsi_values[sp.bar_index] if rsi_values and sp.bar_index < len(rsi_values) else None,
-            volume=bars[sp.bar_index].volume if sp.bar_index < len(bars) else None,
-        ))
+    for swing_points, direction in ((index.highs(), 1), (index.lows(), -1)):
+        for bar_index, price in swing_points:
+            candidates.append(ZigzagPoint(
+                price=price,
+                bar_index=bar_index,
+                timestamp=bars[bar_index].timestamp,
+                direction=direction,
+                rsi=rsi_values[bar_index] if rsi_values and bar_index < len(rsi_values) else None,
+                volume=bars[bar_index].volume,
+            ))
 
     # Sort: by bar_index ascending, then highs before lows at same bar
     candidates.sort(key=lambda p: (p.bar_index, -p.direction))
@@ -691,10 +687,11 @@ def detect_elliott_waves(
     rsi_values = _compute_rsi(closes, rsi_period)
     vol_sma_values = _compute_sma(volumes, vol_sma_period)
 
+    swings = SwingIndexes.from_bars(bars)
     seen: set[tuple[int, int, int]] = set()
 
     for scale in scales:
-        zigzag = build_zigzag(bars, scale, rsi_values)
+        zigzag = build_zigzag(bars, scale, rsi_values, swings)
         result.zigzags[scale] = zigzag
 
         if len(zigzag) < 6:
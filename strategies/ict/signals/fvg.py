@@ -59,12 +59,24 @@ Usage:
 
     fvgs = detect_fvgs(bars, config)
     active = get_active_fvgs(fvgs, current_bar_index, config)
+
+Array kernel:
+    detect_fvgs() and update_all_fvg_mitigations() delegate to
+    detect_fvg_arrays() / first_mitigation_indices(), which work on
+    high/low/open/close NumPy arrays and find every gap and its first
+    mitigation bar without a per-bar (or per-FVG-per-bar) Python loop.
+    Results are identical to the bar-by-bar functions.
 """
 
+import heapq
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Iterator, Literal
+
+import numpy as np
 
+from core.bar_frame import BarFrame
 from core.types import Bar
 
 if TYPE_CHECKING:
@@ -323,7 +335,7 @@ def _detect_fvg_at_index(
 
 
 def detect_fvgs(
-    bars: list[Bar],
+    bars: list[Bar] | BarFrame,
     config: dict,
 ) -> list[FVGZone]:
     """
@@ -333,7 +345,7 @@ def detect_fvgs(
     bars looking for both bullish and bearish FVG patterns.
 
     Args:
-        bars: List of Bar objects in chronological order.
+        bars: List of Bar objects (or a BarFrame) in chronological order.
               Must have at least 3 bars.
 
         config: Configuration dictionary with:
@@ -365,11 +377,34 @@ def detect_fvgs(
     if len(bars) < 3:
         return fvgs
 
-    # Scan for FVGs starting at index 2 (need bars at i-2, i-1, i)
-    for i in range(2, len(bars)):
-        fvg = _detect_fvg_at_index(bars, i, config)
-        if fvg:
-            fvgs.append(fvg)
+    tick_size = config.get("tick_size", 0.25)
+    fvg_mode = config.get("fvg_mode", "wick")
+    arrays = _bar_arrays(bars, ("open", "high", "low", "close") if fvg_mode == "body" else ("high", "low"))
+    hits = detect_fvg_arrays(
+        arrays["high"], arrays["low"],
+        open_=arrays.get("open"), close=arrays.get("close"),
+        min_gap=config.get("min_fvg_ticks", 1) * tick_size,
+        fvg_mode=fvg_mode,
+    )
+
+    # Scan results are in bar order (index 2 onward), same as a bar-by-bar scan
+    for i, is_bull, fvg_low, fvg_high in zip(
+        hits["index"].tolist(), (hits["direction"] > 0).tolist(),
+        hits["low"].tolist(), hits["high"].tolist(),
+    ):
+        gap_size = fvg_high - fvg_low
+        fvgs.append(FVGZone(
+            direction="BULLISH" if is_bull else "BEARISH",
+            low=fvg_low,
+            high=fvg_high,
+            midpoint=(fvg_high + fvg_low) / 2,
+            created_at=bars[i].timestamp,
+            created_bar_index=i,
+            metadata={
+                "gap_size": gap_size,
+                "gap_size_ticks": gap_size / tick_size,
+            },
+        ))
 
     return fvgs
 
@@ -472,7 +507,7 @@ def update_fvg_mitigation(
 
 def update_all_fvg_mitigations(
     fvgs: list[FVGZone],
-    bars: list[Bar],
+    bars: list[Bar] | BarFrame,
     config: dict,
 ) -> None:
     """
@@ -491,15 +526,218 @@ def update_all_fvg_mitigations(
         update_all_fvg_mitigations(fvgs, bars, config)
         active = [f for f in fvgs if not f.mitigated]
     """
-    for fvg in fvgs:
-        if fvg.mitigated:
+    pending = [fvg for fvg in fvgs if not fvg.mitigated]
+    if not pending or not bars:
+        return
+
+    invalidate_on_close = config.get("invalidate_on_close_through", True)
+    arrays = _bar_arrays(bars, ("close",) if invalidate_on_close else ("high", "low"))
+    mitigation = first_mitigation_indices(
+        np.array([fvg.created_bar_index for fvg in pending], dtype=np.int64),
+        np.array([1 if fvg.direction == "BULLISH" else -1 for fvg in pending], dtype=np.int8),
+        np.array([fvg.low for fvg in pending], dtype=np.float64),
+        np.array([fvg.high for fvg in pending], dtype=np.float64),
+        high=arrays.get("high"), low=arrays.get("low"), close=arrays.get("close"),
+        invalidate_on_close_through=invalidate_on_close,
+    )
+
+    # Check all bars after FVG creation (first hit wins)
+    for fvg, idx in zip(pending, mitigation.tolist()):
+        if idx >= 0:
+            fvg.mitigated = True
+            fvg.mitigation_bar_index = idx
+
+
+# =============================================================================
+# Array Kernel (vectorized detection + mitigation)
+# =============================================================================
+
+
+def _bar_arrays(bars: list[Bar] | BarFrame, fields: tuple[str, ...]) -> dict[str, np.ndarray]:
+    """Extract float64 price columns from a bar list (BarFrame columns are used as-is)."""
+    if isinstance(bars, BarFrame):
+        return {name: getattr(bars, name) for name in fields}
+    return {
+        name: np.fromiter((getattr(b, name) for b in bars), dtype=np.float64, count=len(bars))
+        for name in fields
+    }
+
+
+def _range_extreme_table(values: np.ndarray, use_min: bool) -> list[np.ndarray]:
+    """Sparse table: level k, position p holds min/max of values[p:p + 2**k]."""
+    reduce = np.minimum if use_min else np.maximum
+    table = [values]
+    width = 1
+    while width * 2 <= len(values):
+        prev = table[-1]
+        table.append(reduce(prev[:-width], prev[width:]))
+        width *= 2
+    return table
+
+
+def _first_crossing(
+    table: list[np.ndarray],
+    starts: np.ndarray,
+    thresholds: np.ndarray,
+    n: int,
+    at_or_below: bool,
+) -> np.ndarray:
+    """
+    For each query, first index >= start whose value crosses the threshold.
+
+    at_or_below=True finds the first value <= threshold (table of minima),
+    otherwise the first value >= threshold (table of maxima). Skips the
+    longest run of non-crossing values by binary descent over the sparse
+    table, so every query costs O(log n) array operations. Returns n where
+    no bar crosses.
+    """
+    pos = starts.copy()
+    for k in range(len(table) - 1, -1, -1):
+        width = 1 << k
+        level = table[k]
+        in_range = pos <= n - width
+        block = level[np.where(in_range, pos, 0)]
+        no_cross = block > thresholds if at_or_below else block < thresholds
+        pos = np.where(in_range & no_cross, pos + width, pos)
+    return pos
+
+
+def first_mitigation_indices(
+    created_index: np.ndarray,
+    direction: np.ndarray,
+    fvg_low: np.ndarray,
+    fvg_high: np.ndarray,
+    high: np.ndarray | None = None,
+    low: np.ndarray | None = None,
+    close: np.ndarray | None = None,
+    invalidate_on_close_through: bool = True,
+) -> np.ndarray:
+    """
+    First bar after creation that mitigates each FVG (vectorized).
+
+    Same rule as update_fvg_mitigation(): bullish FVGs are mitigated by
+    close <= low (or bar low <= low when invalidate_on_close_through is
+    False), bearish FVGs by close >= high (or bar high >= high).
+
+    Args:
+        created_index: Bar index each FVG was created at (int array).
+        direction: +1 for BULLISH, -1 for BEARISH.
+        fvg_low, fvg_high: FVG boundaries.
+        high, low, close: Bar price arrays (close is required when
+            invalidate_on_close_through, high/low otherwise).
+        invalidate_on_close_through: Require a close through the gap.
+
+    Returns:
+        int64 array of mitigation bar indices, -1 where never mitigated.
+    """
+    created_index = np.asarray(created_index, dtype=np.int64)
+    direction = np.asarray(direction)
+    result = np.full(len(created_index), -1, dtype=np.int64)
+    if len(created_index) == 0:
+        return result
+
+    if invalidate_on_close_through:
+        bull_values = bear_values = close
+    else:
+        bull_values, bear_values = low, high
+    n = len(bull_values)
+
+    for is_bull in (True, False):
+        mask = direction > 0 if is_bull else direction < 0
+        if not mask.any():
             continue
+        values = bull_values if is_bull else bear_values
+        thresholds = np.asarray(fvg_low if is_bull else fvg_high, dtype=np.float64)[mask]
+        table = _range_extreme_table(values, use_min=is_bull)
+        hit = _first_crossing(table, created_index[mask] + 1, thresholds, n, at_or_below=is_bull)
+        result[mask] = np.where(hit < n, hit, -1)
+
+    return result
+
+
+def detect_fvg_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    open_: np.ndarray | None = None,
+    close: np.ndarray | None = None,
+    min_gap: float = 0.25,
+    fvg_mode: str = "wick",
+    mitigation: bool = False,
+    invalidate_on_close_through: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Detect every bullish/bearish FVG from price arrays in one vectorized pass.
 
-        # Check all bars after FVG creation
-        for i in range(fvg.created_bar_index + 1, len(bars)):
-            update_fvg_mitigation(fvg, bars[i], i, config)
-            if fvg.mitigated:
-                break
+    Applies the same rules as detect_fvgs(): gap between bar[i-2] and bar[i]
+    on wicks (high/low) or bodies (open/close), at least min_gap wide,
+    bullish checked before bearish.
+
+    Args:
+        high, low: Bar high/low arrays.
+        open_, close: Bar open/close arrays (needed for body mode, and close
+            for close-through mitigation).
+        min_gap: Minimum gap size in price units (min_fvg_ticks * tick_size).
+        fvg_mode: "wick" (high/low) or "body" (open/close).
+        mitigation: Also compute each FVG's first mitigation bar index.
+        invalidate_on_close_through: Mitigation rule (see update_fvg_mitigation).
+
+    Returns:
+        Dict of equal-length arrays in bar order:
+            index: bar[i] index of each FVG
+            direction: +1 BULLISH, -1 BEARISH
+            low, high, midpoint: FVG zone
+            mitigation_index: first mitigation bar, -1 if none (only when
+                mitigation=True)
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+
+    if len(high) < 3:
+        empty_f = np.empty(0, dtype=np.float64)
+        hits = {
+            "index": np.empty(0, dtype=np.int64),
+            "direction": np.empty(0, dtype=np.int8),
+            "low": empty_f, "high": empty_f, "midpoint": empty_f,
+        }
+        if mitigation:
+            hits["mitigation_index"] = np.empty(0, dtype=np.int64)
+        return hits
+
+    if fvg_mode == "body":
+        open_ = np.asarray(open_, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        body_top = np.maximum(open_, close)
+        body_bottom = np.minimum(open_, close)
+        bull_low, bull_high = body_top[:-2], body_bottom[2:]
+        bear_low, bear_high = body_top[2:], body_bottom[:-2]
+    else:
+        bull_low, bull_high = high[:-2], low[2:]
+        bear_low, bear_high = high[2:], low[:-2]
+
+    is_bull = ~((bull_high - bull_low) < min_gap)
+    is_bear = ~is_bull & ~((bear_high - bear_low) < min_gap)
+    found = np.flatnonzero(is_bull | is_bear)
+    bull_hit = is_bull[found]
+
+    zone_low = np.where(bull_hit, bull_low[found], bear_low[found])
+    zone_high = np.where(bull_hit, bull_high[found], bear_high[found])
+    hits = {
+        "index": (found + 2).astype(np.int64),
+        "direction": np.where(bull_hit, 1, -1).astype(np.int8),
+        "low": zone_low,
+        "high": zone_high,
+        "midpoint": (zone_high + zone_low) / 2,
+    }
+
+    if mitigation:
+        hits["mitigation_index"] = first_mitigation_indices(
+            hits["index"], hits["direction"], zone_low, zone_high,
+            high=high, low=low,
+            close=None if close is None else np.asarray(close, dtype=np.float64),
+            invalidate_on_close_through=invalidate_on_close_through,
+        )
+
+    return hits
 
 
 # =============================================================================
@@ -990,3 +1228,213 @@ def check_retest_entry(
         # Bullish: price retracing DOWN into the FVG for LONG entry
         # Entry when bar.low reaches entry level
         return bar.low <= entry_level
+
+
+class DisplacementFVGTracker:
+    """
+    Displacement FVGs awaiting a retest, kept up to date bar by bar.
+
+    Gives the same results as calling update_price_extremes() and
+    check_retest_eligible() on every tracked FVG each bar, then
+    check_retest_entry() on every eligible one, without touching the FVGs
+    a bar cannot change:
+
+    - An FVG's age only changes when bar_index advances. While it does
+      not (the same bar_index again, as on a strategy whose bar history
+      is full), an eligible FVG stays eligible - price can only have
+      moved further away - and an ineligible one can only become
+      eligible on a bar that extends its max (bearish) / min (bullish)
+      price after displacement.
+    - Eligible FVGs are kept sorted by entry level, so the FVGs a bar
+      reaches are a bisect away.
+
+    FVGs that can never trigger again (retest triggered, FVG used, or
+    older than retest_fvg_max_age_bars) are dropped.
+
+    Args:
+        config: Retest configuration (tick_size, retest_* parameters).
+        entry_mode: FIRST_TOUCH or MIDPOINT (as for check_retest_entry).
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        entry_mode: Literal["FIRST_TOUCH", "MIDPOINT"] = "MIDPOINT",
+    ):
+        self.config = config
+        self.entry_mode = entry_mode
+        self.max_age = config.get("retest_fvg_max_age_bars", 60)
+        self._seq = 0
+        self._bar_index: int | None = None
+        # (seq, disp_fvg) re-checked on every bar: new FVGs, and every FVG
+        # while bar_index advances
+        self._moving: list[tuple[int, DisplacementFVG]] = []
+        # FVGs whose age no longer changes, per displacement direction:
+        # eligible ones sorted by (entry_level, seq), ineligible ones in a
+        # heap keyed on the price extreme a bar has to pass to change them,
+        # and all of them sorted by (midpoint, seq)
+        self._eligible: dict[str, list] = {"BEARISH": [], "BULLISH": []}
+        self._waiting: dict[str, list] = {"BEARISH": [], "BULLISH": []}
+        self._midpoints: dict[str, list] = {"BEARISH": [], "BULLISH": []}
+        self._frozen: dict[int, DisplacementFVG] = {}
+        self._compact_at = 64
+
+    def add(self, disp_fvg: DisplacementFVG) -> None:
+        """Start tracking a newly detected displacement FVG."""
+        self._moving.append((self._seq, disp_fvg))
+        self._seq += 1
+
+    def update(self, bar: Bar, bar_index: int) -> None:
+        """Track price movement and retest eligibility for bar."""
+        if bar_index != self._bar_index:
+            # Every age changes: back to checking each FVG
+            self._moving = sorted(self._frozen.items()) + self._moving
+            self._frozen = {}
+            for side in (self._eligible, self._waiting, self._midpoints):
+                for entries in side.values():
+                    entries.clear()
+            self._bar_index = bar_index
+            moving = []
+            for seq, disp_fvg in self._moving:
+                if self._update_one(disp_fvg, bar, bar_index):
+                    moving.append((seq, disp_fvg))
+            self._moving = moving
+            return
+
+        for seq, disp_fvg in self._moving:
+            if self._update_one(disp_fvg, bar, bar_index):
+                self._freeze(seq, disp_fvg)
+        self._moving = []
+        if len(self._midpoints["BEARISH"]) + len(self._midpoints["BULLISH"]) > self._compact_at:
+            self._compact()
+
+        # Ineligible FVGs this bar moved the extreme of
+        for direction, heap in self._waiting.items():
+            limit = bar.high if direction == "BEARISH" else -bar.low
+            while heap and heap[0][0] < limit:
+                _, seq, disp_fvg = heapq.heappop(heap)
+                if not self._alive(disp_fvg):
+                    self._frozen.pop(seq, None)
+                    continue
+                disp_fvg.update_price_extremes(bar, bar_index)
+                disp_fvg.retest_eligible = check_retest_eligible(disp_fvg, self.config)
+                self._place(seq, disp_fvg)
+
+    def retest_candidates(self, bar: Bar) -> list[DisplacementFVG]:
+        """
+        FVGs whose retest entry bar triggers, in the order they were added.
+
+        Exactly the tracked FVGs not yet triggered or used for which
+        check_retest_entry(bar, ...) is True.
+        """
+        candidates = [
+            (seq, disp_fvg) for seq, disp_fvg in self._moving
+            if self._alive(disp_fvg) and check_retest_entry(bar, disp_fvg, self.entry_mode)
+        ]
+
+        # Bearish: bar.high >= entry level (a prefix); bullish: bar.low <=
+        # entry level (a suffix)
+        bearish = self._eligible["BEARISH"]
+        stop = bisect_right(bearish, bar.high, key=lambda e: e[0])
+        candidates += self._reached(bearish, 0, stop)
+        bullish = self._eligible["BULLISH"]
+        start = bisect_left(bullish, bar.low, key=lambda e: e[0])
+        candidates += self._reached(bullish, start, len(bullish))
+
+        candidates.sort(key=lambda c: c[0])
+        return [disp_fvg for _, disp_fvg in candidates]
+
+    def near_midpoint(
+        self,
+        midpoint: float,
+        distance: float,
+        direction: Literal["BULLISH", "BEARISH"],
+    ) -> list[DisplacementFVG]:
+        """Tracked FVGs not yet triggered with abs(midpoint difference) < distance."""
+        found = [
+            (seq, disp_fvg) for seq, disp_fvg in self._moving
+            if disp_fvg.displacement_direction == direction
+        ]
+        entries = self._midpoints[direction]
+        # Widened bisect range; the exact test is applied below
+        lo = bisect_left(entries, midpoint - 2 * distance, key=lambda e: e[0])
+        hi = bisect_right(entries, midpoint + 2 * distance, key=lambda e: e[0])
+        found += [(seq, disp_fvg) for _, seq, disp_fvg in entries[lo:hi]]
+        found.sort(key=lambda f: f[0])
+        return [
+            disp_fvg for _, disp_fvg in found
+            if not disp_fvg.retest_triggered and abs(disp_fvg.fvg.midpoint - midpoint) < distance
+        ]
+
+    def _update_one(self, disp_fvg: DisplacementFVG, bar: Bar, bar_index: int) -> bool:
+        """update_price_extremes / check_retest_eligible; False once it can never trigger."""
+        if not self._alive(disp_fvg):
+            return False
+        age = bar_index - disp_fvg.displacement_bar_index
+        if not (disp_fvg.retest_eligible and age == disp_fvg.bars_since_displacement):
+            disp_fvg.update_price_extremes(bar, bar_index)
+            disp_fvg.retest_eligible = check_retest_eligible(disp_fvg, self.config)
+        return age <= self.max_age
+
+    def _freeze(self, seq: int, disp_fvg: DisplacementFVG) -> None:
+        self._frozen[seq] = disp_fvg
+        insort(self._midpoints[disp_fvg.displacement_direction], (disp_fvg.fvg.midpoint, seq, disp_fvg),
+               key=lambda e: e[:2])
+        self._place(seq, disp_fvg)
+
+    def _place(self, seq: int, disp_fvg: DisplacementFVG) -> None:
+        direction = disp_fvg.displacement_direction
+        if disp_fvg.retest_eligible:
+            fvg = disp_fvg.fvg
+            if self.entry_mode == "FIRST_TOUCH":
+                entry_level = fvg.high if fvg.direction == "BEARISH" else fvg.low
+            else:
+                entry_level = fvg.midpoint
+            insort(self._eligible[direction], (entry_level, seq, disp_fvg), key=lambda e: e[:2])
+            return
+        # Extremes start at 0 and then always move (see update_price_extremes)
+        if direction == "BEARISH":
+            extreme = disp_fvg.max_price_after
+            key = extreme if extreme != 0 else float("-inf")
+        else:
+            extreme = disp_fvg.min_price_after
+            key = -extreme if extreme != 0 else float("-inf")
+        heapq.heappush(self._waiting[direction], (key, seq, disp_fvg))
+
+    def _compact(self) -> None:
+        """Rebuild the frozen indexes without FVGs that can no longer trigger."""
+        frozen = [(seq, d) for seq, d in sorted(self._frozen.items()) if self._alive(d)]
+        self._frozen = {}
+        for side in (self._eligible, self._waiting, self._midpoints):
+            for entries in side.values():
+                entries.clear()
+        for seq, disp_fvg in frozen:
+            self._freeze(seq, disp_fvg)
+        self._compact_at = 2 * len(frozen) + 64
+
+    def _reached(self, entries: list, start: int, stop: int) -> list[tuple[int, DisplacementFVG]]:
+        """Live entries[start:stop] as (seq, disp_fvg); drops the dead ones."""
+        reached = []
+        live = []
+        for entry in entries[start:stop]:
+            disp_fvg = entry[2]
+            if self._alive(disp_fvg):
+                live.append(entry)
+                reached.append((entry[1], disp_fvg))
+            else:
+                self._frozen.pop(entry[1], None)
+        if len(live) != stop - start:
+            entries[start:stop] = live
+        return reached
+
+    @staticmethod
+    def _alive(disp_fvg: DisplacementFVG) -> bool:
+        return not (disp_fvg.retest_triggered or disp_fvg.fvg.mitigated)
+
+    def __iter__(self) -> Iterator[DisplacementFVG]:
+        """FVGs still tracked that can trigger, in the order they were added."""
+        tracked = sorted(self._frozen.items()) + self._moving
+        return (disp_fvg for _, disp_fvg in tracked if self._alive(disp_fvg))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -47,10 +47,12 @@ Usage:
             pass
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal
 
+from core.swing_index import SwingIndex
 from core.types import Bar
 
 
@@ -260,45 +262,8 @@ def find_swing_highs(
         for sh in swing_highs:
             print(f"Swing high at {sh.price} on {sh.timestamp}")
     """
-    swing_highs: list[SwingPoint] = []
-
-    # Need enough bars for comparison
-    min_bars_needed = left_bars + 1 + right_bars
-    if len(bars) < min_bars_needed:
-        return swing_highs
-
-    # Check each potential swing high
-    # Start at left_bars, end at len - right_bars
-    for i in range(left_bars, len(bars) - right_bars):
-        candidate_high = bars[i].high
-        is_swing_high = True
-
-        # Check left side - all must be lower
-        for j in range(i - left_bars, i):
-            if bars[j].high >= candidate_high:
-                is_swing_high = False
-                break
-
-        if not is_swing_high:
-            continue
-
-        # Check right side - all must be lower
-        for j in range(i + 1, i + right_bars + 1):
-            if bars[j].high >= candidate_high:
-                is_swing_high = False
-                break
-
-        if is_swing_high:
-            swing_highs.append(
-                SwingPoint(
-                    price=candidate_high,
-                    timestamp=bars[i].timestamp,
-                    bar_index=i,
-                    swing_type="HIGH",
-                )
-            )
-
-    return swing_highs
+    index = SwingIndex.from_bars(bars, left_bars, right_bars)
+    return _swing_points(bars, index.highs(), "HIGH")
 
 
 def find_swing_lows(
@@ -336,44 +301,26 @@ def find_swing_lows(
         for sl in swing_lows:
             print(f"Swing low at {sl.price} on {sl.timestamp}")
     """
-    swing_lows: list[SwingPoint] = []
-
-    # Need enough bars for comparison
-    min_bars_needed = left_bars + 1 + right_bars
-    if len(bars) < min_bars_needed:
-        return swing_lows
-
-    # Check each potential swing low
-    for i in range(left_bars, len(bars) - right_bars):
-        candidate_low = bars[i].low
-        is_swing_low = True
-
-        # Check left side - all must be higher
-        for j in range(i - left_bars, i):
-            if bars[j].low <= candidate_low:
-                is_swing_low = False
-                break
-
-        if not is_swing_low:
-            continue
+    index = SwingIndex.from_bars(bars, left_bars, right_bars)
+    return _swing_points(bars, index.lows(), "LOW")
 
-        # Check right side - all must be higher
-        for j in range(i + 1, i + right_bars + 1):
-            if bars[j].low <= candidate_low:
-                is_swing_low = False
-                break
-
-        if is_swing_low:
-            swing_lows.append(
-                SwingPoint(
-                    price=candidate_low,
-                    timestamp=bars[i].timestamp,
-                    bar_index=i,
-                    swing_type="LOW",
-                )
-            )
 
-    return swing_lows
+def _swing_points(
+    bars: list[Bar],
+    swings: list[tuple[int, float]],
+    swing_type: Literal["HIGH", "LOW"],
+    offset: int = 0,
+) -> list[SwingPoint]:
+    """SwingPoints of SwingIndex (bar_index, price) pairs; bar_index - offset indexes bars."""
+    return [
+        SwingPoint(
+            price=price,
+            timestamp=bars[i - offset].timestamp,
+            bar_index=i - offset,
+            swing_type=swing_type,
+        )
+        for i, price in swings
+    ]
 
 
 def find_swing_points(
@@ -399,9 +346,8 @@ def find_swing_points(
         highs, lows = find_swing_points(bars, left_bars=3, right_bars=2)
         print(f"Found {len(highs)} swing highs and {len(lows)} swing lows")
     """
-    swing_highs = find_swing_highs(bars, left_bars, right_bars)
-    swing_lows = find_swing_lows(bars, left_bars, right_bars)
-    return swing_highs, swing_lows
+    index = SwingIndex.from_bars(bars, left_bars, right_bars)
+    return _swing_points(bars, index.highs(), "HIGH"), _swing_points(bars, index.lows(), "LOW")
 
 
 # =============================================================================
@@ -665,6 +611,72 @@ def get_prior_session_levels(
     )
 
 
+class PriorSessionTracker:
+    """
+    get_prior_session_levels() over a sliding window of bars, kept per bar.
+
+    Tracks the high/low of the latest date before the current bar's date
+    among the newest `maxlen` bars (what a BarWindow(maxlen) holds) with
+    monotonic queues, so levels() costs O(1) instead of a scan of the
+    window. Bars must arrive in time order.
+
+    Example:
+        tracker = PriorSessionTracker(maxlen=600)
+        for bar in bars:
+            tracker.append(bar)
+            prior = tracker.levels()  # get_prior_session_levels(window[:-1], bar)
+    """
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.count = 0
+        # (date, highs, lows) for the last two dates in the window; highs /
+        # lows hold (bar number, price) pairs with decreasing highs /
+        # increasing lows, so the front is the extreme of the bars held
+        self._blocks: deque = deque()
+
+    def append(self, bar: Bar) -> None:
+        """Add the newest bar (the window drops its oldest bar past maxlen)."""
+        date = bar.timestamp.date()
+        if not self._blocks or self._blocks[-1][0] != date:
+            self._blocks.append((date, deque(), deque()))
+            if len(self._blocks) > 2:
+                self._blocks.popleft()
+
+        _, highs, lows = self._blocks[-1]
+        while highs and highs[-1][1] <= bar.high:
+            highs.pop()
+        highs.append((self.count, bar.high))
+        while lows and lows[-1][1] >= bar.low:
+            lows.pop()
+        lows.append((self.count, bar.low))
+        self.count += 1
+
+        # Drop the bar that just left the window (from the oldest date;
+        # forget that date once none of its bars are left)
+        first = self.count - self.maxlen
+        while True:
+            _, highs, lows = self._blocks[0]
+            while highs and highs[0][0] < first:
+                highs.popleft()
+            while lows and lows[0][0] < first:
+                lows.popleft()
+            if highs or len(self._blocks) == 1:
+                break
+            self._blocks.popleft()
+
+    def levels(self) -> SessionLevels | None:
+        """Prior session levels for the latest bar, as get_prior_session_levels(window[:-1], bar)."""
+        if min(self.count, self.maxlen) < 3 or len(self._blocks) < 2:
+            return None
+        date, highs, lows = self._blocks[0]
+        return SessionLevels(
+            high=highs[0][1],
+            low=lows[0][1],
+            date=datetime.combine(date, datetime.min.time()),
+        )
+
+
 # =============================================================================
 # Sweep Detection
 # =============================================================================
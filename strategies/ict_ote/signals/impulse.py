@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from core.swing_index import is_swing_high, is_swing_low
+
 
 @dataclass
 class ImpulseLeg:
@@ -29,24 +31,12 @@ class ImpulseLeg:
 
 def _find_swing_high(bars, index: int, lookback: int = 3) -> bool:
     """Check if bar at index is a swing high."""
-    if index < lookback or index >= len(bars) - lookback:
-        return False
-    bar_high = bars[index].high
-    for i in range(1, lookback + 1):
-        if bars[index - i].high >= bar_high or bars[index + i].high >= bar_high:
-            return False
-    return True
+    return is_swing_high(bars, index, lookback)
 
 
 def _find_swing_low(bars, index: int, lookback: int = 3) -> bool:
     """Check if bar at index is a swing low."""
-    if index < lookback or index >= len(bars) - lookback:
-        return False
-    bar_low = bars[index].low
-    for i in range(1, lookback + 1):
-        if bars[index - i].low <= bar_low or bars[index + i].low <= bar_low:
-            return False
-    return True
+    return is_swing_low(bars, index, lookback)
 
 
 def detect_impulse(
@@ -7,6 +7,8 @@ Liquidity pools are areas where stop losses cluster (above swing highs, below sw
 from dataclasses import dataclass
 from datetime import datetime
 
+from core import swing_index
+
 
 @dataclass
 class SwingPoint:
@@ -32,22 +34,7 @@ def is_swing_high(bars, index: int, lookback: int = 3) -> bool:
     Returns:
         True if bar is a swing high
     """
-    if index < lookback or index >= len(bars) - lookback:
-        return False
-
-    bar_high = bars[index].high
-
-    # Check left side (bars before)
-    for i in range(1, lookback + 1):
-        if bars[index - i].high >= bar_high:
-            return False
-
-    # Check right side (bars after)
-    for i in range(1, lookback + 1):
-        if bars[index + i].high >= bar_high:
-            return False
-
-    return True
+    return swing_index.is_swing_high(bars, index, lookback)
 
 
 def is_swing_low(bars, index: int, lookback: int = 3) -> bool:
@@ -64,22 +51,7 @@ def is_swing_low(bars, index: int, lookback: int = 3) -> bool:
     Returns:
         True if bar is a swing low
     """
-    if index < lookback or index >= len(bars) - lookback:
-        return False
-
-    bar_low = bars[index].low
-
-    # Check left side (bars before)
-    for i in range(1, lookback + 1):
-        if bars[index - i].low <= bar_low:
-            return False
-
-    # Check right side (bars after)
-    for i in range(1, lookback + 1):
-        if bars[index + i].low <= bar_low:
-            return False
-
-    return True
+    return swing_index.is_swing_low(bars, index, lookback)
 
 
 def find_swing_highs(bars, lookback: int = 3, max_swings: int = 10) -> list[SwingPoint]:
@@ -94,18 +66,16 @@ def find_swing_highs(bars, lookback: int = 3, max_swings: int = 10) -> list[Swin
     Returns:
         List of SwingPoint objects (most recent first)
     """
-    swings = []
-
-    # Start from lookback, end before lookback from end
-    for i in range(lookback, len(bars) - lookback):
-        if is_swing_high(bars, i, lookback):
-            swings.append(SwingPoint(
-                price=bars[i].high,
-                bar_index=i,
-                timestamp=bars[i].timestamp,
-                swing_type='HIGH',
-                strength=lookback
-            ))
+    swings = [
+        SwingPoint(
+            price=price,
+            bar_index=i,
+            timestamp=bars[i].timestamp,
+            swing_type='HIGH',
+            strength=lookback
+        )
+        for i, price in swing_index.SwingIndex.from_bars(bars, lookback).highs()
+    ]
 
     # Return most recent swings first, limited to max_swings
     return swings[-max_swings:][::-1]
@@ -123,17 +93,16 @@ def find_swing_lows(bars, lookback: int = 3, max_swings: int = 10) -> list[Swing
     Returns:
         List of SwingPoint objects (most recent first)
     """
-    swings = []
-
-    for i in range(lookback, len(bars) - lookback):
-        if is_swing_low(bars, i, lookback):
-            swings.append(SwingPoint(
-                price=bars[i].low,
-                bar_index=i,
-                timestamp=bars[i].timestamp,
-                swing_type='LOW',
-                strength=lookback
-            ))
+    swings = [
+        SwingPoint(
+            price=price,
+            bar_index=i,
+            timestamp=bars[i].timestamp,
+            swing_type='LOW',
+            strength=lookback
+        )
+        for i, price in swing_index.SwingIndex.from_bars(bars, lookback).lows()
+    ]
 
     return swings[-max_swings:][::-1]
 
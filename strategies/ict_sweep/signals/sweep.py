@@ -8,6 +8,7 @@ then reverses.
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
+from core.swing_index import SwingIndex
 from strategies.ict_sweep.signals.liquidity import find_swing_highs, find_swing_lows
 
 
@@ -27,7 +28,8 @@ def detect_sweep(
     tick_size: float = 0.25,
     swing_lookback: int = 3,
     min_sweep_ticks: int = 2,
-    check_bars: int = 3
+    check_bars: int = 3,
+    swings: Optional[SwingIndex] = None
 ) -> Optional[Sweep]:
     """
     Detect if a liquidity sweep occurred in the recent bars.
@@ -41,6 +43,8 @@ def detect_sweep(
         swing_lookback: Bars on each side to confirm swing
         min_sweep_ticks: Minimum ticks price must go beyond level
         check_bars: Number of recent bars to check for sweep
+        swings: Optional SwingIndex (swing_lookback on each side) kept up to
+            date with bars; used instead of rescanning every bar
 
     Returns:
         Sweep object if detected, None otherwise
@@ -49,9 +53,17 @@ def detect_sweep(
         return None
 
     # Find swing highs and lows (excluding the most recent bars we're checking)
-    analysis_bars = bars[:-check_bars] if check_bars > 0 else bars
-    swing_highs = find_swing_highs(analysis_bars, swing_lookback, max_swings=5)
-    swing_lows = find_swing_lows(analysis_bars, swing_lookback, max_swings=5)
+    if swings is not None:
+        if swings.left != swing_lookback or swings.right != swing_lookback:
+            raise ValueError(f"swings index is {swings.left}/{swings.right} bars, expected {swing_lookback}")
+        # A swing is confirmed swing_lookback bars after it, inside the analysed bars
+        end = len(bars) - check_bars if check_bars > 0 else len(bars)
+        swing_highs = swings.recent_highs(end - swing_lookback, 5)
+        swing_lows = swings.recent_lows(end - swing_lookback, 5)
+    else:
+        analysis_bars = bars[:-check_bars] if check_bars > 0 else bars
+        swing_highs = [(s.bar_index, s.price) for s in find_swing_highs(analysis_bars, swing_lookback, max_swings=5)]
+        swing_lows = [(s.bar_index, s.price) for s in find_swing_lows(analysis_bars, swing_lookback, max_swings=5)]
 
     # Check recent bars for sweep
     recent_bars = bars[-check_bars:] if check_bars > 0 else [bars[-1]]
@@ -60,40 +72,40 @@ def detect_sweep(
         bar_index = len(bars) - check_bars + i
 
         # Check for BULLISH sweep (swept low, expecting price to go up)
-        for swing in swing_lows:
+        for swing_idx, swing_price in swing_lows:
             # Skip if swing is too recent (within check_bars)
-            if swing.bar_index >= len(bars) - check_bars:
+            if swing_idx >= len(bars) - check_bars:
                 continue
 
             # Check if wick went below swing low
-            sweep_depth = swing.price - bar.low
+            sweep_depth = swing_price - bar.low
             if sweep_depth >= min_sweep_ticks * tick_size:
                 # Check if price rejected (closed above the swing low)
-                if bar.close > swing.price:
+                if bar.close > swing_price:
                     return Sweep(
                         sweep_type='BULLISH',
                         sweep_price=bar.low,
-                        liquidity_level=swing.price,
+                        liquidity_level=swing_price,
                         bar_index=bar_index,
                         timestamp=bar.timestamp,
                         sweep_depth_ticks=sweep_depth / tick_size
                     )
 
         # Check for BEARISH sweep (swept high, expecting price to go down)
-        for swing in swing_highs:
+        for swing_idx, swing_price in swing_highs:
             # Skip if swing is too recent
-            if swing.bar_index >= len(bars) - check_bars:
+            if swing_idx >= len(bars) - check_bars:
                 continue
 
             # Check if wick went above swing high
-            sweep_depth = bar.high - swing.price
+            sweep_depth = bar.high - swing_price
             if sweep_depth >= min_sweep_ticks * tick_size:
                 # Check if price rejected (closed below the swing high)
-                if bar.close < swing.price:
+                if bar.close < swing_price:
                     return Sweep(
                         sweep_type='BEARISH',
                         sweep_price=bar.high,
-                        liquidity_level=swing.price,
+                        liquidity_level=swing_price,
                         bar_index=bar_index,
                         timestamp=bar.timestamp,
                         sweep_depth_ticks=sweep_depth / tick_size
@@ -13,10 +13,13 @@ Exit Logic:
 - T2: Structure trail after configurable R (default 6R, 4-tick buffer)
 - Runner: Structure trail (6-tick buffer, 1st trade only)
 """
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+from core.bar_history import BarHistory
+from core.swing_index import SwingIndex
 from strategies.ict_sweep.signals.liquidity import find_liquidity_levels
 from strategies.ict_sweep.signals.sweep import detect_sweep, Sweep
 from strategies.ict_sweep.signals.fvg import detect_fvg, FVG
@@ -87,6 +90,93 @@ def calculate_adx(bars, period=14):
     return adx, plus_di, minus_di
 
 
+class IncrementalADX:
+    """
+    calculate_adx() updated one bar at a time.
+
+    Runs the same Wilder smoothing in the same order, so after every bar
+    value() equals calculate_adx() over all bars so far, bit for bit,
+    at O(1) per bar instead of a pass over the whole history.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self._prev = None
+        self._seeded = 0  # TR/DM values summed into the seed so far
+        self._atr = 0
+        self._plus_dm = 0
+        self._minus_dm = 0
+        self._plus_di = 0
+        self._minus_di = 0
+        self._dx = deque(maxlen=period)
+        self._dx_count = 0
+
+    def update(self, bar) -> None:
+        """Add the next bar."""
+        self.count += 1
+        prev = self._prev
+        self._prev = bar
+        if prev is None:
+            return
+
+        tr = max(bar.high - bar.low, abs(bar.high - prev.close), abs(bar.low - prev.close))
+        up_move = bar.high - prev.high
+        down_move = prev.low - bar.low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0
+
+        p = self.period
+        if self._seeded < p:
+            self._atr += tr
+            self._plus_dm += plus_dm
+            self._minus_dm += minus_dm
+            self._seeded += 1
+            if self._seeded < p:
+                return
+        else:
+            self._atr = self._atr - (self._atr / p) + tr
+            self._plus_dm = self._plus_dm - (self._plus_dm / p) + plus_dm
+            self._minus_dm = self._minus_dm - (self._minus_dm / p) + minus_dm
+
+        if self._atr == 0:
+            return
+        self._plus_di = 100 * self._plus_dm / self._atr
+        self._minus_di = 100 * self._minus_dm / self._atr
+        di_sum = self._plus_di + self._minus_di
+        if di_sum == 0:
+            return
+        self._dx.append(100 * abs(self._plus_di - self._minus_di) / di_sum)
+        self._dx_count += 1
+
+    def value(self):
+        """(adx, plus_di, minus_di), or (None, None, None) until there is enough data."""
+        if self.count < self.period * 2 or self._dx_count < self.period:
+            return None, None, None
+        return sum(self._dx) / self.period, self._plus_di, self._minus_di
+
+
+class IncrementalEMA:
+    """EMA seeded with the SMA of the first `period` closes, updated per bar."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.value: Optional[float] = None
+        self._seed = 0
+        self._multiplier = 2 / (period + 1)
+
+    def update(self, close: float) -> None:
+        """Add the next close."""
+        self.count += 1
+        if self.count <= self.period:
+            self._seed += close
+            if self.count == self.period:
+                self.value = self._seed / self.period
+        else:
+            self.value = (close * self._multiplier) + (self.value * (1 - self._multiplier))
+
+
 @dataclass
 class SweepSetup:
     """Single state tracking a sweep through its lifecycle."""
@@ -191,9 +281,16 @@ class ICTSweepStrategy:
         self.ema_fast_period = filters.get('ema_fast', 20)
         self.ema_slow_period = filters.get('ema_slow', 50)
 
+        # Bars a setup can still reach back to: the sweep bar (up to
+        # sweep_check_bars before the setup) for as long as the setup lives,
+        # plus the bar before it, and the avg body window
+        self.history_bars = max(
+            self.avg_body_lookback,
+            max(self.max_fvg_wait_bars, self.max_fvg_age_bars) + self.sweep_check_bars + 2,
+        )
+
         # State
-        self.bars = []
-        self.mtf_bars = []  # Optional 3m bars for dual-TF FVG detection
+        self._reset_history()
         self.setups: list[SweepSetup] = []
         self.losses_per_dir = {'LONG': 0, 'SHORT': 0}
         self.trades_today = 0
@@ -208,10 +305,34 @@ class ICTSweepStrategy:
         # Debug
         self._debug = config.get('debug', False)
 
+    def _reset_history(self):
+        """Empty bar histories and the indicators / swings kept in step with them."""
+        # Bars may also be appended directly (lookback warmup), so the
+        # incremental state is fed from the history's append hook
+        self.bars = BarHistory(self.history_bars, on_append=self._on_bar_appended)
+        self.mtf_bars = BarHistory()  # Optional 3m bars for dual-TF FVG detection
+        self._adx = IncrementalADX()
+        self._emas = {period: IncrementalEMA(period) for period in (self.ema_fast_period, self.ema_slow_period)}
+        self._swings = SwingIndex(self.swing_strength)
+
+    def _on_bar_appended(self, bar):
+        self._adx.update(bar)
+        for ema in self._emas.values():
+            ema.update(bar.close)
+        swings = self._swings
+        swings.append(bar.high, bar.low)
+        # detect_sweep only reads the 5 most recent swings of each side
+        # before the check bars; forget older ones now and then
+        if len(swings.high_indices) > 64 or len(swings.low_indices) > 64:
+            cutoff = len(self.bars) - self.sweep_check_bars - self.swing_strength
+            highs = swings.recent_highs(cutoff, 5)
+            lows = swings.recent_lows(cutoff, 5)
+            if len(highs) == 5 and len(lows) == 5:
+                swings.prune(min(highs[-1][0], lows[-1][0]))
+
     def reset_daily(self):
         """Reset state for a new trading day."""
-        self.bars = []
-        self.mtf_bars = []
+        self._reset_history()
         self.setups = []
         self.losses_per_dir = {'LONG': 0, 'SHORT': 0}
         self.trades_today = 0
@@ -241,6 +362,10 @@ class ICTSweepStrategy:
         bar_index = len(self.bars) - 1
         entries = []
 
+        # 3m bars before the oldest held bar (less the two bars an FVG
+        # window starts before the sweep) can no longer be searched
+        if self.mtf_bars:
+            self.mtf_bars.discard_before(self.mtf_bars.bisect_timestamp(self.bars[self.bars.first_index].timestamp) - 2)
 
         # Need minimum bars for analysis
         if len(self.bars) < self.swing_lookback + self.swing_strength + 5:
@@ -498,6 +623,7 @@ class ICTSweepStrategy:
             self.swing_strength,
             self.min_sweep_ticks,
             check_bars=self.sweep_check_bars,
+            swings=self._swings,
         )
 
         if not sweep:
@@ -600,10 +726,9 @@ class ICTSweepStrategy:
         if self.use_mtf_fvg and len(self.mtf_bars) >= 3:
             sweep_time = self.bars[sweep.bar_index].timestamp
             mtf_start = None
-            for i, b in enumerate(self.mtf_bars):
-                if b.timestamp >= sweep_time:
-                    mtf_start = max(0, i - 2)
-                    break
+            i = self.mtf_bars.bisect_timestamp(sweep_time)
+            if i < len(self.mtf_bars):
+                mtf_start = max(0, i - 2)
             if mtf_start is not None:
                 for offset in range(0, 17):
                     idx = mtf_start + offset
@@ -638,22 +763,15 @@ class ICTSweepStrategy:
 
     def _update_indicators(self):
         """Update cached ADX/DI values."""
-        adx, plus_di, minus_di = calculate_adx(self.bars)
+        adx, plus_di, minus_di = self._adx.value()
         if adx is not None:
             self._last_adx = adx
             self._last_plus_di = plus_di
             self._last_minus_di = minus_di
 
     def _calculate_ema(self, period: int) -> Optional[float]:
-        """Calculate EMA for given period from self.bars."""
-        if len(self.bars) < period:
-            return None
-        closes = [b.close for b in self.bars]
-        multiplier = 2 / (period + 1)
-        ema = sum(closes[:period]) / period
-        for price in closes[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
+        """EMA for a configured period (ema_fast / ema_slow) over self.bars."""
+        return self._emas[period].value
 
     def _check_hybrid_filters(self, direction: str, displacement_ratio: float) -> tuple[bool, str]:
         """
@@ -3,31 +3,10 @@ ICT Sweep Strategy — Trade Simulator
 
 Shared by runner and plotter. Accepts TradeEntry, simulates T1/T2/Runner exits.
 """
+from core.swing_index import is_swing_high, is_swing_low
 from strategies.ict_sweep.strategy import TradeEntry
 
 
-def is_swing_high(bars, idx, lookback=2):
-    """Check if bar at idx is a swing high."""
-    if idx < lookback or idx >= len(bars) - lookback:
-        return False
-    bar_high = bars[idx].high
-    for i in range(1, lookback + 1):
-        if bar_high <= bars[idx - i].high or bar_high <= bars[idx + i].high:
-            return False
-    return True
-
-
-def is_swing_low(bars, idx, lookback=2):
-    """Check if bar at idx is a swing low."""
-    if idx < lookback or idx >= len(bars) - lookback:
-        return False
-    bar_low = bars[idx].low
-    for i in range(1, lookback + 1):
-        if bar_low >= bars[idx - i].low or bar_low >= bars[idx + i].low:
-            return False
-    return True
-
-
 def simulate_trade(bars, entry: TradeEntry, tick_size: float, tick_value: float,
                    contracts: int, t1_r: int = 3, trail_r: int = 6,
                    t2_buffer_ticks: int = 4, runner_buffer_ticks: int = 6,
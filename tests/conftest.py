@@ -0,0 +1,71 @@
+"""
+Shared test fixtures.
+
+make_bars: seeded random-walk OHLC bars on a 0.25 tick grid, either n
+consecutive bars from start or `days` weekdays of 24h bars (midnight to
+midnight). The drift is redrawn every drift_every bars (per day in days
+mode), so the walk has trending stretches, FVGs, sweeps and swings.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.types import Bar
+
+
+def random_walk_bars(n=None, days=None, seed=0, price=5000.0, step=3, symbol='ES',
+                     start=datetime(2026, 2, 2), drift_every=40, drift=(0.2, 1.2),
+                     vol=(0.5, 3.0), wick=0.6, spike_prob=0.0):
+    """
+    Random-walk bars (see module docstring).
+
+    Args:
+        n: Number of consecutive bars from start (n mode).
+        days: Number of weekdays of 24h bars from start's date (days mode).
+        step: Bar length in minutes (also the timeframe label).
+        drift: (low, high) size of the drift per bar; direction is random.
+        vol: (low, high) range of the per-bar volatility.
+        wick: Wick size as a fraction of the bar's volatility.
+        spike_prob: Chance of a bar with 3x volatility.
+    """
+    if (n is None) == (days is None):
+        raise ValueError("pass exactly one of n, days")
+    rnd = random.Random(seed)
+    if days is None:
+        blocks = [(start, n)]
+    else:
+        blocks = []
+        day = start
+        while len(blocks) < days:
+            if day.weekday() < 5:
+                blocks.append((day, 24 * 60 // step))
+            day += timedelta(days=1)
+
+    bars = []
+    p = price
+    trend = 0.0
+    for block_start, count in blocks:
+        ts = block_start
+        for k in range(count):
+            if k % drift_every == 0:
+                trend = rnd.choice([-1, 0, 1]) * rnd.uniform(*drift)
+            sigma = rnd.uniform(*vol)
+            if spike_prob and rnd.random() < spike_prob:
+                sigma *= 3
+            o = p
+            c = o + trend + rnd.gauss(0, sigma)
+            h = max(o, c) + abs(rnd.gauss(0, sigma * wick))
+            l = min(o, c) - abs(rnd.gauss(0, sigma * wick))
+            o, h, l, c = (round(x * 4) / 4 for x in (o, h, l, c))
+            bars.append(Bar(timestamp=ts, open=o, high=max(h, o, c), low=min(l, o, c), close=c,
+                            volume=100, symbol=symbol, timeframe=f'{step}m'))
+            p = c
+            ts += timedelta(minutes=step)
+    return bars
+
+
+@pytest.fixture
+def make_bars():
+    """random_walk_bars() factory: make_bars(days=3, seed=5), make_bars(n=600, step=5), ..."""
+    return random_walk_bars
@@ -0,0 +1,132 @@
+"""
+Tests for event-driven scanning (runners.bar_events): sources deliver closed
+bars, LiveBarCache.push() merges them, and LiveTrader scans on each close
+without polling TradingView, falling back to polling when no event comes.
+"""
+import signal
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import runners.bar_storage as bar_storage
+from runners.bar_events import BarCloseQueue, FeedBarSource, ReplayBarSource, root_symbol
+from runners.run_live import LiveTrader
+
+
+def _today(hour, minute=0):
+    today = datetime.now().date()
+    return datetime(today.year, today.month, today.day, hour, minute)
+
+
+def test_root_symbol():
+    assert [root_symbol(c) for c in ('ESM6', 'MNQZ25', 'mesh6', 'SPY', 'ES')] == ['ES', 'MNQ', 'MES', 'SPY', 'ES']
+
+
+def test_queue_coalesces_one_close(make_bars):
+    closes = BarCloseQueue(['ES', 'NQ'], coalesce_seconds=5.0)
+    t = _today(10)
+    es, nq = make_bars(n=2, symbol='ES', start=t), make_bars(n=2, symbol='NQ', start=t)
+    for bar in (es[0], nq[0], es[1]):
+        closes.put(bar)
+    assert closes.wait(1.0) == [es[0], nq[0]]  # Returns as soon as both reported
+    started = datetime.now()
+    assert closes.wait(1.0) == [es[1]] and (datetime.now() - started).total_seconds() >= 4.5
+    assert closes.wait(0.2) == []
+
+
+def test_feed_source_emits_on_last_minute(monkeypatch, make_bars):
+    source = FeedBarSource(client=None, contracts=['ESM6'], timeframe='3m')
+    monkeypatch.setattr(source, '_run', lambda: None)
+    out = []
+    source.start(out.append)
+
+    start = _today(10).astimezone().astimezone(timezone.utc)  # Exchange timestamps (UTC)
+    minutes = make_bars(n=7, symbol='ESM6', start=start, step=1)
+    emitted = []
+    for bar in minutes:
+        source.on_minute_bar(bar)
+        emitted.append(len(out))
+    assert emitted == [0, 0, 1, 1, 1, 2, 2]
+    assert [b.timestamp for b in out] == [_today(10), _today(10, 3)]
+    assert out[0].symbol == 'ES' and out[0].timeframe == '3m'
+    assert (out[0].open, out[0].close, out[0].volume) == (minutes[0].open, minutes[2].close, 300)
+    source.on_minute_bar(make_bars(n=1, symbol='NQM6', start=start, step=1)[0])  # Not subscribed
+    assert len(out) == 2
+
+
+def test_cache_push(monkeypatch, tmp_path, make_bars):
+    monkeypatch.setattr(bar_storage, '_BARS_DIR', tmp_path)
+    history = make_bars(n=20, start=_today(9))
+    calls = []
+    monkeypatch.setattr(bar_storage, 'fetch_futures_bars',
+                        lambda symbol, interval='3m', n_bars=500, **kw: calls.append(n_bars) or history[-n_bars:])
+    cache = bar_storage.LiveBarCache(n_bars=200)
+
+    new = make_bars(n=22, start=_today(9))
+    assert not cache.push('ES', new[20])  # Nothing cached yet
+    cache.get_bars('ES')
+    assert cache.push('ES', new[20]) and cache.push('ES', new[21])
+    assert cache.get_bars('ES') == new and len(calls) == 1  # Pushed: no fetch
+    cache.get_bars('ES')
+    assert len(calls) == 2  # Next call fetches again
+    assert not cache.push('ES', make_bars(n=1, start=_today(11))[0])  # Gap
+
+
+def _event_trader(symbols, bar_source, tmp_path):
+    with patch.object(signal, 'signal'):
+        trader = LiveTrader(paper_mode=True, symbols=symbols, bar_source=bar_source)
+    trader.running = True
+    trader.SIGNAL_STATE_PATH = tmp_path / 'signal_state.json'
+    trader.PERF_STATE_PATH = tmp_path / 'perf_state.json'
+    return trader
+
+
+def test_live_trader_scans_on_bar_close(monkeypatch, tmp_path, make_bars):
+    monkeypatch.setattr(bar_storage, '_BARS_DIR', tmp_path)
+    symbols = ['ES', 'MES']
+    full = {s: make_bars(n=30, symbol=s, start=_today(9)) for s in symbols}
+    fetches = []
+
+    def fetch(symbol, interval='3m', n_bars=500, **kwargs):
+        fetches.append(symbol)
+        return full[symbol][:20]  # TradingView history up to the start
+
+    source = ReplayBarSource([b for s in symbols for b in full[s][20:]])
+    trader = _event_trader(symbols, source, tmp_path)
+    scanned = []
+
+    def run_session(session_bars, all_bars, **kwargs):
+        scanned.append((all_bars[-1].symbol, all_bars[-1].timestamp))
+        if len(scanned) >= 2 * 11:  # Initial poll + 10 closes, two symbols each
+            trader.running = False
+        return []
+
+    monkeypatch.setattr(bar_storage, 'fetch_futures_bars', fetch)
+    with patch('runners.run_live.run_session_v10', side_effect=run_session), \
+            patch('runners.run_live.detect_fvgs', return_value=[]), \
+            patch.object(trader, '_is_trading_hours', return_value=True), \
+            patch.object(trader, '_print_status'):
+        source.start(trader._bar_closes.put)
+        thread = threading.Thread(target=trader._trading_loop)
+        thread.start()
+        thread.join(timeout=30)
+    trader._scan_pool.shutdown()
+
+    assert not thread.is_alive()
+    assert sorted(fetches) == symbols  # Only the initial load hit TradingView
+    # Symbols of one close are evaluated on the scan pool in any order; each symbol sees every close in turn
+    for symbol in symbols:
+        assert [ts for s, ts in scanned if s == symbol] == [b.timestamp for b in full[symbol][19:30]]
+    assert len(scanned) == 2 * 11
+    summary = trader.timings.summary()
+    assert summary['counters']['bar_events'] == 20 and 'bar_event_misses' not in summary['counters']
+
+
+def test_live_trader_falls_back_to_polling(tmp_path):
+    source = ReplayBarSource([])
+    trader = _event_trader(['ES'], source, tmp_path)
+    trader.bar_event_grace = 0
+    with patch.object(trader, '_seconds_until_next_bar_close', return_value=0.2):
+        trader._wait_for_next_cycle()
+    assert trader.timings.summary()['counters'] == {'bar_event_fallbacks': 1}
+    trader._scan_pool.shutdown()
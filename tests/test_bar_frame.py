@@ -0,0 +1,108 @@
+"""
+Tests for the columnar BarFrame container.
+"""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from core.bar_frame import BarFrame
+from core.types import Bar
+from strategies.ict.signals.fvg import detect_fvgs, update_all_fvg_mitigations
+
+EST = ZoneInfo('America/New_York')
+
+
+def _bars(n=50, tz=None, start=datetime(2026, 3, 6, 9, 30)):
+    """Deterministic 3m bars, optionally timezone-aware (make_bars only builds naive ones)."""
+    # Step aware timestamps in UTC so the series stays valid across DST changes
+    ts = start if tz is None else start.replace(tzinfo=tz).astimezone(timezone.utc)
+    bars = []
+    price = 5000.0
+    for i in range(n):
+        o = price
+        c = o + (1.5 if i % 7 < 4 else -1.25) * (3 if i % 11 == 0 else 1)
+        bars.append(Bar(timestamp=ts if tz is None else ts.astimezone(tz), open=o, high=max(o, c) + 0.5, low=min(o, c) - 0.25,
+                        close=c, volume=100 + i, symbol='ES', timeframe='3m'))
+        price = c
+        ts += timedelta(minutes=3)
+    return bars
+
+
+@pytest.mark.parametrize("tz", [None, EST])
+def test_round_trip(tz):
+    bars = _bars(tz=tz)
+    frame = BarFrame.from_bars(bars)
+
+    assert len(frame) == len(bars)
+    assert frame.to_bars() == bars
+    assert frame[-1] == bars[-1]
+    assert frame[5].timestamp.tzinfo == bars[5].timestamp.tzinfo
+    assert frame.close.dtype == np.float64 and frame.timestamps.dtype == np.int64
+
+
+def test_round_trip_across_dst():
+    start = datetime(2026, 3, 7, 23, 0)
+    bars = _bars(n=200, tz=EST, start=start)
+    assert BarFrame.from_bars(bars).to_bars() == bars
+
+
+def test_slice_is_view():
+    frame = BarFrame.from_bars(_bars())
+    view = frame[10:20]
+
+    assert isinstance(view, BarFrame) and len(view) == 10
+    assert np.shares_memory(view.close, frame.close)
+    assert view.to_bars() == frame.to_bars()[10:20]
+
+
+def test_iteration_is_chunked(monkeypatch):
+    bars = _bars(n=50)
+    frame = BarFrame.from_bars(bars)
+    sizes = []
+    to_bars = BarFrame.to_bars
+    monkeypatch.setattr(BarFrame, 'to_bars', lambda self: sizes.append(len(self)) or to_bars(self))
+
+    assert list(frame.iter_bars(chunk_size=16)) == bars
+    assert sizes == [16, 16, 16, 2]
+    sizes.clear()
+    it = iter(frame)
+    assert sizes == []  # Lazy: nothing materialized until the first row is needed
+    assert next(it) == bars[0] and list(it) == bars[1:]
+
+
+def test_lookups():
+    bars = _bars()
+    frame = BarFrame.from_bars(bars)
+
+    assert frame.index_of(bars[17].timestamp) == 17
+    assert frame.index_of(bars[17].timestamp + timedelta(minutes=1)) is None
+    window = frame.between(bars[3].timestamp, bars[8].timestamp)
+    assert window.to_bars() == bars[3:9]
+
+
+def test_mixed_timezones_rejected():
+    bars = _bars(n=3) + _bars(n=3, tz=EST)
+    with pytest.raises(ValueError):
+        BarFrame.from_bars(bars)
+
+
+def test_float_volume_preserved():
+    bars = _bars(n=5)
+    for b in bars:
+        b.volume = float(b.volume) + 0.5
+    assert BarFrame.from_bars(bars).to_bars() == bars
+
+
+def test_fvg_detection_on_frame_matches_list():
+    bars = _bars(n=120)
+    frame = BarFrame.from_bars(bars)
+    config = {'min_fvg_ticks': 1, 'tick_size': 0.25}
+
+    from_list = detect_fvgs(bars, config)
+    from_frame = detect_fvgs(frame, config)
+    update_all_fvg_mitigations(from_list, bars, config)
+    update_all_fvg_mitigations(from_frame, frame, config)
+
+    assert from_frame == from_list
@@ -0,0 +1,84 @@
+"""
+Tests for core.bar_ingest: column-wise DataFrame -> BarFrame/Bar conversion
+must match the row-by-row iterrows() conversion it replaces.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.bar_ingest import bars_from_dataframe, frame_from_dataframe
+from core.types import Bar
+
+
+def _make_df(n=500, seed=5, tz=None, capitalize=False):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2026-03-06 17:00', periods=n, freq='3min', tz='UTC', name='datetime')
+    index = index.tz_convert('America/New_York')  # Crosses the DST change
+    if tz is None:
+        index = index.tz_localize(None)
+    close = 5000 + rng.standard_normal(n).cumsum()
+    df = pd.DataFrame({
+        'symbol': 'CME_MINI:ES1!',
+        'open': close - 0.25, 'high': close + 1.0, 'low': close - 1.0, 'close': close,
+        'volume': rng.integers(0, 1000, n).astype(float),
+    }, index=index)
+    df.iloc[[3, 7], df.columns.get_loc('volume')] = np.nan
+    return df.rename(columns=str.capitalize) if capitalize else df
+
+
+def _iterrows_bars(df, strip_tz=False):
+    bars = []
+    for idx, row in df.iterrows():
+        ts = idx.to_pydatetime()
+        volume = row.get('volume', row.get('Volume'))
+        bars.append(Bar(
+            timestamp=ts.replace(tzinfo=None) if strip_tz else ts,
+            open=float(row.get('open', row.get('Open'))), high=float(row.get('high', row.get('High'))),
+            low=float(row.get('low', row.get('Low'))), close=float(row.get('close', row.get('Close'))),
+            volume=0 if np.isnan(volume) else int(volume), symbol='ES', timeframe='3m',
+        ))
+    return bars
+
+
+def test_naive_tradingview_frame():
+    df = _make_df()
+    bars = bars_from_dataframe(df, 'ES', '3m')
+    assert bars == _iterrows_bars(df)
+    assert bars[3].volume == 0 and isinstance(bars[0].volume, int)
+
+    frame = frame_from_dataframe(df, 'ES', '3m')
+    assert frame.tz is None and frame.to_bars() == bars
+    np.testing.assert_array_equal(frame.close, df['close'].to_numpy())
+
+
+@pytest.mark.parametrize('strip_tz', [False, True])
+def test_aware_yfinance_frame(strip_tz):
+    df = _make_df(tz='America/New_York', capitalize=True)
+    bars = bars_from_dataframe(df, 'ES', '3m', strip_tz=strip_tz)
+    assert bars == _iterrows_bars(df, strip_tz=strip_tz)
+    assert (bars[0].timestamp.tzinfo is None) == strip_tz
+
+
+def test_missing_columns_and_empty():
+    df = _make_df(n=10).drop(columns=['volume'])
+    assert all(b.volume == 0 for b in bars_from_dataframe(df, 'ES', '3m'))
+    with pytest.raises(ValueError):
+        frame_from_dataframe(df.drop(columns=['close']), 'ES', '3m')
+    assert bars_from_dataframe(df.iloc[:0], 'ES', '3m') == []
+    assert bars_from_dataframe(None, 'ES', '3m') == []
+
+
+def test_ticker_server_bar_rows():
+    from runners.price_ticker_server import _dataframe_to_bar_dicts
+
+    df = _make_df(n=50)
+    expected = []
+    for dt, row in df.iterrows():
+        expected.append({
+            'date': dt.strftime('%Y-%m-%d'), 'ts': int(dt.timestamp()),
+            'open': float(row['open']), 'high': float(row['high']), 'low': float(row['low']),
+            'close': float(row['close']), 'volume': 0 if np.isnan(row['volume']) else int(row['volume']),
+            'datetime': dt.strftime('%Y-%m-%d %H:%M:%S'),
+        })
+    assert _dataframe_to_bar_dicts(df, intraday=True) == expected
+    assert 'datetime' not in _dataframe_to_bar_dicts(df, intraday=False)[0]
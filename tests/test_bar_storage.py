@@ -0,0 +1,204 @@
+"""
+Tests for the binary columnar bar store (runners.bar_storage).
+"""
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+import runners.bar_storage as bar_storage
+from core.types import Bar
+from runners.bar_storage import (
+    export_csv_bars,
+    load_local_bars,
+    load_local_frame,
+    save_daily_bars,
+)
+from runners.data_loader import load_csv_bars
+
+
+@pytest.fixture(autouse=True)
+def bars_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(bar_storage, '_BARS_DIR', tmp_path)
+    return tmp_path
+
+
+def _day_bars(day, n=20, price=5000.0):
+    ts = datetime(day.year, day.month, day.day, 9, 30)
+    bars = []
+    for i in range(n):
+        o = price + i * 0.25
+        bars.append(Bar(timestamp=ts + timedelta(minutes=3 * i), open=o, high=o + 1.0, low=o - 0.75,
+                        close=o + 0.25, volume=100.0 + i, symbol='ES', timeframe='3m'))
+    return bars
+
+
+def _recent_days(k):
+    return [date.today() - timedelta(days=k - i) for i in range(k)]
+
+
+def test_save_and_load_round_trip():
+    d1, d2 = _recent_days(2)
+    bars = _day_bars(d1) + _day_bars(d2, price=5010.0)
+
+    assert save_daily_bars('ES', bars) == [d1.isoformat(), d2.isoformat()]
+    assert load_local_bars('ES') == bars
+    assert save_daily_bars('ES', bars) == []  # idempotent
+
+
+def test_load_is_memory_mapped():
+    save_daily_bars('ES', _day_bars(_recent_days(1)[0]))
+    frame = load_local_frame('ES')
+
+    assert isinstance(frame.close.base, np.memmap)
+    assert len(frame) == 20
+
+
+def test_backfill_keeps_order_and_skips_stored_dates():
+    d1, d2, d3 = _recent_days(3)
+    save_daily_bars('ES', _day_bars(d3))
+    created = save_daily_bars('ES', _day_bars(d1) + _day_bars(d3, price=1.0))
+
+    assert created == [d1.isoformat()]
+    loaded = load_local_bars('ES')
+    assert loaded == _day_bars(d1) + _day_bars(d3)
+
+
+def test_torn_trailing_record_ignored(bars_dir):
+    d1, d2 = _recent_days(2)
+    save_daily_bars('ES', _day_bars(d1))
+    path = bars_dir / 'ES' / '3m.bars'
+    with path.open('ab') as f:
+        f.write(b'\x00' * 7)
+
+    assert load_local_bars('ES') == _day_bars(d1)
+    save_daily_bars('ES', _day_bars(d2))
+    assert load_local_bars('ES') == _day_bars(d1) + _day_bars(d2)
+
+
+def test_retention_prunes_old_dates():
+    old = date.today() - timedelta(days=bar_storage._MAX_RETENTION_DAYS + 5)
+    recent = _recent_days(1)[0]
+    save_daily_bars('ES', _day_bars(old))
+    save_daily_bars('ES', _day_bars(recent))
+
+    assert load_local_frame('ES', apply_retention=False).to_bars() == _day_bars(recent)
+
+
+def test_legacy_csv_import_and_export(bars_dir):
+    d1 = _recent_days(1)[0]
+    save_daily_bars('ES', _day_bars(d1))
+    export_csv_bars('ES')
+    csv_path = bars_dir / 'ES' / f'{d1.isoformat()}.csv'
+    assert load_csv_bars(csv_path) == _day_bars(d1)
+
+    # A fresh directory holding only legacy CSVs is imported on load
+    (bars_dir / 'ES' / '3m.bars').unlink()
+    assert load_local_bars('ES') == _day_bars(d1)
+    assert save_daily_bars('ES', _day_bars(d1)) == []
+
+
+def test_aware_bars_stored_in_new_york_time():
+    d1 = _recent_days(1)[0]
+    naive = _day_bars(d1)
+    # The same bars stamped in UTC
+    aware = [replace(b, timestamp=b.timestamp.replace(tzinfo=ZoneInfo('America/New_York')).astimezone(timezone.utc))
+             for b in naive]
+    assert aware[0].timestamp.hour != naive[0].timestamp.hour
+
+    save_daily_bars('ES', aware)
+    assert load_local_bars('ES') == naive
+
+
+def test_legacy_csv_import_runs_once(bars_dir, monkeypatch):
+    d1, d2 = _recent_days(2)
+    save_daily_bars('ES', _day_bars(d1))
+    globs = []
+    glob = type(bars_dir).glob
+    monkeypatch.setattr(type(bars_dir), 'glob', lambda self, pattern: globs.append(pattern) or glob(self, pattern))
+
+    load_local_frame('ES')
+    save_daily_bars('ES', _day_bars(d2))
+    load_local_frame('ES')
+    assert globs == ['*.csv']  # Only the first load scanned for CSVs
+    assert (bars_dir / 'ES' / '3m.csv-imported').exists()
+
+
+class _FakeFeed:
+    """Serves the last n bars of a growing bar list, like fetch_futures_bars."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.end = 0
+        self.calls = []
+
+    def __call__(self, symbol, interval='3m', n_bars=500, **kwargs):
+        self.calls.append(n_bars)
+        return [replace(b) for b in self.bars[max(0, self.end - n_bars):self.end]]
+
+
+def test_live_cache_matches_full_reload(monkeypatch):
+    d1, d2 = _recent_days(2)
+    save_daily_bars('ES', _day_bars(d1))
+    feed = _FakeFeed(_day_bars(d1) + _day_bars(d2, n=120))
+    monkeypatch.setattr(bar_storage, 'fetch_futures_bars', feed)
+    cache = bar_storage.LiveBarCache(n_bars=200, tail_bars=10)
+
+    for end in range(40, 141, 4):
+        feed.end = end
+        # Last bar is still forming: its close changes between cycles
+        feed.bars[end - 1].close += 0.25
+        assert cache.get_bars('ES') == bar_storage.load_bars_with_history('ES', n_bars=200)
+
+    assert cache.full_reloads == 1
+    assert feed.calls.count(10) == cache.tail_merges
+
+
+def test_live_cache_reloads_after_gap(monkeypatch):
+    d1 = _recent_days(1)[0]
+    feed = _FakeFeed(_day_bars(d1, n=100))
+    monkeypatch.setattr(bar_storage, 'fetch_futures_bars', feed)
+    cache = bar_storage.LiveBarCache(n_bars=200, tail_bars=5)
+
+    feed.end = 20
+    cache.get_bars('ES')
+    feed.end = 40  # Missed more cycles than the tail covers
+    assert cache.get_bars('ES') == feed.bars[:40]
+    assert cache.full_reloads == 2
+
+
+def test_live_cache_times_fetches_and_loads(monkeypatch):
+    from core.stage_timer import StageTimer
+
+    d1 = _recent_days(1)[0]
+    feed = _FakeFeed(_day_bars(d1, n=60))
+    monkeypatch.setattr(bar_storage, 'fetch_futures_bars', feed)
+    timer = StageTimer()
+    cache = bar_storage.LiveBarCache(n_bars=200, tail_bars=5, timer=timer)
+
+    for end in (20, 22, 24):
+        feed.end = end
+        cache.get_bars('ES')
+
+    stages = timer.summary()['stages']
+    assert stages['tv_fetch']['n'] == 3 and stages['tv_fetch']['symbols']['ES']['n'] == 3
+    assert stages['history_load']['n'] == cache.full_reloads == 1
+
+
+def test_live_cache_fetches_only_new_bars(monkeypatch):
+    # Bars up to now: each cycle needs the new bar, the forming one and the overlap
+    start = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=3 * 60)
+    bars = [replace(b, timestamp=start + timedelta(minutes=3 * i)) for i, b in enumerate(_day_bars(start.date(), n=61))]
+    feed = _FakeFeed(bars)
+    monkeypatch.setattr(bar_storage, 'fetch_futures_bars', feed)
+    cache = bar_storage.LiveBarCache(n_bars=200, tail_bars=30)
+
+    feed.end = 58
+    cache.get_bars('ES')
+    feed.end = 61
+    if bars[-1].timestamp.date() != bars[57].timestamp.date():
+        pytest.skip('crosses midnight')
+    assert cache.get_bars('ES') == bars
+    assert feed.calls[-1] == 6  # 3 slots since bar 57, bar 57 itself, 2 overlap
@@ -0,0 +1,145 @@
+"""
+Tests for runners.replay.BatchReplayEngine: one pass over the streams must
+give every strategy exactly what running it alone over its bars gives.
+"""
+import csv
+from pathlib import Path
+
+import pytest
+
+from core.bar_frame import BarFrame
+from core.types import Bar
+from runners.data_loader import iter_csv_bars, load_csv_bars
+from runners.replay import BatchReplayEngine, Feed, ReplayEngine
+from strategies.factory import build_ict_from_yaml
+from strategies.ict_ote.strategy import ICTOTEStrategy
+from strategies.ict_sweep.strategy import ICTSweepStrategy
+
+CONFIGS = Path(__file__).parent.parent / 'config' / 'strategies'
+OTE_CONFIG = {'symbol': 'ES', 'swing_lookback': 3, 'impulse_body_multiplier': 1.5, 'min_impulse_ticks': 8}
+
+
+# 1m bars with a calmer walk than the 3m default
+WALK = dict(step=1, drift_every=45, drift=(0.1, 0.8), vol=(0.3, 1.5), wick=0.5)
+
+
+def _resample(bars, minutes):
+    out = []
+    for i in range(0, len(bars) - minutes + 1, minutes):
+        chunk = bars[i:i + minutes]
+        out.append(Bar(timestamp=chunk[0].timestamp, open=chunk[0].open, high=max(b.high for b in chunk),
+                       low=min(b.low for b in chunk), close=chunk[-1].close, volume=sum(b.volume for b in chunk),
+                       symbol=chunk[0].symbol, timeframe=f'{minutes}m'))
+    return out
+
+
+def _write_csv(path, bars):
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(['timestamp', 'open', 'high', 'low', 'close', 'volume', 'symbol', 'timeframe'])
+        for b in bars:
+            w.writerow([b.timestamp.isoformat(), b.open, b.high, b.low, b.close, b.volume, b.symbol, b.timeframe])
+
+
+def _counting(bars, reads):
+    for bar in bars:
+        reads.append(bar)
+        yield bar
+
+
+def test_iter_csv_bars_streams_rows(tmp_path, make_bars):
+    bars = make_bars(days=1, seed=21, **WALK)[:200]
+    path = tmp_path / 'es_1m.csv'
+    _write_csv(path, bars)
+    stream = iter_csv_bars(path)
+    assert next(stream) == bars[0]
+    assert list(stream) == bars[1:] and load_csv_bars(path) == bars
+    with pytest.raises(FileNotFoundError):
+        iter_csv_bars(tmp_path / 'missing.csv')
+
+    frame = BarFrame.from_bars(bars)
+    assert list(frame.iter_bars(chunk_size=7)) == frame.to_bars()
+
+
+def test_batch_matches_individual_runs(tmp_path, make_bars):
+    es_1m = make_bars(days=3, seed=21, **WALK)
+    nq_1m = make_bars(days=3, seed=22, price=18000.0, symbol='NQ', **WALK)
+    es_3m, es_5m = _resample(es_1m, 3), _resample(es_1m, 5)
+    csv_path = tmp_path / 'es_1m.csv'
+    _write_csv(csv_path, es_1m)
+    es_1m = load_csv_bars(csv_path)  # CSV round trip (float volume)
+
+    engine = BatchReplayEngine()
+    assert engine.add_yaml(CONFIGS / 'ict_es.yaml', timeframe='1m') == 'ict_es_ES'
+    engine.add_yaml(CONFIGS / 'ict_nq.yaml', symbol='NQ', name='ict_nq')
+    engine.add_yaml(CONFIGS / 'ict_sweep.yaml', symbol='ES')
+    engine.add('ote_es', ICTOTEStrategy(OTE_CONFIG), [
+        Feed('ES', '5m', 'update_htf', signals=False),
+        Feed('ES', '3m', 'update_ltf'),
+    ], reset_daily=True)
+
+    reads = []
+    result = engine.run({
+        ('ES', '1m'): _counting(iter_csv_bars(csv_path), reads),
+        ('NQ', '1m'): _counting(BarFrame.from_bars(nq_1m).iter_bars(), reads),
+        ('ES', '3m'): _counting(es_3m, reads),
+        ('ES', '5m'): _counting(es_5m, reads),
+        ('ES', '15m'): _counting(_resample(es_1m, 15), reads),  # Unused: never read
+    })
+    assert result.bars_read == len(reads) == len(es_1m) + len(nq_1m) + len(es_3m) + len(es_5m)
+    assert list(result.results) == ['ict_es_ES', 'ict_nq', 'ict_sweep_ES', 'ote_es']
+    assert result.strategy_seconds <= result.seconds
+
+    # ICTStrategy alone
+    for name, path, bars in (('ict_es_ES', CONFIGS / 'ict_es.yaml', es_1m),
+                             ('ict_nq', CONFIGS / 'ict_nq.yaml', nq_1m)):
+        alone = ReplayEngine(build_ict_from_yaml(path)).run(bars)
+        run = result.results[name]
+        assert run.bars_processed == len(bars)
+        assert [(s.direction, s.entry_price, s.stop_price) for s in run.signals] == \
+            [(s.direction, s.entry_price, s.stop_price) for s in alone.signals]
+
+    # ICTSweepStrategy alone: 3m bars up to each 5m bar first, reset per date
+    from config.loader import load_yaml
+    cfg = load_yaml(CONFIGS / 'ict_sweep.yaml')
+    sweep = ICTSweepStrategy({**{k: v for k, v in cfg.items() if k != 'symbols'}, **cfg['symbols']['ES']})
+    ote = ICTOTEStrategy(OTE_CONFIG)
+    sweep_entries, ote_trades = [], []
+    last_date = None
+    timestamps = sorted({b.timestamp for b in es_3m} | {b.timestamp for b in es_5m})
+    by_ts_3m = {b.timestamp: b for b in es_3m}
+    by_ts_5m = {b.timestamp: b for b in es_5m}
+    for ts in timestamps:
+        if last_date is not None and ts.date() != last_date:
+            sweep.reset_daily()
+            ote.reset_daily()
+        last_date = ts.date()
+        if ts in by_ts_3m:
+            sweep.process_mtf_bar(by_ts_3m[ts])
+        if ts in by_ts_5m:
+            sweep_entries += sweep.process_bar(by_ts_5m[ts])
+            ote.update_htf(by_ts_5m[ts])
+        if ts in by_ts_3m:
+            trade = ote.update_ltf(by_ts_3m[ts])
+            if trade:
+                ote_trades.append(trade)
+
+    assert sweep_entries and ote_trades
+    assert [(e.timestamp, e.direction, e.entry_price) for e in result.results['ict_sweep_ES'].signals] == \
+        [(e.timestamp, e.direction, e.entry_price) for e in sweep_entries]
+    assert [(t.timestamp, t.direction, t.entry_price) for t in result.results['ote_es'].signals] == \
+        [(t.timestamp, t.direction, t.entry_price) for t in ote_trades]
+    assert result.results['ote_es'].bars_processed == len(es_3m) + len(es_5m)
+
+
+def test_batch_engine_errors():
+    engine = BatchReplayEngine()
+    engine.add('a', ICTOTEStrategy(OTE_CONFIG), [Feed('ES', '3m', 'update_ltf')])
+    with pytest.raises(ValueError):
+        engine.add('a', ICTOTEStrategy(OTE_CONFIG), [Feed('ES', '3m', 'update_ltf')])
+    with pytest.raises(ValueError):
+        engine.add('b', ICTOTEStrategy(OTE_CONFIG), [Feed('ES', '3m', 'on_bar')])
+    with pytest.raises(ValueError):
+        engine.add('c', ICTOTEStrategy(OTE_CONFIG), [])
+    with pytest.raises(ValueError):
+        engine.run({('ES', '5m'): []})
@@ -0,0 +1,107 @@
+"""
+Parity tests for the vectorized exit simulator (core.exit_kernel):
+run_v10_dual_entry.replay_trades_vectorized vs manage_trades_on_bar()
+stepped through every session bar.
+"""
+import inspect
+import random
+from datetime import time as dt_time
+
+import numpy as np
+import pytest
+
+from core.exit_kernel import first_true, price_arrays, swing_masks, trail_levels
+import runners.run_v10_dual_entry as v10
+from runners.symbol_defaults import get_session_v10_kwargs
+
+
+def _replay_per_bar(session_bars, entries, params, opp_fvgs, session_to_all_idx):
+    """Reference: manage_trades_on_bar() on every session bar."""
+    entries_by_bar = {}
+    for entry in entries:
+        entries_by_bar.setdefault(entry['entry_bar_idx'], []).append(entry)
+
+    state = v10.new_trade_state()
+    for i in range(len(session_bars)):
+        v10.manage_trades_on_bar(state, i, session_bars, entries_by_bar.get(i, []),
+                                 params, opp_fvgs, session_to_all_idx)
+    return state
+
+
+def _random_exit_kwargs(rnd):
+    return {
+        't1_fixed_4r': rnd.random() < 0.6,
+        't1_r_target': rnd.choice([1, 2, 3]),
+        'trail_r_trigger': rnd.choice([1, 2, 4, 6]),
+        'opposing_fvg_exit': rnd.random() < 0.4,
+        'opposing_fvg_after_6r_only': rnd.random() < 0.5,
+        'post_t1_trail_r': rnd.choice([0, 0, 0.5, 1]),
+        't2_fixed_r': rnd.choice([0, 0, 2, 5]),
+        'time_decay_bars': rnd.choice([0, 0, 3, 10]),
+        'time_decay_r': rnd.choice([0, 0.5, 1]),
+        'contracts': rnd.choice([1, 2, 3, 4]),
+        'max_open_trades': rnd.choice([1, 2, 3]),
+        'max_consec_losses': rnd.choice([0, 1, 2]),
+        'max_losses_per_day': rnd.choice([1, 3]),
+        'max_retrace_risk_pts': rnd.choice([None, 2, 8]),
+    }
+
+
+def test_swing_masks_match_scalar(make_bars):
+    bars = make_bars(days=1, seed=5)[:300]
+    high, low, _ = price_arrays(bars)
+    for lookback in (1, 2, 3):
+        swing_high, swing_low = swing_masks(high, low, lookback)
+        assert list(swing_high) == [v10.is_swing_high(bars, i, lookback) for i in range(len(bars))]
+        assert list(swing_low) == [v10.is_swing_low(bars, i, lookback) for i in range(len(bars))]
+
+
+def test_first_true_and_trail_levels():
+    assert first_true(np.array([False, False, True, True])) == 2
+    assert first_true(np.array([False, False])) == -1
+    assert first_true(np.array([], dtype=bool)) == -1
+    levels = trail_levels(np.array([-np.inf, 3.0, 2.0, 5.0, -np.inf]), 2.5)
+    assert list(levels) == [2.5, 3.0, 3.0, 5.0, 5.0]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_v10_vectorized_replay_matches_scalar(seed, make_bars):
+    rnd = random.Random(seed)
+    bars = make_bars(days=3, seed=seed)
+    defaults = {n: p.default for n, p in inspect.signature(v10.simulate_exits).parameters.items()}
+
+    for day in sorted({b.timestamp.date() for b in bars})[1:]:
+        session = [b for b in bars if b.timestamp.date() == day and dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+        for symbol in ('ES', 'NQ'):
+            for _ in range(4):
+                kwargs = {**get_session_v10_kwargs(symbol), **_random_exit_kwargs(rnd)}
+                entry_kwargs, exit_kwargs = v10.split_session_kwargs(kwargs)
+                candidates = v10.generate_entries(session, bars, **entry_kwargs)
+                params = {name: exit_kwargs.get(name, defaults[name]) for name in v10.EXIT_PARAM_NAMES}
+                args = (session, candidates['entries'], params, candidates['fvgs'], candidates['session_to_all_idx'])
+
+                scalar = _replay_per_bar(*args)
+                vectorized = v10.replay_trades_vectorized(*args)
+                for key in ('entries_taken', 'loss_count', 'bos_loss_count', 'global_consec_losses'):
+                    assert vectorized[key] == scalar[key]
+                assert (v10.build_session_results(vectorized, session, params['tick_size'], 12.50, params['contracts'])
+                        == v10.build_session_results(scalar, session, params['tick_size'], 12.50, params['contracts']))
+
+
+def test_run_session_v10_uses_kernel_with_same_results(make_bars):
+    bars = make_bars(days=3, seed=5)
+    day = sorted({b.timestamp.date() for b in bars})[-1]
+    session = [b for b in bars if b.timestamp.date() == day and dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+    kwargs = get_session_v10_kwargs('ES')
+
+    entry_kwargs, _ = v10.split_session_kwargs(kwargs)
+    candidates = v10.generate_entries(session, bars, **entry_kwargs)
+    params = {name: kwargs.get(name, p.default) for name, p in inspect.signature(v10.simulate_exits).parameters.items()
+              if name in v10.EXIT_PARAM_NAMES}
+    state = _replay_per_bar(session, candidates['entries'], params,
+                            candidates['fvgs'], candidates['session_to_all_idx'])
+
+    expected = v10.build_session_results(state, session, params['tick_size'], kwargs.get('tick_value', 12.50),
+                                         params['contracts'])
+    assert expected
+    assert v10.run_session_v10(session, bars, **kwargs) == expected
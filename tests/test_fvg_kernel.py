@@ -0,0 +1,86 @@
+"""
+Parity tests for the vectorized FVG kernel.
+
+detect_fvgs() and update_all_fvg_mitigations() delegate to the NumPy array
+kernel. The bar-by-bar helpers (_detect_fvg_at_index, update_fvg_mitigation)
+are kept as the reference implementation; both paths must agree exactly.
+"""
+from dataclasses import asdict
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from strategies.ict.signals.fvg import (
+    _detect_fvg_at_index,
+    detect_fvg_arrays,
+    detect_fvgs,
+    update_all_fvg_mitigations,
+    update_fvg_mitigation,
+)
+
+
+# Choppy 3m walk from 4:00 with occasional displacement candles
+WALK = dict(start=datetime(2026, 2, 2, 4, 0), spike_prob=0.1)
+
+
+def _reference(bars, config):
+    """Bar-by-bar detection + per-FVG mitigation scan (pre-kernel behavior)."""
+    fvgs = [f for f in (_detect_fvg_at_index(bars, i, config) for i in range(2, len(bars))) if f]
+    for fvg in fvgs:
+        for i in range(fvg.created_bar_index + 1, len(bars)):
+            update_fvg_mitigation(fvg, bars[i], i, config)
+            if fvg.mitigated:
+                break
+    return fvgs
+
+
+@pytest.mark.parametrize("fvg_mode", ["wick", "body"])
+@pytest.mark.parametrize("invalidate_on_close", [True, False])
+@pytest.mark.parametrize("min_fvg_ticks", [1, 2, 5])
+def test_kernel_matches_reference(fvg_mode, invalidate_on_close, min_fvg_ticks, make_bars):
+    bars = make_bars(n=600, seed=min_fvg_ticks, **WALK)
+    config = {
+        'min_fvg_ticks': min_fvg_ticks,
+        'tick_size': 0.25,
+        'fvg_mode': fvg_mode,
+        'invalidate_on_close_through': invalidate_on_close,
+    }
+
+    fvgs = detect_fvgs(bars, config)
+    update_all_fvg_mitigations(fvgs, bars, config)
+    expected = _reference(bars, config)
+
+    assert fvgs
+    assert [asdict(f) for f in fvgs] == [asdict(f) for f in expected]
+
+
+def test_array_api_mitigation_matches_objects(make_bars):
+    bars = make_bars(n=300, seed=4, **WALK)
+    config = {'min_fvg_ticks': 2, 'tick_size': 0.25}
+    hits = detect_fvg_arrays(
+        np.array([b.high for b in bars]), np.array([b.low for b in bars]),
+        close=np.array([b.close for b in bars]), min_gap=0.5, mitigation=True,
+    )
+    expected = _reference(bars, config)
+
+    assert hits['index'].tolist() == [f.created_bar_index for f in expected]
+    assert hits['midpoint'].tolist() == [f.midpoint for f in expected]
+    assert hits['mitigation_index'].tolist() == [
+        f.mitigation_bar_index if f.mitigated else -1 for f in expected
+    ]
+
+
+def test_mitigation_against_shorter_bar_list(make_bars):
+    """FVGs created beyond the given bars are left unmitigated, as before."""
+    bars = make_bars(n=200, seed=2, **WALK)
+    config = {'min_fvg_ticks': 1, 'tick_size': 0.25}
+    fvgs = detect_fvgs(bars, config)
+    update_all_fvg_mitigations(fvgs, bars[:50], config)
+
+    assert all(not f.mitigated for f in fvgs if f.created_bar_index >= 49)
+
+
+def test_too_few_bars(make_bars):
+    assert detect_fvgs(make_bars(n=2, seed=1, **WALK), {'tick_size': 0.25}) == []
+    assert detect_fvg_arrays(np.array([1.0]), np.array([0.5]), mitigation=True)['index'].size == 0
@@ -0,0 +1,132 @@
+"""
+Tests for the multi-day backtest's window mode: build_history_windows()
+slice boundaries and the full-vs-window parity report.
+"""
+from datetime import date, datetime, timedelta
+
+import runners.backtest_v10_multiday as multiday
+from core.types import Bar
+
+
+def _bars_on(dates, per_day=4):
+    """per_day 3m bars at 9:30 on each date, prices encoding the date order.
+
+    Not make_bars: the slice bounds asserted below need exact bar counts
+    on arbitrary dates, gaps included.
+    """
+    bars = []
+    for k, d in enumerate(dates):
+        ts = datetime(d.year, d.month, d.day, 9, 30)
+        for j in range(per_day):
+            p = 5000.0 + k * 10 + j
+            bars.append(Bar(timestamp=ts + timedelta(minutes=3 * j), open=p, high=p + 1, low=p - 1,
+                            close=p, volume=100, symbol='ES', timeframe='3m'))
+    return bars
+
+
+def _trade(hour, minute, price, exits=(('T1', 1, 5010.0),), dollars=150.0):
+    entry_time = datetime(2026, 3, 4, hour, minute)
+    return {
+        'entry_time': entry_time, 'direction': 'LONG', 'entry_type': 'CREATION',
+        'entry_price': price, 'stop_price': price - 2, 'contracts': 1, 'risk': 2.0,
+        'exits': [{'type': t, 'cts': cts, 'price': p, 'time': entry_time + timedelta(minutes=6), 'pnl': dollars}
+                  for t, cts, p in exits],
+        'pnl': dollars / 50, 'total_dollars': dollars,
+    }
+
+
+# Mon-Wed, then a gap over Thu/Fri and the weekend, then Mon-Tue
+DATES = [date(2026, 3, 2), date(2026, 3, 3), date(2026, 3, 4), date(2026, 3, 9), date(2026, 3, 10)]
+
+
+def test_windows_first_date_and_gaps():
+    bars = _bars_on(DATES)
+    windows = multiday.build_history_windows(bars, DATES, window_days=2)
+
+    # First date: nothing before it, the window is just the day
+    assert windows[DATES[0]] == (0, 4)
+    # Two prior dates present in the data, whatever the calendar gap
+    assert windows[DATES[2]] == (0, 12)
+    assert windows[DATES[3]] == (4, 16)
+    assert {b.timestamp.date() for b in bars[slice(*windows[DATES[3]])]} == {DATES[1], DATES[2], DATES[3]}
+    assert windows[DATES[4]] == (8, 20)
+
+
+def test_window_larger_than_history_starts_at_first_bar():
+    bars = _bars_on(DATES)
+    windows = multiday.build_history_windows(bars, DATES, window_days=30)
+    assert all(start == 0 for start, _ in windows.values())
+    assert [end for _, end in windows.values()] == [4, 8, 12, 16, 20]
+
+
+def test_dates_without_bars_are_skipped():
+    bars = _bars_on(DATES)
+    windows = multiday.build_history_windows(bars, [date(2026, 3, 5), DATES[1]], window_days=1)
+    assert windows == {DATES[1]: (0, 8)}
+
+
+def test_compare_trade_lists():
+    same = _trade(10, 0, 5000.0)
+    moved_exit = _trade(11, 0, 5004.0)
+    other_exit = _trade(11, 0, 5004.0, exits=(('STOP', 1, 5002.0),), dollars=-100.0)
+    window_only = _trade(12, 0, 5008.0)
+
+    only_full, only_window = multiday.compare_trade_lists([moved_exit, same], [window_only, same, other_exit])
+    assert only_full == [moved_exit]
+    assert only_window == [window_only, other_exit]
+    assert multiday.compare_trade_lists([same], [dict(same)]) == ([], [])
+
+
+def test_parity_report_lists_differences(monkeypatch, capsys):
+    full_bars = []
+    for d in [date(2026, 3, 2) + timedelta(days=k) for k in range(10)]:
+        if d.weekday() < 5:
+            ts = datetime(d.year, d.month, d.day, 4, 0)
+            full_bars += [Bar(timestamp=ts + timedelta(minutes=3 * j), open=5000.0, high=5001.0, low=4999.0,
+                              close=5000.0, volume=100, symbol='ES', timeframe='3m') for j in range(240)]
+    monkeypatch.setattr(multiday, 'load_bars_with_history', lambda **kwargs: list(full_bars))
+
+    shared = _trade(10, 0, 5000.0)
+    full_only = _trade(13, 30, 5012.0, dollars=-75.0)
+
+    def fake_run(session_bars, all_bars, **kwargs):
+        # Only the last day differs, and only with the full history
+        last_day = session_bars[0].timestamp.date() == full_bars[-1].timestamp.date()
+        if last_day and len(all_bars) == len(full_bars):
+            return [shared, full_only]
+        return [shared]
+
+    monkeypatch.setattr(multiday, 'run_session_v10', fake_run)
+    multiday.backtest_v10_multiday('ES', days=5, parity_report=True)
+    out = capsys.readouterr().out
+
+    report = out[out.index('PARITY REPORT'):]
+    assert 'PARITY REPORT - 3-date window vs full history' in report
+    assert f'{full_bars[-1].timestamp.date()}: 1 trade(s) only in full history, 0 only in window' in report
+    assert '  [full  ] LONG CREATION @ 13:30 Entry: 5012.00 $-75.00' in report
+    assert report.count('only in full history') == 1
+
+
+def test_drop_last_bar_cuts_full_and_window_alike(monkeypatch):
+    # 4:00-18:00 bars, so each day has bars after its last session bar (16:00)
+    bars = []
+    for d in DATES:
+        ts = datetime(d.year, d.month, d.day, 4, 0)
+        bars += [Bar(timestamp=ts + timedelta(minutes=3 * j), open=5000.0, high=5001.0, low=4999.0,
+                     close=5000.0, volume=100, symbol='ES', timeframe='3m') for j in range(281)]
+    windows = multiday.build_history_windows(bars, DATES, window_days=2)
+    runs = []
+    monkeypatch.setattr(multiday, 'run_session_v10',
+                        lambda session_bars, all_bars, **kwargs: runs.append((session_bars, all_bars)) or [])
+
+    target = DATES[2]
+    multiday.run_backtest_day(target, bars, {}, windows, drop_last_bar=True, parity_report=True)
+    multiday.run_backtest_day(target, bars, {}, None, drop_last_bar=True)
+
+    (window_session, window_bars), (full_session, full_bars), (plain_session, plain_bars) = runs
+    last_seen = datetime(target.year, target.month, target.day, 15, 57)
+    assert window_session == full_session == plain_session
+    assert window_session[-1].timestamp == last_seen
+    # Same cut in every mode: the history ends with the last session bar the scanner sees
+    assert window_bars[-1].timestamp == full_bars[-1].timestamp == plain_bars[-1].timestamp == last_seen
+    assert window_bars == full_bars[windows[target][0]:]
@@ -0,0 +1,136 @@
+"""
+Tests for the constant-cost ICTStrategy bar path: BarWindow (must behave as
+a trimmed list), PriorSessionTracker (must equal get_prior_session_levels on
+the window) and DisplacementFVGTracker (must equal updating and checking
+every displacement FVG on every bar).
+"""
+import copy
+import random
+from datetime import datetime
+
+import pytest
+
+from core.bar_history import BarWindow
+from strategies.ict.ict_strategy import ICTStrategy
+from strategies.ict.signals.fvg import (
+    DisplacementFVGTracker,
+    check_retest_eligible,
+    check_retest_entry,
+    detect_displacement_fvg,
+)
+from strategies.ict.signals.sweep import PriorSessionTracker, get_prior_session_levels
+
+
+# Intraday bars from 8:00 with strong trending stretches
+WALK = dict(start=datetime(2026, 2, 2, 8, 0), drift_every=25, drift=(0.2, 2.0), vol=(0.5, 4.0), wick=0.5)
+
+
+RETEST_CONFIG = {
+    "tick_size": 0.25,
+    "min_fvg_ticks": 2,
+    "retest_min_move_away_ticks": 8,
+    "retest_min_move_away_pct": 50,
+    "retest_fvg_max_age_bars": 60,
+}
+
+
+def test_bar_window_matches_trimmed_list(make_bars):
+    bars = make_bars(n=300, seed=11, step=5, **WALK)
+    window = BarWindow(maxlen=40)
+    expected = []
+    for bar in bars:
+        window.append(bar)
+        expected = (expected + [bar])[-40:]
+        assert len(window) == len(expected)
+        assert window[-1] is bar and window[0] is expected[0]
+        assert window[:-1] == expected[:-1]
+        assert window[-5:] == expected[-5:]
+        assert window[3:9] == expected[3:9]
+    assert list(window) == expected
+    assert list(reversed(window)) == expected[::-1]
+    assert window[::3] == expected[::3]
+    with pytest.raises(IndexError):
+        window[40]
+    with pytest.raises(ValueError):
+        BarWindow(maxlen=0)
+
+
+@pytest.mark.parametrize("step,maxlen", [(5, 60), (15, 30), (60, 40), (240, 12)])
+def test_prior_session_tracker_matches_window_scan(step, maxlen, make_bars):
+    bars = make_bars(n=600, seed=11, step=step, **WALK)
+    window = BarWindow(maxlen)
+    tracker = PriorSessionTracker(maxlen)
+    found = 0
+    for bar in bars:
+        window.append(bar)
+        tracker.append(bar)
+        expected = get_prior_session_levels(window[:-1], bar)
+        assert tracker.levels() == expected
+        found += expected is not None
+    assert found
+
+
+@pytest.mark.parametrize("entry_mode,freeze_at", [("MIDPOINT", 150), ("FIRST_TOUCH", 150), ("MIDPOINT", None)])
+def test_displacement_fvg_tracker_matches_full_scan(entry_mode, freeze_at, make_bars):
+    bars = make_bars(n=2000, seed=11, step=5, **WALK)
+    rnd = random.Random(3)
+    tracker = DisplacementFVGTracker(RETEST_CONFIG, entry_mode)
+    reference = []
+    triggered = 0
+
+    for i, bar in enumerate(bars):
+        # As in ICTStrategy: indices stop advancing once the history is full
+        bar_index = i if freeze_at is None else min(i, freeze_at)
+        disp_fvg = detect_displacement_fvg(bars[:i + 1], i - 1, RETEST_CONFIG)
+        if disp_fvg:
+            disp_fvg.displacement_bar_index = bar_index - 1
+            reference.append(disp_fvg)
+            tracker.add(copy.deepcopy(disp_fvg))
+
+        for ref in reference:
+            if not ref.fvg.mitigated:
+                ref.update_price_extremes(bar, bar_index)
+                ref.retest_eligible = check_retest_eligible(ref, RETEST_CONFIG)
+        tracker.update(bar, bar_index)
+
+        expected = [ref for ref in reference if not ref.retest_triggered and check_retest_entry(bar, ref, entry_mode)]
+        candidates = tracker.retest_candidates(bar)
+        assert [(c.fvg.midpoint, c.displacement_bar_index) for c in candidates] == \
+            [(r.fvg.midpoint, r.displacement_bar_index) for r in expected]
+
+        # Trigger some candidates (rejected ones stay triggered but unused)
+        # and use one, marking the FVGs around it, as the strategy does
+        for ref, cand in zip(expected, candidates):
+            ref.retest_triggered = cand.retest_triggered = True
+            if rnd.random() < 0.5:
+                ref.fvg.mitigated = cand.fvg.mitigated = True
+                triggered += 1
+                for other in reference:
+                    if (not other.retest_triggered and abs(other.fvg.midpoint - ref.fvg.midpoint) < 0.5
+                            and other.displacement_direction == ref.displacement_direction):
+                        other.retest_triggered = other.fvg.mitigated = True
+                for other in tracker.near_midpoint(cand.fvg.midpoint, 0.5, cand.displacement_direction):
+                    other.retest_triggered = other.fvg.mitigated = True
+                break
+
+    assert triggered
+    live = [ref for ref in reference if not (ref.retest_triggered or ref.fvg.mitigated)
+            and bar_index - ref.displacement_bar_index <= 60]
+    assert [d.displacement_bar_index for d in tracker] == [r.displacement_bar_index for r in live]
+
+
+def test_strategy_state_stays_bounded(make_bars):
+    config = {
+        "name": "ICT_Incremental",
+        "lookback_bars": 20,
+        "require_sweep": False,
+        "enable_fvg_retest": True,
+    }
+    strategy = ICTStrategy(config, {"symbol": "ES", "tick_size": 0.25, "tick_value": 12.50})
+    bars = make_bars(n=3000, seed=11, step=1, **WALK)
+    for bar in bars:
+        strategy.on_bar(bar)
+
+    assert len(strategy._bars) == 60 and strategy._bars[-1] is bars[-1]
+    assert len(strategy._ema_history) <= strategy._crossover_lookback_bars + 10
+    assert len(strategy._swing_index.high_indices) <= 20
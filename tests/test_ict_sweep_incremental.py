@@ -0,0 +1,111 @@
+"""
+Tests for the constant-cost ICTSweepStrategy bar path: BarHistory, the
+incremental ADX/EMA (must equal calculate_adx and the full-history EMA bit
+for bit) and detect_sweep on a SwingIndex (must equal the rescan).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.bar_history import BarHistory
+from core.swing_index import SwingIndex
+from core.types import Bar
+from strategies.ict_sweep.signals.sweep import detect_sweep
+from strategies.ict_sweep.strategy import ICTSweepStrategy, IncrementalADX, IncrementalEMA, calculate_adx
+
+
+# Intraday bars from 8:00 with trending stretches (sweeps and FVGs happen)
+WALK = dict(start=datetime(2026, 2, 2, 8, 0), drift_every=30, drift=(0.2, 1.5))
+
+
+def _full_ema(closes, period):
+    if len(closes) < period:
+        return None
+    multiplier = 2 / (period + 1)
+    ema = sum(closes[:period]) / period
+    for price in closes[period:]:
+        ema = (price * multiplier) + (ema * (1 - multiplier))
+    return ema
+
+
+def test_bar_history_absolute_indices(make_bars):
+    bars = make_bars(n=300, seed=7, step=5, **WALK)
+    history = BarHistory(maxlen=50)
+    for bar in bars:
+        history.append(bar)
+
+    assert len(history) == 300
+    assert history.first_index == 250
+    assert history[-1] is bars[-1]
+    assert history[260] is bars[260]
+    assert history[290:] == bars[290:]
+    assert history[-3:] == bars[-3:]
+    assert list(history) == bars[250:]
+    with pytest.raises(IndexError):
+        history[249]
+    with pytest.raises(IndexError):
+        history[100:260]
+
+    assert history.bisect_timestamp(bars[270].timestamp) == 270
+    assert history.bisect_timestamp(bars[-1].timestamp + timedelta(minutes=1)) == 300
+    history.discard_before(280)
+    assert history.first_index == 280 and history[280] is bars[280]
+
+    seen = []
+    BarHistory(maxlen=5, bars=bars[:20], on_append=seen.append)
+    assert seen == bars[:20]
+    with pytest.raises(ValueError):
+        BarHistory(maxlen=0)
+
+
+@pytest.mark.parametrize("period", [5, 14])
+def test_incremental_adx_and_ema_match_full_history(period, make_bars):
+    bars = make_bars(n=250, seed=7, step=5, **WALK)
+    # Flat stretch: zero ATR / zero DI sum paths
+    flat = [Bar(timestamp=b.timestamp, open=5000, high=5000, low=5000, close=5000, volume=1) for b in bars[:40]]
+    bars = flat + bars
+    adx = IncrementalADX(period)
+    ema = IncrementalEMA(period)
+    for n, bar in enumerate(bars, start=1):
+        adx.update(bar)
+        ema.update(bar.close)
+        assert adx.value() == calculate_adx(bars[:n], period)
+        assert ema.value == _full_ema([b.close for b in bars[:n]], period)
+
+
+@pytest.mark.parametrize("lookback,check_bars", [(3, 3), (2, 1), (1, 0)])
+def test_detect_sweep_with_swing_index_matches_rescan(lookback, check_bars, make_bars):
+    bars = make_bars(n=600, seed=7, step=5, **WALK)
+    swings = SwingIndex(lookback)
+    found = 0
+    for n, bar in enumerate(bars, start=1):
+        swings.append(bar.high, bar.low)
+        expected = detect_sweep(bars[:n], 0.25, lookback, 2, check_bars)
+        assert detect_sweep(bars[:n], 0.25, lookback, 2, check_bars, swings=swings) == expected
+        found += expected is not None
+    assert found
+
+    with pytest.raises(ValueError):
+        detect_sweep(bars, 0.25, lookback + 1, 2, check_bars, swings=swings)
+
+
+def test_strategy_memory_stays_bounded(make_bars):
+    config = {'use_mtf_fvg': True, 'max_daily_trades': 1000, 'max_daily_losses': 1000}
+    strategy = ICTSweepStrategy(config)
+    bars = make_bars(n=3000, seed=7, step=5, **WALK)
+    mtf = make_bars(n=5000, seed=8, step=3, **WALK)
+    mi = 0
+    for bar in bars:
+        while mi < len(mtf) and mtf[mi].timestamp <= bar.timestamp:
+            strategy.process_mtf_bar(mtf[mi])
+            mi += 1
+        strategy.process_bar(bar)
+
+    assert len(strategy.bars) == 3000
+    assert len(list(strategy.bars)) <= strategy.history_bars
+    assert len(list(strategy.mtf_bars)) < 2 * strategy.history_bars
+    assert len(strategy._swings.high_indices) <= 65
+    assert strategy._calculate_ema(20) == _full_ema([b.close for b in bars], 20)
+
+    strategy.reset_daily()
+    assert len(strategy.bars) == 0 and strategy._calculate_ema(20) is None
@@ -0,0 +1,106 @@
+"""
+Tests for the LRU memo layer and its use in run_session_v10.
+"""
+from datetime import time as dt_time
+
+import pytest
+
+from core.bar_frame import BarFrame
+from core.memo import LRUMemo, bars_fingerprint
+from core.types import Bar
+import runners.run_v10_dual_entry as v10
+from runners.symbol_defaults import get_session_v10_kwargs
+
+
+
+def test_lru_eviction_and_counters():
+    memo = LRUMemo(maxsize=2)
+    calls = []
+
+    def compute(k):
+        calls.append(k)
+        return k * 10
+
+    assert memo.get_or_compute(1, lambda: compute(1)) == 10
+    assert memo.get_or_compute(2, lambda: compute(2)) == 20
+    assert memo.get_or_compute(1, lambda: compute(1)) == 10  # hit, 1 is now most recent
+    memo.get_or_compute(3, lambda: compute(3))               # evicts 2
+
+    assert 1 in memo and 3 in memo and 2 not in memo
+    assert calls == [1, 2, 3]
+    assert memo.stats() == {'hits': 1, 'misses': 3, 'size': 2, 'maxsize': 2}
+
+
+def test_lru_disabled():
+    memo = LRUMemo(maxsize=0)
+    memo.get_or_compute('k', lambda: 1)
+    memo.get_or_compute('k', lambda: 1)
+    assert memo.misses == 2 and len(memo) == 0
+
+
+def test_fingerprint_sees_every_value(make_bars):
+    bars = make_bars(n=50, seed=1)
+    assert bars_fingerprint(bars) == bars_fingerprint(list(bars))
+    changed = list(bars)
+    changed[-1] = Bar(**{**vars(bars[-1]), 'close': bars[-1].close + 0.25})
+    assert bars_fingerprint(changed) != bars_fingerprint(bars)
+    assert bars_fingerprint(BarFrame.from_bars(bars)) == bars_fingerprint(BarFrame.from_bars(bars))
+
+
+@pytest.fixture
+def memos_on():
+    previous = v10.set_memoization(True)
+    v10.FVG_MEMO.clear()
+    v10.ENTRY_MEMO.clear()
+    yield
+    v10.set_memoization(previous)
+
+
+def test_memos_off_by_default(make_bars):
+    bars = make_bars(days=1, seed=1)
+    session = [b for b in bars if dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+    assert v10.set_memoization(False) is False  # Nothing in the suite leaves them on
+
+    v10.run_session_v10(session, bars, **get_session_v10_kwargs('ES'))
+    v10.run_session_v10(session, bars, **get_session_v10_kwargs('ES'))
+
+    assert v10.memo_stats()['fvgs'] == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 16}
+    assert v10.memo_stats()['entries'] == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 256}
+
+
+def test_entry_memo_holds_candidates_only(memos_on, make_bars):
+    bars = make_bars(days=1, seed=1)
+    session = [b for b in bars if dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+    entry_kwargs, _ = v10.split_session_kwargs(get_session_v10_kwargs('ES'))
+
+    candidates = v10.generate_entries(session, bars, **entry_kwargs)
+    (stored,) = v10.ENTRY_MEMO._data.values()
+    assert set(stored) == {'entries', 'session_to_all_idx', 'fvg_config', 'bars_key', 'consol_skips'}
+
+    # The FVG list handed out is the one owned by FVG_MEMO
+    (fvgs,) = v10.FVG_MEMO._data.values()
+    assert candidates['fvgs'] is fvgs
+    assert candidates['kernel_cache'] is not v10.generate_entries(session, bars, **entry_kwargs)['kernel_cache']
+
+
+def test_exit_only_variant_reuses_entries(memos_on, make_bars):
+    bars = make_bars(days=1, seed=1)
+    session = [b for b in bars if dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+    kwargs = get_session_v10_kwargs('ES')
+
+    base = v10.run_session_v10(session, bars, **kwargs)
+    exit_variant = {**kwargs, 'trail_r_trigger': 6, 't1_r_target': 2, 'post_t1_trail_r': 1}
+    memoized = v10.run_session_v10(session, bars, **exit_variant)
+
+    stats = v10.memo_stats()
+    assert stats['entries']['hits'] == 1 and stats['fvgs']['hits'] == 1
+
+    # Same results as a cold run
+    v10.FVG_MEMO.clear()
+    v10.ENTRY_MEMO.clear()
+    assert base and memoized != base
+    assert memoized == v10.run_session_v10(session, bars, **exit_variant)
+
+    # Entry params are part of the key
+    v10.run_session_v10(session, bars, **{**kwargs, 'min_risk_pts': kwargs['min_risk_pts'] + 1})
+    assert v10.ENTRY_MEMO.misses == 2
@@ -0,0 +1,22 @@
+"""
+The process-pool multi-day backtest (--workers=N) must print exactly the
+same report as the serial run.
+"""
+import pytest
+
+import runners.backtest_v10_multiday as multiday
+
+
+@pytest.mark.parametrize("options", [{}, {'drop_last_bar': True, 'opp_fvg_exit': True}])
+def test_workers_report_identical(options, monkeypatch, capsys, make_bars):
+    bars = make_bars(days=6, seed=3)
+    monkeypatch.setattr(multiday, 'load_bars_with_history', lambda **kwargs: list(bars))
+
+    serial = multiday.backtest_v10_multiday('ES', days=10, verbose=True, **options)
+    serial_out = capsys.readouterr().out
+    parallel = multiday.backtest_v10_multiday('ES', days=10, verbose=True, workers=2, **options)
+    parallel_out = capsys.readouterr().out
+
+    assert parallel == serial
+    assert parallel_out == serial_out
+    assert 'Total Trades' in serial_out
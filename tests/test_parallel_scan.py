@@ -0,0 +1,207 @@
+"""
+Tests for LiveTrader's parallel scan stage and per-cycle bar snapshot.
+
+Fetch + evaluate runs on the scan pool; applying results (last prices,
+caches, signal processing) must stay on the loop thread and in symbol
+order no matter which fetch finishes first. Trade management reuses the
+bars the scan fetched instead of calling TradingView once per trade.
+"""
+import pstats
+import signal
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from core.types import Bar
+from runners.run_live import LiveTrader, PaperTrade, PaperTradeStatus
+from runners.prop_firm.run_live import LiveTrader as PropLiveTrader
+
+EST = ZoneInfo('America/New_York')
+
+# Later symbols fetch faster, so completion order is the reverse of symbol order
+FETCH_DELAY = {'ES': 0.15, 'NQ': 0.10, 'MES': 0.05, 'MNQ': 0.0}
+
+
+def _session_bars(symbol, price):
+    today = datetime.now(EST).date()
+    ts = datetime(today.year, today.month, today.day, 10, 0)
+    return [Bar(timestamp=ts, open=price, high=price + 1, low=price - 1, close=price,
+                volume=100, symbol=symbol, timeframe='3m')]
+
+
+def _run_scan(trader_cls, symbols):
+    with patch.object(signal, 'signal'):
+        trader = trader_cls(paper_mode=True, symbols=symbols)
+    trader.running = True
+    fetch_threads = {}
+    processed = []
+
+    def get_bars(symbol):
+        fetch_threads[symbol] = threading.current_thread()
+        time.sleep(FETCH_DELAY[symbol])
+        return _session_bars(symbol, 100.0 + len(fetch_threads))
+
+    def process(symbol, results, config):
+        processed.append((symbol, threading.current_thread(), dict(trader.last_prices)))
+
+    module = trader_cls.__module__
+    with patch.object(trader.bar_cache, 'get_bars', side_effect=get_bars), \
+            patch(f'{module}.run_session_v10', return_value=[]), \
+            patch(f'{module}.detect_fvgs', return_value=[]), \
+            patch.object(trader, '_process_futures_signals', side_effect=process):
+        started = time.monotonic()
+        trader._scan_symbols()
+        elapsed = time.monotonic() - started
+
+    trader._scan_pool.shutdown()
+    return trader, fetch_threads, processed, elapsed
+
+
+@pytest.mark.parametrize("trader_cls", [LiveTrader, PropLiveTrader])
+def test_parallel_fetch_serial_apply(trader_cls):
+    symbols = ['ES', 'NQ', 'MES', 'MNQ']
+    trader, fetch_threads, processed, elapsed = _run_scan(trader_cls, symbols)
+
+    # Signals processed on the loop thread, in symbol order
+    assert [p[0] for p in processed] == symbols
+    assert all(p[1] is threading.main_thread() for p in processed)
+    # Each symbol's state is applied right before its own signal processing
+    for k, (symbol, _, prices) in enumerate(processed):
+        assert set(prices) == set(symbols[:k + 1])
+
+    # Fetches ran concurrently on the pool
+    assert all(t is not threading.main_thread() for t in fetch_threads.values())
+    assert elapsed < sum(FETCH_DELAY.values())
+
+    assert set(trader.scan_latency) == set(symbols)
+    assert trader.scan_latency['ES'] >= FETCH_DELAY['ES']
+
+
+def test_scan_error_isolated_to_symbol():
+    with patch.object(signal, 'signal'):
+        trader = LiveTrader(paper_mode=True, symbols=['ES', 'NQ'])
+    trader.running = True
+
+    def get_bars(symbol):
+        if symbol == 'ES':
+            raise RuntimeError('feed down')
+        return _session_bars(symbol, 20000.0)
+
+    with patch.object(trader.bar_cache, 'get_bars', side_effect=get_bars), \
+            patch('runners.run_live.run_session_v10', return_value=[]) as run, \
+            patch('runners.run_live.detect_fvgs', return_value=[]):
+        trader._scan_symbols()
+
+    trader._scan_pool.shutdown()
+    assert run.call_count == 1
+    assert trader.last_prices == {'NQ': 20000.0}
+
+
+def _paper_trade(trade_id, symbol='ES', entry=5000.0, stop=4990.0):
+    return PaperTrade(
+        id=trade_id, symbol=symbol, direction='LONG', entry_type='CREATION',
+        entry_price=entry, stop_price=stop, target_4r=entry + 30, target_8r=entry + 60,
+        plus_4r=entry + 30, contracts=3, tick_size=0.25, tick_value=12.50,
+        asset_type='futures', status=PaperTradeStatus.OPEN,
+        entry_time=datetime(2026, 3, 2, 10, 0, tzinfo=EST),
+        t1_last_swing=entry, t2_last_swing=entry, runner_last_swing=entry,
+    )
+
+
+def _trader_with_trades(symbols, trades):
+    with patch.object(signal, 'signal'):
+        trader = LiveTrader(paper_mode=True, symbols=symbols)
+    trader.running = True
+    for trade in trades:
+        trader.paper_trades[trade.id] = trade
+    return trader
+
+
+def test_paper_trades_use_scan_snapshot():
+    trader = _trader_with_trades(['ES', 'NQ'], [_paper_trade('P1'), _paper_trade('P2'), _paper_trade('P3', 'NQ', 20000.0, 19990.0)])
+    prices = {'ES': 5001.0, 'NQ': 20001.0}
+
+    with patch.object(trader.bar_cache, 'get_bars', side_effect=lambda s: _session_bars(s, prices[s])), \
+            patch('runners.run_live.run_session_v10', return_value=[]), \
+            patch('runners.run_live.detect_fvgs', return_value=[]):
+        trader._scan_symbols()
+    trader._scan_pool.shutdown()
+
+    with patch('runners.run_live.fetch_futures_bars') as fetch:
+        trader._manage_paper_trades()
+
+    fetch.assert_not_called()
+    assert all(t.status == PaperTradeStatus.OPEN for t in trader.paper_trades.values())
+
+
+def test_stale_snapshot_fetched_once_per_symbol():
+    trader = _trader_with_trades(['ES'], [_paper_trade('P1'), _paper_trade('P2')])
+    # Fetched before the last bar close: must be refreshed
+    trader._bar_snapshot['ES'] = {'bars': _session_bars('ES', 5001.0), 'fetched_at': time.time() - 180}
+
+    stop_bars = _session_bars('ES', 4985.0)
+    with patch('runners.run_live.fetch_futures_bars', return_value=stop_bars) as fetch:
+        trader._manage_paper_trades()
+
+    assert fetch.call_count == 1
+    assert not trader.paper_trades  # Both stopped out on the refreshed bars
+    assert trader.paper_daily_losses == 2
+
+
+def test_cycle_stages_written_to_perf_state(tmp_path):
+    import json
+
+    trader = _trader_with_trades(['ES', 'NQ'], [_paper_trade('P1')])
+    prices = {'ES': 5001.0, 'NQ': 20001.0}
+
+    with patch.object(trader.bar_cache, 'get_bars', side_effect=lambda s: _session_bars(s, prices[s])), \
+            patch('runners.run_live.run_session_v10', return_value=[]), \
+            patch('runners.run_live.detect_fvgs', return_value=[]), \
+            patch.object(LiveTrader, 'SIGNAL_STATE_PATH', tmp_path / 'signal_state.json'), \
+            patch.object(LiveTrader, 'PERF_STATE_PATH', tmp_path / 'perf_state.json'), \
+            patch.object(trader, '_print_status'):
+        trader._run_cycle()
+    trader._scan_pool.shutdown()
+
+    state = json.loads((tmp_path / 'perf_state.json').read_text())
+    assert state['cycle_budget_s'] == trader.scan_interval
+    stages = state['stages']
+    for name in ('cycle', 'scan', 'manage_paper_trades', 'write_signal_state'):
+        assert stages[name]['n'] == 1
+    for name in ('apply_signals', 'run_session_v10'):
+        assert stages[name]['n'] == 2 and set(stages[name]['symbols']) == {'ES', 'NQ'}
+    assert stages['cycle']['max'] >= stages['scan']['max']
+
+
+def test_profiled_cycle_sees_symbol_evaluation(tmp_path):
+    trader = _trader_with_trades(['ES', 'NQ'], [])
+    prices = {'ES': 5001.0, 'NQ': 20001.0}
+    eval_threads = []
+
+    def strategy_hot_path(*args, **kwargs):
+        eval_threads.append(threading.current_thread())
+        return []
+
+    logged = []
+    with patch.object(trader.bar_cache, 'get_bars', side_effect=lambda s: _session_bars(s, prices[s])), \
+            patch('runners.run_live.run_session_v10', side_effect=strategy_hot_path), \
+            patch('runners.run_live.detect_fvgs', return_value=[]), \
+            patch('runners.run_live.log', side_effect=logged.append), \
+            patch.object(LiveTrader, 'SIGNAL_STATE_PATH', tmp_path / 'signal_state.json'), \
+            patch.object(LiveTrader, 'PERF_STATE_PATH', tmp_path / 'perf_state.json'), \
+            patch.object(LiveTrader, 'PROFILE_DIR', tmp_path / 'profiles'), \
+            patch.object(trader, '_print_status'):
+        trader._profile_cycle()
+    trader._scan_pool.shutdown()
+
+    # cProfile only sees its own thread: the profiled cycle evaluates there
+    assert eval_threads == [threading.main_thread()] * 2
+    (path,) = (tmp_path / 'profiles').glob('cycle_*.prof')
+    profiled = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert 'strategy_hot_path' in profiled
+    assert any('Profiling this cycle' in line for line in logged)
+    assert not trader._scan_inline
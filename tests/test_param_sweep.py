@@ -0,0 +1,106 @@
+"""
+Tests for the parameter sweep engine (runners.param_sweep).
+"""
+from datetime import time as dt_time
+
+import pytest
+
+from runners.backtest_v10_multiday import build_history_windows, run_backtest_day
+from runners.param_sweep import (
+    build_variant_kwargs,
+    grid_variants,
+    lhs_variants,
+    parse_param_spec,
+    run_sweep,
+    run_sweep_day,
+    summarize_trades,
+)
+from runners.run_v10_dual_entry import run_session_v10
+
+
+VARIANTS = [
+    {},
+    {'trail_r_trigger': 6, 't1_r_target': 2},
+    {'fvg_mode': 'body', 'min_risk': 2.0},
+    {'opp_fvg_exit': True, 'opposing_fvg_mode': 'body'},
+]
+
+
+def test_parse_param_spec():
+    assert parse_param_spec('trail_r_trigger=4,6,8') == ('trail_r_trigger', {'choices': [4, 6, 8]})
+    assert parse_param_spec('min_risk=1:2:0.5') == ('min_risk', {'choices': [1.0, 1.5, 2.0]})
+    assert parse_param_spec('consol_threshold=0:2') == ('consol_threshold', {'range': (0, 2)})
+    assert parse_param_spec('fvg_mode=wick,body') == ('fvg_mode', {'choices': ['wick', 'body']})
+    assert parse_param_spec('max_bos_risk=none,8') == ('max_bos_risk', {'choices': [None, 8]})
+    with pytest.raises(ValueError):
+        parse_param_spec('trail_r_trigger')
+
+
+def test_samplers():
+    space = dict(parse_param_spec(s) for s in ('a=1,2,3', 'b=x,y'))
+    assert len(grid_variants(space)) == 6
+    assert {'a': 3, 'b': 'y'} in grid_variants(space)
+
+    # Each of the n strata of a continuous range is hit exactly once
+    samples = lhs_variants({'c': {'range': (0.0, 1.0)}}, 10, seed=3)
+    assert sorted(int(v['c'] * 10) for v in samples) == list(range(10))
+
+
+def test_variant_kwargs():
+    kwargs = build_variant_kwargs('ES', {'min_risk': 2.5, 'fvg_mode': 'body'})
+    assert kwargs['min_risk_pts'] == 2.5
+    assert kwargs['fvg_mode'] == 'body'
+    with pytest.raises(ValueError):
+        build_variant_kwargs('ES', {'not_a_param': 1})
+
+
+def test_precomputed_matches_fresh_runs(make_bars):
+    bars = make_bars(days=4, seed=11)
+    day = sorted({b.timestamp.date() for b in bars})[2]
+    session = [b for b in bars if b.timestamp.date() == day and dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+
+    precomputed = {}
+    for overrides in VARIANTS:
+        kwargs = build_variant_kwargs('ES', overrides)
+        assert run_session_v10(session, bars, precomputed=precomputed, **kwargs) == run_session_v10(session, bars, **kwargs)
+    assert ('fvgs', 0.25, 'body') in precomputed
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep_matches_per_day_backtest(workers, make_bars):
+    bars = make_bars(days=4, seed=11)
+    rows = run_sweep(['ES'], VARIANTS, days=3, workers=workers, bars_by_symbol={'ES': bars})
+
+    days = sorted({b.timestamp.date() for b in bars})[-3:]
+    for row, overrides in zip(rows, VARIANTS):
+        kwargs = build_variant_kwargs('ES', overrides)
+        pnls = []
+        for d in days:
+            session = [b for b in bars if b.timestamp.date() == d and dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+            pnls += [r['total_dollars'] for r in run_session_v10(session, bars, **kwargs)]
+        assert {k: row[k] for k in summarize_trades(pnls)} == summarize_trades(pnls)
+        assert row['symbol'] == 'ES' and all(row[k] == v for k, v in overrides.items())
+
+
+@pytest.mark.parametrize("window_days", [None, 1])
+def test_drop_last_bar_matches_backtest_day(window_days, make_bars):
+    bars = make_bars(days=4, seed=11)
+    days = sorted({b.timestamp.date() for b in bars})[1:]
+    windows = build_history_windows(bars, days, window_days) if window_days is not None else None
+    variant_kwargs = [build_variant_kwargs('ES', overrides) for overrides in VARIANTS]
+
+    for d in days:
+        window = windows[d] if windows is not None else None
+        swept = run_sweep_day(d, bars, variant_kwargs, window, drop_last_bar=True)
+        for pnls, kwargs in zip(swept, variant_kwargs):
+            results = run_backtest_day(d, bars, kwargs, windows, drop_last_bar=True)[0]
+            assert pnls == [r['total_dollars'] for r in results]
+
+
+def test_summarize_trades():
+    stats = summarize_trades([100.0, -50.0, -75.0, 200.0])
+    assert stats['trades'] == 4
+    assert stats['win_rate'] == 50.0
+    assert stats['pnl'] == 175.0
+    assert stats['profit_factor'] == 300.0 / 125.0
+    assert stats['max_drawdown'] == 125.0
@@ -0,0 +1,177 @@
+"""
+Tests for core.resample: clock-aligned, session-aware buckets, the vectorized
+and incremental resamplers agreeing, and one 1m stream feeding every timeframe.
+"""
+import random
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import runners.tradingview_loader as tradingview_loader
+from core.bar_frame import BarFrame
+from core.resample import BarResampler, resample_bars, resample_frame, resample_stream, timeframe_minutes
+from core.types import Bar
+
+ET = ZoneInfo('America/New_York')
+
+
+def _make_bars(start=datetime(2026, 3, 1, 18, 0), end=datetime(2026, 3, 11, 17, 0), seed=9, gaps=True):
+    """Globex-hours 1m bars (no 17:00 hour, no weekend) with random gaps."""
+    rnd = random.Random(seed)
+    bars = []
+    p = 5000.0
+    t = start
+    while t < end:
+        if t.hour != 17 and t.weekday() != 5 and not (t.weekday() == 4 and t.hour >= 17) \
+                and not (t.weekday() == 6 and t.hour < 18) and not (gaps and rnd.random() < 0.05):
+            o = p
+            c = round((o + rnd.gauss(0, 1)) * 4) / 4
+            bars.append(Bar(timestamp=t, open=o, high=max(o, c) + 0.25, low=min(o, c) - 0.25, close=c,
+                            volume=rnd.randint(1, 50), symbol='ES', timeframe='1m'))
+            p = c
+        t += timedelta(minutes=1)
+    return bars
+
+
+def _reference(bars, minutes):
+    """Group by the CME bucket computed per bar with datetime arithmetic."""
+    groups = {}
+    for b in bars:
+        session_open = datetime.combine(b.timestamp.date(), time(18, 0))
+        if b.timestamp < session_open:
+            session_open -= timedelta(days=1)
+        if minutes == 1440:
+            key = session_open.replace(hour=0) + timedelta(days=1)
+        else:
+            elapsed = (b.timestamp - session_open) // timedelta(minutes=minutes)
+            key = session_open + timedelta(minutes=minutes * elapsed)
+        groups.setdefault(key, []).append(b)
+    return [Bar(timestamp=k, open=g[0].open, high=max(b.high for b in g), low=min(b.low for b in g),
+                close=g[-1].close, volume=sum(b.volume for b in g), symbol='ES', timeframe=f'{minutes}m')
+            for k, g in groups.items()]
+
+
+@pytest.mark.parametrize('tf', ['2m', '3m', '5m', '15m', '1h', '4h', '1d'])
+def test_vectorized_and_incremental_match_reference(tf):
+    bars = _make_bars()
+    minutes = timeframe_minutes(tf)
+    expected = [Bar(**{**b.__dict__, 'timeframe': tf}) for b in _reference(bars, minutes)]
+    assert resample_bars(bars, tf) == expected
+    assert list(resample_stream(bars, [tf])) == expected
+
+
+def test_session_anchoring_and_close():
+    bars = _make_bars(gaps=False)
+    four_hour = resample_bars(bars, '4h')
+    assert [b.timestamp.hour for b in four_hour[:7]] == [18, 22, 2, 6, 10, 14, 18]
+    # The 14:00 bar ends at the 17:00 close: 180 minutes
+    assert four_hour[5].volume == sum(b.volume for b in bars if b.timestamp.date() == four_hour[5].timestamp.date()
+                                      and 14 <= b.timestamp.hour < 17)
+    daily = resample_bars(bars, '1d')
+    # Sunday evening open belongs to Monday; no weekend bars
+    assert [d.timestamp for d in daily[:6]] == [datetime(2026, 3, d) for d in (2, 3, 4, 5, 6, 9)]
+    assert daily[0].open == bars[0].open
+
+    # Calendar buckets
+    calendar = resample_bars(bars, '1d', session=None)
+    assert calendar[0].timestamp == datetime(2026, 3, 1) and calendar[1].timestamp == datetime(2026, 3, 2)
+
+
+def test_gap_keeps_alignment():
+    bars = _make_bars(gaps=False)[:60]
+    del bars[7]  # 18:07 missing
+    two = resample_bars(bars, '2m')
+    assert all(b.timestamp.minute % 2 == 0 for b in two)
+    assert [b.volume for b in two if b.timestamp.minute == 6][0] == bars[6].volume
+
+
+def test_incremental_closes_on_last_minute():
+    bars = _make_bars(gaps=False)[:38]
+    resampler = BarResampler(['5m', '15m'])
+    emitted = []
+    for bar in bars:
+        closed = resampler.update(bar)
+        emitted.append([(b.timeframe, b.timestamp.minute) for b in closed])
+    assert emitted[3] == [] and emitted[4] == [('5m', 0)]
+    assert emitted[14] == [('5m', 10), ('15m', 0)]
+    assert resampler.forming('5m').timestamp.minute == 35 and resampler.forming('15m').volume == \
+        sum(b.volume for b in bars[30:])
+    assert resampler.update(bars[-1]) == []  # Not newer: ignored
+    assert [b.timeframe for b in resampler.flush()] == ['5m', '15m']
+    assert resampler.forming('5m') is None
+
+
+def test_aware_timestamps_across_dst():
+    naive = _make_bars(start=datetime(2026, 3, 5, 18, 0), end=datetime(2026, 3, 10, 17, 0))
+    aware = [Bar(**{**b.__dict__, 'timestamp': b.timestamp.replace(tzinfo=ET)}) for b in naive]
+    for tf in ('1h', '4h', '1d'):
+        expected = [b.timestamp.replace(tzinfo=ET) for b in resample_bars(naive, tf)]
+        frame = resample_frame(BarFrame.from_bars(aware), tf)
+        assert frame.tz is ET and frame.datetimes() == expected
+        assert [b.timestamp for b in resample_stream(aware, [tf])] == expected
+
+
+def test_fetch_timeframes_derives_from_one_stream(monkeypatch):
+    bars = _make_bars(gaps=False)[:600]
+    calls = []
+
+    def fetch(symbol, interval='3m', n_bars=500, **kwargs):
+        calls.append((interval, n_bars))
+        return bars[-n_bars:]
+
+    monkeypatch.setattr(tradingview_loader, 'fetch_futures_bars', fetch)
+    out = tradingview_loader.fetch_timeframes('ES', ['1m', '3m', '1h'], {}, max_bars=5000)
+    assert calls == [('1m', 5000)]
+    assert out['1m'] == bars and out['3m'] == resample_bars(bars, '3m') and len(out['1h']) == 10
+
+
+def test_partial_first_bucket_dropped():
+    bars = _make_bars(gaps=False)
+    mid_bucket = bars[7:]  # Starts 18:07, inside the 18:00 15m bucket
+    full = resample_bars(mid_bucket, '15m')
+    assert full[0].timestamp == datetime(2026, 3, 1, 18, 0)
+    assert resample_bars(mid_bucket, '15m', drop_partial_first=True) == full[1:]
+    # An aligned start keeps its first bucket; a lone partial bucket leaves nothing
+    assert resample_bars(bars[15:], '15m', drop_partial_first=True) == resample_bars(bars[15:], '15m')
+    assert resample_bars(bars[7:12], '15m', drop_partial_first=True) == []
+
+
+def test_fetch_timeframes_drops_partial_first_bucket(monkeypatch):
+    bars = _make_bars(gaps=False)[:600]
+    monkeypatch.setattr(tradingview_loader, 'fetch_futures_bars',
+                        lambda symbol, interval='3m', n_bars=500, **kwargs: bars[-n_bars:])
+    # 500 capped minutes start at 19:40, partway through the 19:30 15m bucket
+    out = tradingview_loader.fetch_timeframes('ES', ['1m', '15m'], {}, max_bars=500)
+    assert out['1m'][0].timestamp == datetime(2026, 3, 1, 19, 40)
+    assert out['15m'][0].timestamp == datetime(2026, 3, 1, 19, 45)
+    assert out['15m'] == resample_bars(bars, '15m')[-len(out['15m']):]
+
+
+def test_ticker_15m_datasets_built_from_1m(monkeypatch):
+    import runners.price_ticker_server as ticker
+
+    bars = _make_bars(gaps=False)
+    calls = []
+
+    def fetch(symbol, interval='3m', n_bars=500, **kwargs):
+        calls.append((symbol, interval))
+        return bars[-n_bars:]
+
+    monkeypatch.setattr(tradingview_loader, 'fetch_futures_bars', fetch)
+    monkeypatch.setattr(ticker, '_bar_1m_cache', {})
+    rows = ticker._fetch_resampled_dataset(ticker.BAR_DATASETS['ES_15m'])
+
+    assert calls == [('ES', '1m')]
+    expected = resample_bars(bars, '15m')[-100:]
+    assert len(rows) == 100
+    assert [r['datetime'] for r in rows] == [b.timestamp.strftime('%Y-%m-%d %H:%M:%S') for b in expected]
+    assert rows[-1]['close'] == expected[-1].close and rows[-1]['volume'] == expected[-1].volume
+    assert rows[0]['ts'] == int((expected[0].timestamp - datetime(1970, 1, 1)).total_seconds())
+
+
+def test_timeframe_parsing():
+    assert [timeframe_minutes(tf) for tf in ('1m', '15min', '1h', '4H', '1d')] == [1, 15, 60, 240, 1440]
+    for bad in ('2d', '0m', 'm5', '1w'):
+        with pytest.raises(ValueError):
+            timeframe_minutes(bad)
@@ -0,0 +1,53 @@
+"""
+Tests for map_session_indices(): the timestamp-hash mapping between
+session_bars and all_bars positions must match the nested scan it
+replaced (first all_bars occurrence wins, unmatched session bars are left
+out of both maps).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import runners.prop_firm.run_v10_dual_entry as prop_v10
+import runners.run_v10_dual_entry as v10
+from core.types import Bar
+
+
+def _bar(minute, price=5000.0):
+    ts = datetime(2026, 3, 2, 9, 30) + timedelta(minutes=minute)
+    return Bar(timestamp=ts, open=price, high=price + 1, low=price - 1, close=price,
+               volume=100, symbol='ES', timeframe='3m')
+
+
+def _nested_scan(session_bars, all_bars):
+    """The original O(session x history) mapping."""
+    session_to_all_idx = {}
+    all_to_session_idx = {}
+    for i, sbar in enumerate(session_bars):
+        for j, abar in enumerate(all_bars):
+            if abar.timestamp == sbar.timestamp:
+                session_to_all_idx[i] = j
+                all_to_session_idx[j] = i
+                break
+    return session_to_all_idx, all_to_session_idx
+
+
+@pytest.mark.parametrize("module", [v10, prop_v10])
+def test_duplicates_and_missing_bars(module):
+    # all_bars repeats 9:36 (a re-fetched bar) and has no 9:39 or 9:45 bar
+    all_bars = [_bar(0), _bar(3), _bar(6), _bar(6, 5002.0), _bar(12), _bar(15)]
+    # The session repeats 9:42 and has bars all_bars lacks (9:39, 9:45)
+    session_bars = [_bar(3), _bar(6), _bar(9), _bar(12), _bar(12), _bar(18), _bar(15)]
+
+    session_to_all, all_to_session = module.map_session_indices(session_bars, all_bars)
+
+    assert session_to_all == {0: 1, 1: 2, 3: 4, 4: 4, 6: 5}  # First 9:36 (index 2) wins
+    assert all_to_session == {1: 0, 2: 1, 4: 4, 5: 6}         # Last session duplicate wins
+    assert (session_to_all, all_to_session) == _nested_scan(session_bars, all_bars)
+
+
+@pytest.mark.parametrize("module", [v10, prop_v10])
+def test_empty_inputs(module):
+    bars = [_bar(0), _bar(3)]
+    assert module.map_session_indices([], bars) == ({}, {})
+    assert module.map_session_indices(bars, []) == ({}, {})
@@ -0,0 +1,115 @@
+"""
+Parity tests for the streaming SessionV10Engine.
+
+Feeding bars one at a time must give the same result list as calling
+run_session_v10() on the same prefix (what the live scanner does every
+cycle), including bars after the session close and after midnight.
+"""
+from datetime import datetime, time as dt_time
+
+import pytest
+
+from runners.run_v10_dual_entry import run_session_v10
+from runners.session_v10_engine import SessionV10Engine
+from runners.symbol_defaults import get_session_v10_kwargs
+
+
+def _session(bars, d):
+    return [b for b in bars if b.timestamp.date() == d and dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+
+
+VARIANTS = [
+    {},
+    {'consol_threshold': 1.5, 'retracement_morning_only': True},
+    {'disable_bos_retrace': False, 'max_bos_risk_pts': None, 'use_hybrid_filters': False},
+    {'opposing_fvg_exit': True, 'opposing_fvg_mode': 'body', 'confirm_creation': True},
+    {'fvg_mode': 'body', 'retracement_trend_aligned': True, 'post_t1_trail_r': 1,
+     'time_decay_bars': 10, 'time_decay_r': 2, 'max_consec_losses': 2},
+]
+
+
+@pytest.mark.parametrize("symbol,seed", [('ES', 1), ('NQ', 7)])
+@pytest.mark.parametrize("variant", VARIANTS)
+def test_streaming_matches_batch(symbol, seed, variant, make_bars):
+    bars = make_bars(days=4, seed=seed, price=5000.0 if symbol == 'ES' else 20000.0, symbol=symbol, spike_prob=0.05)
+    session_date = sorted({b.timestamp.date() for b in bars})[2]
+    history = [b for b in bars if b.timestamp.date() < session_date]
+    # Session day plus the following night (post-close mitigation, after-midnight FVGs)
+    stream = [b for b in bars if b.timestamp.date() >= session_date][:600]
+    kwargs = {**get_session_v10_kwargs(symbol), **variant}
+
+    engine = SessionV10Engine(session_date, history, **kwargs)
+    for k, bar in enumerate(stream):
+        update = engine.on_bar(bar)
+        if k % 40 and k != len(stream) - 1:
+            continue
+        all_bars = history + stream[:k + 1]
+        session_bars = _session(all_bars, session_date)
+        if not session_bars:
+            assert engine.results() == []
+            continue
+        results = engine.results()
+        assert results == run_session_v10(session_bars, all_bars, **kwargs)
+        for trade in update['entries']:
+            assert trade['entry_time'] in {r['entry_time'] for r in results}
+
+
+def test_history_with_session_bars_replays(make_bars):
+    """Session bars passed as history are streamed, same as feeding them one by one."""
+    bars = make_bars(days=3, seed=5, spike_prob=0.05)
+    session_date = sorted({b.timestamp.date() for b in bars})[-1]
+    kwargs = get_session_v10_kwargs('ES')
+    cut = len(bars) - 200
+
+    engine = SessionV10Engine(session_date, bars[:cut], **kwargs)
+    for bar in bars[cut:]:
+        engine.on_bar(bar)
+
+    assert engine.results() == run_session_v10(_session(bars, session_date), bars, **kwargs)
+
+
+def test_rejects_out_of_order_bars(make_bars):
+    bars = make_bars(days=1, seed=1, spike_prob=0.05)
+    engine = SessionV10Engine(bars[0].timestamp.date(), bars[:100])
+    with pytest.raises(ValueError):
+        engine.on_bar(bars[50])
+
+
+def test_unknown_kwarg_rejected():
+    with pytest.raises(TypeError):
+        SessionV10Engine(datetime(2026, 2, 2).date(), [], not_a_param=1)
+
+
+def test_revision_replays_from_checkpoint(make_bars, monkeypatch):
+    """A changed entry restarts trade management at the last entry bar before it, not at 4:00."""
+    import runners.session_v10_engine as engine_module
+
+    stepped = []
+    manage = engine_module.manage_trades_on_bar
+
+    def recording(state, k, *args):
+        stepped.append(k)
+        return manage(state, k, *args)
+
+    monkeypatch.setattr(engine_module, 'manage_trades_on_bar', recording)
+    bars = make_bars(days=4, seed=7, spike_prob=0.05)
+    session_date = sorted({b.timestamp.date() for b in bars})[2]
+    history = [b for b in bars if b.timestamp.date() < session_date]
+    stream = [b for b in bars if b.timestamp.date() >= session_date][:600]
+    kwargs = get_session_v10_kwargs('ES')
+
+    engine = SessionV10Engine(session_date, history, **kwargs)
+    restarts = []
+    for bar in stream:
+        stepped.clear()
+        n = len(engine.session_bars)
+        checkpoints = {k for k, _ in engine._checkpoints}
+        if engine.on_bar(bar)['revised']:
+            restarts.append(stepped[0])
+            assert stepped[0] == 0 or stepped[0] in checkpoints
+        else:
+            assert stepped == list(range(n, len(engine.session_bars)))
+
+    assert any(k > 0 for k in restarts)
+    session_bars = _session(history + stream, session_date)
+    assert engine.results() == run_session_v10(session_bars, history + stream, **kwargs)
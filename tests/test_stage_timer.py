@@ -0,0 +1,67 @@
+"""
+Tests for core.stage_timer: rolling per-stage statistics and cProfile capture.
+"""
+import threading
+
+import pytest
+
+from core.stage_timer import StageTimer, profile_call
+
+
+def test_summary_percentiles_and_window():
+    timer = StageTimer(window=100)
+    for k in range(1, 201):
+        timer.record('fetch', k / 100)
+    stats = timer.summary()['stages']['fetch']
+    # Only the last 100 samples (1.01 .. 2.00) count; n counts every run
+    assert stats['n'] == 200
+    assert stats['last'] == stats['max'] == 2.0
+    assert stats['p50'] == pytest.approx(1.505)
+    assert stats['p95'] == pytest.approx(1.9505)
+    assert timer.last('fetch') == 2.0 and timer.last('missing') is None
+    with pytest.raises(ValueError):
+        StageTimer(window=0)
+
+
+def test_stage_records_per_symbol_and_on_error():
+    timer = StageTimer()
+    with timer.stage('scan', 'ES'):
+        pass
+    with pytest.raises(RuntimeError):
+        with timer.stage('scan', 'NQ'):
+            raise RuntimeError('boom')
+    timer.count('cycles_over_budget')
+    timer.count('cycles_over_budget', 2)
+
+    summary = timer.summary()
+    scan = summary['stages']['scan']
+    assert scan['n'] == 2 and set(scan['symbols']) == {'ES', 'NQ'}
+    assert scan['symbols']['NQ']['n'] == 1
+    assert summary['counters'] == {'cycles_over_budget': 3}
+
+    timer.reset()
+    assert timer.summary() == {'stages': {}, 'counters': {}}
+
+
+def test_threads_record_concurrently():
+    timer = StageTimer(window=50)
+
+    def work(symbol):
+        for _ in range(500):
+            timer.record('run', 0.001, symbol)
+
+    threads = [threading.Thread(target=work, args=(s,)) for s in ('ES', 'NQ', 'GC', 'CL')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stages = timer.summary()['stages']['run']
+    assert stages['n'] == 2000 and all(s['n'] == 500 for s in stages['symbols'].values())
+
+
+def test_profile_call_writes_stats(tmp_path):
+    calls = []
+    path = tmp_path / 'profiles' / 'cycle.prof'
+    report = profile_call(lambda: calls.append(sum(range(1000))), path, top=5)
+    assert calls == [499500]
+    assert path.exists() and 'cumulative' in report
@@ -0,0 +1,159 @@
+"""
+Tests for core.swing_index: the incremental SwingIndex must find exactly
+the swings of the point checks it replaced, and the callers moved onto
+it (find_swing_highs/lows, ICTStrategy, build_zigzag, V10 BOS) must
+return what they did before.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.bar_frame import BarFrame
+from core.swing_index import SwingIndex, SwingIndexes, is_swing_high, is_swing_low
+from core.types import Bar
+import runners.run_v10_dual_entry as v10
+from strategies.ict.ict_strategy import ICTStrategy
+from strategies.ict.signals.elliott_wave import build_zigzag
+from strategies.ict.signals.sweep import find_swing_highs, find_swing_lows, find_swing_points
+from strategies.ict_sweep.signals import liquidity
+
+
+def _make_bars(n=400, seed=3, price=5000.0):
+    """Random-walk 1m bars on a tick grid (plenty of equal highs/lows)."""
+    rnd = random.Random(seed)
+    bars = []
+    p = price
+    ts = datetime(2026, 2, 2, 9, 30)
+    for _ in range(n):
+        o = p
+        c = o + rnd.choice([-1, 0, 1]) * rnd.choice([0.25, 0.5, 1.0])
+        h = max(o, c) + rnd.choice([0, 0, 0.25, 0.5])
+        l = min(o, c) - rnd.choice([0, 0, 0.25, 0.5])
+        bars.append(Bar(timestamp=ts, open=o, high=h, low=l, close=c, volume=100, symbol='ES', timeframe='1m'))
+        p = c
+        ts += timedelta(minutes=1)
+    return bars
+
+
+def _scalar_high(bars, i, left, right):
+    """The original find_swing_highs rule."""
+    if i < left or i >= len(bars) - right:
+        return False
+    return all(bars[j].high < bars[i].high for j in range(i - left, i + right + 1) if j != i)
+
+
+def _scalar_low(bars, i, left, right):
+    if i < left or i >= len(bars) - right:
+        return False
+    return all(bars[j].low > bars[i].low for j in range(i - left, i + right + 1) if j != i)
+
+
+@pytest.mark.parametrize("left,right", [(0, 0), (1, 1), (2, 2), (3, 1), (2, 0), (4, 2)])
+def test_index_matches_point_checks(left, right):
+    bars = _make_bars()
+    index = SwingIndex(left, right)
+    for n, bar in enumerate(bars, start=1):
+        index.append(bar.high, bar.low)
+        # Every prefix: the index holds exactly the swings confirmed so far
+        if n % 37 == 0 or n == len(bars):
+            prefix = bars[:n]
+            assert [i for i, _ in index.highs()] == [i for i in range(n) if _scalar_high(prefix, i, left, right)]
+            assert [i for i, _ in index.lows()] == [i for i in range(n) if _scalar_low(prefix, i, left, right)]
+
+    for i in range(len(bars)):
+        assert index.is_high(i) == is_swing_high(bars, i, left, right) == _scalar_high(bars, i, left, right)
+        assert index.is_low(i) == is_swing_low(bars, i, left, right) == _scalar_low(bars, i, left, right)
+    assert all(price == bars[i].high for i, price in index.highs())
+    assert all(price == bars[i].low for i, price in index.lows())
+
+
+def test_last_swing_queries():
+    bars = _make_bars()
+    index = SwingIndex.from_bars(bars, 2)
+    for before in range(0, len(bars) + 1, 7):
+        for after in (-1, before - 10):
+            highs = [i for i in range(after + 1, before) if index.is_high(i)]
+            lows = [i for i in range(after + 1, before) if index.is_low(i)]
+            assert index.last_high(before, after) == ((highs[-1], bars[highs[-1]].high) if highs else (None, None))
+            assert index.last_low(before, after) == ((lows[-1], bars[lows[-1]].low) if lows else (None, None))
+
+
+def test_prune_and_bar_frame_input():
+    bars = _make_bars()
+    index = SwingIndex.from_bars(BarFrame.from_bars(bars), 3, 1)
+    assert index.highs() == SwingIndex.from_bars(bars, 3, 1).highs()
+
+    index.prune(200)
+    assert index.highs() == SwingIndex.from_bars(bars, 3, 1).highs(200)
+    assert index.last_high(150) == (None, None)
+    assert len(index) == len(bars)
+
+    with pytest.raises(ValueError):
+        SwingIndex(-1)
+
+
+def test_swing_indexes_backfill_on_get():
+    bars = _make_bars()
+    indexes = SwingIndexes()
+    for bar in bars[:150]:
+        indexes.append(bar.high, bar.low)
+    early = indexes.get(2)
+    for bar in bars[150:]:
+        indexes.append(bar.high, bar.low)
+    late = indexes.get(4, 1)
+
+    assert indexes.get(2) is early
+    assert early.highs() == SwingIndex.from_bars(bars, 2).highs()
+    assert late.lows() == SwingIndex.from_bars(bars, 4, 1).lows()
+
+
+def test_find_swing_functions_match_scalar():
+    bars = _make_bars()
+    for left, right in ((2, 2), (3, 1), (1, 3)):
+        highs = find_swing_highs(bars, left, right)
+        lows = find_swing_lows(bars, left, right)
+        assert [s.bar_index for s in highs] == [i for i in range(len(bars)) if _scalar_high(bars, i, left, right)]
+        assert [s.bar_index for s in lows] == [i for i in range(len(bars)) if _scalar_low(bars, i, left, right)]
+        assert all(s.timestamp == bars[s.bar_index].timestamp and s.swing_type == 'HIGH' for s in highs)
+        assert find_swing_points(bars, left, right) == (highs, lows)
+    assert find_swing_highs(bars[:4], 2, 2) == []
+
+    recent = liquidity.find_swing_highs(bars, lookback=3, max_swings=5)
+    expected = [i for i in range(len(bars)) if _scalar_high(bars, i, 3, 3)][-5:][::-1]
+    assert [s.bar_index for s in recent] == expected
+
+
+def test_ict_strategy_swings_match_window_scan():
+    config = {
+        "name": "ICT_Swing_Index",
+        "swing_left_bars": 3,
+        "swing_right_bars": 1,
+        "lookback_bars": 12,
+    }
+    strategy = ICTStrategy(config, {"symbol": "ES", "tick_size": 0.25, "tick_value": 12.50})
+    for bar in _make_bars(n=300):
+        strategy.on_bar(bar)
+        strategy._update_swing_points()
+        window = strategy._bars[max(0, len(strategy._bars) - 12):]
+        assert strategy._swing_highs == find_swing_highs(window, 3, 1)
+        assert strategy._swing_lows == find_swing_lows(window, 3, 1)
+
+
+def test_build_zigzag_shared_indexes():
+    bars = _make_bars(n=600)
+    swings = SwingIndexes.from_bars(bars)
+    for scale in (2, 4, 8):
+        zigzag = build_zigzag(bars, scale, swings=swings)
+        assert zigzag == build_zigzag(bars, scale)
+        assert all(p.bar_index < len(bars) - 1 for p in zigzag)
+
+
+def test_v10_detect_bos_with_index():
+    bars = _make_bars(n=300)
+    swings = SwingIndex(2)
+    for i, bar in enumerate(bars):
+        swings.append(bar.high, bar.low)
+        # Streaming: only bars[:i + 1] are in the index
+        assert v10.detect_bos(bars, i, 10, swings=swings) == v10.detect_bos(bars, i, 10)
+        assert v10.find_recent_swing_low(bars, i, 20, swings=swings) == v10.find_recent_swing_low(bars, i, 20)
@@ -198,6 +198,7 @@ class TestKwargsCompleteness:
         'time_decay_bars',        # A/B testing CLI flag (trail improvement option D)
         'time_decay_r',           # A/B testing CLI flag (trail improvement option D)
         'confirm_creation',       # A/B testing CLI flag (FVG confirmation filter)
+        'precomputed',            # sweep-only cache of FVGs/indicators, not a strategy param
     }
 
     EQUITY_ALLOWLIST = {
@@ -334,7 +334,7 @@ class TestBug3StaleFvgCache:
             timestamp=session_ts,
         )] * 30
 
-        with patch('runners.run_live.load_bars_with_history', return_value=fake_bars):
+        with patch.object(trader.bar_cache, 'get_bars', return_value=fake_bars):
             with patch('runners.run_live.run_session_v10', return_value=[]):
                 with patch('runners.run_live.detect_fvgs', return_value=[]):
                     trader._scan_futures_symbol('ES')
@@ -0,0 +1,86 @@
+"""
+Tests for delta fetching in runners.tradingview_loader: sizing the tail
+request, merging it into held bars, and falling back to a full fetch.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import runners.tradingview_loader as tradingview_loader
+from core.types import Bar
+from runners.tradingview_loader import bars_to_cover, fetch_tail, merge_tail
+
+START = datetime(2026, 3, 2, 9, 30)
+
+
+class _FakeFeed:
+    """Serves the last n bars up to `end`, like fetch_futures_bars."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.end = 0
+        self.calls = []
+
+    def __call__(self, symbol, interval='3m', n_bars=500, **kwargs):
+        self.calls.append(n_bars)
+        return list(self.bars[max(0, self.end - n_bars):self.end])
+
+
+def test_bars_to_cover():
+    last = datetime(2026, 3, 2, 10, 0)
+    assert bars_to_cover(last, '3m', overlap=2, now=last + timedelta(minutes=1)) == 3
+    assert bars_to_cover(last, '3m', overlap=2, now=last + timedelta(minutes=7)) == 5
+    assert bars_to_cover(last, '1h', overlap=0, now=last + timedelta(hours=3)) == 4
+    assert bars_to_cover(last, '5m', overlap=1, now=last - timedelta(minutes=5)) == 2  # Clock skew
+    with pytest.raises(ValueError):
+        bars_to_cover(last, '7m')
+
+
+def test_merge_tail_replaces_overlap_and_extends(make_bars):
+    bars = make_bars(n=10, start=START)
+    tail = [Bar(**{**b.__dict__, 'close': b.close + 1}) for b in make_bars(n=14, start=START)[8:]]
+    merged = merge_tail(bars, tail)
+    assert merged == bars[:8] + tail
+    assert len(bars) == 10  # Not modified
+    assert merge_tail(bars, []) == bars
+
+    assert merge_tail(bars, make_bars(n=14, start=START)[11:]) is None  # Gap
+    assert merge_tail(bars, make_bars(n=4, start=START + timedelta(minutes=1))) is None  # Misaligned
+    assert merge_tail([], tail) is None
+
+
+def test_fetch_tail_requests_only_the_gap(monkeypatch, make_bars):
+    feed = _FakeFeed(make_bars(n=300, start=START))
+    monkeypatch.setattr(tradingview_loader, 'fetch_futures_bars', feed)
+    cache = {}
+
+    feed.end = 100
+    assert fetch_tail('ES', '3m', cache, max_bars=120) == feed.bars[:100]
+    assert feed.calls == [120]
+
+    for end in range(101, 160):
+        feed.end = end
+        now = feed.bars[end - 1].timestamp + timedelta(seconds=30)
+        bars = fetch_tail('es', '3m', cache, max_bars=120, overlap=2, now=now)
+        assert bars == feed.bars[max(0, end - 120):end] and cache[('ES', '3m')] is bars
+    # Each cycle: one new bar + the previous last bar + 2 overlap
+    assert feed.calls[1:] == [4] * 59
+
+
+def test_fetch_tail_falls_back_to_full_fetch(monkeypatch, make_bars):
+    feed = _FakeFeed(make_bars(n=300, start=START))
+    monkeypatch.setattr(tradingview_loader, 'fetch_futures_bars', feed)
+    cache = {}
+    feed.end = 50
+    fetch_tail('ES', '3m', cache, max_bars=80)
+
+    # Feed returned nothing: keep what is held
+    feed.end = 0
+    assert fetch_tail('ES', '3m', cache, max_bars=80, now=feed.bars[60].timestamp) == feed.bars[:50]
+
+    # Tail no longer lines up with the held bars: refetch everything
+    feed.bars = feed.bars[:50] + make_bars(n=250, seed=1, start=feed.bars[50].timestamp + timedelta(minutes=1))
+    feed.end = 200
+    bars = fetch_tail('ES', '3m', cache, max_bars=80, now=feed.bars[199].timestamp)
+    assert bars == feed.bars[120:200]
+    assert feed.calls[-2:] == [80, 80]
@@ -0,0 +1,196 @@
+"""
+Tests for broker.tradovate.data_feed: batch frame decoding, exchange-time
+bar building, bounded consumer queues, and reconnect with resubscribe
+against a local websocket server replaying recorded messages.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from websockets.asyncio.server import serve
+
+from broker.tradovate.data_feed import BarBuilder, TradovateDataFeed, decode_frame
+
+CONTRACT_IDS = {'ESM6': 1001, 'NQM6': 1002}
+START = datetime(2026, 3, 10, 14, 0, tzinfo=timezone.utc)
+
+
+class _Client:
+    """Market data side of TradovateClient: token, md_url and contract lookups."""
+
+    def __init__(self, md_url='ws://127.0.0.1:1'):
+        self.config = SimpleNamespace(md_url=md_url)
+        self.access_token = 'token'
+        self.lookups = []
+
+    def is_authenticated(self):
+        return True
+
+    def get_contract(self, symbol):
+        self.lookups.append(symbol)
+        return {'id': CONTRACT_IDS[symbol]}
+
+
+def _iso(ts):
+    return ts.strftime('%Y-%m-%dT%H:%M:%S.') + f'{ts.microsecond // 1000:03d}Z'
+
+
+def _recorded_trades(minutes=5, per_minute=6):
+    """(contract, exchange time, price, size), time ordered across ES and NQ."""
+    trades = []
+    for m in range(minutes):
+        for k in range(per_minute):
+            ts = START + timedelta(minutes=m, seconds=k * 10, milliseconds=250)
+            trades.append(('ESM6', ts, 5000 + m + (k % 3) * 0.25, 1 + k))
+            trades.append(('NQM6', ts, 18000 + m * 2 - (k % 2) * 0.5, 2))
+    return trades
+
+
+def _frames(trades, batch=4):
+    """Tradovate array frames, several md items per frame, quotes mixed in."""
+    frames = ['o']
+    for i in range(0, len(trades), batch):
+        items = []
+        for contract, ts, price, size in trades[i:i + batch]:
+            items.append({'contractId': CONTRACT_IDS[contract], 'timestamp': _iso(ts), 'price': price, 'size': size})
+            items.append({'contractId': CONTRACT_IDS[contract], 'timestamp': _iso(ts),
+                          'bid': price - 0.25, 'ask': price, 'last': price, 'volume': size})
+        frames.append('a' + json.dumps([{'e': 'md', 'd': items}]))
+        frames.append('h')
+    return frames
+
+
+def _expected_bars(trades, minutes):
+    bars = {}
+    for contract, ts, price, size in trades:
+        key = (contract, ts.replace(second=0, microsecond=0))
+        if key[1] >= START + timedelta(minutes=minutes):
+            continue
+        o, h, l, c, v = bars.get(key, (price, price, price, price, 0))
+        bars[key] = (o, max(h, price), min(l, price), price, v + size)
+    return {(sym, datetime.fromtimestamp(t.timestamp())): ohlcv for (sym, t), ohlcv in bars.items()}
+
+
+def test_decode_frame():
+    assert decode_frame('o') == decode_frame('h') == decode_frame('') == []
+    assert decode_frame('a[{"e":"md","d":[]},{"s":200},3]') == [{'e': 'md', 'd': []}, {'s': 200}]
+    assert decode_frame(b'{"type":"quote","d":{"bid":1}}') == [{'type': 'quote', 'd': {'bid': 1}}]
+    with pytest.raises(ValueError):
+        decode_frame('a[{"e":')
+
+
+def test_bar_builder_uses_exchange_time():
+    builder = BarBuilder('ES')
+    t0 = int(START.timestamp())
+    assert builder.add(t0 + 5, 10.0, 1) is None
+    assert builder.add(t0 + 30, 12.0, 2) is None
+    assert builder.add(t0 + 59.9, 9.0, 3) is None
+    bar = builder.add(t0 + 61, 11.0, 1)
+    assert bar.timestamp == datetime.fromtimestamp(t0) and bar.timeframe == '1m'
+    assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (10.0, 12.0, 9.0, 9.0, 6)
+
+    assert builder.add(t0 + 50, 99.0, 1) is None and builder.late == 1  # Closed minute
+    assert builder.close_due(t0 + 124, grace=5) is None
+    bar = builder.close_due(t0 + 125, grace=5)
+    assert bar.timestamp == datetime.fromtimestamp(t0 + 60) and bar.volume == 1
+    assert builder.add(t0 + 119, 1.0, 1) is None and builder.late == 2  # Closed by time
+
+
+def test_frame_batch_fans_out_to_bounded_queues():
+    feed = TradovateDataFeed(_Client(), bar_close_grace=None)
+    feed._contract_symbols = {v: k for k, v in CONTRACT_IDS.items()}
+    latest = feed.add_consumer('quote', maxsize=10, policy='coalesce')
+    recent_trades = feed.add_consumer('trade', maxsize=5)
+    bars = feed.add_consumer('bar')
+    seen = []
+    feed.on_bar = seen.append
+    with pytest.raises(ValueError):
+        feed.add_consumer('bar', policy='coalesce')
+    with pytest.raises(ValueError):
+        feed.add_consumer('depth')
+
+    trades = _recorded_trades(minutes=3)
+    for frame in _frames(trades):
+        feed.process_frame(frame)
+
+    # Quotes: one pending per symbol, the newest
+    assert latest.qsize() == 2
+    quote = latest.get_nowait()
+    assert quote.symbol == 'ESM6' and quote.last == trades[-2][2]
+    assert quote.timestamp == datetime.fromtimestamp(int(trades[-2][1].timestamp()))
+    # Trades: the 5 newest survive
+    assert [t.price for t in (recent_trades.get_nowait() for _ in range(5))] == [t[2] for t in trades[-5:]]
+
+    expected = _expected_bars(trades, minutes=2)
+    got = [bars.get_nowait() for _ in range(bars.qsize())]
+    assert got == seen and len(got) == len(expected) == 4
+    assert {(b.symbol, b.timestamp): (b.open, b.high, b.low, b.close, b.volume) for b in got} == expected
+
+    counters = feed.throughput()['counters']
+    assert counters['trades'] == counters['quotes'] == len(trades)
+    assert counters['bars'] == 4 and counters['trades_dropped'] == len(trades) - 5
+    assert counters['quotes_coalesced'] == len(trades) - 2
+    assert counters['frames'] == len(_frames(trades)) and 'decode_errors' not in counters
+
+    feed.process_frame('a[{"e":')
+    assert feed.throughput()['counters']['decode_errors'] == 1
+
+
+def test_bar_closes_on_time_without_next_trade():
+    feed = TradovateDataFeed(_Client(), bar_close_grace=2.0)
+    t0 = START.timestamp()
+    received = t0 + 30.5  # Local clock 0.5s behind receipt of exchange time
+    feed.process_frame(json.dumps({'e': 'md', 'd': [
+        {'symbol': 'ESM6', 'timestamp': _iso(START + timedelta(seconds=30)), 'price': 5000.0, 'size': 1}]}),
+        received=received)
+    assert feed.close_due_bars(now=received + 31) == []
+    closed = feed.close_due_bars(now=received + 32)
+    assert [(b.symbol, b.timestamp) for b in closed] == [('ESM6', datetime.fromtimestamp(t0))]
+
+
+def test_reconnect_resubscribes_against_replay_server():
+    trades = _recorded_trades(minutes=5)
+    frames = _frames(trades)
+    split = len(frames) // 2  # Connection drops mid-minute
+    connections = []
+
+    async def replay(ws):
+        received = [json.loads(await ws.recv())]
+        await ws.send('a[{"s":200,"i":0}]')
+        received += [json.loads(await ws.recv()) for _ in CONTRACT_IDS]
+        connections.append(received)
+        for frame in frames[:split] if len(connections) == 1 else frames[split:]:
+            await ws.send(frame)
+        if len(connections) > 1:
+            await ws.wait_closed()
+
+    async def main():
+        async with serve(replay, '127.0.0.1', 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            client = _Client(f'ws://127.0.0.1:{port}')
+            feed = TradovateDataFeed(client, reconnect_delay=0.05)
+            bars = feed.add_consumer('bar')
+            task = asyncio.create_task(feed.run(list(CONTRACT_IDS)))
+            got = [await asyncio.wait_for(bars.get(), timeout=10) for _ in range(8)]
+            feed.stop()
+            await asyncio.wait_for(task, timeout=10)
+            return client, feed, got
+
+    client, feed, got = asyncio.run(main())
+
+    assert len(connections) == 2
+    for received in connections:
+        assert received[0] == {'op': 'authorize', 'token': 'token'}
+        assert sorted(m['args']['symbol'] for m in received[1:]) == sorted(CONTRACT_IDS)
+        assert {m['args']['contractId'] for m in received[1:]} == set(CONTRACT_IDS.values())
+    assert sorted(client.lookups) == sorted(CONTRACT_IDS)  # Not looked up again on resubscribe
+
+    # The bar open across the drop is neither lost nor duplicated
+    assert {(b.symbol, b.timestamp): (b.open, b.high, b.low, b.close, b.volume) for b in got} == \
+        _expected_bars(trades, minutes=4)
+    stats = feed.throughput()
+    assert stats['counters']['reconnects'] == 1 and stats['counters']['trades'] == len(trades)
+    assert stats['frame']['n'] == len(frames) and stats['per_second']['trades'] > 0
+    assert not feed.running
@@ -0,0 +1,81 @@
+"""
+Parity tests for the precomputed V10 indicator series.
+
+precompute_indicators() replaces per-candidate calculate_ema/calculate_adx/
+calculate_atr/is_consolidating calls on all_bars[:idx+1] slices inside
+run_session_v10. Every lookup must equal the slice-based value exactly
+(not approximately), otherwise filter decisions could flip.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.types import Bar
+from runners.run_v10_dual_entry import (
+    calculate_adx,
+    calculate_atr,
+    calculate_ema,
+    is_consolidating,
+    is_consolidating_at,
+    precompute_indicators,
+)
+
+
+def _make_bars(n=400, seed=3, flat_from=None, flat_len=0):
+    """Random-walk 3m bars on a 0.25 tick grid, optionally with a flat stretch."""
+    rnd = random.Random(seed)
+    bars = []
+    price = 5000.0
+    ts = datetime(2026, 2, 2, 4, 0)
+    for i in range(n):
+        if flat_from is not None and flat_from <= i < flat_from + flat_len:
+            o = h = l = c = price
+        else:
+            o = price
+            c = round((o + rnd.gauss(0, 2)) * 4) / 4
+            h = max(o, c) + round(abs(rnd.gauss(0, 1)) * 4) / 4
+            l = min(o, c) - round(abs(rnd.gauss(0, 1)) * 4) / 4
+        bars.append(Bar(timestamp=ts, open=o, high=h, low=l, close=c,
+                        volume=100, symbol='ES', timeframe='3m'))
+        price = c
+        ts += timedelta(minutes=3)
+    return bars
+
+
+@pytest.mark.parametrize("bars", [
+    _make_bars(),
+    _make_bars(seed=11, flat_from=0, flat_len=40),
+    _make_bars(n=60, seed=5, flat_from=10, flat_len=30),
+])
+def test_series_match_slice_calculations(bars):
+    ind = precompute_indicators(bars)
+
+    for k in range(len(bars)):
+        prefix = bars[:k + 1]
+        assert ind['ema'][20][k] == calculate_ema(prefix, 20)
+        assert ind['ema'][50][k] == calculate_ema(prefix, 50)
+        assert ind['atr'][k] == calculate_atr(prefix, 14)
+        adx, plus_di, minus_di = calculate_adx(prefix, 14)
+        assert ind['adx'][k] == adx
+        assert ind['plus_di'][k] == plus_di
+        assert ind['minus_di'][k] == minus_di
+
+
+@pytest.mark.parametrize("threshold", [0.0, 1.0, 2.5])
+def test_consolidation_lookup_matches(threshold):
+    bars = _make_bars(n=120, seed=9, flat_from=50, flat_len=20)
+    ind = precompute_indicators(bars)
+
+    for k in range(len(bars)):
+        assert is_consolidating_at(bars, ind, k, threshold=threshold) == \
+            is_consolidating(bars[:k + 1], threshold=threshold)
+
+
+def test_short_history_returns_none():
+    bars = _make_bars(n=10)
+    ind = precompute_indicators(bars)
+
+    assert all(v is None for v in ind['ema'][20])
+    assert all(v is None for v in ind['adx'])
+    assert precompute_indicators([])['atr'] == []
@@ -0,0 +1,74 @@
+"""
+Tests for the two-stage V10 API: generate_entries() + simulate_exits()
+must reproduce run_session_v10(), and one set of candidates must serve
+any number of exit variants.
+"""
+import copy
+import inspect
+from datetime import time as dt_time
+
+import runners.run_v10_dual_entry as v10
+from runners.symbol_defaults import get_session_v10_kwargs
+
+
+def _session(bars, day_index=-1):
+    day = sorted({b.timestamp.date() for b in bars})[day_index]
+    return [b for b in bars if b.timestamp.date() == day and dt_time(4, 0) <= b.timestamp.time() <= dt_time(16, 0)]
+
+
+EXIT_VARIANTS = [
+    {},
+    {'trail_r_trigger': 6, 't1_r_target': 2},
+    {'opposing_fvg_exit': True, 'opposing_fvg_mode': 'body'},
+    {'post_t1_trail_r': 1, 't2_fixed_r': 5, 'contracts': 2},
+]
+
+
+def test_stage_keywords_cover_run_session_v10():
+    params = set(inspect.signature(v10.run_session_v10).parameters) - {'session_bars', 'all_bars'}
+    stages = set(v10.ENTRY_KWARG_NAMES) | set(v10.EXIT_KWARG_NAMES)
+    assert params - stages == {'use_opposing_fvg_exit'}
+    assert stages <= params
+
+    # Same defaults as run_session_v10
+    defaults = {n: p.default for n, p in inspect.signature(v10.run_session_v10).parameters.items()}
+    for fn in (v10.generate_entries, v10.simulate_exits):
+        for name, p in list(inspect.signature(fn).parameters.items())[2:]:
+            assert p.default == defaults[name], name
+
+
+def test_two_stages_match_run_session_v10(make_bars):
+    bars = make_bars(days=3, seed=5)
+    session = _session(bars)
+    base = get_session_v10_kwargs('ES')
+    v10.ENTRY_MEMO.clear()
+
+    entry_kwargs, _ = v10.split_session_kwargs(base)
+    candidates = v10.generate_entries(session, bars, **entry_kwargs)
+    snapshot = copy.deepcopy(candidates['entries'])
+    assert candidates['entries']
+
+    for overrides in EXIT_VARIANTS:
+        kwargs = {**base, **overrides}
+        _, exit_kwargs = v10.split_session_kwargs(kwargs)
+        assert v10.simulate_exits(candidates, session, **exit_kwargs) == v10.run_session_v10(session, bars, **kwargs)
+
+    # Stage one is read-only for stage two
+    assert candidates['entries'] == snapshot
+
+
+def test_candidates_do_not_depend_on_exit_params(make_bars):
+    bars = make_bars(days=3, seed=5)
+    session = _session(bars)
+    v10.ENTRY_MEMO.clear()
+    v10.FVG_MEMO.clear()
+
+    entry_kwargs, _ = v10.split_session_kwargs(get_session_v10_kwargs('ES'))
+    first = v10.generate_entries(session, bars, **entry_kwargs)
+    v10.ENTRY_MEMO.clear()
+    v10.FVG_MEMO.clear()
+    second = v10.generate_entries(session, bars, **entry_kwargs)
+
+    assert first['entries'] == second['entries']
+    assert first['session_to_all_idx'] == second['session_to_all_idx']
+    assert first['all_bars'] is bars